@@ -0,0 +1,77 @@
+""" benchmark of the scenario construction, with checks and with the trusted construction
+
+    usage: python benchmarks/construction.py [number of events]
+
+"""
+import os
+import sys
+import timeit
+
+# the repository (for pyoscx) and this directory (for the shared builders) are imported without installing
+BENCHMARKS = os.path.dirname(os.path.abspath(__file__))
+sys.path[:0] = [os.path.dirname(BENCHMARKS),BENCHMARKS]
+
+import pyoscx
+
+
+def build(n_events):
+    """ builds a scenario with two vehicles and n_events speed change events
+
+    """
+    bb = pyoscx.BoundingBox(2,5,1.8,2.0,0,0.9)
+    fa = pyoscx.Axle(0.5,0.8,1.68,2.98,0.4)
+    ba = pyoscx.Axle(0.5,0.8,1.68,0,0.4)
+    entities = pyoscx.Entities()
+    entities.add_scenario_object('Ego',pyoscx.Vehicle('car',pyoscx.VehicleCategory.car,bb,fa,ba,69,10,10))
+    entities.add_scenario_object('Target',pyoscx.Vehicle('car',pyoscx.VehicleCategory.car,bb,fa,ba,69,10,10))
+
+    init = pyoscx.Init()
+    td = pyoscx.TransitionDynamics(pyoscx.DynamicsShapes.step,pyoscx.DynamicsDimension.time,1)
+    init.add_init_action('Ego',pyoscx.AbsoluteSpeedAction(30,td))
+    init.add_init_action('Ego',pyoscx.TeleportAction(pyoscx.LanePosition(25,0,-1,1)))
+    init.add_init_action('Target',pyoscx.AbsoluteSpeedAction(30,td))
+    init.add_init_action('Target',pyoscx.TeleportAction(pyoscx.LanePosition(50,0,-1,1)))
+
+    man = pyoscx.Maneuver('man')
+    for i in range(n_events):
+        event = pyoscx.Event('event' + str(i),pyoscx.Priority.overwrite)
+        condition = pyoscx.SimulationTimeCondition(i,pyoscx.Rule.greaterThan)
+        event.add_trigger(pyoscx.ValueTrigger('start' + str(i),0,pyoscx.ConditionEdge.rising,condition))
+        dynamics = pyoscx.TransitionDynamics(pyoscx.DynamicsShapes.sinusoidal,pyoscx.DynamicsDimension.time,2)
+        event.add_action('speed' + str(i),pyoscx.AbsoluteSpeedAction(10 + i % 20,dynamics))
+        man.add_event(event)
+    sb = pyoscx.StoryBoard(init)
+    sb.add_maneuver(man,'Target')
+    return pyoscx.Scenario('benchmark','pyoscx',pyoscx.ParameterDeclarations(),entities,sb,pyoscx.RoadNetwork('road.xodr'),pyoscx.Catalog())
+
+
+def best(function,repeat=7):
+    """ returns the best time of a function in ms
+
+    """
+    return min(timeit.repeat(function,number=1,repeat=repeat))*1000
+
+
+def main(n_events=1000):
+    checked = best(lambda: build(n_events))
+
+    with pyoscx.trusted_construction(record=False):
+        trusted = best(lambda: build(n_events))
+
+    def recorded():
+        with pyoscx.trusted_construction():
+            scenario = build(n_events)
+        scenario.validate()
+    with pyoscx.trusted_construction():
+        scenario = build(n_events)
+    validate = best(scenario.validate,1)
+    recorded_total = best(recorded)
+
+    print('construction of a scenario with %d events' % n_events)
+    print('  checked:              %8.2f ms' % checked)
+    print('  trusted:              %8.2f ms (%.2fx)' % (trusted,checked/trusted))
+    print('  trusted and recorded: %8.2f ms, of which validate %.2f ms' % (recorded_total,validate))
+
+
+if __name__ == '__main__':
+    main(*[int(a) for a in sys.argv[1:]])
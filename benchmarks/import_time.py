@@ -0,0 +1,44 @@
+""" benchmark of the import time of pyoscx, each measured in a new python process
+
+    usage: python benchmarks/import_time.py [number of runs]
+
+"""
+import os
+import subprocess
+import sys
+import time
+
+
+STATEMENTS = [
+    ('python start','pass'),
+    ('import pyoscx','import pyoscx'),
+    ('pyoscx.Scenario','import pyoscx; pyoscx.Scenario'),
+    ('pyoscx.EsminiRunner','import pyoscx; pyoscx.EsminiRunner'),
+    ('everything (from pyoscx import *)','from pyoscx import *'),
+]
+
+
+def measure(statement,runs):
+    """ returns the best wall time of running the statement in a new interpreter, in ms
+
+    """
+    env = dict(os.environ)
+    env['PYTHONPATH'] = os.pathsep.join([os.path.join(os.path.dirname(__file__),'..'),env.get('PYTHONPATH','')])
+    best = None
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run([sys.executable,'-c',statement],env=env,check=True)
+        elapsed = (time.perf_counter() - start)*1000
+        best = elapsed if best is None else min(best,elapsed)
+    return best
+
+
+def main(runs=10):
+    results = [(name,measure(statement,runs)) for name, statement in STATEMENTS]
+    start = results[0][1]
+    for name, elapsed in results:
+        print('%-36s %8.2f ms (+%.2f ms)' % (name,elapsed,elapsed - start))
+
+
+if __name__ == '__main__':
+    main(*[int(a) for a in sys.argv[1:]])
@@ -0,0 +1,98 @@
+""" benchmark of the translated serializers (xml_string) against printing the element of get_element,
+    per class of actions.py and triggers.py and for a whole scenario
+
+    usage: python benchmarks/serializers.py [number of events]
+
+"""
+import os
+import sys
+import timeit
+
+# the repository (for pyoscx) and this directory (for the shared builders) are imported without installing
+BENCHMARKS = os.path.dirname(os.path.abspath(__file__))
+sys.path[:0] = [os.path.dirname(BENCHMARKS),BENCHMARKS]
+
+import pyoscx
+from pyoscx.helpers import _serialize, _PRETTY, _UGLY
+from pyoscx.serializers import xml_string
+
+from construction import build
+
+
+def samples():
+    """ returns one object of the benchmarked classes of actions.py and triggers.py
+
+    """
+    td = pyoscx.TransitionDynamics(pyoscx.DynamicsShapes.step,pyoscx.DynamicsDimension.rate,1)
+    route = pyoscx.Route('myroute')
+    route.add_waypoint(pyoscx.WorldPosition(0,0,0,0,0,0),pyoscx.RouteStrategy.shortest)
+    route.add_waypoint(pyoscx.WorldPosition(1,1,0,0,0,0),pyoscx.RouteStrategy.shortest)
+    condition = pyoscx.TimeToCollisionCondition(10,pyoscx.Rule.equalTo,True,freespace=False,position=pyoscx.WorldPosition())
+    group = pyoscx.ConditionGroup()
+    group.add_condition(pyoscx.EntityTrigger('entity',0.2,pyoscx.ConditionEdge.rising,condition,'Target'))
+    group.add_condition(pyoscx.ValueTrigger('value',0,pyoscx.ConditionEdge.none,pyoscx.SimulationTimeCondition(1,pyoscx.Rule.greaterThan)))
+    trigger = pyoscx.Trigger()
+    trigger.add_conditiongroup(group)
+    return [
+        pyoscx.AbsoluteSpeedAction(50,td),
+        pyoscx.RelativeSpeedAction(1,'Ego',td),
+        pyoscx.LongitudinalDistanceAction(1,'Ego'),
+        pyoscx.AbsoluteLaneChangeAction(1,td),
+        pyoscx.RelativeLaneOffsetAction(1,'Ego',pyoscx.DynamicsShapes.step,3,False),
+        pyoscx.LateralDistanceAction('Ego',3,max_speed=50),
+        pyoscx.TeleportAction(pyoscx.LanePosition(25,0,-1,1)),
+        pyoscx.AssignRouteAction(route),
+        pyoscx.OverrideBrakeAction(0.4,True),
+        pyoscx.VisibilityAction(True,False,True),
+        pyoscx.ParameterSetAction('Param',3),
+        pyoscx.AddEntityAction('Ego',pyoscx.WorldPosition()),
+        pyoscx.EntityTrigger('trigger',0.2,pyoscx.ConditionEdge.rising,condition,'Target'),
+        pyoscx.ValueTrigger('trigger',0,pyoscx.ConditionEdge.rising,pyoscx.SimulationTimeCondition(1,pyoscx.Rule.greaterThan)),
+        trigger,
+        pyoscx.TimeHeadwayCondition('Ego',20,pyoscx.Rule.equalTo,True,False),
+        condition,
+        pyoscx.SpeedCondition(1,pyoscx.Rule.lessThan),
+        pyoscx.ReachPositionCondition(pyoscx.WorldPosition(),0.01),
+        pyoscx.RelativeDistanceCondition(1,pyoscx.Rule.equalTo,pyoscx.RelativeDistanceType.longitudinal,'Ego',True,False),
+        pyoscx.ParameterCondition('MyParam',1,pyoscx.Rule.equalTo),
+        pyoscx.StoryboardElementStateCondition(pyoscx.StoryboardElementType.action,'hej',pyoscx.StoryboardElementState.endTransition),
+        pyoscx.TrafficSignalCondition('traflight','green')]
+
+
+def best(function,number=1,repeat=7):
+    """ returns the best time of a function in ms
+
+    """
+    return min(timeit.repeat(function,number=number,repeat=repeat))*1000/number
+
+
+def compare(obj,prettyprint,number=1):
+    """ returns the time of the element based and the translated serialization in ms
+
+    """
+    mode = _PRETTY if prettyprint else _UGLY
+    if not xml_string(obj,prettyprint).endswith(_serialize(obj.get_element(),mode)):
+        raise AssertionError('different output for ' + type(obj).__name__)
+    element = best(lambda: _serialize(obj.get_element(),mode),number)
+    translated = best(lambda: xml_string(obj,prettyprint),number)
+    return element, translated
+
+
+def main(n_events=1000):
+    # the translated serializers are opt-in
+    pyoscx.enable_streaming()
+    print('%-36s %12s %12s %8s %8s' % ('class','element [us]','streamed [us]','pretty','ugly'))
+    for obj in samples():
+        element, translated = compare(obj,True,1000)
+        ugly_element, ugly_translated = compare(obj,False,1000)
+        print('%-36s %12.1f %12.1f %7.2fx %7.2fx' % (type(obj).__name__,element*1000,translated*1000,element/translated,ugly_element/ugly_translated))
+
+    scenario = build(n_events)
+    scenario.header.date = pyoscx.CANONICAL_DATE
+    for prettyprint in (True,False):
+        element, translated = compare(scenario,prettyprint)
+        print('scenario with %d events, %s: %.1f ms -> %.1f ms (%.2fx)' % (n_events,'pretty' if prettyprint else 'ugly',element,translated,element/translated))
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
@@ -0,0 +1,357 @@
+""" benchmark suite of pyoscx: construction, get_element, write_xml (pretty and ugly), peak memory and import time
+    of synthetic workloads and of the scenarios in examples/, compared against a stored baseline
+
+    usage: python benchmarks/suite.py [--save] [--baseline FILE] [--tolerance FRACTION] [--scale FACTOR] [--repeat N] [--only TEXT] [--retries N]
+
+    Without --save the results are compared with the baseline (benchmarks/baseline.json),
+    every measure that is more than tolerance (default 0.25) above its baseline value is
+    reported as a regression and the exit code is 1. A workload with a regression is
+    measured again (--retries times) and the best value is used, so short slowdowns of the
+    machine are not reported. With --save the median of 1 + retries runs is stored as the new baseline.
+    The comparison uses at least MIN_REPEAT repetitions, and the tolerance of every measure is
+    widened by its measured spread (how far the typical repetition is above the best one),
+    so a noisy measure is not reported as a regression.
+
+    The times are measured in units of a calibration loop (python objects, ElementTree and
+    strings, like pyoscx), whose runs alternate with the timed runs. So a machine that is
+    slower as a whole, or for a while, does not report regressions, and the baseline can be
+    used on other machines. The baseline stores the times in these units.
+
+"""
+import argparse
+import ast
+import json
+import os
+import statistics
+import sys
+import tempfile
+import timeit
+import tracemalloc
+import types
+import xml.etree.ElementTree as ET
+
+# the repository (for pyoscx) and this directory (for the shared builders) are imported without installing
+BENCHMARKS = os.path.dirname(os.path.abspath(__file__))
+sys.path[:0] = [os.path.dirname(BENCHMARKS),BENCHMARKS]
+
+import pyoscx
+
+from construction import build as build_events
+from import_time import measure as measure_import
+
+
+EXAMPLES = os.path.join(BENCHMARKS,'..','examples')
+# fewer repetitions are too noisy to be compared with the baseline
+MIN_REPEAT = 5
+BASELINE = os.path.join(BENCHMARKS,'baseline.json')
+
+def _vehicle(name):
+    bb = pyoscx.BoundingBox(2,5,1.8,2.0,0,0.9)
+    fa = pyoscx.Axle(0.5,0.8,1.68,2.98,0.4)
+    ba = pyoscx.Axle(0.5,0.8,1.68,0,0.4)
+    return pyoscx.Vehicle(name,pyoscx.VehicleCategory.car,bb,fa,ba,69,10,10)
+
+
+def _scenario(entities,init,maneuver,actor):
+    sb = pyoscx.StoryBoard(init)
+    sb.add_maneuver(maneuver,actor)
+    return pyoscx.Scenario('benchmark','pyoscx',pyoscx.ParameterDeclarations(),entities,sb,pyoscx.RoadNetwork('road.xodr'),pyoscx.Catalog())
+
+
+def _event(name,action_name,action):
+    event = pyoscx.Event(name,pyoscx.Priority.overwrite)
+    event.add_trigger(pyoscx.ValueTrigger(name,0,pyoscx.ConditionEdge.rising,pyoscx.SimulationTimeCondition(1,pyoscx.Rule.greaterThan)))
+    event.add_action(action_name,action)
+    return event
+
+
+def build_entities(n):
+    """ a scenario with n vehicles, each with an initial speed and position
+
+    """
+    entities = pyoscx.Entities()
+    init = pyoscx.Init()
+    td = pyoscx.TransitionDynamics(pyoscx.DynamicsShapes.step,pyoscx.DynamicsDimension.time,1)
+    for i in range(n):
+        name = 'car' + str(i)
+        entities.add_scenario_object(name,_vehicle(name))
+        init.add_init_action(name,pyoscx.AbsoluteSpeedAction(10 + i % 20,td))
+        init.add_init_action(name,pyoscx.TeleportAction(pyoscx.LanePosition(10*i,0,-1 - i % 3,1)))
+    maneuver = pyoscx.Maneuver('man')
+    maneuver.add_event(_event('start','speed',pyoscx.AbsoluteSpeedAction(30,td)))
+    return _scenario(entities,init,maneuver,'car0')
+
+
+def build_trajectory(n):
+    """ a scenario with one vehicle following a polyline trajectory of n vertices
+
+    """
+    entities = pyoscx.Entities()
+    entities.add_scenario_object('Ego',_vehicle('Ego'))
+    init = pyoscx.Init()
+    init.add_init_action('Ego',pyoscx.TeleportAction(pyoscx.WorldPosition()))
+    positions = [pyoscx.WorldPosition(i*0.5,(i % 10)*0.1,0,0.01*i,0,0) for i in range(n)]
+    polyline = pyoscx.Polyline([i*0.1 for i in range(n)],positions)
+    trajectory = pyoscx.Trajectory('trajectory',False)
+    trajectory.add_shape(polyline)
+    maneuver = pyoscx.Maneuver('man')
+    maneuver.add_event(_event('follow','trajectory',pyoscx.FollowTrajectoryAction(trajectory,pyoscx.FollowMode.position,pyoscx.ReferenceContext.relative,1,0)))
+    return _scenario(entities,init,maneuver,'Ego')
+
+
+def build_conditions(n):
+    """ a scenario with one event started by a trigger of n condition groups of n conditions each
+
+        (OpenSCENARIO does not nest condition groups, a Trigger is an or of
+        ConditionGroups that are each an and of conditions)
+
+    """
+    entities = pyoscx.Entities()
+    entities.add_scenario_object('Ego',_vehicle('Ego'))
+    entities.add_scenario_object('Target',_vehicle('Target'))
+    init = pyoscx.Init()
+    init.add_init_action('Ego',pyoscx.TeleportAction(pyoscx.LanePosition(25,0,-1,1)))
+    init.add_init_action('Target',pyoscx.TeleportAction(pyoscx.LanePosition(50,0,-1,1)))
+    trigger = pyoscx.Trigger()
+    for i in range(n):
+        group = pyoscx.ConditionGroup()
+        for j in range(n):
+            name = 'condition' + str(i) + '_' + str(j)
+            if j % 2:
+                condition = pyoscx.TimeHeadwayCondition('Target',1 + j,pyoscx.Rule.lessThan)
+                group.add_condition(pyoscx.EntityTrigger(name,0,pyoscx.ConditionEdge.rising,condition,'Ego'))
+            else:
+                condition = pyoscx.SimulationTimeCondition(i + j,pyoscx.Rule.greaterThan)
+                group.add_condition(pyoscx.ValueTrigger(name,0,pyoscx.ConditionEdge.rising,condition))
+        trigger.add_conditiongroup(group)
+    event = pyoscx.Event('event',pyoscx.Priority.overwrite)
+    event.add_trigger(trigger)
+    event.add_action('speed',pyoscx.AbsoluteSpeedAction(30,pyoscx.TransitionDynamics(pyoscx.DynamicsShapes.step,pyoscx.DynamicsDimension.time,1)))
+    maneuver = pyoscx.Maneuver('man')
+    maneuver.add_event(event)
+    return _scenario(entities,init,maneuver,'Ego')
+
+
+# calls of the examples that start esmini, write files or print
+_EXAMPLE_CALLS = ('esminiRunner','esminiRunViewer','dump_to_catalog','write_xml','prettyprint','print')
+
+
+class _RemoveCalls(ast.NodeTransformer):
+    def visit_Expr(self,node):
+        if isinstance(node.value,ast.Call) and isinstance(node.value.func,(ast.Attribute,ast.Name)):
+            func = node.value.func
+            if (func.attr if isinstance(func,ast.Attribute) else func.id) in _EXAMPLE_CALLS:
+                return ast.Pass()
+        return node
+
+
+def example(filename):
+    """ returns a function running an example script (without starting esmini or writing files) and returning its scenario,
+        or None if the example does not create a scenario, needs a module that is not installed or reads files
+
+    """
+    with open(filename) as f:
+        tree = ast.parse(f.read(),filename)
+    tree = ast.fix_missing_locations(_RemoveCalls().visit(tree))
+    code = compile(tree,filename,'exec')
+
+    def run():
+        namespace = {'__name__':'__main__','__file__':filename}
+        exec(code,namespace)
+        scenarios = [value for value in namespace.values() if isinstance(value,pyoscx.Scenario)]
+        return scenarios[-1] if scenarios else None
+    try:
+        if run() is None:
+            return None
+    except (ImportError,OSError):
+        return None
+    return run
+
+
+def workloads(scale=1.0,only=None):
+    """ returns the name and scenario building function of each workload
+
+    """
+    def size(n):
+        return max(1,int(n*scale))
+    result = []
+    for n in (10,100):
+        result.append(('entities_%d' % size(n),lambda n=size(n): build_entities(n)))
+    for n in (100,1000):
+        result.append(('events_%d' % size(n),lambda n=size(n): build_events(n)))
+    for n in (100,5000):
+        result.append(('trajectory_%d' % size(n),lambda n=size(n): build_trajectory(n)))
+    result.append(('conditions_%dx%d' % (size(30),size(30)),lambda n=size(30): build_conditions(n)))
+    for filename in sorted(os.listdir(EXAMPLES)):
+        if filename.endswith('.py'):
+            run = example(os.path.join(EXAMPLES,filename))
+            if run is not None:
+                result.append(('examples/' + filename[:-3],run))
+    if only:
+        result = [(name,function) for name, function in result if only in name]
+    return result
+
+
+def best(function,repeat):
+    """ returns the best time of a function in ms
+
+    """
+    return min(timeit.repeat(function,number=1,repeat=repeat))*1000
+
+
+def _calibration_loop():
+    root = ET.Element('root')
+    for i in range(500):
+        obj = types.SimpleNamespace(name='item' + str(i),value=i*0.5)
+        ET.SubElement(root,'item',attrib={'name':obj.name,'value':str(obj.value)})
+    return len(ET.tostring(root))
+
+
+def calibrate(repeat=20):
+    """ returns the best time of the calibration loop in ms
+
+    """
+    return best(_calibration_loop,repeat)
+
+
+def relative(function,repeat):
+    """ returns the best time of a function in units of the calibration loop, the repetitions
+        alternate with runs of the calibration loop so both are timed under the same load
+
+        Returns
+        -------
+            (float, float): the time and its spread, the relative distance of the median repetition
+                to the best one (of the function and of the calibration loop)
+
+    """
+    # short functions are run several times in a row, for at least about one run of the calibration loop
+    calibrations = [timeit.timeit(_calibration_loop,number=1)]
+    number = max(1,int(calibrations[0]/max(timeit.timeit(function,number=1),1e-9)))
+    times = []
+    for _ in range(repeat):
+        times.append(timeit.timeit(function,number=number)/number)
+        calibrations.append(timeit.timeit(_calibration_loop,number=1))
+    spread = statistics.median(times)/min(times) + statistics.median(calibrations)/min(calibrations) - 2
+    return min(times)/min(calibrations), spread
+
+
+def measure(build,directory,repeat=5):
+    """ returns the measures of a workload, times in units of the calibration loop and the peak memory in kB,
+        and the spreads of the times
+
+    """
+    scenario = build()
+    filename = os.path.join(directory,'benchmark.xosc')
+    timed = {
+        'construction':relative(build,repeat),
+        'get_element':relative(scenario.get_element,repeat),
+        'write_pretty':relative(lambda: scenario.write_xml(filename,prettyprint=True),repeat),
+        'write_ugly':relative(lambda: scenario.write_xml(filename,prettyprint=False),repeat)}
+    result = {key:value for key, (value, _) in timed.items()}
+    spreads = {key:spread for key, (_, spread) in timed.items()}
+    tracemalloc.start()
+    try:
+        scenario = build()
+        scenario.get_element()
+        scenario.write_xml(filename)
+        result['peak_memory'] = tracemalloc.get_traced_memory()[1]/1024
+    finally:
+        tracemalloc.stop()
+    return result, spreads
+
+
+def run(scale=1.0,only=None,repeat=5,import_runs=5,names=None,spreads=None):
+    """ runs all workloads (or the named ones), returns the results as {workload: {measure: value}}
+        and adds the spreads of the times to spreads (if given) as {workload: {measure: spread}}
+
+    """
+    results = {}
+    with tempfile.TemporaryDirectory() as directory:
+        for name, build in workloads(scale,only):
+            if names is not None and name not in names:
+                continue
+            results[name], spread = measure(build,directory,repeat)
+            if spreads is not None:
+                spreads[name] = spread
+            print('%-44s' % name + ''.join(' %s %.3f' % (key,value) for key, value in results[name].items()),flush=True)
+    if (only is None or only == 'import') and (names is None or 'import' in names):
+        calibration = calibrate(5)
+        start = measure_import('pass',import_runs)
+        imported = measure_import('import pyoscx; pyoscx.Scenario',import_runs)
+        calibration = min(calibration,calibrate(5))
+        results['import'] = {'import_pyoscx':(imported - start)/calibration}
+        print('%-44s import_pyoscx %.3f' % ('import',results['import']['import_pyoscx']))
+    return results
+
+
+def compare(results,baseline,tolerance=0.25,spreads=None):
+    """ returns the regressions, as (workload, measure, baseline value, value), of the results against the baseline,
+        the tolerance of a measure is widened by its spread (if given)
+
+    """
+    spreads = spreads or {}
+    regressions = []
+    for name, measures in results.items():
+        for key, value in measures.items():
+            reference = baseline.get(name,{}).get(key)
+            spread = spreads.get(name,{}).get(key,0)
+            if reference is not None and value > reference*(1 + tolerance + spread):
+                regressions.append((name,key,reference,value))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='pyoscx benchmark suite')
+    parser.add_argument('--save',action='store_true',help='store the results as the baseline')
+    parser.add_argument('--baseline',default=BASELINE,help='baseline file')
+    parser.add_argument('--tolerance',type=float,default=0.25,help='allowed slowdown as a fraction of the baseline')
+    parser.add_argument('--scale',type=float,default=1.0,help='factor of the workload sizes')
+    parser.add_argument('--repeat',type=int,default=MIN_REPEAT,help='repetitions of each timing, the best is used (at least %d when comparing)' % MIN_REPEAT)
+    parser.add_argument('--only',default=None,help='only run the workloads containing this text')
+    parser.add_argument('--retries',type=int,default=2,help='times a workload with a regression is measured again')
+    args = parser.parse_args(argv)
+
+    print('times in units of the calibration loop, %.3f ms on this machine' % calibrate())
+    repeat = args.repeat
+    if not args.save and repeat < MIN_REPEAT:
+        print('comparing with %d repetitions instead of %d' % (MIN_REPEAT,repeat))
+        repeat = MIN_REPEAT
+    spreads = {}
+    results = run(args.scale,args.only,repeat,spreads=spreads)
+    if args.save:
+        # the baseline is the median of several runs, so it does not come from an unusually fast run
+        runs = [results] + [run(args.scale,args.only,repeat) for _ in range(args.retries)]
+        results = {name:{key:statistics.median(r[name][key] for r in runs) for key in measures} for name, measures in results.items()}
+        with open(args.baseline,'w') as f:
+            json.dump({name:{key:round(value,4) for key, value in measures.items()} for name, measures in results.items()},f,indent=1,sort_keys=True)
+        print('baseline written to ' + args.baseline)
+        return 0
+    if not os.path.isfile(args.baseline):
+        print('no baseline found, run with --save to create ' + args.baseline)
+        return 0
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    regressions = compare(results,baseline,args.tolerance,spreads)
+    for _ in range(args.retries):
+        if not regressions:
+            break
+        # a regression has to show up again, the best value of all runs is used
+        print('measuring %d workloads again' % len(set(name for name, _, _, _ in regressions)))
+        again_spreads = {}
+        again = run(args.scale,args.only,repeat,names=set(name for name, _, _, _ in regressions),spreads=again_spreads)
+        for name, measures in again.items():
+            for key, value in measures.items():
+                if value < results[name][key]:
+                    results[name][key] = value
+                    if key in again_spreads.get(name,{}):
+                        spreads[name][key] = again_spreads[name][key]
+        regressions = compare(results,baseline,args.tolerance,spreads)
+    for name, key, reference, value in regressions:
+        print('REGRESSION %s %s: %.3f -> %.3f (%+.0f%%)' % (name,key,reference,value,(value/reference - 1)*100))
+    if not regressions:
+        print('no regressions (tolerance %.0f%%)' % (args.tolerance*100))
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
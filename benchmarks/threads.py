@@ -0,0 +1,56 @@
+""" benchmark of multi-threaded scenario generation: each thread builds and serializes its own scenarios,
+    the output is compared with the single-threaded output
+
+    usage: python benchmarks/threads.py [number of scenarios] [number of events]
+
+    The threads only run in parallel on a free-threaded Python build (python3.13t and later),
+    with the GIL the throughput stays about the same for all thread counts.
+
+"""
+import os
+import sys
+import sysconfig
+import time
+
+# the repository (for pyoscx) and this directory (for the shared builders) are imported without installing
+BENCHMARKS = os.path.dirname(os.path.abspath(__file__))
+sys.path[:0] = [os.path.dirname(BENCHMARKS),BENCHMARKS]
+
+import pyoscx
+
+from construction import build
+
+
+def generate(index,n_events):
+    """ builds and serializes one scenario
+
+    """
+    scenario = build(n_events)
+    scenario.header.date = '2020-06-01T12:00:00'
+    scenario.storyboard.init.add_init_action('Ego',pyoscx.AbsoluteSpeedAction(index,pyoscx.TransitionDynamics(pyoscx.DynamicsShapes.step,pyoscx.DynamicsDimension.time,1)))
+    return pyoscx.xml_string(scenario)
+
+
+def main(n_scenarios=64,n_events=100):
+    gil = getattr(sys,'_is_gil_enabled',lambda: True)()
+    print('generation of %d scenarios with %d events (free-threaded build: %s, gil enabled: %s, cpus: %s)' % (
+        n_scenarios,n_events,bool(sysconfig.get_config_var('Py_GIL_DISABLED')),gil,os.cpu_count()))
+    calls = [(generate,(i,n_events)) for i in range(n_scenarios)]
+    # the serializers are translated on first use
+    generate(0,n_events)
+    expected = None
+    single = None
+    for workers in (1,2,4,8):
+        start = time.perf_counter()
+        results = pyoscx.run_parallel(calls,workers)
+        elapsed = time.perf_counter() - start
+        if expected is None:
+            expected = results
+            single = elapsed
+        elif results != expected:
+            raise AssertionError('the output of %d threads differs from the single-threaded output' % workers)
+        print('  %d threads: %8.2f ms, %7.1f scenarios/s (%.2fx)' % (workers,elapsed*1000,n_scenarios/elapsed,single/elapsed))
+
+
+if __name__ == '__main__':
+    main(*[int(a) for a in sys.argv[1:]])
@@ -1,11 +1,109 @@
 # __init__.py
+import importlib
 
-from .utils import *
-from .actions import *
-from .helpers import *
-from .position import *
-from .triggers import *
-from .scenario import *
-from .storyboard import *
-from .entities import *
-from .enumerations import *
\ No newline at end of file
+# the names defined in each submodule, in the order of the former star imports;
+# a submodule is only imported when one of its names is used the first time (PEP 562)
+_SUBMODULES = {
+    'utils':(
+        'enable_element_cache','disable_element_cache','enable_interning','disable_interning',
+        'enable_trusted_construction','disable_trusted_construction','trusted_construction',
+        'ParameterDeclarations','EntityRef','Parameter','Orientation','TransitionDynamics',
+        'DynamicsConstrains','Route','Waypoint','Trajectory','TimeReference','Polyline','Clothoid',
+        'ControlPoint','Nurbs','FileHeader','Phase','TrafficSignalController','TrafficDefinition',
+        'CatalogFile','Catalog','CatalogReference','ParameterAssignment','TimeOfDay','Weather',
+        'RoadCondition','Environment','Controller','BoundingBox','Center','Dimensions','Properties',
+        'merge_dicts','convert_bool','set_numeric_format','omit_default','convert_float'),
+    'actions':(
+        'AbsoluteSpeedAction','RelativeSpeedAction','LongitudinalDistanceAction',
+        'LongitudinalTimegapAction','AbsoluteLaneChangeAction','RelativeLaneChangeAction',
+        'AbsoluteLaneOffsetAction','RelativeLaneOffsetAction','LateralDistanceAction','TeleportAction',
+        'AssignRouteAction','AcquirePositionAction','FollowTrajectoryAction','ActivateControllerAction',
+        'AssignControllerAction','OverrideThrottleAction','OverrideBrakeAction','OverrideClutchAction',
+        'OverrideParkingBrakeAction','OverrideSteeringWheelAction','OverrideGearAction','VisibilityAction',
+        'AbsoluteSynchronizeAction','RelativeSynchronizeAction','ParameterAddAction',
+        'ParameterMultiplyAction','ParameterSetAction','TrafficSignalStateAction','AddEntityAction',
+        'DeleteEntityAction','TrafficSignalControllerAction','TrafficSourceAction','TrafficSinkAction',
+        'TrafficSwarmAction','EnvironmentAction','CustomCommandAction'),
+    'helpers':(
+        'CANONICAL_DATE','esminiRunner','esminiRunViewer','prettyprint','canonical_xml','printToFile'),
+    'position':(
+        'WorldPosition','RelativeWorldPosition','RelativeObjectPosition','RoadPosition',
+        'RelativeRoadPosition','LanePosition','RelativeLanePosition','RoutePositionOfCurrentEntity',
+        'RoutePositionInRoadCoordinates','RoutePositionInLaneCoordinates'),
+    'triggers':(
+        'EmptyTrigger','Trigger','ConditionGroup','EntityTrigger','ValueTrigger','TriggeringEntities',
+        'EndOfRoadCondition','CollisionCondition','OffroadCondition','TimeHeadwayCondition',
+        'TimeToCollisionCondition','AccelerationCondition','StandStillCondition','SpeedCondition',
+        'RelativeSpeedCondition','TraveledDistanceCondition','ReachPositionCondition','DistanceCondition',
+        'RelativeDistanceCondition','ParameterCondition','TimeOfDayCondition','SimulationTimeCondition',
+        'StoryboardElementStateCondition','UserDefinedValueCondition','TrafficSignalCondition',
+        'TrafficSignalControllerCondition'),
+    'scenario':(
+        'Scenario','RoadNetwork'),
+    'storyboard':(
+        'Init','StoryBoard','Story','Act','ManeuverGroup','Maneuver','Event'),
+    'entities':(
+        'Entities','ScenarioObject','Entity','Pedestrian','MiscObject','Vehicle','Axle','Axles'),
+    'enumerations':(
+        'XMLNS','XSI','CloudState','ConditionEdge','DynamicsDimension','DynamicsShapes','FollowMode',
+        'MiscObjectCategory','ObjectType','ParameterType','PedestrianCategory','PrecipitationType',
+        'Priority','ReferenceContext','RelativeDistanceType','RouteStrategy','Rule','SpeedTargetValueType',
+        'StoryboardElementState','StoryboardElementType','TriggeringEntitiesRule','VehicleCategory'),
+    'runner':(
+        'RunResult','EsminiRunner','run_parallel'),
+    'sampling':(
+        'Sample','AdaptiveSampler','FalsificationSearch'),
+    'minimizer':(
+        'ScenarioMinimizer',),
+    'cache':(
+        'ResultCache',),
+    'extraction':(
+        'CatalogExtractor',),
+    'serializers':(
+        'xml_string','write_object','enable_streaming','disable_streaming'),
+    'instrumentation':(
+        'Profile','enable_profiling','disable_profiling','profiling'),
+    'traces':(
+        'Tracer','merge_traces','enable_tracing','disable_tracing','tracing'),
+    'metrics':(
+        'RunMetrics',),
+    'archive':(
+        'ScenarioArchive',),
+    'corpus':(
+        'ShardedCorpus',),
+    'variants':(
+        'ParameterVariants','parameterized_scenario'),
+    'writer':(
+        'AsyncWriter',),
+}
+
+_NAMES = {name:module for module, names in _SUBMODULES.items() for name in names}
+
+__all__ = list(_NAMES)
+
+
+def __getattr__(name):
+    """ imports the submodule of a name on first use
+
+    """
+    if name in _NAMES:
+        value = getattr(importlib.import_module('.' + _NAMES[name],__name__),name)
+    elif name in _SUBMODULES:
+        value = importlib.import_module('.' + name,__name__)
+    elif not name.startswith('_'):
+        # the names imported by the submodules (e.g. ET) were exported by the star imports as well
+        for module in reversed(list(_SUBMODULES)):
+            module = importlib.import_module('.' + module,__name__)
+            if hasattr(module,name):
+                value = getattr(module,name)
+                break
+        else:
+            raise AttributeError('module ' + repr(__name__) + ' has no attribute ' + repr(name))
+    else:
+        raise AttributeError('module ' + repr(__name__) + ' has no attribute ' + repr(name))
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_NAMES))
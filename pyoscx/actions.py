@@ -1,12 +1,12 @@
 import xml.etree.ElementTree as ET
 
-from .utils import DynamicsConstrains, TimeReference, convert_bool, TransitionDynamics, CatalogReference, Route, Trajectory, TrafficDefinition, Environment
-from .utils import Controller
+from .utils import DynamicsConstrains, TimeReference, convert_bool, convert_float, TransitionDynamics, CatalogReference, Route, Trajectory, TrafficDefinition, Environment
+from .utils import Controller, _BaseType, _checks, _trust
 from .enumerations import DynamicsShapes, SpeedTargetValueType, FollowMode, ReferenceContext
 
 from .position import _PositionType
 
-class _ActionType():
+class _ActionType(_BaseType):
     """ helper class for typesetting
     """
     pass
@@ -14,7 +14,7 @@ class _PrivateActionType(_ActionType):
     """ helper class for typesetting
     """
     pass
-class _Action():
+class _Action(_BaseType):
     """ Private class used to define an action, should not be used by the user.
         Used as a wrapper to create the extra elements needed
         
@@ -108,15 +108,16 @@ class AbsoluteSpeedAction(_PrivateActionType):
             transition_dynamics (TransitionDynamics): how the change should be made
 
         """
+        checks = _trust.off or _checks(self,'__init__',speed,transition_dynamics)
         self.speed = speed
-        if not isinstance(transition_dynamics,TransitionDynamics):
+        if checks and not isinstance(transition_dynamics,TransitionDynamics):
             raise TypeError('transition_dynamics input not of type TransitionDynamics')
         self.transition_dynamics = transition_dynamics
     def get_attributes(self):
         """ returns the attributes of the AbsoluteSpeedAction as a dict
 
         """
-        return {'value':str(self.speed)}
+        return {'value':convert_float(self.speed,'speed')}
 
     def get_element(self):
         """ returns the elementTree of the AbsoluteSpeedAction
@@ -185,13 +186,14 @@ class RelativeSpeedAction(_PrivateActionType):
             continuous (bool): if the controller tries to keep the relative speed 
 
         """
+        checks = _trust.off or _checks(self,'__init__',speed,entity,transition_dynamics,valuetype,continuous)
         self.speed = speed
         self.target = entity
         self.valuetype = valuetype
-        if not isinstance(continuous,bool):
+        if checks and not isinstance(continuous,bool):
             raise TypeError('continuous input not of type bool')
         
-        if not isinstance(transition_dynamics,TransitionDynamics):
+        if checks and not isinstance(transition_dynamics,TransitionDynamics):
             raise TypeError('transition_dynamics input not of type TransitionDynamics')
         self.transition_dynamics = transition_dynamics
         self.continuous = continuous
@@ -201,7 +203,7 @@ class RelativeSpeedAction(_PrivateActionType):
         """ returns the attributes of the RelativeSpeedAction as a dict
 
         """
-        return {'entityRef':self.target,'value':str(self.speed),'speedTargetValueType':self.valuetype,'continuous':convert_bool(self.continuous)}
+        return {'entityRef':self.target,'value':convert_float(self.speed,'speed'),'speedTargetValueType':self.valuetype,'continuous':convert_bool(self.continuous)}
 
     def get_element(self):
         """ returns the elementTree of the RelativeSpeedAction
@@ -287,11 +289,12 @@ class LongitudinalDistanceAction(_PrivateActionType):
                 Default: None
 
         """
+        checks = _trust.off or _checks(self,'__init__',distance,entity,freespace,continuous,max_acceleration,max_deceleration,max_speed)
         self.target = entity
-        if not isinstance(continuous,bool):
+        if checks and not isinstance(continuous,bool):
             raise TypeError('continuous input not of type bool')
         
-        if not isinstance(freespace,bool):
+        if checks and not isinstance(freespace,bool):
             raise TypeError('freespace input not of type bool')
 
 
@@ -309,7 +312,7 @@ class LongitudinalDistanceAction(_PrivateActionType):
         retdict['entityRef'] = self.target
         retdict['freespace'] = convert_bool(self.freespace)
         retdict['continuous'] = convert_bool(self.continuous)
-        retdict['distance'] = str(self.distance)
+        retdict['distance'] = convert_float(self.distance,'position')
         return retdict
 
     def get_element(self):
@@ -394,12 +397,13 @@ class LongitudinalTimegapAction(_PrivateActionType):
                 Default: None
 
         """
+        checks = _trust.off or _checks(self,'__init__',timegap,entity,freespace,continuous,max_acceleration,max_deceleration,max_speed)
         self.target = entity
-        if not isinstance(continuous,bool):
+        if checks and not isinstance(continuous,bool):
             raise TypeError('continuous input not of type bool')
 
 
-        if not isinstance(freespace,bool):
+        if checks and not isinstance(freespace,bool):
             raise TypeError('freespace input not of type bool')
 
 
@@ -418,7 +422,7 @@ class LongitudinalTimegapAction(_PrivateActionType):
         retdict['entityRef'] = self.target
         retdict['freespace'] = convert_bool(self.freespace)
         retdict['continuous'] = convert_bool(self.continuous)
-        retdict['timeGap'] = str(self.timegap)
+        retdict['timeGap'] = convert_float(self.timegap,'time')
         return retdict
 
     def get_element(self):
@@ -477,10 +481,11 @@ class AbsoluteLaneChangeAction(_PrivateActionType):
                 Default: None
 
         """
+        checks = _trust.off or _checks(self,'__init__',lane,transition_dynamics,target_lane_offset)
 
         self.lane = lane
         self.target_lane_offset = target_lane_offset       
-        if not isinstance(transition_dynamics,TransitionDynamics):
+        if checks and not isinstance(transition_dynamics,TransitionDynamics):
             raise TypeError('transition_dynamics input not of type TransitionDynamics')
         self.transition_dynamics = transition_dynamics
 
@@ -500,7 +505,7 @@ class AbsoluteLaneChangeAction(_PrivateActionType):
         laneoffset = {}
         lataction = ET.SubElement(element,'LateralAction')
         if self.target_lane_offset:
-            laneoffset = {'targetLaneOffset':str(self.target_lane_offset)}
+            laneoffset = {'targetLaneOffset':convert_float(self.target_lane_offset,'position')}
         lanechangeaction = ET.SubElement(lataction,'LaneChangeAction',attrib=laneoffset)
 
         
@@ -559,11 +564,12 @@ class RelativeLaneChangeAction(_PrivateActionType):
                 Default: None
 
         """
+        checks = _trust.off or _checks(self,'__init__',lane,entity,transition_dynamics,target_lane_offset)
 
         self.lane = lane
         self.target = entity
         self.target_lane_offset = target_lane_offset
-        if not isinstance(transition_dynamics,TransitionDynamics):
+        if checks and not isinstance(transition_dynamics,TransitionDynamics):
             raise TypeError('transition_dynamics input not of type TransitionDynamics')
         self.transition_dynamics = transition_dynamics
 
@@ -585,7 +591,7 @@ class RelativeLaneChangeAction(_PrivateActionType):
         laneoffset = {}
         lataction = ET.SubElement(element,'LateralAction')
         if self.target_lane_offset:
-            laneoffset = {'targetLaneOffset':str(self.target_lane_offset)}
+            laneoffset = {'targetLaneOffset':convert_float(self.target_lane_offset,'position')}
         lanechangeaction = ET.SubElement(lataction,'LaneChangeAction',attrib=laneoffset)
         
         lanechangeaction.append(self.transition_dynamics.get_element('LaneChangeActionDynamics'))
@@ -642,12 +648,13 @@ class AbsoluteLaneOffsetAction(_PrivateActionType):
                 continuous (bool): if the controller tries to keep the relative speed 
                     Default: True
         """
-        if not isinstance(continuous,bool):
+        checks = _trust.off or _checks(self,'__init__',value,shape,maxlatacc,continuous)
+        if checks and not isinstance(continuous,bool):
             raise TypeError('continuous input not of type bool')
 
         self.continuous = continuous
         self.value = value
-        if shape not in DynamicsShapes:
+        if checks and shape not in DynamicsShapes:
             raise ValueError(shape + '; is not a valid shape.')
         self.dynshape = shape
         self.maxlatacc = maxlatacc
@@ -657,7 +664,7 @@ class AbsoluteLaneOffsetAction(_PrivateActionType):
 
         """
         retdict = {}
-        retdict['value'] = str(self.value)
+        retdict['value'] = convert_float(self.value,'position')
         return retdict
         
     def get_element(self):
@@ -667,7 +674,7 @@ class AbsoluteLaneOffsetAction(_PrivateActionType):
         element = ET.Element('PrivateAction')
         lataction = ET.SubElement(element,'LateralAction')
         laneoffsetaction = ET.SubElement(lataction,'LaneOffsetAction',attrib={'continuous':convert_bool(self.continuous)})
-        ET.SubElement(laneoffsetaction,'LaneOffsetActionDynamics',{'maxLateralAcc':str(self.maxlatacc),'dynamicsShape':self.dynshape.name})
+        ET.SubElement(laneoffsetaction,'LaneOffsetActionDynamics',{'maxLateralAcc':convert_float(self.maxlatacc),'dynamicsShape':self.dynshape.name})
         laneoftarget = ET.SubElement(laneoffsetaction,'LaneOffsetTarget')
         ET.SubElement(laneoftarget,'AbsoluteTargetLaneOffset',self.get_attributes())
 
@@ -726,13 +733,14 @@ class RelativeLaneOffsetAction(_PrivateActionType):
                 continuous (bool): if the controller tries to keep the relative speed 
                     Default: True
         """
-        if not isinstance(continuous,bool):
+        checks = _trust.off or _checks(self,'__init__',value,entity,shape,maxlatacc,continuous)
+        if checks and not isinstance(continuous,bool):
             raise TypeError('continuous input not of type bool')
         
         self.continuous = continuous
         self.value = value
         self.target = entity
-        if shape not in DynamicsShapes:
+        if checks and shape not in DynamicsShapes:
             raise ValueError(shape + '; is not a valid shape.')
         self.dynshape = shape
         self.maxlatacc = maxlatacc
@@ -742,7 +750,7 @@ class RelativeLaneOffsetAction(_PrivateActionType):
 
         """
         retdict = {}
-        retdict['value'] = str(self.value)
+        retdict['value'] = convert_float(self.value,'position')
         retdict['entityRef'] = self.target
         return retdict
         
@@ -753,7 +761,7 @@ class RelativeLaneOffsetAction(_PrivateActionType):
         element = ET.Element('PrivateAction')
         lataction = ET.SubElement(element,'LateralAction')
         laneoffsetaction = ET.SubElement(lataction,'LaneOffsetAction',attrib={'continuous':convert_bool(self.continuous)})
-        ET.SubElement(laneoffsetaction,'LaneOffsetActionDynamics',{'maxLateralAcc':str(self.maxlatacc),'dynamicsShape':self.dynshape.name})
+        ET.SubElement(laneoffsetaction,'LaneOffsetActionDynamics',{'maxLateralAcc':convert_float(self.maxlatacc),'dynamicsShape':self.dynshape.name})
         laneoftarget = ET.SubElement(laneoffsetaction,'LaneOffsetTarget')
         ET.SubElement(laneoftarget,'RelativeTargetLaneOffset',attrib=self.get_attributes())
 
@@ -834,12 +842,13 @@ class LateralDistanceAction(_PrivateActionType):
             max_speed (float): maximum speed allowed
                 Default: None
         """
+        checks = _trust.off or _checks(self,'__init__',entity,distance,freespace,continuous,max_acceleration,max_deceleration,max_speed)
         self.distance = distance
         self.target = entity
-        if not isinstance(continuous,bool):
+        if checks and not isinstance(continuous,bool):
             raise TypeError('continuous input not of type bool')
 
-        if not isinstance(freespace,bool):
+        if checks and not isinstance(freespace,bool):
             raise TypeError('freespace input not of type bool')
         
         self.freespace = freespace
@@ -855,7 +864,7 @@ class LateralDistanceAction(_PrivateActionType):
         retdict['freespace'] = convert_bool(self.freespace)
         retdict['continuous'] = convert_bool(self.continuous)
         if self.distance:
-            retdict['distance'] = str(self.distance)
+            retdict['distance'] = convert_float(self.distance,'position')
         return retdict
 
     def get_element(self):
@@ -899,7 +908,8 @@ class TeleportAction(_PrivateActionType):
             position (*Position): any position object
 
         """
-        if not isinstance(position,_PositionType):
+        checks = _trust.off or _checks(self,'__init__',position)
+        if checks and not isinstance(position,_PositionType):
             raise TypeError('position input not a valid Position type')        
 
         self.position = position
@@ -943,7 +953,8 @@ class AssignRouteAction(_PrivateActionType):
                 route (Route, or CatalogReference): the route to follow
 
         """
-        if not ( isinstance(route,Route) or isinstance(route,CatalogReference)):
+        checks = _trust.off or _checks(self,'__init__',route)
+        if checks and not ( isinstance(route,Route) or isinstance(route,CatalogReference)):
             raise TypeError('route input not of type Route or CatalogReference') 
 
         self.route = route
@@ -985,7 +996,8 @@ class AcquirePositionAction(_PrivateActionType):
                 position (*Position): target position
 
         """
-        if not isinstance(position,_PositionType):
+        checks = _trust.off or _checks(self,'__init__',position)
+        if checks and not isinstance(position,_PositionType):
             raise TypeError('position input not a valid Position type')        
 
         self.position = position
@@ -1049,9 +1061,10 @@ class FollowTrajectoryAction(_PrivateActionType):
                 offset (double): offset for time values (must be combined with reference_domain and scale)
                     Default: None
         """
+        checks = _trust.off or _checks(self,'__init__',trajectory,following_mode,reference_domain,scale,offset)
         # if following_mode not in FollowMode:
         #     ValueError(str(following_mode) + ' is not a valied following mode.')
-        if not ( isinstance(trajectory,Trajectory) or isinstance(trajectory,CatalogReference)):
+        if checks and not ( isinstance(trajectory,Trajectory) or isinstance(trajectory,CatalogReference)):
             raise TypeError('route input not of type Route or CatalogReference') 
         self.trajectory = trajectory
         self.following_mode = following_mode
@@ -1109,9 +1122,10 @@ class ActivateControllerAction(_PrivateActionType):
                 longitudinal (boolean): activate or deactivate the controller
 
         """
-        if not isinstance(lateral,bool):
+        checks = _trust.off or _checks(self,'__init__',lateral,longitudinal)
+        if checks and not isinstance(lateral,bool):
             raise TypeError('lateral input is not of type bool') 
-        if not isinstance(longitudinal,bool):
+        if checks and not isinstance(longitudinal,bool):
             raise TypeError('longitudinal input is not of type bool') 
         self.lateral = lateral
         self.longitudinal = longitudinal
@@ -1157,7 +1171,8 @@ class AssignControllerAction(_PrivateActionType):
                 controller (Controller or Catalogreference): a controller to assign
 
         """
-        if not ( isinstance(controller,Controller) or isinstance(controller,CatalogReference)):
+        checks = _trust.off or _checks(self,'__init__',controller)
+        if checks and not ( isinstance(controller,Controller) or isinstance(controller,CatalogReference)):
             raise TypeError('route input not of type Route or CatalogReference') 
         self.controller = controller
 
@@ -1206,8 +1221,9 @@ class OverrideThrottleAction(_PrivateActionType):
                 active (boolean): overide (True) or stop override (False)
 
         """
+        checks = _trust.off or _checks(self,'__init__',value,activate)
         self.value = value
-        if not isinstance(activate,bool):
+        if checks and not isinstance(activate,bool):
             raise TypeError('activate input is not of type bool')
         self.activate = activate
 
@@ -1215,7 +1231,7 @@ class OverrideThrottleAction(_PrivateActionType):
         """ returns the attributes of the OverrideThrottleAction as a dict
 
         """
-        return {'value':str(self.value),'active':convert_bool(self.activate)}
+        return {'value':convert_float(self.value),'active':convert_bool(self.activate)}
 
     def get_element(self):
         """ returns the elementTree of the OverrideThrottleAction
@@ -1262,8 +1278,9 @@ class OverrideBrakeAction(_PrivateActionType):
                 active (boolean): overide (True) or stop override (False)
 
         """
+        checks = _trust.off or _checks(self,'__init__',value,activate)
         self.value = value
-        if not isinstance(activate,bool):
+        if checks and not isinstance(activate,bool):
             raise TypeError('activate input is not of type bool')
         self.activate = activate
 
@@ -1271,7 +1288,7 @@ class OverrideBrakeAction(_PrivateActionType):
         """ returns the attributes of the OverrideBrakeAction as a dict
 
         """
-        return {'value':str(self.value),'active':convert_bool(self.activate)}
+        return {'value':convert_float(self.value),'active':convert_bool(self.activate)}
 
     def get_element(self):
         """ returns the elementTree of the OverrideBrakeAction
@@ -1318,8 +1335,9 @@ class OverrideClutchAction(_PrivateActionType):
                 active (boolean): overide (True) or stop override (False)
 
         """
+        checks = _trust.off or _checks(self,'__init__',value,activate)
         self.value = value
-        if not isinstance(activate,bool):
+        if checks and not isinstance(activate,bool):
             raise TypeError('activate input is not of type bool')
         self.activate = activate
 
@@ -1327,7 +1345,7 @@ class OverrideClutchAction(_PrivateActionType):
         """ returns the attributes of the OverrideClutchAction as a dict
 
         """
-        return {'value':str(self.value),'active':convert_bool(self.activate)}
+        return {'value':convert_float(self.value),'active':convert_bool(self.activate)}
 
     def get_element(self):
         """ returns the elementTree of the OverrideClutchAction
@@ -1375,8 +1393,9 @@ class OverrideParkingBrakeAction(_PrivateActionType):
                 active (boolean): overide (True) or stop override (False)
 
         """
+        checks = _trust.off or _checks(self,'__init__',value,activate)
         self.value = value
-        if not isinstance(activate,bool):
+        if checks and not isinstance(activate,bool):
             raise TypeError('activate input is not of type bool')
         self.activate = activate
 
@@ -1384,7 +1403,7 @@ class OverrideParkingBrakeAction(_PrivateActionType):
         """ returns the attributes of the OverrideParkingBrakeAction as a dict
 
         """
-        return {'value':str(self.value),'active':convert_bool(self.activate)}
+        return {'value':convert_float(self.value),'active':convert_bool(self.activate)}
 
     def get_element(self):
         """ returns the elementTree of the OverrideParkingBrakeAction
@@ -1433,8 +1452,9 @@ class OverrideSteeringWheelAction(_PrivateActionType):
                 active (boolean): overide (True) or stop override (False)
 
         """
+        checks = _trust.off or _checks(self,'__init__',value,activate)
         self.value = value
-        if not isinstance(activate,bool):
+        if checks and not isinstance(activate,bool):
             raise TypeError('activate input is not of type bool')
         self.activate = activate
 
@@ -1442,7 +1462,7 @@ class OverrideSteeringWheelAction(_PrivateActionType):
         """ returns the attributes of the OverrideSteeringWheelAction as a dict
 
         """
-        return {'value':str(self.value),'active':convert_bool(self.activate)}
+        return {'value':convert_float(self.value),'active':convert_bool(self.activate)}
 
     def get_element(self):
         """ returns the elementTree of the OverrideSteeringWheelAction
@@ -1490,8 +1510,9 @@ class OverrideGearAction(_PrivateActionType):
                 active (boolean): overide (True) or stop override (False)
 
         """
+        checks = _trust.off or _checks(self,'__init__',value,activate)
         self.value = value
-        if not isinstance(activate,bool):
+        if checks and not isinstance(activate,bool):
             raise TypeError('activate input is not of type bool')
         self.activate = activate
 
@@ -1499,7 +1520,7 @@ class OverrideGearAction(_PrivateActionType):
         """ returns the attributes of the OverrideGearAction as a dict
 
         """
-        return {'value':str(self.value),'active':convert_bool(self.activate)}
+        return {'value':convert_float(self.value),'active':convert_bool(self.activate)}
 
     def get_element(self):
         """ returns the elementTree of the OverrideGearAction
@@ -1553,11 +1574,12 @@ class VisibilityAction(_PrivateActionType):
             sensors (boolean): visible to sensors or not
 
         """
-        if not isinstance(graphics,bool):
+        checks = _trust.off or _checks(self,'__init__',graphics,traffic,sensors)
+        if checks and not isinstance(graphics,bool):
             raise TypeError('graphics input is not of type bool')
-        if not isinstance(traffic,bool):
+        if checks and not isinstance(traffic,bool):
             raise TypeError('traffic input is not of type bool')
-        if not isinstance(sensors,bool):
+        if checks and not isinstance(sensors,bool):
             raise TypeError('sensors input is not of type bool')
         self.graphics = graphics
         self.traffic = traffic
@@ -1634,12 +1656,13 @@ class AbsoluteSynchronizeAction(_PrivateActionType):
 
                 target_tolerance (optional) (double): tolerance offset of the target's position [m]. Not officially part of OpenSCENARIO but supported in esmini
         """
+        checks = _trust.off or _checks(self,'__init__',entity,entity_PositionType,target_PositionType,speed,target_tolerance_master,target_tolerance)
 
         self.entity = entity
-        if not isinstance(entity_PositionType,_PositionType):
+        if checks and not isinstance(entity_PositionType,_PositionType):
             raise TypeError('entity_PositionType input is not a valid Position')
         
-        if not isinstance(target_PositionType,_PositionType):
+        if checks and not isinstance(target_PositionType,_PositionType):
             raise TypeError('target_PositionType input is not a valid Position')
         self.entity_PositionType = entity_PositionType
         self.target_PositionType = target_PositionType
@@ -1653,9 +1676,9 @@ class AbsoluteSynchronizeAction(_PrivateActionType):
         """
         attr = {'masterEntityRef':self.entity}
         if self.target_tolerance_master is not None:
-            attr.update({'targetToleranceMaster': str(self.target_tolerance_master)})
+            attr.update({'targetToleranceMaster': convert_float(self.target_tolerance_master,'position')})
         if self.target_tolerance is not None:
-            attr.update({'targetTolerance': str(self.target_tolerance)})
+            attr.update({'targetTolerance': convert_float(self.target_tolerance,'position')})
         return attr
 
     def get_element(self):
@@ -1667,7 +1690,7 @@ class AbsoluteSynchronizeAction(_PrivateActionType):
         syncaction.append(self.entity_PositionType.get_element('TargetPositionMaster'))
         syncaction.append(self.target_PositionType.get_element('TargetPosition'))
         finalspeed = ET.SubElement(syncaction,'FinalSpeed')
-        ET.SubElement(finalspeed,'AbsoluteSpeed',attrib={'value':str(self.speed)})
+        ET.SubElement(finalspeed,'AbsoluteSpeed',attrib={'value':convert_float(self.speed,'speed')})
         
         return element
 
@@ -1735,12 +1758,13 @@ class RelativeSynchronizeAction(_PrivateActionType):
 
                 target_tolerance (optional) (double): tolerance offset of the target's position [m]. Not officially part of OpenSCENARIO but supported in esmini
         """
+        checks = _trust.off or _checks(self,'__init__',entity,entity_PositionType,target_PositionType,speed,speed_target_type,target_tolerance_master,target_tolerance)
 
         self.entity = entity
-        if not isinstance(entity_PositionType,_PositionType):
+        if checks and not isinstance(entity_PositionType,_PositionType):
             raise TypeError('entity_PositionType input is not a valid Position')
         
-        if not isinstance(target_PositionType,_PositionType):
+        if checks and not isinstance(target_PositionType,_PositionType):
             raise TypeError('target_PositionType input is not a valid Position')
         self.entity_PositionType = entity_PositionType
         self.target_PositionType = target_PositionType
@@ -1757,9 +1781,9 @@ class RelativeSynchronizeAction(_PrivateActionType):
         """
         attr = {'masterEntityRef':self.entity}
         if self.target_tolerance_master is not None:
-            attr.update({'targetToleranceMaster': str(self.target_tolerance_master)})
+            attr.update({'targetToleranceMaster': convert_float(self.target_tolerance_master,'position')})
         if self.target_tolerance is not None:
-            attr.update({'targetTolerance': str(self.target_tolerance)})
+            attr.update({'targetTolerance': convert_float(self.target_tolerance,'position')})
         return attr
 
     def get_element(self):
@@ -1771,7 +1795,7 @@ class RelativeSynchronizeAction(_PrivateActionType):
         syncaction.append(self.entity_PositionType.get_element('TargetPositionMaster'))
         syncaction.append(self.target_PositionType.get_element('TargetPosition'))
         finalspeed = ET.SubElement(syncaction,'FinalSpeed')
-        ET.SubElement(finalspeed,'RelativeSpeedToMaster',attrib={'value':str(self.speed),'speedTargetValueType':self.speed_target_type})
+        ET.SubElement(finalspeed,'RelativeSpeedToMaster',attrib={'value':convert_float(self.speed,'speed'),'speedTargetValueType':self.speed_target_type})
         
         return element
 
@@ -1820,7 +1844,7 @@ class ParameterAddAction(_ActionType):
         """ returns the attributes of the AbsoluteSpeedAction as a dict
 
         """
-        return {'value':str(self.value)}
+        return {'value':convert_float(self.value)}
 
     def get_element(self):
         """ returns the elementTree of the AbsoluteSpeedAction
@@ -1877,7 +1901,7 @@ class ParameterMultiplyAction(_ActionType):
         """ returns the attributes of the AbsoluteSpeedAction as a dict
 
         """
-        return {'value':str(self.value)}
+        return {'value':convert_float(self.value)}
 
     def get_element(self):
         """ returns the elementTree of the AbsoluteSpeedAction
@@ -1933,7 +1957,7 @@ class ParameterSetAction(_ActionType):
         """ returns the attributes of the AbsoluteSpeedAction as a dict
 
         """
-        return {'value':str(self.value)}
+        return {'value':convert_float(self.value)}
 
     def get_element(self):
         """ returns the elementTree of the AbsoluteSpeedAction
@@ -2227,12 +2251,13 @@ class TrafficSourceAction(_ActionType):
                 Default: None
 
         """
+        checks = _trust.off or _checks(self,'__init__',rate,radius,position,trafficdefinition,velocity)
         self.rate = rate
         self.radius = radius
-        if not isinstance(position,_PositionType):
+        if checks and not isinstance(position,_PositionType):
             raise TypeError('position input is not a valid Position')
         
-        if not isinstance(trafficdefinition,TrafficDefinition):
+        if checks and not isinstance(trafficdefinition,TrafficDefinition):
             raise TypeError('trafficdefinition input is not of type TrafficDefinition')
         self.position = position
         self.trafficdefinition = trafficdefinition
@@ -2243,10 +2268,10 @@ class TrafficSourceAction(_ActionType):
 
         """
         retdict = {}
-        retdict['rate'] = str(self.rate)
-        retdict['radius'] = str(self.radius)
+        retdict['rate'] = convert_float(self.rate)
+        retdict['radius'] = convert_float(self.radius,'position')
         if self.velocity:
-            retdict['velocity'] = str(self.velocity)
+            retdict['velocity'] = convert_float(self.velocity,'speed')
         return retdict
 
     def get_element(self):
@@ -2311,12 +2336,13 @@ class TrafficSinkAction(_ActionType):
             trafficdefinition (TrafficDefinition): definition of the traffic
 
         """
+        checks = _trust.off or _checks(self,'__init__',rate,radius,position,trafficdefinition)
         self.rate = rate
         self.radius = radius
-        if not isinstance(position,_PositionType):
+        if checks and not isinstance(position,_PositionType):
             raise TypeError('position input is not a valid Position')
         
-        if not isinstance(trafficdefinition,TrafficDefinition):
+        if checks and not isinstance(trafficdefinition,TrafficDefinition):
             raise TypeError('trafficdefinition input is not of type TrafficDefinition')
         self.position = position
         self.trafficdefinition = trafficdefinition
@@ -2327,8 +2353,8 @@ class TrafficSinkAction(_ActionType):
 
         """
         retdict = {}
-        retdict['rate'] = str(self.rate)
-        retdict['radius'] = str(self.radius)
+        retdict['rate'] = convert_float(self.rate)
+        retdict['radius'] = convert_float(self.radius,'position')
         return retdict
 
     def get_element(self):
@@ -2417,13 +2443,14 @@ class TrafficSwarmAction(_ActionType):
             velocity (float): optional starting velocity
                 Default: None
         """
+        checks = _trust.off or _checks(self,'__init__',semimajoraxis,semiminoraxis,innerradius,offset,numberofvehicles,centralobject,trafficdefinition,velocity)
         self.semimajoraxis = semimajoraxis
         self.semiminoraxis = semiminoraxis
         self.innerradius = innerradius
         self.offset = offset
         self.numberofvehicles = numberofvehicles
         self.centralobject = centralobject
-        if not isinstance(trafficdefinition,TrafficDefinition):
+        if checks and not isinstance(trafficdefinition,TrafficDefinition):
             raise TypeError('trafficdefinition input is not of type TrafficDefinition')
         self.trafficdefinition = trafficdefinition
         self.velocity = velocity
@@ -2433,13 +2460,13 @@ class TrafficSwarmAction(_ActionType):
 
         """
         retdict = {}
-        retdict['semiMajorAxis'] = str(self.semimajoraxis)
-        retdict['semiMinorAxis'] = str(self.semiminoraxis)
-        retdict['innerRadius'] = str(self.innerradius)
-        retdict['offset'] = str(self.offset)
+        retdict['semiMajorAxis'] = convert_float(self.semimajoraxis,'position')
+        retdict['semiMinorAxis'] = convert_float(self.semiminoraxis,'position')
+        retdict['innerRadius'] = convert_float(self.innerradius,'position')
+        retdict['offset'] = convert_float(self.offset,'position')
         retdict['numberOfVehicles'] = str(self.numberofvehicles)
         if self.velocity:
-            retdict['velocity'] = str(self.velocity)
+            retdict['velocity'] = convert_float(self.velocity,'speed')
         return retdict
 
     def get_element(self):
@@ -2489,8 +2516,9 @@ class EnvironmentAction(_ActionType):
                 environment (Environment or CatalogReference): the environment to change to
 
         """
+        checks = _trust.off or _checks(self,'__init__',name,environment)
         self.name = name
-        if not ( isinstance(environment,Environment) or isinstance(environment,CatalogReference)):
+        if checks and not ( isinstance(environment,Environment) or isinstance(environment,CatalogReference)):
             raise TypeError('route input not of type Route or CatalogReference') 
         self.environment = environment
 
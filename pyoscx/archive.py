@@ -0,0 +1,207 @@
+import io
+import os
+import threading
+import zipfile
+
+from .helpers import _check_variant
+
+
+class ScenarioArchive():
+    """ the ScenarioArchive stores many scenarios in one compressed file instead of one file per scenario
+
+        The archive is a zip file with one compressed member <variant>.xosc per scenario.
+        The central directory of the zip file is the index by variant id: it is read once
+        when the archive is opened, and each scenario is then read (or extracted) on its own,
+        without decompressing the others. Any zip tool can list or unpack the archive.
+
+        Scenarios are added with Scenario.write_xml(variant,archive=archive) or add().
+        Adding is thread safe, so runners and samplers can write into one archive from
+        their worker threads.
+
+        Parameters
+        ----------
+            filename (str): the archive file
+
+            mode (str): 'r' to read, 'w' to create a new archive, 'a' to add to an existing archive
+                Default: 'r'
+
+            compression (int): compression method of the zipfile module (zipfile.ZIP_DEFLATED, ZIP_BZIP2, ZIP_LZMA or ZIP_STORED)
+                Default: zipfile.ZIP_DEFLATED
+
+            compresslevel (int): compression level, None for the default of the method
+                Default: None
+
+        Attributes
+        ----------
+            filename (str): the archive file
+
+            mode (str): 'r', 'w' or 'a'
+
+        Methods
+        -------
+            add(variant,data)
+                adds the xml of a scenario
+
+            read(variant)
+                returns the xml of a scenario
+
+            open(variant)
+                returns a file object of a scenario
+
+            extract(variant,directory)
+                writes a scenario to a file
+
+            variants()
+                returns the variant ids in the archive
+
+            close()
+                writes the index and closes the archive
+
+    """
+    _SUFFIX = '.xosc'
+
+    def __init__(self,filename,mode='r',compression=zipfile.ZIP_DEFLATED,compresslevel=None):
+        """ initalize the ScenarioArchive
+
+        Parameters
+        ----------
+            filename (str): the archive file
+
+            mode (str): 'r' to read, 'w' to create a new archive, 'a' to add to an existing archive
+                Default: 'r'
+
+            compression (int): compression method of the zipfile module (zipfile.ZIP_DEFLATED, ZIP_BZIP2, ZIP_LZMA or ZIP_STORED)
+                Default: zipfile.ZIP_DEFLATED
+
+            compresslevel (int): compression level, None for the default of the method
+                Default: None
+
+        """
+        if mode not in ('r','w','a'):
+            raise ValueError("mode should be 'r', 'w' or 'a', not " + str(mode))
+        self.filename = filename
+        self.mode = mode
+        self._zip = zipfile.ZipFile(filename,mode,compression=compression,compresslevel=compresslevel)
+        self._names = set(self._zip.namelist())
+        self._lock = threading.Lock()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self,*args):
+        self.close()
+
+    def __len__(self):
+        return len(self._names)
+
+    def __contains__(self,variant):
+        return self._member(variant) in self._names
+
+    def _member(self,variant):
+        """ returns the name of the member of a variant, raises a ValueError for ids with path separators or ..
+
+        """
+        return _check_variant(variant) + self._SUFFIX
+
+    def add(self,variant,data):
+        """ add adds the xml of a scenario to the archive
+
+            Parameters
+            ----------
+                variant (str): the variant id, unique in the archive (no path separators or ..)
+
+                data (bytes or str): the xml of the scenario
+
+        """
+        if self.mode == 'r':
+            raise ValueError('the archive is opened for reading')
+        member = self._member(variant)
+        if isinstance(data,str):
+            data = data.encode('utf-8')
+        with self._lock:
+            if member in self._names:
+                raise ValueError('variant ' + variant + ' is already in the archive')
+            self._zip.writestr(member,data)
+            self._names.add(member)
+
+    def read(self,variant):
+        """ read returns the xml of a scenario, only this scenario is decompressed
+
+            Parameters
+            ----------
+                variant (str): the variant id
+
+            Returns
+            -------
+                bytes
+
+        """
+        # not while add appends to the archive and its central directory
+        with self._lock:
+            return self._zip.read(self._info(variant))
+
+    def open(self,variant):
+        """ open returns a file object reading the xml of a scenario,
+            for an archive opened to write or add it reads a copy (as add can write while it is read)
+
+            Parameters
+            ----------
+                variant (str): the variant id
+
+            Returns
+            -------
+                file object (binary)
+
+        """
+        if self.mode != 'r':
+            return io.BytesIO(self.read(variant))
+        with self._lock:
+            return self._zip.open(self._info(variant))
+
+    def extract(self,variant,directory):
+        """ extract writes a scenario to <directory>/<variant>.xosc, for example for a simulator
+
+            Parameters
+            ----------
+                variant (str): the variant id
+
+                directory (str): the directory to write to
+
+            Returns
+            -------
+                str, the written file
+
+        """
+        filename = os.path.join(directory,self._member(variant))
+        os.makedirs(os.path.dirname(filename) or '.',exist_ok=True)
+        with open(filename,'wb') as file_handle:
+            file_handle.write(self.read(variant))
+        return filename
+
+    def variants(self):
+        """ variants returns the variant ids in the archive (in the order they were added)
+
+            Returns
+            -------
+                list of str
+
+        """
+        with self._lock:
+            names = self._zip.namelist()
+        return [name[:-len(self._SUFFIX)] for name in names if name.endswith(self._SUFFIX)]
+
+    def close(self):
+        """ close writes the index (for 'w' and 'a') and closes the archive
+
+        """
+        with self._lock:
+            self._zip.close()
+
+    def _info(self,variant):
+        """ returns the ZipInfo of a variant
+
+        """
+        try:
+            return self._zip.getinfo(self._member(variant))
+        except KeyError:
+            raise ValueError('variant ' + variant + ' is not in the archive') from None
@@ -0,0 +1,305 @@
+import hashlib
+import json
+import os
+import shutil
+import threading
+import time
+
+from .runner import RunResult
+
+
+class ResultCache():
+    """ the ResultCache is a local, content addressed, store of simulation results
+
+        The key of a result is built from the fingerprint of the scenario, the
+        content of the referenced road network files and catalog directories,
+        the simulator binary and its arguments. An unchanged scenario can
+        therefore be looked up without simulating (or even writing) it.
+        When the size of the cache grows above max_size, the least recently
+        used entries are removed.
+
+        Parameters
+        ----------
+            directory (str): directory of the cache
+
+            max_size (int): maximum size of the cache in bytes
+                Default: 1 GB
+
+        Attributes
+        ----------
+            directory (str): directory of the cache
+
+            max_size (int): maximum size of the cache in bytes
+
+            hits (int): number of lookups that found a result
+
+            misses (int): number of lookups that did not find a result
+
+        Methods
+        -------
+            key(scenario,executable,args,basedir)
+                returns the cache key of a run
+
+            get(key,name)
+                returns the stored RunResult of a key, or None
+
+            put(key,result)
+                stores a RunResult
+
+            size()
+                returns the current size of the cache in bytes
+
+            clear()
+                removes all entries
+
+    """
+    _RESULTFILE = 'result.json'
+    _RECORDFILE = 'record.dat'
+
+    def __init__(self,directory,max_size=10**9):
+        """ initalize the ResultCache
+
+        Parameters
+        ----------
+            directory (str): directory of the cache
+
+            max_size (int): maximum size of the cache in bytes
+                Default: 1 GB
+
+        """
+        self.directory = directory
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(directory,exist_ok=True)
+        self._lock = threading.Lock()
+        self._file_digests = {}
+        self._index = None
+
+    def _entry(self,key):
+        """ returns the directory of an entry
+
+        """
+        return os.path.join(self.directory,key[:2],key)
+
+    def _file_digest(self,path):
+        """ returns the hash of a file, reusing the hash if the file has not been modified
+
+        """
+        stat = os.stat(path)
+        memokey = (os.path.abspath(path),stat.st_size,stat.st_mtime_ns)
+        digest = self._file_digests.get(memokey)
+        if digest is None:
+            hasher = hashlib.blake2b(digest_size=16)
+            with open(path,'rb') as file_handle:
+                for block in iter(lambda: file_handle.read(1 << 20),b''):
+                    hasher.update(block)
+            digest = self._file_digests[memokey] = hasher.hexdigest()
+        return digest
+
+    def _path_digest(self,path,basedir):
+        """ returns the hash of a file or of all files in a directory
+
+        """
+        if basedir is not None and not os.path.isabs(path):
+            path = os.path.join(basedir,path)
+        if os.path.isfile(path):
+            return self._file_digest(path)
+        if os.path.isdir(path):
+            hasher = hashlib.blake2b(digest_size=16)
+            for root, dirs, files in os.walk(path):
+                dirs.sort()
+                for name in sorted(files):
+                    filename = os.path.join(root,name)
+                    hasher.update(os.path.relpath(filename,path).encode() + b'=' + self._file_digest(filename).encode())
+            return hasher.hexdigest()
+        return 'missing'
+
+    def key(self,scenario,executable,args='',basedir=None):
+        """ key returns the cache key of a simulation of a scenario
+
+            Parameters
+            ----------
+                scenario (Scenario): the scenario to simulate
+
+                executable (str): path to the simulator binary
+
+                args (str): command line arguments of the simulator
+                    Default: ''
+
+                basedir (str): directory relative paths in the scenario are relative to
+                    Default: None (current working directory)
+
+            Returns
+            -------
+                str
+
+        """
+        hasher = hashlib.blake2b(digest_size=20)
+        hasher.update(b'scenario=' + scenario.fingerprint().encode())
+        road = scenario.roadnetwork
+        for path in (road.road_file,road.scene):
+            if path:
+                hasher.update(b'road=' + self._path_digest(path,basedir).encode())
+        for name in sorted(scenario.catalog.catalogs):
+            hasher.update(b'catalog=' + name.encode() + self._path_digest(scenario.catalog.catalogs[name],basedir).encode())
+        hasher.update(b'simulator=' + self._path_digest(executable,None).encode())
+        hasher.update(b'args=' + args.encode())
+        return hasher.hexdigest()
+
+    def _load_index(self):
+        """ scans the cache directory for existing entries
+
+        """
+        self._index = {}
+        for prefix in os.listdir(self.directory):
+            prefixdir = os.path.join(self.directory,prefix)
+            if len(prefix) != 2 or not os.path.isdir(prefixdir):
+                continue
+            for key in os.listdir(prefixdir):
+                resultfile = os.path.join(prefixdir,key,self._RESULTFILE)
+                if os.path.isfile(resultfile):
+                    self._index[key] = [_dir_size(os.path.join(prefixdir,key)),os.stat(resultfile).st_mtime]
+
+    def get(self,key,name=None,record_file=None):
+        """ get returns the stored result of a key
+
+            Parameters
+            ----------
+                key (str): the cache key
+
+                name (str): name of the new run
+                    Default: None (name of the stored run)
+
+                record_file (str): file the stored recording is copied to, before the entry can be evicted
+                    Default: None (the record_file of the result is in the cache directory)
+
+            Returns
+            -------
+                RunResult (with cached=True and no scenario_file), or None if the key is not in the cache
+
+        """
+        entry = self._entry(key)
+        resultfile = os.path.join(entry,self._RESULTFILE)
+        try:
+            with open(resultfile) as file_handle:
+                stored = json.load(file_handle)
+            fields = (stored['returncode'],stored['stdout'],stored['stderr'],stored['wall_time'])
+            record = stored['record']
+        except (OSError,ValueError,KeyError,TypeError):
+            if os.path.isdir(entry):
+                # a corrupted entry is removed, so the next put can store the result again
+                shutil.rmtree(entry,ignore_errors=True)
+            with self._lock:
+                self.misses += 1
+                if self._index is not None:
+                    self._index.pop(key,None)
+            return None
+        now = time.time()
+        try:
+            os.utime(resultfile,(now,now))
+        except OSError:
+            pass
+        with self._lock:
+            if record:
+                stored_record = os.path.join(entry,self._RECORDFILE)
+                if record_file is None:
+                    record_file = stored_record
+                else:
+                    # copied with the lock held, so _evict can not remove the entry in the meantime
+                    try:
+                        shutil.copyfile(stored_record,record_file)
+                    except FileNotFoundError:
+                        # evicted (e.g. by another process) after reading the result, the rest is removed
+                        shutil.rmtree(entry,ignore_errors=True)
+                        self.misses += 1
+                        if self._index is not None:
+                            self._index.pop(key,None)
+                        return None
+            else:
+                record_file = None
+            self.hits += 1
+            if self._index is not None and key in self._index:
+                self._index[key][1] = now
+        return RunResult(name or stored.get('name'),None,*fields,record_file,cached=True)
+
+    def put(self,key,result):
+        """ put stores a result (and its recording), timed out runs are not stored
+
+            Parameters
+            ----------
+                key (str): the cache key
+
+                result (RunResult): the result to store
+
+        """
+        if result.timed_out:
+            return
+        entry = self._entry(key)
+        tmpdir = entry + '.tmp' + str(os.getpid()) + '_' + str(threading.get_ident())
+        os.makedirs(tmpdir,exist_ok=True)
+        has_record = bool(result.record_file) and os.path.isfile(result.record_file)
+        if has_record:
+            shutil.copyfile(result.record_file,os.path.join(tmpdir,self._RECORDFILE))
+        stored = {
+            'name':result.name,
+            'returncode':result.returncode,
+            'stdout':result.stdout,
+            'stderr':result.stderr,
+            'wall_time':result.wall_time,
+            'record':has_record}
+        with open(os.path.join(tmpdir,self._RESULTFILE),'w') as file_handle:
+            json.dump(stored,file_handle)
+        try:
+            os.rename(tmpdir,entry)
+        except OSError:
+            # stored by someone else in the meantime
+            shutil.rmtree(tmpdir,ignore_errors=True)
+            return
+        with self._lock:
+            if self._index is None:
+                self._load_index()
+            else:
+                self._index[key] = [_dir_size(entry),time.time()]
+            self._evict()
+
+    def _evict(self):
+        """ removes the least recently used entries until the cache is smaller than max_size
+
+        """
+        total = sum(size for size, _ in self._index.values())
+        if total <= self.max_size:
+            return
+        for key in sorted(self._index,key=lambda k: self._index[k][1]):
+            size = self._index.pop(key)[0]
+            shutil.rmtree(self._entry(key),ignore_errors=True)
+            total -= size
+            if total <= self.max_size:
+                break
+
+    def size(self):
+        """ size returns the size of all entries in bytes
+
+            Returns: int
+
+        """
+        with self._lock:
+            if self._index is None:
+                self._load_index()
+            return sum(size for size, _ in self._index.values())
+
+    def clear(self):
+        """ clear removes all entries of the cache
+
+        """
+        with self._lock:
+            for prefix in os.listdir(self.directory):
+                shutil.rmtree(os.path.join(self.directory,prefix),ignore_errors=True)
+            self._index = {}
+
+
+def _dir_size(path):
+    """ returns the size of all files in a directory
+
+    """
+    return sum(os.path.getsize(os.path.join(path,f)) for f in os.listdir(path))
@@ -0,0 +1,221 @@
+import hashlib
+import json
+import os
+import threading
+
+from .helpers import _check_variant
+from .runner import run_parallel
+
+
+class ShardedCorpus():
+    """ the ShardedCorpus writes scenarios to a hash sharded directory layout and records them in a manifest
+
+        Each scenario is written to <directory>/ab/cd/<variant>.xosc, where ab/cd is taken from
+        the hash of the variant id, so no directory holds more than a few thousand files even
+        for millions of variants. Every written scenario adds one line to the manifest
+        (<directory>/manifest.jsonl, json lines) with the variant id, the path relative to the
+        directory, the parameters, the fingerprint and the size of the file. Readers and runners
+        use the manifest instead of listing the directories.
+
+        A variant that is written again gets a new manifest line, the last line of a variant is used.
+
+        Parameters
+        ----------
+            directory (str): the root directory of the corpus
+
+            levels (int): number of directory levels of the shards
+                Default: 2
+
+            width (int): number of hex characters of the hash per level (256 directories per level for 2)
+                Default: 2
+
+        Attributes
+        ----------
+            directory (str): the root directory of the corpus
+
+            levels (int): number of directory levels of the shards
+
+            width (int): number of hex characters of the hash per level
+
+            manifest (str): the manifest file
+
+        Methods
+        -------
+            path(variant)
+                returns the file of a variant
+
+            write(variant,scenario,parameters,prettyprint)
+                writes a scenario and adds it to the manifest
+
+            write_batch(variants,workers,prettyprint)
+                writes many scenarios in parallel
+
+            entries()
+                returns the manifest entries
+
+            entry(variant)
+                returns the manifest entry of a variant
+
+            variants()
+                returns the variant ids
+
+    """
+    MANIFEST = 'manifest.jsonl'
+
+    def __init__(self,directory,levels=2,width=2):
+        """ initalize the ShardedCorpus
+
+        Parameters
+        ----------
+            directory (str): the root directory of the corpus
+
+            levels (int): number of directory levels of the shards
+                Default: 2
+
+            width (int): number of hex characters of the hash per level (256 directories per level for 2)
+                Default: 2
+
+        """
+        if levels < 0 or width < 1 or levels*width > 40:
+            raise ValueError('levels*width should be between 0 and 40, with width at least 1')
+        self.directory = directory
+        self.levels = levels
+        self.width = width
+        self.manifest = os.path.join(directory,self.MANIFEST)
+        os.makedirs(directory,exist_ok=True)
+        self._lock = threading.Lock()
+        self._entries = None
+
+    def _relative_path(self,variant):
+        """ returns the path of a variant relative to the directory
+
+        """
+        _check_variant(variant)
+        digest = hashlib.blake2b(variant.encode('utf-8'),digest_size=20).hexdigest()
+        shards = [digest[i*self.width:(i+1)*self.width] for i in range(self.levels)]
+        return '/'.join(shards + [variant + '.xosc'])
+
+    def path(self,variant):
+        """ path returns the file of a variant (computed from the variant id, the file may not exist)
+
+            Parameters
+            ----------
+                variant (str): the variant id (no path separators or ..)
+
+            Returns
+            -------
+                str
+
+        """
+        return os.path.join(self.directory,*self._relative_path(variant).split('/'))
+
+    def write(self,variant,scenario,parameters=None,prettyprint=True):
+        """ write writes a scenario to its shard and adds it to the manifest
+
+            Parameters
+            ----------
+                variant (str): the variant id
+
+                scenario (Scenario): the scenario
+
+                parameters (dict): the parameters of the variant, stored in the manifest (json serializable)
+                    Default: None
+
+                prettyprint (bool): pretty or "ugly" print
+                    Default: True
+
+            Returns
+            -------
+                str, the written file
+
+        """
+        filename = self.path(variant)
+        os.makedirs(os.path.dirname(filename),exist_ok=True)
+        scenario.write_xml(filename,prettyprint)
+        entry = {
+            'variant':variant,
+            'path':self._relative_path(variant),
+            'parameters':parameters or {},
+            'fingerprint':scenario.fingerprint(),
+            'size':os.path.getsize(filename)}
+        line = json.dumps(entry,sort_keys=True) + '\n'
+        with self._lock:
+            with open(self.manifest,'a') as file_handle:
+                file_handle.write(line)
+            if self._entries is not None:
+                self._entries[variant] = entry
+        return filename
+
+    def write_batch(self,variants,workers=None,prettyprint=True):
+        """ write_batch writes many scenarios in parallel
+
+            Parameters
+            ----------
+                variants (list of (str, Scenario, dict)): variant id, scenario and parameters of each variant
+
+                workers (int): number of parallel writers
+                    Default: None (number of cpus)
+
+                prettyprint (bool): pretty or "ugly" print
+                    Default: True
+
+            Returns
+            -------
+                list of str, the written files (in the same order as variants)
+
+        """
+        return run_parallel([(self.write,(variant,scenario,parameters,prettyprint)) for variant, scenario, parameters in variants],workers)
+
+    def _load(self):
+        """ reads the manifest, the last line of each variant is kept
+
+        """
+        entries = {}
+        if os.path.isfile(self.manifest):
+            with open(self.manifest) as file_handle:
+                for line in file_handle:
+                    if line.strip():
+                        entry = json.loads(line)
+                        entries[entry['variant']] = entry
+        return entries
+
+    def entries(self):
+        """ entries returns the manifest entries, read from the manifest file on the first call
+
+            Returns
+            -------
+                list of dict (variant, path, parameters, fingerprint, size), in the order the variants were first written
+
+        """
+        with self._lock:
+            if self._entries is None:
+                self._entries = self._load()
+            return list(self._entries.values())
+
+    def entry(self,variant):
+        """ entry returns the manifest entry of a variant
+
+            Parameters
+            ----------
+                variant (str): the variant id
+
+            Returns
+            -------
+                dict (variant, path, parameters, fingerprint, size)
+
+        """
+        self.entries()
+        try:
+            return self._entries[variant]
+        except KeyError:
+            raise ValueError('variant ' + variant + ' is not in the manifest') from None
+
+    def variants(self):
+        """ variants returns the variant ids in the manifest
+
+            Returns
+            -------
+                list of str
+
+        """
+        return [entry['variant'] for entry in self.entries()]
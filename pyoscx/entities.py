@@ -1,12 +1,11 @@
 import xml.etree.ElementTree as ET
 from .utils import Controller, Dimensions, Center, BoundingBox, Properties, Parameter
-from .utils import EntityRef
-from .scenario import ParameterDeclarations
+from .utils import EntityRef, convert_float, _BaseType, ParameterDeclarations, _checks, _trust
 from .enumerations import VehicleCategory, PedestrianCategory, MiscObjectCategory, ObjectType
-from .utils import DynamicsConstrains, CatalogFile, CatalogReference
+from .utils import DynamicsConstrains, CatalogFile, CatalogReference, _catalog_lock
 
 
-class Entities():
+class Entities(_BaseType):
     """ The Entities class creates the entities part of OpenScenario
         
         Attributes
@@ -96,7 +95,7 @@ class Entities():
         return element
 
 
-class ScenarioObject():
+class ScenarioObject(_BaseType):
     """ The ScenarioObject creates a scenario object of OpenScenario
         
         Parameters
@@ -136,11 +135,12 @@ class ScenarioObject():
                     Default: None
 
         """
+        checks = _trust.off or _checks(self,'__init__',name,entityobject,controller)
         self.name = name
-        if not (isinstance(entityobject,CatalogReference) or isinstance(entityobject,Vehicle) or isinstance(entityobject,Pedestrian) or isinstance(entityobject,MiscObject)):
+        if checks and not (isinstance(entityobject,CatalogReference) or isinstance(entityobject,Vehicle) or isinstance(entityobject,Pedestrian) or isinstance(entityobject,MiscObject)):
             raise TypeError('entityobject is not of type CatalogReference, Vehicle, Pedestrian, nor MiscObject')
         
-        if controller is not None and not (isinstance(controller,CatalogReference) or isinstance(controller,Controller)):
+        if checks and controller is not None and not (isinstance(controller,CatalogReference) or isinstance(controller,Controller)):
             raise TypeError('controller input is not of type CatalogReference or Controller')
         self.entityobject = entityobject
         self.controller = controller
@@ -165,7 +165,7 @@ class ScenarioObject():
         
         return element
 
-class Entity():
+class Entity(_BaseType):
     """ The Entity class creates an Entity of OpenScenario
         Can either use a object_type or entityref (not both)
         
@@ -208,16 +208,17 @@ class Entity():
                 entityref (str): reference to an entity
 
         """
+        checks = _trust.off or _checks(self,'__init__',name,object_type,entityref)
         self.name = name
-        if (object_type !=None) and (entityref != None):
+        if checks and (object_type !=None) and (entityref != None):
             raise KeyError('only one of objecttype or entityref are alowed')
-        if (object_type ==None) and (entityref == None):
+        if checks and (object_type ==None) and (entityref == None):
             raise KeyError('either objecttype or entityref is requiered')
         if entityref:
             self.entity = EntityRef(entityref)
             self.object_type = None
         else:
-            if object_type not in ObjectType:
+            if checks and object_type not in ObjectType:
                 ValueError('object_type input not a valid ObjectType')
             self.object_type = object_type
             self.entity = None
@@ -240,7 +241,7 @@ class Entity():
             ET.SubElement(members,'ByType',attrib={'value':self.object_type.name})
         return element
 
-class Pedestrian():
+class Pedestrian(_BaseType):
     """ the Pedestrian class creates a pedestrian type entity of openscenario
 
         Parameters
@@ -312,12 +313,13 @@ class Pedestrian():
             boundingbox (BoundingBox): the bounding box of the pedestrian
         
         """
+        checks = _trust.off or _checks(self,'__init__',name,model,mass,category,boundingbox)
         self.name = name
         self.model = model
         self.mass = mass
-        if category not in PedestrianCategory:
+        if checks and category not in PedestrianCategory:
             ValueError(str(category) + ' is not a valid pedestrian type')    
-        if not isinstance(boundingbox,BoundingBox):
+        if checks and not isinstance(boundingbox,BoundingBox):
             raise TypeError('boundingbox input is not of type BoundingBox')
 
         self.category = category
@@ -341,10 +343,11 @@ class Pedestrian():
                 author (str): author of the catalog
         
         """
-        cf = CatalogFile()
-        cf.create_catalog(filename,catalogtype,description,author)
-        cf.add_to_catalog(self)
-        cf.dump()
+        with _catalog_lock(filename):
+            cf = CatalogFile()
+            cf.create_catalog(filename,catalogtype,description,author)
+            cf.add_to_catalog(self)
+            cf.dump()
         
     def append_to_catalog(self,filename):
         """ adds the Pedestrian to an existing catalog
@@ -354,10 +357,11 @@ class Pedestrian():
                 filename (str): path to the catalog file
 
         """
-        cf = CatalogFile()
-        cf.open_catalog(filename)
-        cf.add_to_catalog(self)
-        cf.dump()
+        with _catalog_lock(filename):
+            cf = CatalogFile()
+            cf.open_catalog(filename)
+            cf.add_to_catalog(self)
+            cf.dump()
         
     def add_parameter(self,parameter):
         """ adds a parameter declaration to the pedestrian
@@ -367,7 +371,8 @@ class Pedestrian():
                 parameter (Parameter): A new parameter declaration for the pedestrian
 
         """
-        if not isinstance(parameter,Parameter):
+        checks = _trust.off or _checks(self,'add_parameter',parameter)
+        if checks and not isinstance(parameter,Parameter):
             raise TypeError('parameter input is not of type Parameter')
         self.parameters.add_parameter(parameter)
 
@@ -397,7 +402,7 @@ class Pedestrian():
         """ returns the attributes as a dict of the pedestrian
 
         """
-        return {'name':str(self.name),'pedestrianCategory':self.category.name,'model':self.model,'mass':str(self.mass)}
+        return {'name':str(self.name),'pedestrianCategory':self.category.name,'model':self.model,'mass':convert_float(self.mass)}
 
     def get_element(self):
         """ returns the elementTree of the pedestrian
@@ -410,7 +415,7 @@ class Pedestrian():
         
         return element
 
-class MiscObject():
+class MiscObject(_BaseType):
     """ the MiscObject Class creates a MiscObject for openscenario
 
         Parameters
@@ -475,13 +480,14 @@ class MiscObject():
             boundingbox (BoundingBox): the bounding box of the MiscObject       
         
         """
+        checks = _trust.off or _checks(self,'__init__',name,mass,category,boundingbox)
         self.name = name
         self.mass = mass
-        if category not in MiscObjectCategory:
+        if checks and category not in MiscObjectCategory:
             print(category)
             raise TypeError(str(category) + ' is not a valid MiscObject type')    
         self.category = category
-        if not isinstance(boundingbox,BoundingBox):
+        if checks and not isinstance(boundingbox,BoundingBox):
             raise TypeError('boundingbox input is not of type BoundingBox')
         self.boundingbox = boundingbox
         self.parameters = ParameterDeclarations()
@@ -503,10 +509,11 @@ class MiscObject():
                 author (str): author of the catalog
         
         """
-        cf = CatalogFile()
-        cf.create_catalog(filename,catalogtype,description,author)
-        cf.add_to_catalog(self)
-        cf.dump()
+        with _catalog_lock(filename):
+            cf = CatalogFile()
+            cf.create_catalog(filename,catalogtype,description,author)
+            cf.add_to_catalog(self)
+            cf.dump()
         
     def append_to_catalog(self,filename):
         """ adds the MiscObject to an existing catalog
@@ -516,10 +523,11 @@ class MiscObject():
                 filename (str): path to the catalog file
 
         """
-        cf = CatalogFile()
-        cf.open_catalog(filename)
-        cf.add_to_catalog(self)
-        cf.dump()
+        with _catalog_lock(filename):
+            cf = CatalogFile()
+            cf.open_catalog(filename)
+            cf.add_to_catalog(self)
+            cf.dump()
 
     def add_parameter(self,parameter):
         """ adds a parameter declaration to the MiscObject
@@ -529,7 +537,8 @@ class MiscObject():
                 parameter (Parameter): A new parameter declaration for the MiscObject
 
         """
-        if not isinstance(parameter,Parameter):
+        checks = _trust.off or _checks(self,'add_parameter',parameter)
+        if checks and not isinstance(parameter,Parameter):
             raise TypeError('parameter input is not of type Parameter')
         self.parameters.add_parameter(parameter)
 
@@ -559,7 +568,7 @@ class MiscObject():
         """ returns the attributes as a dict of the MiscObject
 
         """
-        return {'name':str(self.name),'MiscObjectCategory':str(self.category),'mass':str(self.mass)}
+        return {'name':str(self.name),'MiscObjectCategory':str(self.category),'mass':convert_float(self.mass)}
 
     def get_element(self):
         """ returns the elementTree of the MiscObject
@@ -572,7 +581,7 @@ class MiscObject():
         
         return element
 
-class Vehicle():
+class Vehicle(_BaseType):
     """ the Vehicle Class creates a Vehicle for openscenario
 
         Parameters
@@ -659,11 +668,12 @@ class Vehicle():
                 max_deceleration (float): the maximum deceleration of the vehicle
         
         """
+        checks = _trust.off or _checks(self,'__init__',name,vehicle_type,boundingbox,frontaxle,rearaxle,max_speed,max_acceleration,max_deceleration)
         self.name = name
-        if vehicle_type not in VehicleCategory:
+        if checks and vehicle_type not in VehicleCategory:
             print('wtf' , vehicle_type)
             raise TypeError('not a valid vehicle type')  
-        if not isinstance(boundingbox,BoundingBox):
+        if checks and not isinstance(boundingbox,BoundingBox):
             raise TypeError('boundingbox input is not of type BoundingBox')
         
         self.vehicle_type = vehicle_type
@@ -689,10 +699,11 @@ class Vehicle():
                 author (str): author of the catalog
         
         """
-        cf = CatalogFile()
-        cf.create_catalog(filename,catalogtype,description,author)
-        cf.add_to_catalog(self)
-        cf.dump()
+        with _catalog_lock(filename):
+            cf = CatalogFile()
+            cf.create_catalog(filename,catalogtype,description,author)
+            cf.add_to_catalog(self)
+            cf.dump()
         
     def append_to_catalog(self,filename):
         """ adds the vehicle to an existing catalog
@@ -702,10 +713,11 @@ class Vehicle():
                 filename (str): path to the catalog file
 
         """
-        cf = CatalogFile()
-        cf.open_catalog(filename)
-        cf.add_to_catalog(self)
-        cf.dump()
+        with _catalog_lock(filename):
+            cf = CatalogFile()
+            cf.open_catalog(filename)
+            cf.add_to_catalog(self)
+            cf.dump()
 
     def add_axle(self,axle):
         """ adds an additional axle to the vehicle
@@ -727,7 +739,8 @@ class Vehicle():
                 parameter (Parameter): A new parameter declaration for the vehicle
 
         """
-        if not isinstance(parameter,Parameter):
+        checks = _trust.off or _checks(self,'add_parameter',parameter)
+        if checks and not isinstance(parameter,Parameter):
             raise TypeError('parameter input is not of type Parameter')
         self.parameters.add_parameter(parameter)
 
@@ -775,7 +788,7 @@ class Vehicle():
 
 
 
-class Axle():
+class Axle(_BaseType):
     """ the Axle describes the axle properties of a vehicle
 
         Parameters
@@ -837,7 +850,7 @@ class Axle():
         """ returns the attributes of the Axle as a dict
 
         """
-        return {'maxSteering':str(self.maxsteer),'wheelDiameter':str(self.wheeldia),'trackWidth':str(self.track_width),'positionX':str(self.xpos),'positionZ':str(self.zpos)}
+        return {'maxSteering':convert_float(self.maxsteer,'angle'),'wheelDiameter':convert_float(self.wheeldia,'position'),'trackWidth':convert_float(self.track_width,'position'),'positionX':convert_float(self.xpos,'position'),'positionZ':convert_float(self.zpos,'position')}
 
     def get_element(self, elementname='AdditionalAxle'):
         """ returns the elementTree of the Axle
@@ -845,7 +858,7 @@ class Axle():
         """
         return ET.Element(elementname, attrib=self.get_attributes())
         
-class Axles():
+class Axles(_BaseType):
     """ the Axles combines the different Axles to one Element
 
         Parameters
@@ -883,9 +896,10 @@ class Axles():
                 rearaxle (Axle): Axle properties of the rear axle
 
         """
-        if not isinstance(frontaxle,Axle):
+        checks = _trust.off or _checks(self,'__init__',frontaxle,rearaxle)
+        if checks and not isinstance(frontaxle,Axle):
             raise TypeError('frontaxle input is not of type Axle')
-        if not isinstance(rearaxle,Axle):
+        if checks and not isinstance(rearaxle,Axle):
             raise TypeError('rearaxle input is not of type Axle')
         self.frontaxle = frontaxle
         self.rearaxle = rearaxle
@@ -899,7 +913,8 @@ class Axles():
                 frontaxle (Axle): Axle properties of the front axle
 
         """
-        if not isinstance(axle,Axle):
+        checks = _trust.off or _checks(self,'add_axle',axle)
+        if checks and not isinstance(axle,Axle):
             raise TypeError('axle input is not of type Axle')
         self.additionals.append(axle)
 
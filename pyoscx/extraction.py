@@ -0,0 +1,196 @@
+import copy
+import os
+
+from .utils import CatalogFile, CatalogReference, Controller, Route, Trajectory, _BaseType, _CACHE_ATTRIBUTES, _attributes
+from .entities import ScenarioObject, Vehicle, Pedestrian, MiscObject
+from .actions import AssignControllerAction, AssignRouteAction, FollowTrajectoryAction
+
+
+class CatalogExtractor():
+    """ the CatalogExtractor moves definitions that are repeated in a corpus of scenarios into shared catalogs
+
+        Vehicles, Pedestrians, MiscObjects, Controllers, Trajectories and Routes
+        are compared by their fingerprint. Definitions used at least min_count times
+        (in all scenarios together) are written once to a catalog file, and the
+        scenarios are changed in place to use a CatalogReference instead.
+        Entries with the same name but different content get the start of their
+        fingerprint added to the name.
+
+        A scenario that already uses another directory for a catalog keeps its
+        definitions of that catalog inline.
+
+        Parameters
+        ----------
+            directory (str): directory where the catalog files are written
+
+            catalog_path (str): the path of the directory written in the scenarios
+                Default: None (directory)
+
+            min_count (int): number of uses needed to move a definition to a catalog
+                Default: 2
+
+            author (str): author of the catalog files
+                Default: pyoscx
+
+            canonical (bool): write the catalog files in the canonical format
+                Default: False
+
+        Attributes
+        ----------
+            directory (str): directory where the catalog files are written
+
+            catalog_path (str): the path of the directory written in the scenarios
+
+            min_count (int): number of uses needed to move a definition to a catalog
+
+            author (str): author of the catalog files
+
+            canonical (bool): write the catalog files in the canonical format
+
+            entries (dict of str: list): the extracted definitions of each catalog
+
+            references (int): number of definitions replaced by a CatalogReference
+
+        Methods
+        -------
+            extract(scenarios)
+                moves the repeated definitions to catalogs and writes the catalog files
+
+    """
+    _CATALOG_NAMES = {
+        Vehicle:'VehicleCatalog',
+        Pedestrian:'PedestrianCatalog',
+        MiscObject:'MiscObjectCatalog',
+        Controller:'ControllerCatalog',
+        Trajectory:'TrajectoryCatalog',
+        Route:'RouteCatalog'}
+
+    # attributes that can hold either a definition or a CatalogReference
+    _SLOTS = {
+        ScenarioObject:('entityobject','controller'),
+        AssignControllerAction:('controller',),
+        AssignRouteAction:('route',),
+        FollowTrajectoryAction:('trajectory',)}
+
+    def __init__(self,directory,catalog_path=None,min_count=2,author='pyoscx',canonical=False):
+        """ initalize the CatalogExtractor
+
+        Parameters
+        ----------
+            directory (str): directory where the catalog files are written
+
+            catalog_path (str): the path of the directory written in the scenarios
+                Default: None (directory)
+
+            min_count (int): number of uses needed to move a definition to a catalog
+                Default: 2
+
+            author (str): author of the catalog files
+                Default: pyoscx
+
+            canonical (bool): write the catalog files in the canonical format
+                Default: False
+
+        """
+        if min_count < 1:
+            raise ValueError('min_count has to be at least 1')
+        self.directory = directory
+        if catalog_path is None:
+            catalog_path = directory
+        self.catalog_path = catalog_path
+        self.min_count = min_count
+        self.author = author
+        self.canonical = canonical
+        self.entries = {}
+        self.references = 0
+        self._entrynames = {}
+
+    def _catalog_name(self,definition):
+        """ returns the name of the catalog of a definition, or None if it can not be extracted
+
+        """
+        return self._CATALOG_NAMES.get(type(definition))
+
+    def extract(self,scenarios):
+        """ extract moves the repeated definitions of the scenarios to catalogs
+
+            The scenarios are changed in place.
+
+            Parameters
+            ----------
+                scenarios (list of Scenario): the corpus
+
+            Returns
+            -------
+                dict of str: str, the catalog name and file of each written catalog
+
+        """
+        uses = []
+        counts = {}
+        for scenario in scenarios:
+            for owner, attribute, definition in _definitions(scenario,self._SLOTS):
+                catalogname = self._catalog_name(definition)
+                if catalogname is None:
+                    continue
+                path = scenario.catalog.catalogs.get(catalogname)
+                if path is not None and path != self.catalog_path:
+                    continue
+                key = (catalogname,definition.fingerprint())
+                counts[key] = counts.get(key,0) + 1
+                uses.append((scenario,owner,attribute,key,definition))
+
+        entrynames = self._entrynames
+        for scenario, owner, attribute, key, definition in uses:
+            if counts[key] < self.min_count:
+                continue
+            catalogname = key[0]
+            if key not in entrynames:
+                entries = self.entries.setdefault(catalogname,[])
+                if any(entry.name == definition.name for entry in entries):
+                    definition = copy.deepcopy(definition)
+                    definition.name = definition.name + '_' + key[1][:8]
+                entries.append(definition)
+                entrynames[key] = definition.name
+            setattr(owner,attribute,CatalogReference(catalogname,entrynames[key]))
+            if catalogname not in scenario.catalog.catalogs:
+                scenario.catalog.add_catalog(catalogname,self.catalog_path)
+            self.references += 1
+        return self._write()
+
+    def _write(self):
+        """ writes one file per catalog
+
+        """
+        os.makedirs(self.directory,exist_ok=True)
+        files = {}
+        for catalogname, entries in self.entries.items():
+            filename = os.path.join(self.directory,catalogname + '.xosc')
+            cf = CatalogFile(canonical=self.canonical)
+            cf.create_catalog(filename,catalogname,'shared ' + catalogname,self.author)
+            for entry in entries:
+                cf.add_to_catalog(entry)
+            cf.dump()
+            files[catalogname] = filename
+        return files
+
+
+def _definitions(root,slots):
+    """ yields the owner, attribute name and value of all slots in the tree of root
+
+    """
+    seen = set()
+    stack = [root]
+    while stack:
+        value = stack.pop()
+        if isinstance(value,(list,tuple)):
+            stack.extend(reversed(value))
+        elif isinstance(value,dict):
+            stack.extend(reversed(list(value.values())))
+        elif isinstance(value,_BaseType) and id(value) not in seen:
+            seen.add(id(value))
+            attributes = slots.get(type(value),())
+            for name in attributes:
+                child = getattr(value,name,None)
+                if isinstance(child,_BaseType) and not isinstance(child,CatalogReference):
+                    yield value, name, child
+            stack.extend(reversed([v for k, v in _attributes(value).items() if k not in _CACHE_ATTRIBUTES]))
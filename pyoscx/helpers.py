@@ -1,8 +1,11 @@
 import xml.etree.ElementTree as ET
-import xml.dom.minidom as mini
 import os
+import threading
+import weakref
 
 
+CANONICAL_DATE = '1970-01-01T00:00:00'
+
 def esminiRunner(scenario, esminipath='esmini', args='--window 60 60 800 400'):
     """ write a scenario and runs it in esmini
         Parameters
@@ -72,12 +75,35 @@ def prettyprint(element):
             element (Element): element to print
 
     """
+    import xml.dom.minidom as mini
     rough = ET.tostring(element, 'utf-8')
     reparsed = mini.parseString(rough)
     print(reparsed.toprettyxml(indent="\t"))
 
 
-def printToFile(element, filename, prettyprint=True):
+def canonical_xml(element, prettyprint=True):
+    """ returns the canonical serialization of an element,
+        identical elements always give identical bytes: attributes are sorted,
+        whitespace around elements is dropped, pretty printing uses one tab per level
+        and the output starts with an utf-8 xml declaration
+
+        Parameters
+        ----------
+            element (Element): element to serialize
+
+            prettyprint (bool): pretty or "ugly" print
+                Default: True
+
+        Returns
+        -------
+            bytes
+
+    """
+    mode = _CANONICAL if prettyprint else _CANONICAL_UGLY
+    return (_CANONICAL_DECLARATION + _serialize(element, mode) + '\n').encode('utf-8')
+
+
+def printToFile(element, filename, prettyprint=True, canonical=False):
     """ prints the element to a xml file
 
         Parameters
@@ -88,14 +114,209 @@ def printToFile(element, filename, prettyprint=True):
 
             prettyprint (bool): pretty or "ugly" print
 
+            canonical (bool): write the canonical serialization (see canonical_xml),
+                so unchanged elements give byte identical files
+                Default: False
+
     """
-    if prettyprint:
-        rough = ET.tostring(element, 'utf-8').replace(b'\n', b'').replace(b'\t', b'')
-        reparsed = mini.parseString(rough)
-        towrite = reparsed.toprettyxml(indent="\t")
+    if canonical:
+        with open(filename, "wb") as file_handle:
+            file_handle.write(canonical_xml(element, prettyprint))
+    elif prettyprint:
+        towrite = _PRETTY_DECLARATION + _serialize(element, _PRETTY)
         with open(filename, "w") as file_handle:
             file_handle.write(towrite)
     else:
-        tree = ET.ElementTree(element)
         with open(filename, "wb") as file_handle:
-            tree.write(file_handle)
+            file_handle.write(_serialize(element, _UGLY).encode('ascii', 'xmlcharrefreplace'))
+
+
+# The serialization below writes the same output as the minidom pretty print
+# (_PRETTY) and ElementTree.write (_UGLY), but can reuse the text of elements
+# that are kept in the element cache of the pyoscx objects (see enable_element_cache)
+_PRETTY = 'pretty'
+_UGLY = 'ugly'
+_CANONICAL = 'canonical'
+_CANONICAL_UGLY = 'canonical_ugly'
+_PRETTY_DECLARATION = '<?xml version="1.0" ?>\n'
+_CANONICAL_DECLARATION = "<?xml version='1.0' encoding='utf-8'?>\n"
+
+# serialized text of cached elements, by mode (and depth for the indented modes)
+_fragments = weakref.WeakKeyDictionary()
+# the WeakKeyDictionary is not safe for concurrent changes (lookups are)
+_fragments_lock = threading.Lock()
+
+
+def _check_variant(variant):
+    """ raises a ValueError for a variant id that is not a plain file name (empty, with a path separator or ..)
+
+    """
+    if not isinstance(variant,str):
+        raise TypeError('variant should be a str, not ' + str(type(variant)))
+    separators = [sep for sep in ('/','\\',os.sep,os.altsep,'\0') if sep]
+    if not variant or '..' in variant or any(sep in variant for sep in separators):
+        raise ValueError('variant id ' + repr(variant) + ' should be a file name without path separators or ..')
+    return variant
+
+def _register_fragment(element):
+    """ marks an element as unchanging, so its serialized text can be reused
+
+    """
+    with _fragments_lock:
+        _fragments[element] = {}
+
+
+def _serialize(element, mode):
+    """ serializes an element (without xml declaration)
+
+    """
+    parts = []
+    _write_element(element, mode, 0, parts)
+    return ''.join(parts)
+
+
+def _write_element(element, mode, depth, parts):
+    """ appends the serialized element to parts, using the stored text if there is one
+
+    """
+    fragments = _fragments.get(element)
+    if fragments is None:
+        _WRITERS[mode](element, depth, parts)
+        return
+    key = (mode, depth) if mode in (_PRETTY, _CANONICAL) else mode
+    text = fragments.get(key)
+    if text is None:
+        fragment = []
+        _WRITERS[mode](element, depth, fragment)
+        text = fragments[key] = ''.join(fragment)
+    parts.append(text)
+
+
+def _escape_cdata(text):
+    """ escapes text as ElementTree does
+
+    """
+    return text.replace('&', '&amp;').replace('<', '&lt;').replace('>', '&gt;')
+
+
+def _escape_attrib(text):
+    """ escapes an attribute value as ElementTree does
+
+    """
+    try:
+        text = text.replace('&', '&amp;').replace('<', '&lt;').replace('>', '&gt;').replace('"', '&quot;')
+        return text.replace('\r', '&#13;').replace('\n', '&#10;').replace('\t', '&#09;')
+    except AttributeError:
+        raise TypeError('cannot serialize %r (type %s)' % (text, type(text).__name__))
+
+
+def _escape_minidom(text):
+    """ escapes text and attribute values as minidom does
+
+    """
+    return text.replace('&', '&amp;').replace('<', '&lt;').replace('"', '&quot;').replace('>', '&gt;')
+
+
+def _layout_stripped(text):
+    """ text as minidom reads it after the tabs and newlines were removed
+
+    """
+    if not text:
+        return ''
+    return text.replace('\n', '').replace('\t', '').replace('\r', '\n')
+
+
+def _write_pretty(element, depth, parts):
+    """ writes an element as the minidom pretty print does
+
+    """
+    indent = '\t' * depth
+    tag = element.tag
+    parts.append(indent + '<' + tag)
+    items = element.items()
+    # minidom puts the namespace declarations first
+    items = [i for i in items if i[0].startswith('xmlns')] + [i for i in items if not i[0].startswith('xmlns')]
+    for key, value in items:
+        parts.append(' ' + key + '="' + _escape_minidom(value) + '"')
+    nodes = []
+    text = _layout_stripped(element.text)
+    if text:
+        nodes.append(text)
+    for child in element:
+        nodes.append(child)
+        tail = _layout_stripped(child.tail)
+        if tail:
+            nodes.append(tail)
+    if not nodes:
+        parts.append('/>\n')
+    elif len(nodes) == 1 and isinstance(nodes[0], str):
+        parts.append('>' + _escape_minidom(nodes[0]) + '</' + tag + '>\n')
+    else:
+        parts.append('>\n')
+        for node in nodes:
+            if isinstance(node, str):
+                parts.append(_escape_minidom(indent + '\t' + node + '\n'))
+            else:
+                _write_element(node, _PRETTY, depth + 1, parts)
+        parts.append(indent + '</' + tag + '>\n')
+
+
+def _write_ugly(element, depth, parts):
+    """ writes an element as ElementTree.write does
+
+    """
+    tag = element.tag
+    parts.append('<' + tag)
+    for key, value in element.items():
+        parts.append(' ' + key + '="' + _escape_attrib(value) + '"')
+    if element.text or len(element):
+        parts.append('>')
+        if element.text:
+            parts.append(_escape_cdata(element.text))
+        for child in element:
+            _write_element(child, _UGLY, 0, parts)
+        parts.append('</' + tag + '>')
+    else:
+        parts.append(' />')
+    if element.tail:
+        parts.append(_escape_cdata(element.tail))
+
+
+def _write_canonical(element, depth, parts, pretty=True):
+    """ writes an element with sorted attributes, stripped text and no tails,
+        indented as ElementTree.indent does
+
+    """
+    tag = element.tag
+    parts.append('<' + tag)
+    for key, value in sorted(element.items()):
+        parts.append(' ' + key + '="' + _escape_attrib(value) + '"')
+    text = (element.text or '').strip()
+    if not len(element):
+        if text:
+            parts.append('>' + _escape_cdata(text) + '</' + tag + '>')
+        else:
+            parts.append(' />')
+        return
+    mode = _CANONICAL if pretty else _CANONICAL_UGLY
+    newline = '\n' + '\t' * (depth + 1) if pretty else ''
+    parts.append('>' + (_escape_cdata(text) if text else newline))
+    for i, child in enumerate(element):
+        if i:
+            parts.append(newline)
+        _write_element(child, mode, depth + 1, parts)
+    parts.append(('\n' + '\t' * depth if pretty else '') + '</' + tag + '>')
+
+
+def _write_canonical_ugly(element, depth, parts):
+    """ writes an element in the canonical format without indentation
+
+    """
+    _write_canonical(element, depth, parts, False)
+
+
+_WRITERS = {
+    _PRETTY: _write_pretty,
+    _UGLY: _write_ugly,
+    _CANONICAL: _write_canonical,
+    _CANONICAL_UGLY: _write_canonical_ugly}
@@ -0,0 +1,262 @@
+import contextlib
+import functools
+import json
+import time
+import types
+
+from .utils import _BaseType, _subclasses, _cached_get_element, _profile
+
+
+class Profile():
+    """ the Profile holds the counts and times collected while the profiling is enabled (see enable_profiling)
+
+        For every pyoscx class it counts the constructor calls, and for the get_element
+        and write methods (write_xml, dump, dump_to_catalog, append_to_catalog) the calls,
+        the elements built and the time. The time of a call includes the get_element calls
+        it makes (total), the self time does not. For a write method the self time is
+        the time of the serialization and of writing the file.
+
+        The same is collected per subtree, i.e. per path of classes from the outermost
+        call (e.g. Scenario/StoryBoard/Story/Act).
+
+        get_element calls answered from the element cache (see enable_element_cache) are not counted.
+
+        Attributes
+        ----------
+            created (dict of str: int): number of constructor calls by class
+
+            methods (dict of str: dict): calls, elements, total and self time (s) by 'class.method'
+
+            subtrees (dict of str: dict): calls, elements, total and self time (s) by path of classes
+
+        Methods
+        -------
+            to_dict()
+                returns the collected data as a dict
+
+            report(format='text',limit=20)
+                returns the collected data as a text table or as json
+
+    """
+    def __init__(self):
+        """ initalize the Profile
+
+        """
+        self.created = {}
+        self.methods = {}
+        self.subtrees = {}
+        # the running calls, each as [path, nested time, nested elements]
+        self._stack = []
+
+    def to_dict(self):
+        """ to_dict returns the collected data
+
+            Returns
+            -------
+                dict with created, methods and subtrees
+
+        """
+        return {'created':dict(self.created),'methods':_copy_stats(self.methods),'subtrees':_copy_stats(self.subtrees)}
+
+    def report(self,format='text',limit=20):
+        """ report returns the collected data as a text table or as json
+
+            Parameters
+            ----------
+                format (str): 'text' or 'json'
+                    Default: 'text'
+
+                limit (int): number of rows of each text table (sorted by self time), None for all
+                    Default: 20
+
+            Returns
+            -------
+                str
+
+        """
+        if format == 'json':
+            return json.dumps(self.to_dict(),indent=1,sort_keys=True)
+        if format != 'text':
+            raise ValueError('format has to be text or json, not ' + str(format))
+        lines = []
+        for title, stats in (('method',self.methods),('subtree',self.subtrees)):
+            rows = sorted(stats.items(),key=lambda item: item[1]['self_time'],reverse=True)[:limit]
+            width = max([len(title)] + [len(name) for name, _ in rows])
+            lines.append('%-*s %8s %9s %11s %11s' % (width,title,'calls','elements','total [ms]','self [ms]'))
+            for name, s in rows:
+                lines.append('%-*s %8d %9d %11.2f %11.2f' % (width,name,s['calls'],s['elements'],s['total_time']*1000,s['self_time']*1000))
+            lines.append('')
+        rows = sorted(self.created.items(),key=lambda item: item[1],reverse=True)[:limit]
+        width = max([len('class')] + [len(name) for name, _ in rows])
+        lines.append('%-*s %8s' % (width,'class','created'))
+        for name, count in rows:
+            lines.append('%-*s %8d' % (width,name,count))
+        return '\n'.join(lines) + '\n'
+
+    def _add(self,stats,key,elements,total,own):
+        entry = stats.get(key)
+        if entry is None:
+            entry = stats[key] = {'calls':0,'elements':0,'total_time':0.0,'self_time':0.0}
+        entry['calls'] += 1
+        entry['elements'] += elements
+        entry['total_time'] += total
+        entry['self_time'] += own
+
+
+def _copy_stats(stats):
+    return {key:dict(value) for key, value in stats.items()}
+
+
+# the profiled methods, besides get_element
+_WRITE_METHODS = ('write_xml','dump','dump_to_catalog','append_to_catalog')
+
+
+def enable_profiling(profile=None):
+    """ enable_profiling starts counting the constructor calls and counting and timing the get_element
+        and write calls of all pyoscx classes
+
+        Nothing is installed while the profiling is disabled, so it costs nothing then.
+        While it is enabled the objects are written from their elements (not streamed, see serializers).
+        The profiling is not meant for threads, calls from several threads are mixed up.
+
+        Parameters
+        ----------
+            profile (Profile): the profile to add to
+                Default: None (a new Profile)
+
+        Returns
+        -------
+            Profile
+
+    """
+    if profile is None:
+        profile = Profile()
+    if _profile.profile is None:
+        for cls in [_BaseType] + _subclasses(_BaseType):
+            _install_profiling(cls)
+    _profile.profile = profile
+    return profile
+
+
+def disable_profiling():
+    """ disable_profiling stops the profiling and removes the instrumentation
+
+        Returns
+        -------
+            Profile, the profile that was collected (None if the profiling was not enabled)
+
+    """
+    profile = _profile.profile
+    if profile is None:
+        return None
+    _profile.profile = None
+    for cls in [_BaseType] + _subclasses(_BaseType):
+        for name, value in list(vars(cls).items()):
+            cached = getattr(value,'_uncached',None)
+            if cached is not None and hasattr(cached,'_unprofiled'):
+                # the caching wrapper of the element cache is kept
+                setattr(cls,name,_cached_get_element(cached._unprofiled))
+            elif hasattr(value,'_unprofiled'):
+                setattr(cls,name,value._unprofiled)
+    return profile
+
+
+@contextlib.contextmanager
+def profiling():
+    """ context manager for the profiling (see enable_profiling), yields the Profile
+
+        Example
+        -------
+            with profiling() as profile:
+                scenario = build_scenario()
+                scenario.write_xml('scenario.xosc')
+            print(profile.report())
+
+    """
+    previous = _profile.profile
+    profile = enable_profiling(Profile())
+    try:
+        yield profile
+    finally:
+        if previous is None:
+            disable_profiling()
+        else:
+            enable_profiling(previous)
+
+
+def _install_profiling(cls):
+    """ wraps the constructor, the get_element and the write methods of a class,
+        get_element inside the caching wrapper of the element cache
+
+
+    """
+    for name, value in list(vars(cls).items()):
+        if name == '__init__':
+            if isinstance(value,types.FunctionType) and not hasattr(value,'_unprofiled'):
+                setattr(cls,name,_counting_init(value))
+            continue
+        if name != 'get_element' and name not in _WRITE_METHODS:
+            continue
+        cached = getattr(value,'_uncached',None)
+        if cached is not None:
+            if not hasattr(cached,'_unprofiled'):
+                setattr(cls,name,_cached_get_element(_profiled(cached,name)))
+        elif callable(value) and not hasattr(value,'_unprofiled'):
+            setattr(cls,name,_profiled(value,name))
+
+
+_profile.install = _install_profiling
+
+
+def _profiled(func,name):
+    """ wraps a method to count and time its calls
+
+    """
+    # not functools.wraps, the attributes of the other wrappers must not be copied
+    @functools.wraps(func,updated=())
+    def method(self,*args,**kwargs):
+        profile = _profile.profile
+        if profile is None:
+            return func(self,*args,**kwargs)
+        stack = profile._stack
+        classname = type(self).__name__
+        step = classname if name == 'get_element' else classname + '.' + name
+        path = stack[-1][0] + '/' + step if stack else step
+        frame = [path,0.0,0]
+        stack.append(frame)
+        start = time.perf_counter()
+        try:
+            result = func(self,*args,**kwargs)
+        finally:
+            total = time.perf_counter() - start
+            stack.pop()
+        elements = 0
+        if name == 'get_element':
+            # the elements of the returned tree, without those built by the nested calls
+            elements = sum(1 for _ in result.iter())
+        own = total - frame[1]
+        own_elements = max(elements - frame[2],0)
+        profile._add(profile.methods,classname + '.' + name,own_elements,total,own)
+        profile._add(profile.subtrees,path,own_elements,total,own)
+        if stack:
+            stack[-1][1] += total
+            stack[-1][2] += elements
+        return result
+    method._unprofiled = func
+    return method
+
+
+def _counting_init(func):
+    """ wraps a constructor to count the created objects
+
+    """
+    @functools.wraps(func,updated=())
+    def __init__(self,*args,**kwargs):
+        profile = _profile.profile
+        if profile is not None:
+            created = profile.created
+            name = type(self).__name__
+            created[name] = created.get(name,0) + 1
+        func(self,*args,**kwargs)
+    __init__._unprofiled = func
+    return __init__
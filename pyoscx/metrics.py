@@ -0,0 +1,262 @@
+import bisect
+import os
+import threading
+import time
+
+
+class _Histogram():
+    """ a histogram with cumulative buckets, as in the Prometheus histogram type
+
+    """
+    def __init__(self,buckets):
+        self.buckets = tuple(sorted(buckets))
+        self.counts = [0]*len(self.buckets)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self,value):
+        index = bisect.bisect_left(self.buckets,value)
+        if index < len(self.buckets):
+            self.counts[index] += 1
+        self.sum += value
+        self.count += 1
+
+    def lines(self,name):
+        lines = []
+        total = 0
+        for bound, count in zip(self.buckets,self.counts):
+            total += count
+            lines.append('%s_bucket{le="%s"} %d' % (name,_number(bound),total))
+        lines.append('%s_bucket{le="+Inf"} %d' % (name,self.count))
+        lines.append('%s_sum %s' % (name,_number(self.sum)))
+        lines.append('%s_count %d' % (name,self.count))
+        return lines
+
+
+def _number(value):
+    """ formats a number for the textfile format
+
+    """
+    return repr(float(value)) if isinstance(value,float) else str(value)
+
+
+class RunMetrics():
+    """ RunMetrics counts the runs of a runner (or of a sweep) and writes them in the
+        Prometheus textfile format, for a node exporter textfile collector or any other watcher
+
+        The counters are updated by the EsminiRunner (and run_parallel) when the RunMetrics
+        is given to the runner. While runs are ongoing the file is rewritten at most once per
+        interval, and once more when a batch is finished. The file is replaced atomically,
+        so a reader never sees a partial file.
+
+        Metrics (with prefix pyoscx)
+            pyoscx_runs_started_total, pyoscx_runs_completed_total, pyoscx_runs_failed_total,
+            pyoscx_runs_timed_out_total, pyoscx_cache_hits_total, pyoscx_bytes_written_total (counters)
+
+            pyoscx_queue_depth (gauge): calls of run_parallel not yet started
+
+            pyoscx_run_wall_seconds, pyoscx_run_cpu_seconds (histograms): of the simulated
+            (not cached) runs, the cpu time of the simulator process is only measured on
+            platforms with os.waitid
+
+        Parameters
+        ----------
+            filename (str): the metrics file, should end with .prom for a textfile collector (optional)
+                Default: None (not written)
+
+            interval (float): minimum time in seconds between two writes of the file
+                Default: 10
+
+            buckets (list of float): upper bounds of the histogram buckets in seconds
+                Default: (0.1,0.25,0.5,1,2.5,5,10,30,60,120,300,600)
+
+            prefix (str): prefix of the metric names
+                Default: pyoscx
+
+        Attributes
+        ----------
+            filename (str): the metrics file
+
+            interval (float): minimum time in seconds between two writes of the file
+
+            prefix (str): prefix of the metric names
+
+            started (int): number of started runs
+
+            completed (int): number of runs that succeeded (also from the cache)
+
+            failed (int): number of runs that did not succeed (also from the cache)
+
+            timed_out (int): number of runs stopped because of the timeout (also counted as failed)
+
+            cache_hits (int): number of runs answered by the cache
+
+            bytes_written (int): size of the written scenario files in bytes
+
+            queue_depth (int): number of calls waiting for a worker
+
+        Methods
+        -------
+            run_started()
+                counts a started run
+
+            run_finished(result)
+                counts a finished run
+
+            add_bytes(size)
+                counts written bytes
+
+            add_queued(n)
+                changes the queue depth
+
+            to_text()
+                returns the metrics in the textfile format
+
+            write(filename)
+                writes the metrics file
+
+    """
+    def __init__(self,filename=None,interval=10,buckets=(0.1,0.25,0.5,1,2.5,5,10,30,60,120,300,600),prefix='pyoscx'):
+        """ initalize the RunMetrics
+
+        Parameters
+        ----------
+            filename (str): the metrics file, should end with .prom for a textfile collector (optional)
+                Default: None (not written)
+
+            interval (float): minimum time in seconds between two writes of the file
+                Default: 10
+
+            buckets (list of float): upper bounds of the histogram buckets in seconds
+                Default: (0.1,0.25,0.5,1,2.5,5,10,30,60,120,300,600)
+
+            prefix (str): prefix of the metric names
+                Default: pyoscx
+
+        """
+        if interval < 0:
+            raise ValueError('interval can not be negative')
+        self.filename = filename
+        self.interval = interval
+        self.prefix = prefix
+        self.started = 0
+        self.completed = 0
+        self.failed = 0
+        self.timed_out = 0
+        self.cache_hits = 0
+        self.bytes_written = 0
+        self.queue_depth = 0
+        self._wall_time = _Histogram(buckets)
+        self._cpu_time = _Histogram(buckets)
+        self._lock = threading.Lock()
+        self._last_write = None
+
+    def run_started(self):
+        """ run_started counts a started run
+
+        """
+        with self._lock:
+            self.started += 1
+        self._changed()
+
+    def run_finished(self,result):
+        """ run_finished counts a finished run
+
+            Parameters
+            ----------
+                result (RunResult): the result of the run
+
+        """
+        with self._lock:
+            if result.succeeded():
+                self.completed += 1
+            else:
+                self.failed += 1
+            if result.timed_out:
+                self.timed_out += 1
+            if result.cached:
+                self.cache_hits += 1
+            else:
+                self._wall_time.observe(result.wall_time)
+                if result.cpu_time is not None:
+                    self._cpu_time.observe(result.cpu_time)
+        self._changed()
+
+    def add_bytes(self,size):
+        """ add_bytes counts written bytes
+
+            Parameters
+            ----------
+                size (int): number of bytes
+
+        """
+        with self._lock:
+            self.bytes_written += size
+        self._changed()
+
+    def add_queued(self,n):
+        """ add_queued changes the queue depth
+
+            Parameters
+            ----------
+                n (int): number of calls added to (or removed from, if negative) the queue
+
+        """
+        with self._lock:
+            self.queue_depth += n
+        self._changed()
+
+    def to_text(self):
+        """ to_text returns the metrics in the Prometheus textfile format
+
+            Returns
+            -------
+                str
+
+        """
+        p = self.prefix
+        with self._lock:
+            lines = []
+            for name, help_text, value in (
+                    ('runs_started_total','Runs started.',self.started),
+                    ('runs_completed_total','Runs that succeeded.',self.completed),
+                    ('runs_failed_total','Runs that did not succeed.',self.failed),
+                    ('runs_timed_out_total','Runs stopped because of the timeout.',self.timed_out),
+                    ('cache_hits_total','Runs answered by the result cache.',self.cache_hits),
+                    ('bytes_written_total','Bytes of written scenario files.',self.bytes_written)):
+                lines += ['# HELP %s_%s %s' % (p,name,help_text),'# TYPE %s_%s counter' % (p,name),'%s_%s %d' % (p,name,value)]
+            lines += ['# HELP %s_queue_depth Calls waiting for a worker.' % p,'# TYPE %s_queue_depth gauge' % p,'%s_queue_depth %d' % (p,self.queue_depth)]
+            for name, help_text, histogram in (
+                    ('run_wall_seconds','Wall time of the simulated runs.',self._wall_time),
+                    ('run_cpu_seconds','Cpu time of the simulator processes.',self._cpu_time)):
+                lines += ['# HELP %s_%s %s' % (p,name,help_text),'# TYPE %s_%s histogram' % (p,name)]
+                lines += histogram.lines(p + '_' + name)
+        return '\n'.join(lines) + '\n'
+
+    def write(self,filename=None):
+        """ write writes the metrics file, replacing the old file atomically
+
+            Parameters
+            ----------
+                filename (str): the file
+                    Default: None (filename of the RunMetrics)
+
+        """
+        if filename is None:
+            filename = self.filename
+        if filename is None:
+            raise ValueError('no filename given for the metrics')
+        tmpfile = filename + '.tmp' + str(os.getpid()) + '_' + str(threading.get_ident())
+        with open(tmpfile,'w') as f:
+            f.write(self.to_text())
+        os.replace(tmpfile,filename)
+        self._last_write = time.monotonic()
+
+    def _changed(self):
+        """ writes the file if the interval has passed since the last write
+
+        """
+        if self.filename is None:
+            return
+        if self._last_write is None or time.monotonic() - self._last_write >= self.interval:
+            self.write()
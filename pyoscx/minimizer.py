@@ -0,0 +1,228 @@
+import copy
+
+from .runner import run_parallel
+from .triggers import Trigger, ConditionGroup
+from .traces import _span
+
+
+class ScenarioMinimizer():
+    """ the ScenarioMinimizer reduces a failing scenario to a small reproducer (delta debugging)
+
+        Parts of the scenario (ScenarioObjects, Stories, Acts, ManeuverGroups,
+        Maneuvers, Events, Actions, Init actions and trigger conditions) are
+        removed in chunks of decreasing size, and a removal is kept as long as
+        the predicate still reports the failure. The candidates of each step
+        are tested in parallel.
+
+        Parameters
+        ----------
+            predicate (callable): predicate(scenario) returns True if the scenario still fails,
+                an exception raised by the predicate counts as False
+
+            workers (int): number of candidates tested in parallel
+                Default: None (number of cpus)
+
+            max_tests (int): maximum number of predicate evaluations
+                Default: None (no limit)
+
+        Attributes
+        ----------
+            predicate (callable): the failure predicate
+
+            workers (int): number of candidates tested in parallel
+
+            max_tests (int): maximum number of predicate evaluations
+
+            tests (int): number of predicate evaluations done
+
+        Methods
+        -------
+            minimize(scenario)
+                returns a minimized copy of the scenario
+
+    """
+    def __init__(self,predicate,workers=None,max_tests=None):
+        """ initalize the ScenarioMinimizer
+
+        Parameters
+        ----------
+            predicate (callable): predicate(scenario) returns True if the scenario still fails
+
+            workers (int): number of candidates tested in parallel
+                Default: None (number of cpus)
+
+            max_tests (int): maximum number of predicate evaluations
+                Default: None (no limit)
+
+        """
+        self.predicate = predicate
+        self.workers = workers
+        self.max_tests = max_tests
+        self.tests = 0
+
+    def _test(self,scenario):
+        """ evaluates the predicate, exceptions are treated as not failing
+
+        """
+        try:
+            with _span('test','minimizer'):
+                return bool(self.predicate(scenario))
+        except Exception:
+            return False
+
+    def _budget_left(self):
+        """ checks if more predicate evaluations are allowed
+
+        """
+        return self.max_tests is None or self.tests < self.max_tests
+
+    def minimize(self,scenario):
+        """ minimize returns the smallest found copy of the scenario that still fails
+
+            Parameters
+            ----------
+                scenario (Scenario): the failing scenario (is not changed)
+
+            Returns
+            -------
+                Scenario
+
+        """
+        current = copy.deepcopy(scenario)
+        self.tests += 1
+        if not self._test(current):
+            raise ValueError('the predicate does not hold for the input scenario')
+        reduced = True
+        while reduced and self._budget_left():
+            reduced = False
+            # one pass over all lists, coarsest parts first. Paths found at the
+            # start of the pass can become invalid when a parent list shrinks.
+            for path, minimum in list(_reducible_lists(current)):
+                try:
+                    _resolve(current,path)
+                except (IndexError,KeyError,AttributeError):
+                    continue
+                candidate = self._reduce_list(current,path,minimum)
+                if candidate is not None:
+                    current = candidate
+                    reduced = True
+        return current
+
+    def _reduce_list(self,scenario,path,minimum):
+        """ runs delta debugging on one list of the scenario
+
+            Returns the reduced scenario, or None if nothing could be removed
+
+        """
+        items = list(range(len(_resolve(scenario,path))))
+        reduced = None
+        granularity = 2
+        first = True
+        while len(items) > minimum and self._budget_left():
+            if first and minimum == 0:
+                keeps = [[]]
+            else:
+                size = -(-len(items)//granularity)
+                chunks = [items[i:i+size] for i in range(0,len(items),size)]
+                # subsets first (smallest candidates), then complements
+                keeps = list(chunks)
+                if len(chunks) > 2:
+                    keeps += [[i for i in items if i not in c] for c in chunks]
+                keeps = [k for k in keeps if minimum <= len(k) < len(items)]
+            first = False
+            if self.max_tests is not None:
+                keeps = keeps[:self.max_tests - self.tests]
+            candidates = [_remove_items(scenario,path,k) for k in keeps]
+            self.tests += len(candidates)
+            results = run_parallel([(self._test,(c,)) for c in candidates],self.workers)
+            for keep, candidate, failing in zip(keeps,candidates,results):
+                if failing:
+                    scenario = reduced = candidate
+                    items = list(range(len(keep)))
+                    granularity = max(granularity-1,2)
+                    break
+            else:
+                if granularity >= len(items):
+                    break
+                granularity = min(len(items),granularity*2)
+        return reduced
+
+
+def _resolve(root,path):
+    """ follows a path of attribute names, list indices and dict keys from the root
+
+    """
+    obj = root
+    for step in path:
+        if isinstance(obj,(list,dict)):
+            obj = obj[step]
+        else:
+            obj = getattr(obj,step)
+    return obj
+
+
+def _remove_items(scenario,path,keep):
+    """ returns a copy of the scenario where the list at path only keeps the indices in keep
+
+    """
+    candidate = copy.deepcopy(scenario)
+    items = _resolve(candidate,path)
+    items[:] = [items[i] for i in keep]
+    if not items and len(path) > 1:
+        # remove empty entries of the init actions
+        owner = _resolve(candidate,path[:-1])
+        if isinstance(owner,dict):
+            del owner[path[-1]]
+    return candidate
+
+
+def _trigger_lists(trigger,path):
+    """ yields the reducible lists of a trigger
+
+    """
+    if isinstance(trigger,Trigger):
+        yield path + ('conditiongroups',), 1
+        for i, group in enumerate(trigger.conditiongroups):
+            yield path + ('conditiongroups',i,'conditions'), 1
+    elif isinstance(trigger,ConditionGroup):
+        yield path + ('conditions',), 1
+
+
+def _reducible_lists(scenario):
+    """ yields the path and minimum length of all reducible lists, coarsest parts first
+
+    """
+    yield ('entities','scenario_objects'), 0
+    yield ('entities','entities'), 0
+    yield ('storyboard','stories'), 0
+    init = scenario.storyboard.init
+    yield ('storyboard','init','global_actions'), 0
+    yield ('storyboard','init','user_defined_actions'), 0
+    for name in init.initactions:
+        yield ('storyboard','init','initactions',name), 0
+    for i, story in enumerate(scenario.storyboard.stories):
+        yield ('storyboard','stories',i,'acts'), 1
+    for i, story in enumerate(scenario.storyboard.stories):
+        for j, act in enumerate(story.acts):
+            yield ('storyboard','stories',i,'acts',j,'maneuvergroup'), 1
+    for i, story in enumerate(scenario.storyboard.stories):
+        for j, act in enumerate(story.acts):
+            for k, mangr in enumerate(act.maneuvergroup):
+                yield ('storyboard','stories',i,'acts',j,'maneuvergroup',k,'maneuvers'), 0
+    for i, story in enumerate(scenario.storyboard.stories):
+        for j, act in enumerate(story.acts):
+            for k, mangr in enumerate(act.maneuvergroup):
+                for l, man in enumerate(mangr.maneuvers):
+                    yield ('storyboard','stories',i,'acts',j,'maneuvergroup',k,'maneuvers',l,'events'), 1
+    for i, story in enumerate(scenario.storyboard.stories):
+        for j, act in enumerate(story.acts):
+            actpath = ('storyboard','stories',i,'acts',j)
+            for k, mangr in enumerate(act.maneuvergroup):
+                for l, man in enumerate(mangr.maneuvers):
+                    for m, event in enumerate(man.events):
+                        eventpath = actpath + ('maneuvergroup',k,'maneuvers',l,'events',m)
+                        yield eventpath + ('action',), 1
+                        yield from _trigger_lists(event.trigger,eventpath + ('trigger',))
+            yield from _trigger_lists(act.starttrigger,actpath + ('starttrigger',))
+            yield from _trigger_lists(act.stoptrigger,actpath + ('stoptrigger',))
+    yield from _trigger_lists(scenario.storyboard.stoptrigger,('storyboard','stoptrigger'))
@@ -1,6 +1,6 @@
 import xml.etree.ElementTree as ET
 
-from .utils import Orientation, CatalogReference, Route, _PositionType
+from .utils import Orientation, CatalogReference, Route, convert_float, omit_default, _PositionType, _checks, _trust
 
 class WorldPosition(_PositionType):
     """ the WorldPostion creates a worldposition of openScenario
@@ -70,15 +70,15 @@ class WorldPosition(_PositionType):
         """ returns the attributes of the WorldPostion as a dict
 
         """
-        retdict = {'x':str(self.x),'y':str(self.y)}
+        retdict = {'x':convert_float(self.x,'position'),'y':convert_float(self.y,'position')}
         if self.z:
-            retdict['z'] = str(self.z)
+            retdict['z'] = convert_float(self.z,'position')
         if self.h:
-            retdict['h'] = str(self.h)
+            retdict['h'] = convert_float(self.h,'angle')
         if self.p:
-            retdict['p'] = str(self.p)
+            retdict['p'] = convert_float(self.p,'angle')
         if self.r:
-            retdict['r'] = str(self.r)
+            retdict['r'] = convert_float(self.r,'angle')
         return retdict
     def get_element(self,elementname = 'Position'):
         """ returns the elementTree of the WorldPostion
@@ -130,7 +130,7 @@ class RelativeWorldPosition(_PositionType):
                 Returns a dictionary of all attributes of the class
 
     """
-    def __init__ (self,entity,dx,dy,dz,orientation = Orientation()):
+    def __init__ (self,entity,dx,dy,dz,orientation = None):
         """ initalizes the RelativeWorldPosition
 
         Parameters
@@ -147,11 +147,14 @@ class RelativeWorldPosition(_PositionType):
                 Default: Orientation()
 
         """
+        checks = _trust.off or _checks(self,'__init__',entity,dx,dy,dz,orientation)
         self.target = entity
         self.dx = dx
         self.dy = dy
         self.dz = dz
-        if not isinstance(orientation,Orientation):
+        if orientation is None:
+            orientation = Orientation()
+        if checks and not isinstance(orientation,Orientation):
             raise TypeError('input orientation is not of type Orientation')
         self.orient = orientation
 
@@ -161,9 +164,10 @@ class RelativeWorldPosition(_PositionType):
         """
         retdict = {}
         retdict['entityRef'] = self.target
-        retdict['dx'] = str(self.dx)
-        retdict['dy'] = str(self.dy)
-        retdict['dz'] = str(self.dz)
+        retdict['dx'] = convert_float(self.dx,'position')
+        retdict['dy'] = convert_float(self.dy,'position')
+        if not omit_default(self.dz):
+            retdict['dz'] = convert_float(self.dz,'position')
         return retdict
 
     def get_element(self,elementname = 'Position'):
@@ -220,7 +224,7 @@ class RelativeObjectPosition(_PositionType):
                 Returns a dictionary of all attributes of the class
 
     """
-    def __init__ (self,entity,dx,dy,dz=None,orientation = Orientation()):
+    def __init__ (self,entity,dx,dy,dz=None,orientation = None):
         """ initalizes the RelativeObjectPosition
 
         Parameters
@@ -238,11 +242,14 @@ class RelativeObjectPosition(_PositionType):
                 Default: Orientation()
 
         """
+        checks = _trust.off or _checks(self,'__init__',entity,dx,dy,dz,orientation)
         self.target = entity
         self.dx = dx
         self.dy = dy
         self.dz = dz
-        if not isinstance(orientation,Orientation):
+        if orientation is None:
+            orientation = Orientation()
+        if checks and not isinstance(orientation,Orientation):
             raise TypeError('input orientation is not of type Orientation')
         self.orient = orientation
 
@@ -252,10 +259,10 @@ class RelativeObjectPosition(_PositionType):
         """
         retdict = {}
         retdict['entityRef'] = self.target
-        retdict['dx'] = str(self.dx)
-        retdict['dy'] = str(self.dy)
+        retdict['dx'] = convert_float(self.dx,'position')
+        retdict['dy'] = convert_float(self.dy,'position')
         if self.dz != None:
-            retdict['dz'] = str(self.dz)
+            retdict['dz'] = convert_float(self.dz,'position')
         return retdict
 
     def get_element(self,elementname = 'Position'):
@@ -309,7 +316,7 @@ class RoadPosition(_PositionType):
                 Returns a dictionary of all attributes of the class
 
     """
-    def __init__(self,s,t,reference_id,orientation=Orientation()):
+    def __init__(self,s,t,reference_id,orientation=None):
         """ initalize the RoadPosition
         
             Parameters
@@ -324,10 +331,13 @@ class RoadPosition(_PositionType):
                     Default: Orientation()
 
         """
+        checks = _trust.off or _checks(self,'__init__',s,t,reference_id,orientation)
         self.s = s
         self.t = t
         self.id = reference_id
-        if not isinstance(orientation,Orientation):
+        if orientation is None:
+            orientation = Orientation()
+        if checks and not isinstance(orientation,Orientation):
             raise TypeError('input orientation is not of type Orientation')
         self.orient = orientation
     
@@ -337,8 +347,8 @@ class RoadPosition(_PositionType):
         """
         retdict = {}
         retdict['roadId'] = str(self.id)
-        retdict['s'] = str(self.s)
-        retdict['t'] = str(self.t)                
+        retdict['s'] = convert_float(self.s,'position')
+        retdict['t'] = convert_float(self.t,'position')                
         return retdict
     
     def get_element(self,elementname = 'Position'):
@@ -391,7 +401,7 @@ class RelativeRoadPosition(_PositionType):
                 Returns a dictionary of all attributes of the class
 
     """
-    def __init__(self,ds,dt,entity,orientation=Orientation()):
+    def __init__(self,ds,dt,entity,orientation=None):
         """ initalize the RoadPosition
         
             Parameters
@@ -406,10 +416,13 @@ class RelativeRoadPosition(_PositionType):
                     Default: Orientation()
 
         """
+        checks = _trust.off or _checks(self,'__init__',ds,dt,entity,orientation)
         self.ds = ds
         self.dt = dt
         self.target = entity
-        if not isinstance(orientation,Orientation):
+        if orientation is None:
+            orientation = Orientation()
+        if checks and not isinstance(orientation,Orientation):
             raise TypeError('input orientation is not of type Orientation')
         self.orient = orientation
     
@@ -419,8 +432,8 @@ class RelativeRoadPosition(_PositionType):
         """
         retdict = {}
         retdict['entityRef'] = self.target
-        retdict['ds'] = str(self.ds)
-        retdict['dt'] = str(self.dt)
+        retdict['ds'] = convert_float(self.ds,'position')
+        retdict['dt'] = convert_float(self.dt,'position')
         return retdict
     
     def get_element(self,elementname = 'Position'):
@@ -476,7 +489,7 @@ class LanePosition(_PositionType):
                 Returns a dictionary of all attributes of the class
 
     """
-    def __init__(self,s,offset,lane_id,road_id,orientation=Orientation()):
+    def __init__(self,s,offset,lane_id,road_id,orientation=None):
         """ initalizes the LanePosition
         
         Parameters
@@ -493,11 +506,14 @@ class LanePosition(_PositionType):
                 Default: Orientation()  
         
         """ 
+        checks = _trust.off or _checks(self,'__init__',s,offset,lane_id,road_id,orientation)
         self.s = s
         self.lane_id = lane_id
         self.offset = offset
         self.road_id = road_id
-        if not isinstance(orientation,Orientation):
+        if orientation is None:
+            orientation = Orientation()
+        if checks and not isinstance(orientation,Orientation):
             raise TypeError('input orientation is not of type Orientation')
         self.orient = orientation
     
@@ -508,8 +524,9 @@ class LanePosition(_PositionType):
         retdict = {}
         retdict['roadId'] = str(self.road_id)
         retdict['laneId'] = str(self.lane_id)
-        retdict['s'] = str(self.s)
-        retdict['offset'] = str(self.offset)
+        retdict['s'] = convert_float(self.s,'position')
+        if not omit_default(self.offset):
+            retdict['offset'] = convert_float(self.offset,'position')
                    
         return retdict
     
@@ -567,7 +584,7 @@ class RelativeLanePosition(_PositionType):
                 Returns a dictionary of all attributes of the class
 
     """
-    def __init__(self,s,offset,lane_id,entity,orientation=Orientation()):
+    def __init__(self,s,offset,lane_id,entity,orientation=None):
         """ initalizes the LanePosition
         
         Parameters
@@ -584,11 +601,14 @@ class RelativeLanePosition(_PositionType):
                 Default: Orientation()  
         
         """ 
+        checks = _trust.off or _checks(self,'__init__',s,offset,lane_id,entity,orientation)
         self.s = s
         self.lane_id = lane_id
         self.offset = offset
         self.entity = entity
-        if not isinstance(orientation,Orientation):
+        if orientation is None:
+            orientation = Orientation()
+        if checks and not isinstance(orientation,Orientation):
             raise TypeError('input orientation is not of type Orientation')
         self.orient = orientation
     
@@ -598,8 +618,9 @@ class RelativeLanePosition(_PositionType):
         """
         retdict = {}
         retdict['entityRef'] = self.entity
-        retdict['ds'] = str(self.s)
-        retdict['offset'] = str(self.offset)
+        retdict['ds'] = convert_float(self.s,'position')
+        if not omit_default(self.offset):
+            retdict['offset'] = convert_float(self.offset,'position')
         retdict['dLane'] = str(self.lane_id)
         return retdict
     
@@ -645,7 +666,10 @@ class RoutePositionOfCurrentEntity(_PositionType):
                 Returns the full ElementTree of the class
 
     """
-    def __init__(self,route_ref,entity,orientation = Orientation()):
+    # holds a changeable Route
+    _INTERN = False
+
+    def __init__(self,route_ref,entity,orientation = None):
         """ Initalize the RoutePositionOfCurrentEntity class
         
             Parameters
@@ -657,11 +681,14 @@ class RoutePositionOfCurrentEntity(_PositionType):
                 orientation (Orientation): Oritation of the entity
                     Default: Orientation()
         """
-        if not ( isinstance(route_ref,Route) or isinstance(route_ref,CatalogReference)):
+        checks = _trust.off or _checks(self,'__init__',route_ref,entity,orientation)
+        if checks and not ( isinstance(route_ref,Route) or isinstance(route_ref,CatalogReference)):
             raise TypeError('route input not of type Route or CatalogReference') 
         self.route_ref = route_ref
         self.entity = entity
-        if not isinstance(orientation,Orientation):
+        if orientation is None:
+            orientation = Orientation()
+        if checks and not isinstance(orientation,Orientation):
             raise TypeError('input orientation is not of type Orientation')
         self.orientation = orientation
     
@@ -709,7 +736,10 @@ class RoutePositionInRoadCoordinates(_PositionType):
                 Returns the full ElementTree of the class
 
     """
-    def __init__(self, route_ref, s, t, orientation = Orientation()):
+    # holds a changeable Route
+    _INTERN = False
+
+    def __init__(self, route_ref, s, t, orientation = None):
         """ Initalize the RoutePositionInRoadCoordinates class
         
             Parameters
@@ -723,12 +753,15 @@ class RoutePositionInRoadCoordinates(_PositionType):
                 orientation (Orientation): Oritation of the entity
                     Default: Orientation()
         """
-        if not ( isinstance(route_ref,Route) or isinstance(route_ref,CatalogReference)):
+        checks = _trust.off or _checks(self,'__init__',route_ref,s,t,orientation)
+        if checks and not ( isinstance(route_ref,Route) or isinstance(route_ref,CatalogReference)):
             raise TypeError('route input not of type Route or CatalogReference') 
         self.route_ref = route_ref
         self.s = s
         self.t = t
-        if not isinstance(orientation,Orientation):
+        if orientation is None:
+            orientation = Orientation()
+        if checks and not isinstance(orientation,Orientation):
             raise TypeError('input orientation is not of type Orientation')
         self.orientation = orientation
     
@@ -741,7 +774,7 @@ class RoutePositionInRoadCoordinates(_PositionType):
         routeref.append(self.route_ref.get_element())
         element.append(self.orientation.get_element())
         inroute = ET.SubElement(element,'InRoutePosition')
-        ET.SubElement(inroute,'PositionInRoadCoordinates',attrib={'pathS':str(self.s),'t':str(self.t)})
+        ET.SubElement(inroute,'PositionInRoadCoordinates',attrib={'pathS':convert_float(self.s,'position'),'t':convert_float(self.t,'position')})
         return element
 
 
@@ -781,7 +814,10 @@ class RoutePositionInLaneCoordinates(_PositionType):
                 Returns the full ElementTree of the class
 
     """
-    def __init__(self, route_ref, s, laneid, offset, orientation = Orientation()):
+    # holds a changeable Route
+    _INTERN = False
+
+    def __init__(self, route_ref, s, laneid, offset, orientation = None):
         """ Initalize the RoutePositionInRoadCoordinates class
         
             Parameters
@@ -798,13 +834,16 @@ class RoutePositionInLaneCoordinates(_PositionType):
                 orientation (Orientation): Oritation of the entity
                     Default: Orientation()
         """
-        if not ( isinstance(route_ref,Route) or isinstance(route_ref,CatalogReference)):
+        checks = _trust.off or _checks(self,'__init__',route_ref,s,laneid,offset,orientation)
+        if checks and not ( isinstance(route_ref,Route) or isinstance(route_ref,CatalogReference)):
             raise TypeError('route input not of type Route or CatalogReference') 
         self.route_ref = route_ref
         self.s = s
         self.laneid = laneid
         self.offset = offset
-        if not isinstance(orientation,Orientation):
+        if orientation is None:
+            orientation = Orientation()
+        if checks and not isinstance(orientation,Orientation):
             raise TypeError('input orientation is not of type Orientation')
         self.orientation = orientation
     
@@ -817,5 +856,5 @@ class RoutePositionInLaneCoordinates(_PositionType):
         routeref.append(self.route_ref.get_element())
         element.append(self.orientation.get_element())
         inroute = ET.SubElement(element,'InRoutePosition')
-        ET.SubElement(inroute,'PositionInLaneCoordinates',attrib={'pathS':str(self.s),'laneId':self.laneid,'laneOffset':str(self.offset)})
+        ET.SubElement(inroute,'PositionInLaneCoordinates',attrib={'pathS':convert_float(self.s,'position'),'laneId':self.laneid,'laneOffset':convert_float(self.offset,'position')})
         return element
\ No newline at end of file
@@ -0,0 +1,602 @@
+import contextlib
+import os
+import shlex
+import signal
+import subprocess
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from .serializers import xml_string, _encode
+from .traces import _span
+
+
+# staging directory of EsminiRunner(staging='tmpfs')
+_TMPFS = '/dev/shm'
+
+
+class RunResult():
+    """ RunResult holds the outcome of one simulation run
+
+        Parameters
+        ----------
+            name (str): name of the run
+
+            scenario_file (str): path to the scenario that was simulated
+
+            returncode (int): returncode of the simulator (None if the run timed out)
+
+            stdout (str): the standard output of the simulator
+
+            stderr (str): the standard error of the simulator
+
+            wall_time (float): wall clock time of the run in seconds
+
+            record_file (str): path to the recording of the run (optional)
+                Default: None
+
+            timed_out (bool): if the run was stopped because of the timeout
+                Default: False
+
+            cached (bool): if the result was taken from a ResultCache
+                Default: False
+
+            cpu_time (float): cpu time of the simulator process in seconds (optional)
+                Default: None (not measured)
+
+        Attributes
+        ----------
+            name (str): name of the run
+
+            scenario_file (str): path to the scenario that was simulated
+
+            returncode (int): returncode of the simulator (None if the run timed out)
+
+            stdout (str): the standard output of the simulator
+
+            stderr (str): the standard error of the simulator
+
+            wall_time (float): wall clock time of the run in seconds
+
+            record_file (str): path to the recording of the run
+
+            timed_out (bool): if the run was stopped because of the timeout
+
+            cached (bool): if the result was taken from a ResultCache
+
+            cpu_time (float): cpu time of the simulator process in seconds (None if not measured)
+
+        Methods
+        -------
+            succeeded()
+                True if the simulator finished with returncode 0
+
+    """
+    def __init__(self,name,scenario_file,returncode,stdout,stderr,wall_time,record_file=None,timed_out=False,cached=False,cpu_time=None):
+        """ initalize the RunResult
+
+        Parameters
+        ----------
+            name (str): name of the run
+
+            scenario_file (str): path to the scenario that was simulated
+
+            returncode (int): returncode of the simulator (None if the run timed out)
+
+            stdout (str): the standard output of the simulator
+
+            stderr (str): the standard error of the simulator
+
+            wall_time (float): wall clock time of the run in seconds
+
+            record_file (str): path to the recording of the run (optional)
+                Default: None
+
+            timed_out (bool): if the run was stopped because of the timeout
+                Default: False
+
+            cached (bool): if the result was taken from a ResultCache
+                Default: False
+
+            cpu_time (float): cpu time of the simulator process in seconds (optional)
+                Default: None (not measured)
+
+        """
+        self.name = name
+        self.scenario_file = scenario_file
+        self.returncode = returncode
+        self.stdout = stdout
+        self.stderr = stderr
+        self.wall_time = wall_time
+        self.record_file = record_file
+        self.timed_out = timed_out
+        self.cached = cached
+        self.cpu_time = cpu_time
+
+    def succeeded(self):
+        """ succeeded checks if the simulator finished without errors
+
+            Returns: boolean
+
+        """
+        return self.returncode == 0 and not self.timed_out
+
+
+class EsminiRunner():
+    """ the EsminiRunner writes scenarios and simulates them headless in esmini, one process per run
+
+        Parameters
+        ----------
+            esminipath (str): the path to esmini
+                Default: esmini
+
+            outputdir (str): directory where the scenarios (and recordings) are written
+                Default: None (a new temporary directory)
+
+            args (str): extra command line arguments to esmini
+                Default: '--headless'
+
+            timeout (float): maximum wall time in seconds of one run
+                Default: None
+
+            record (bool): if a recording (.dat) should be written for each run
+                Default: True
+
+            cache (ResultCache): cache of earlier results, unchanged scenarios are not simulated again
+                Default: None
+
+            metrics (RunMetrics): metrics updated by the runs (optional)
+                Default: None
+
+            staging (str): how the scenario is handed to esmini: 'disk' (a file in the outputdir),
+                'memfd' (an anonymous in memory file passed as /proc/self/fd/N, Linux only)
+                or 'tmpfs' (a temporary file in /dev/shm that is removed after the run).
+                With 'memfd' and 'tmpfs' relative paths in the scenario (road network, catalogs)
+                are not resolved from the outputdir, use absolute paths
+                Default: 'disk'
+
+        Attributes
+        ----------
+            esminipath (str): the path to esmini
+
+            outputdir (str): directory where the scenarios (and recordings) are written
+
+            args (str): extra command line arguments to esmini
+
+            timeout (float): maximum wall time in seconds of one run
+
+            record (bool): if a recording (.dat) should be written for each run
+
+            cache (ResultCache): cache of earlier results
+
+            metrics (RunMetrics): metrics updated by the runs
+
+            staging (str): 'disk', 'memfd' or 'tmpfs'
+
+        Methods
+        -------
+            run(scenario,name)
+                writes and simulates one scenario
+
+            run_batch(scenarios,workers)
+                simulates many scenarios in parallel
+
+            run_archived(archive,variant,name)
+                extracts and simulates one scenario of a ScenarioArchive
+
+            run_file(scenario_file,name)
+                simulates an already written scenario file
+
+            run_corpus(corpus,variants,workers)
+                simulates the scenarios of a ShardedCorpus in parallel
+
+            run_variant(variants,parameters,name)
+                simulates the base scenario of ParameterVariants with other parameter values
+
+    """
+    def __init__(self,esminipath='esmini',outputdir=None,args='--headless',timeout=None,record=True,cache=None,metrics=None,staging='disk'):
+        """ initalize the EsminiRunner
+
+        Parameters
+        ----------
+            esminipath (str): the path to esmini
+                Default: esmini
+
+            outputdir (str): directory where the scenarios (and recordings) are written
+                Default: None (a new temporary directory)
+
+            args (str): extra command line arguments to esmini
+                Default: '--headless'
+
+            timeout (float): maximum wall time in seconds of one run
+                Default: None
+
+            record (bool): if a recording (.dat) should be written for each run
+                Default: True
+
+            cache (ResultCache): cache of earlier results, unchanged scenarios are not simulated again
+                Default: None
+
+            metrics (RunMetrics): metrics updated by the runs (optional)
+                Default: None
+
+            staging (str): how the scenario is handed to esmini: 'disk' (a file in the outputdir),
+                'memfd' (an anonymous in memory file passed as /proc/self/fd/N, Linux only)
+                or 'tmpfs' (a temporary file in /dev/shm that is removed after the run).
+                With 'memfd' and 'tmpfs' relative paths in the scenario (road network, catalogs)
+                are not resolved from the outputdir, use absolute paths
+                Default: 'disk'
+
+        """
+        if staging not in ('disk','memfd','tmpfs'):
+            raise ValueError("staging should be 'disk', 'memfd' or 'tmpfs', not " + str(staging))
+        if staging == 'memfd' and not hasattr(os,'memfd_create'):
+            raise ValueError('memfd staging needs os.memfd_create (Linux)')
+        if staging == 'tmpfs' and not os.path.isdir(_TMPFS):
+            raise ValueError('tmpfs staging needs ' + _TMPFS)
+        self.esminipath = esminipath
+        if outputdir is None:
+            outputdir = tempfile.mkdtemp(prefix='pyoscx_')
+        os.makedirs(outputdir,exist_ok=True)
+        self.outputdir = outputdir
+        self.args = args
+        self.timeout = timeout
+        self.record = record
+        self.cache = cache
+        self.metrics = metrics
+        self.staging = staging
+
+    def _executable(self):
+        """ returns the path to the esmini binary
+
+        """
+        if os.name == 'nt':
+            return os.path.join(self.esminipath,'bin','esmini.exe')
+        return os.path.join(self.esminipath,'bin','esmini')
+
+    def _command(self,scenario_file,record_file,extra_args=()):
+        """ creates the command line for one run
+
+        """
+        cmd = [self._executable(),'--osc',scenario_file]
+        if record_file:
+            cmd += ['--record',record_file]
+        cmd += shlex.split(self.args)
+        cmd += extra_args
+        return cmd
+
+    def run(self,scenario,name='pythonscenario'):
+        """ run writes the scenario to the outputdir and simulates it
+
+        Parameters
+        ----------
+            scenario (Scenario): the scenario to run
+
+            name (str): name of the run, used for the filenames
+                Default: pythonscenario
+
+        Returns
+        -------
+            RunResult
+
+        """
+        metrics = self.metrics
+        with _span('run','runner',run=name):
+            if metrics is not None:
+                metrics.run_started()
+            key = None
+            if self.cache is not None:
+                with _span('cache_lookup','cache',run=name) as args:
+                    key = self.cache.key(scenario,self._executable(),' '.join([self.args,str(self.record)]),self.outputdir)
+                    # the recording is copied out of the cache, to the same file as the one of a simulated run
+                    result = self.cache.get(key,name,os.path.join(self.outputdir,name + '.dat'))
+                    args['hit'] = result is not None
+                if result is not None:
+                    if metrics is not None:
+                        metrics.run_finished(result)
+                    return result
+            record_file = None
+            if self.record:
+                record_file = os.path.join(self.outputdir,name + '.dat')
+            if self.staging == 'disk':
+                scenario_file = os.path.join(self.outputdir,name + '.xosc')
+                scenario.write_xml(scenario_file)
+                if metrics is not None:
+                    metrics.add_bytes(os.path.getsize(scenario_file))
+                result = self._simulate(name,scenario_file,record_file)
+            else:
+                with _span('serialize','generation',type='Scenario'):
+                    data = _encode(xml_string(scenario),True)
+                if metrics is not None:
+                    metrics.add_bytes(len(data))
+                with self._staged(name,data) as (scenario_file,pass_fds):
+                    result = self._simulate(name,scenario_file,record_file,pass_fds=pass_fds)
+                # the staged file is gone after the run
+                result.scenario_file = None
+            if key is not None:
+                self.cache.put(key,result)
+            if metrics is not None:
+                metrics.run_finished(result)
+            return result
+
+    def run_archived(self,archive,variant,name=None):
+        """ run_archived extracts one scenario of a ScenarioArchive to the outputdir and simulates it
+
+        Parameters
+        ----------
+            archive (ScenarioArchive): the archive
+
+            variant (str): the variant id of the scenario
+
+            name (str): name of the run, used for the filenames
+                Default: None (the variant id)
+
+        Returns
+        -------
+            RunResult
+
+        """
+        if name is None:
+            name = variant
+        scenario_file = os.path.join(self.outputdir,name + '.xosc')
+        with open(scenario_file,'wb') as file_handle:
+            file_handle.write(archive.read(variant))
+        if self.metrics is not None:
+            self.metrics.add_bytes(os.path.getsize(scenario_file))
+        return self._run_written(name,scenario_file)
+
+    def run_file(self,scenario_file,name=None):
+        """ run_file simulates an already written scenario file
+
+        Parameters
+        ----------
+            scenario_file (str): the scenario file
+
+            name (str): name of the run, used for the recording
+                Default: None (the filename without extension)
+
+        Returns
+        -------
+            RunResult
+
+        """
+        if name is None:
+            name = os.path.splitext(os.path.basename(scenario_file))[0]
+        return self._run_written(name,scenario_file)
+
+    def run_corpus(self,corpus,variants=None,workers=None):
+        """ run_corpus simulates the scenarios of a ShardedCorpus in parallel,
+            the files are taken from the manifest (the directories are not listed)
+
+        Parameters
+        ----------
+            corpus (ShardedCorpus): the corpus
+
+            variants (list of str): the variant ids to simulate
+                Default: None (all variants of the manifest)
+
+            workers (int): number of parallel simulations
+                Default: None (number of cpus)
+
+        Returns
+        -------
+            list of RunResult (in the order of the variants, or of the manifest)
+
+        """
+        if variants is None:
+            entries = corpus.entries()
+        else:
+            entries = [corpus.entry(variant) for variant in variants]
+        calls = [(self.run_file,(os.path.join(corpus.directory,*entry['path'].split('/')),entry['variant'])) for entry in entries]
+        return run_parallel(calls,workers,self.metrics)
+
+    def run_variant(self,variants,parameters,name='pythonscenario'):
+        """ run_variant simulates the base scenario of a ParameterVariants with the parameter values
+            given on the command line (--param name=value), no scenario file is written for the variant
+
+        Parameters
+        ----------
+            variants (ParameterVariants): the base scenario
+
+            parameters (dict): values of the declared parameters that differ from the defaults
+
+            name (str): name of the run, used for the recording
+                Default: pythonscenario
+
+        Returns
+        -------
+            RunResult
+
+        """
+        extra_args = variants.command_line(parameters)
+        return self._run_written(name,variants.write_base(),extra_args)
+
+    def _run_written(self,name,scenario_file,extra_args=()):
+        """ simulates an already written scenario file, counted in the metrics
+
+        """
+        metrics = self.metrics
+        with _span('run','runner',run=name):
+            if metrics is not None:
+                metrics.run_started()
+            record_file = None
+            if self.record:
+                record_file = os.path.join(self.outputdir,name + '.dat')
+            result = self._simulate(name,scenario_file,record_file,extra_args)
+            if metrics is not None:
+                metrics.run_finished(result)
+            return result
+
+    @contextlib.contextmanager
+    def _staged(self,name,data):
+        """ writes the scenario to a memfd or to tmpfs, yields the path for esmini and the fds it needs
+
+        """
+        if self.staging == 'memfd':
+            fd = os.memfd_create(name)
+            try:
+                with open(fd,'wb',closefd=False) as file_handle:
+                    file_handle.write(data)
+                # the fd keeps its number in esmini (pass_fds), where /proc/self/fd/N opens it from the start
+                yield '/proc/self/fd/' + str(fd), (fd,)
+            finally:
+                os.close(fd)
+        else:
+            fd, path = tempfile.mkstemp(suffix='.xosc',prefix=name + '_',dir=_TMPFS)
+            try:
+                with open(fd,'wb') as file_handle:
+                    file_handle.write(data)
+                yield path, ()
+            finally:
+                os.remove(path)
+
+    def _simulate(self,name,scenario_file,record_file,extra_args=(),pass_fds=()):
+        """ runs esmini on an already written scenario file
+
+        """
+        with _span('simulate','simulation',run=name) as args:
+            start = time.perf_counter()
+            if hasattr(os,'waitid'):
+                returncode, stdout, stderr, cpu_time = _wait4_run(self._command(scenario_file,record_file,extra_args),self.timeout,pass_fds)
+                if returncode is None:
+                    args['timed_out'] = True
+                    return RunResult(name,scenario_file,None,stdout,stderr,time.perf_counter()-start,record_file,timed_out=True,cpu_time=cpu_time)
+                args['returncode'] = returncode
+                return RunResult(name,scenario_file,returncode,stdout,stderr,time.perf_counter()-start,record_file,cpu_time=cpu_time)
+            try:
+                proc = subprocess.run(self._command(scenario_file,record_file,extra_args),capture_output=True,text=True,timeout=self.timeout,pass_fds=pass_fds)
+            except subprocess.TimeoutExpired as e:
+                args['timed_out'] = True
+                return RunResult(name,scenario_file,None,_decode(e.stdout),_decode(e.stderr),time.perf_counter()-start,record_file,timed_out=True)
+            args['returncode'] = proc.returncode
+        return RunResult(name,scenario_file,proc.returncode,proc.stdout,proc.stderr,time.perf_counter()-start,record_file)
+
+    def run_batch(self,scenarios,workers=None,skip_duplicates=False):
+        """ run_batch simulates many scenarios in parallel, each in its own esmini process
+
+        Parameters
+        ----------
+            scenarios (list of (str, Scenario)): name and scenario of each run
+
+            workers (int): number of parallel simulations
+                Default: None (number of cpus)
+
+            skip_duplicates (bool): simulate structurally identical scenarios only once,
+                the duplicates get the RunResult of the first one
+                Default: False
+
+        Returns
+        -------
+            list of RunResult (in the same order as scenarios)
+
+        """
+        if not skip_duplicates:
+            return run_parallel([(self.run,(scenario,name)) for name, scenario in scenarios],workers,self.metrics)
+        first_index = {}
+        mapping = []
+        unique = []
+        for name, scenario in scenarios:
+            key = scenario.fingerprint()
+            if key not in first_index:
+                first_index[key] = len(unique)
+                unique.append((name,scenario))
+            mapping.append(first_index[key])
+        results = run_parallel([(self.run,(scenario,name)) for name, scenario in unique],workers,self.metrics)
+        return [results[i] for i in mapping]
+
+
+def _wait4_run(cmd,timeout,pass_fds=()):
+    """ runs a process and reaps it with os.wait4, which also returns the cpu time of the process
+
+        Returns: returncode (None if the process was killed because of the timeout), stdout, stderr, cpu time
+
+    """
+    with tempfile.TemporaryFile('w+',errors='replace') as out, tempfile.TemporaryFile('w+',errors='replace') as err:
+        proc = subprocess.Popen(cmd,stdout=out,stderr=err,pass_fds=pass_fds)
+        lock = threading.Lock()
+        killed = []
+
+        def kill():
+            with lock:
+                if proc.returncode is None:
+                    killed.append(True)
+                    # not reaped before the lock is released, the pid is still the process
+                    os.kill(proc.pid,signal.SIGKILL)
+        timer = None
+        if timeout is not None:
+            timer = threading.Timer(timeout,kill)
+            timer.start()
+        try:
+            # wait without reaping, so the timer can not kill a reused pid
+            os.waitid(os.P_PID,proc.pid,os.WEXITED | os.WNOWAIT)
+            with lock:
+                _, status, usage = os.wait4(proc.pid,0)
+                # reaped here, Popen must not wait for it again
+                proc.returncode = os.waitstatus_to_exitcode(status)
+        finally:
+            if timer is not None:
+                timer.cancel()
+            if proc.returncode is None:
+                # the wait was interrupted (e.g. KeyboardInterrupt), the process is killed and reaped
+                with lock:
+                    proc.kill()
+                    proc.wait()
+        out.seek(0)
+        err.seek(0)
+        returncode = None if killed else proc.returncode
+        return returncode, out.read(), err.read(), usage.ru_utime + usage.ru_stime
+
+
+def _decode(output):
+    """ the output of a timed out process is bytes (or None) even in text mode
+
+    """
+    if output is None:
+        return ''
+    if isinstance(output,bytes):
+        return output.decode(errors='replace')
+    return output
+
+
+def run_parallel(calls,workers=None,metrics=None):
+    """ run_parallel executes a list of calls in a thread pool and returns the results in order
+
+        Parameters
+        ----------
+            calls (list of (callable, tuple)): the functions and their arguments
+
+            workers (int): number of parallel workers
+                Default: None (number of cpus)
+
+            metrics (RunMetrics): metrics whose queue depth counts the calls not yet started,
+                written at the end if it has a filename (optional)
+                Default: None
+
+        Returns
+        -------
+            list of the return values
+
+    """
+    if metrics is not None:
+        metrics.add_queued(len(calls))
+        calls = [(_dequeue,(metrics,func,args)) for func, args in calls]
+    if workers is None:
+        workers = os.cpu_count() or 1
+    try:
+        if workers <= 1 or len(calls) <= 1:
+            return [func(*args) for func, args in calls]
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = [executor.submit(func,*args) for func, args in calls]
+            return [f.result() for f in futures]
+    finally:
+        if metrics is not None and metrics.filename is not None:
+            metrics.write()
+
+
+def _dequeue(metrics,func,args):
+    """ removes a call from the queue of the metrics and executes it
+
+    """
+    metrics.add_queued(-1)
+    return func(*args)
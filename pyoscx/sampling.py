@@ -0,0 +1,529 @@
+import itertools
+import json
+import math
+import os
+import random
+
+from .runner import run_parallel
+from .traces import _span
+
+
+class Sample():
+    """ Sample holds one evaluated point of a parameter space
+
+        Parameters
+        ----------
+            parameters (dict {str: float}): the parameters used to build the scenario
+
+            result (any): what the runner returned for the scenario
+
+            passed (bool): the classification of the result
+                Default: None
+
+            kpi (float): the kpi extracted from the result
+                Default: None
+
+        Attributes
+        ----------
+            parameters (dict {str: float}): the parameters used to build the scenario
+
+            result (any): what the runner returned for the scenario
+
+            passed (bool): the classification of the result
+
+            kpi (float): the kpi extracted from the result
+
+    """
+    def __init__(self,parameters,result,passed=None,kpi=None):
+        """ initalize the Sample
+
+        Parameters
+        ----------
+            parameters (dict {str: float}): the parameters used to build the scenario
+
+            result (any): what the runner returned for the scenario
+
+            passed (bool): the classification of the result
+                Default: None
+
+            kpi (float): the kpi extracted from the result
+                Default: None
+
+        """
+        self.parameters = parameters
+        self.result = result
+        self.passed = passed
+        self.kpi = kpi
+
+
+class _ParameterSpace():
+    """ helper class mapping between named parameter bounds and points on an integer lattice
+
+        Parameters
+        ----------
+            bounds (dict {str: (float, float)}): lower and upper bound of each parameter
+
+            resolution (int): number of lattice steps between the lower and upper bound
+
+    """
+    def __init__(self,bounds,resolution):
+        if not bounds:
+            raise ValueError('no parameters to sample')
+        for name in bounds:
+            low, high = bounds[name]
+            if not high > low:
+                raise ValueError('upper bound of ' + name + ' is not larger than the lower bound')
+        self.names = list(bounds)
+        self.bounds = bounds
+        self.resolution = resolution
+
+    def to_parameters(self,point):
+        """ converts a lattice point to a parameter dict
+
+        """
+        params = {}
+        for name, coord in zip(self.names,point):
+            low, high = self.bounds[name]
+            params[name] = low + (high - low)*coord/self.resolution
+        return params
+
+
+class AdaptiveSampler():
+    """ the AdaptiveSampler maps the pass/fail boundary of a parameter space with as few simulations as possible
+
+        The space is first sampled on a coarse grid. After that only cells where
+        the corners have different outcomes are refined (split in half along
+        every parameter), so the samples concentrate around the boundary
+        between passing and failing scenarios.
+
+        NOTE: a failing (or passing) region that does not touch any point of the
+        initial grid can not be found, use initial_points to control this.
+
+        Parameters
+        ----------
+            builder (callable): builder(**parameters) returns the scenario to run
+
+            parameters (dict {str: (float, float)}): lower and upper bound of each parameter
+
+            runner (EsminiRunner): any object with a run(scenario,name) method
+
+            classifier (callable): classifier(result) returns True if the run passed
+                Default: None (result.succeeded())
+
+            budget (int): maximum number of simulations
+                Default: 100
+
+            batch_size (int): number of simulations run in parallel
+                Default: 8
+
+            initial_points (int): number of grid points along each parameter in the initial grid
+                Default: 3
+
+            max_depth (int): maximum number of refinements of a cell
+                Default: 6
+
+        Attributes
+        ----------
+            samples (list of Sample): all evaluated samples, in the order they were run
+
+        Methods
+        -------
+            run()
+                samples until the boundary is resolved or the budget is used
+
+            boundary_cells()
+                returns the smallest cells containing the boundary
+
+    """
+    def __init__(self,builder,parameters,runner,classifier=None,budget=100,batch_size=8,initial_points=3,max_depth=6):
+        """ initalize the AdaptiveSampler
+
+        Parameters
+        ----------
+            builder (callable): builder(**parameters) returns the scenario to run
+
+            parameters (dict {str: (float, float)}): lower and upper bound of each parameter
+
+            runner (EsminiRunner): any object with a run(scenario,name) method
+
+            classifier (callable): classifier(result) returns True if the run passed
+                Default: None (result.succeeded())
+
+            budget (int): maximum number of simulations
+                Default: 100
+
+            batch_size (int): number of simulations run in parallel
+                Default: 8
+
+            initial_points (int): number of grid points along each parameter in the initial grid
+                Default: 3
+
+            max_depth (int): maximum number of refinements of a cell
+                Default: 6
+
+        """
+        if initial_points < 2:
+            raise ValueError('initial_points has to be at least 2')
+        if batch_size < 1:
+            raise ValueError('batch_size has to be at least 1')
+        self.builder = builder
+        self.runner = runner
+        if classifier is None:
+            classifier = lambda result: result.succeeded()
+        self.classifier = classifier
+        self.budget = budget
+        self.batch_size = batch_size
+        self._step = 2**max_depth
+        self._space = _ParameterSpace(parameters,(initial_points-1)*self._step)
+        self._initial_points = initial_points
+        self._outcomes = {}
+        self._cells = []
+        self.samples = []
+
+    def _evaluate(self,points):
+        """ builds, runs and classifies a batch of lattice points in parallel
+
+        """
+        params = [self._space.to_parameters(p) for p in points]
+        first = len(self.samples)
+        calls = [(self._run_one,(par,'sample_' + str(first+i))) for i, par in enumerate(params)]
+        for point, sample in zip(points,run_parallel(calls,self.batch_size,getattr(self.runner,'metrics',None))):
+            self._outcomes[point] = sample.passed
+            self.samples.append(sample)
+
+    def _run_one(self,parameters,name):
+        """ builds, runs and classifies one sample
+
+        """
+        with _span('build','generation',run=name):
+            scenario = self.builder(**parameters)
+        result = self.runner.run(scenario,name)
+        with _span('classify','results',run=name):
+            passed = bool(self.classifier(result))
+        return Sample(parameters,result,passed)
+
+    def _corners(self,cell,size):
+        """ returns the corner points of a cell
+
+        """
+        return [tuple(c + size*o for c, o in zip(cell[0],offset)) for offset in itertools.product((0,1),repeat=len(cell[0]))]
+
+    def _is_mixed(self,cell):
+        """ checks if the corners of a cell have different outcomes
+
+        """
+        return len(set(self._outcomes[p] for p in self._corners(cell,cell[1]))) > 1
+
+    def _split(self,cell):
+        """ returns the children of a cell and the points needed to evaluate them
+
+        """
+        lower, size = cell
+        half = size//2
+        children = [(tuple(c + half*o for c, o in zip(lower,offset)),half) for offset in itertools.product((0,1),repeat=len(lower))]
+        points = [tuple(c + half*o for c, o in zip(lower,offset)) for offset in itertools.product((0,1,2),repeat=len(lower))]
+        return children, [p for p in points if p not in self._outcomes]
+
+    def run(self):
+        """ run samples the parameter space until the boundary is resolved to max_depth or the budget is used
+
+            Returns
+            -------
+                list of Sample
+
+        """
+        if not self._cells:
+            ndim = len(self._space.names)
+            grid = [tuple(self._step*i for i in idx) for idx in itertools.product(range(self._initial_points),repeat=ndim)]
+            if len(grid) > self.budget:
+                raise ValueError('the initial grid needs ' + str(len(grid)) + ' samples, which is more than the budget')
+            self._evaluate(grid)
+            self._cells = [(tuple(self._step*i for i in idx),self._step) for idx in itertools.product(range(self._initial_points-1),repeat=ndim)]
+
+        while True:
+            refinable = [c for c in self._cells if c[1] > 1 and self._is_mixed(c)]
+            # refine the coarsest cells first
+            refinable.sort(key=lambda c: -c[1])
+            to_split = []
+            batch = []
+            for cell in refinable:
+                children, points = self._split(cell)
+                points = [p for p in points if p not in batch]
+                if batch and len(batch) + len(points) > self.batch_size:
+                    break
+                if len(self.samples) + len(batch) + len(points) > self.budget:
+                    break
+                to_split.append((cell,children))
+                batch += points
+            if not to_split:
+                break
+            self._evaluate(batch)
+            for cell, children in to_split:
+                self._cells.remove(cell)
+                self._cells += children
+        return self.samples
+
+    def boundary_cells(self):
+        """ boundary_cells returns the smallest cells where the corners have different outcomes
+
+            Returns
+            -------
+                list of (dict, dict): the lower and upper parameters of each cell
+
+        """
+        cells = [c for c in self._cells if self._is_mixed(c)]
+        return [(self._space.to_parameters(c[0]),self._space.to_parameters(tuple(x + c[1] for x in c[0]))) for c in cells]
+
+
+class FalsificationSearch():
+    """ the FalsificationSearch looks for the parameters that minimize a kpi (e.g. the minimum time to collision)
+
+        The search uses the cross entropy method: each generation a population is
+        drawn from a normal distribution (clipped to the bounds), simulated in
+        parallel, and the distribution is refitted to the elite (lowest kpi)
+        candidates. The state is written to the checkpoint after each
+        generation, and a search with an existing checkpoint continues from it.
+
+        Parameters
+        ----------
+            builder (callable): builder(**parameters) returns the scenario to run
+
+            parameters (dict {str: (float, float)}): lower and upper bound of each parameter
+
+            runner (EsminiRunner): any object with a run(scenario,name) method
+
+            kpi (callable): kpi(result) returns the value to minimize (None if the run is invalid)
+
+            population (int): number of candidates per generation
+                Default: 20
+
+            generations (int): number of generations
+                Default: 10
+
+            elite_fraction (float): part of the population used to refit the distribution
+                Default: 0.2
+
+            workers (int): number of parallel simulations
+                Default: None (number of cpus)
+
+            checkpoint (str): path to the json checkpoint file (optional)
+                Default: None
+
+            seed (int): seed of the random generator
+                Default: None
+
+        Attributes
+        ----------
+            samples (list of Sample): all evaluated candidates
+
+            generation (int): number of finished generations
+
+            mean (dict {str: float}): mean of the search distribution
+
+            std (dict {str: float}): standard deviation of the search distribution
+
+        Methods
+        -------
+            run(n_worst, outputdir)
+                runs the remaining generations and returns the worst cases
+
+            worst_cases(n)
+                returns the n candidates with the lowest kpi
+
+            write_worst_cases(outputdir,n)
+                writes the scenarios of the worst cases
+
+    """
+    def __init__(self,builder,parameters,runner,kpi,population=20,generations=10,elite_fraction=0.2,workers=None,checkpoint=None,seed=None):
+        """ initalize the FalsificationSearch
+
+        Parameters
+        ----------
+            builder (callable): builder(**parameters) returns the scenario to run
+
+            parameters (dict {str: (float, float)}): lower and upper bound of each parameter
+
+            runner (EsminiRunner): any object with a run(scenario,name) method
+
+            kpi (callable): kpi(result) returns the value to minimize (None if the run is invalid)
+
+            population (int): number of candidates per generation
+                Default: 20
+
+            generations (int): number of generations
+                Default: 10
+
+            elite_fraction (float): part of the population used to refit the distribution
+                Default: 0.2
+
+            workers (int): number of parallel simulations
+                Default: None (number of cpus)
+
+            checkpoint (str): path to the json checkpoint file (optional)
+                Default: None
+
+            seed (int): seed of the random generator
+                Default: None
+
+        """
+        if not 0 < elite_fraction <= 1:
+            raise ValueError('elite_fraction has to be in (0, 1]')
+        self.builder = builder
+        self.runner = runner
+        self.kpi = kpi
+        self._space = _ParameterSpace(parameters,1)
+        self.population = population
+        self.generations = generations
+        self.n_elite = max(2,int(round(population*elite_fraction)))
+        self.workers = workers
+        self.checkpoint = checkpoint
+        self._random = random.Random(seed)
+        self.samples = []
+        self.generation = 0
+        self.mean = {n:(low + high)/2 for n, (low, high) in parameters.items()}
+        self.std = {n:(high - low)/2 for n, (low, high) in parameters.items()}
+        if checkpoint and os.path.isfile(checkpoint):
+            self._load_checkpoint()
+
+    def _load_checkpoint(self):
+        """ restores the state of the search from the checkpoint file
+
+        """
+        with open(self.checkpoint) as file_handle:
+            state = json.load(file_handle)
+        if state['parameters'] != self._space.names:
+            raise ValueError('the checkpoint does not match the parameters of the search')
+        self.generation = state['generation']
+        self.mean = state['mean']
+        self.std = state['std']
+        self.samples = [Sample(s['parameters'],None,kpi=s['kpi']) for s in state['samples']]
+        version, internal, gauss_next = state['random']
+        self._random.setstate((version,tuple(internal),gauss_next))
+
+    def _save_checkpoint(self):
+        """ writes the state of the search to the checkpoint file
+
+        """
+        state = {
+            'parameters':self._space.names,
+            'generation':self.generation,
+            'mean':self.mean,
+            'std':self.std,
+            'samples':[{'parameters':s.parameters,'kpi':s.kpi} for s in self.samples],
+            'random':self._random.getstate()}
+        tmpfile = self.checkpoint + '.tmp'
+        with open(tmpfile,'w') as file_handle:
+            json.dump(state,file_handle)
+        os.replace(tmpfile,self.checkpoint)
+
+    def _draw(self):
+        """ draws one candidate from the search distribution
+
+        """
+        params = {}
+        for name in self._space.names:
+            low, high = self._space.bounds[name]
+            params[name] = min(high,max(low,self._random.gauss(self.mean[name],self.std[name])))
+        return params
+
+    def _run_one(self,parameters,name):
+        """ builds, runs and evaluates one candidate
+
+        """
+        with _span('build','generation',run=name):
+            scenario = self.builder(**parameters)
+        result = self.runner.run(scenario,name)
+        with _span('kpi','results',run=name):
+            kpi = self.kpi(result)
+        return Sample(parameters,result,kpi=kpi)
+
+    @staticmethod
+    def _sort_key(sample):
+        if sample.kpi is None or math.isnan(sample.kpi):
+            return math.inf
+        return sample.kpi
+
+    def _refit(self,candidates):
+        """ refits the search distribution to the elite candidates
+
+        """
+        elite = sorted(candidates,key=self._sort_key)[:self.n_elite]
+        elite = [s for s in elite if self._sort_key(s) != math.inf]
+        if len(elite) < 2:
+            return
+        for name in self._space.names:
+            low, high = self._space.bounds[name]
+            values = [s.parameters[name] for s in elite]
+            mean = sum(values)/len(values)
+            std = math.sqrt(sum((v - mean)**2 for v in values)/len(values))
+            self.mean[name] = mean
+            # keep a minimum spread, so the search does not get stuck
+            self.std[name] = max(std,(high - low)*1e-3)
+
+    def run(self,n_worst=5,outputdir=None):
+        """ run evaluates the remaining generations and returns the worst cases found
+
+            Parameters
+            ----------
+                n_worst (int): number of worst cases to return
+                    Default: 5
+
+                outputdir (str): directory to write the scenarios of the worst cases to (optional)
+                    Default: None
+
+            Returns
+            -------
+                list of Sample (lowest kpi first)
+
+        """
+        while self.generation < self.generations:
+            params = [self._draw() for _ in range(self.population)]
+            calls = [(self._run_one,(p,'gen' + str(self.generation) + '_' + str(i))) for i, p in enumerate(params)]
+            candidates = run_parallel(calls,self.workers,getattr(self.runner,'metrics',None))
+            self.samples += candidates
+            self._refit(candidates)
+            self.generation += 1
+            if self.checkpoint:
+                self._save_checkpoint()
+        if outputdir:
+            self.write_worst_cases(outputdir,n_worst)
+        return self.worst_cases(n_worst)
+
+    def worst_cases(self,n=5):
+        """ worst_cases returns the candidates with the lowest kpi
+
+            Parameters
+            ----------
+                n (int): number of candidates
+                    Default: 5
+
+            Returns
+            -------
+                list of Sample (lowest kpi first)
+
+        """
+        valid = [s for s in self.samples if self._sort_key(s) != math.inf]
+        return sorted(valid,key=self._sort_key)[:n]
+
+    def write_worst_cases(self,outputdir,n=5):
+        """ write_worst_cases rebuilds and writes the scenarios of the worst cases
+
+            Parameters
+            ----------
+                outputdir (str): directory to write the scenarios to
+
+                n (int): number of scenarios
+                    Default: 5
+
+            Returns
+            -------
+                list of str: the written files (lowest kpi first)
+
+        """
+        os.makedirs(outputdir,exist_ok=True)
+        files = []
+        for i, sample in enumerate(self.worst_cases(n)):
+            filename = os.path.join(outputdir,'worst_' + str(i) + '.xosc')
+            self.builder(**sample.parameters).write_xml(filename)
+            files.append(filename)
+        return files
@@ -1,14 +1,15 @@
 import xml.etree.ElementTree as ET
-import xml.dom.minidom as mini
 
 
-from .helpers import printToFile
-from .utils import FileHeader, ParameterDeclarations, Catalog, TrafficSignalController
+from .helpers import printToFile, canonical_xml, CANONICAL_DATE
+from .utils import FileHeader, ParameterDeclarations, Catalog, TrafficSignalController, _BaseType, _checks, _trust
 from .enumerations import XMLNS, XSI
 from .entities import Entities
 from .storyboard import StoryBoard
+from .serializers import write_object, xml_string, _encode
+from .traces import _span
 
-class Scenario():
+class Scenario(_BaseType):
     """ The Scenario class collects all parts of OpenScenario and creates a .xml file
 
         Attributes
@@ -32,9 +33,14 @@ class Scenario():
             write_xml(filename)
                 write a open scenario xml
 
+            clone()
+                Returns a copy on write copy of the scenario, to create variants of it
+
     """
     _XMLNS = XMLNS
     _XSI = XSI
+    # the header is created at every write
+    _CACHE_ELEMENT = False
     def __init__(self,name,author,parameters,entities,storyboard,roadnetwork,catalog):
         """ Initalizes the Scenario class, and creates the header.
 
@@ -54,15 +60,16 @@ class Scenario():
 
             catalog (Catalog): the catalogs used in the scenario
         """
-        if not isinstance(entities,Entities):
+        checks = _trust.off or _checks(self,'__init__',name,author,parameters,entities,storyboard,roadnetwork,catalog)
+        if checks and not isinstance(entities,Entities):
             raise TypeError('entities input is not of type Entities')
-        if not isinstance(storyboard,StoryBoard):
+        if checks and not isinstance(storyboard,StoryBoard):
             raise TypeError('storyboard input is not of type StoryBoard')
-        if not isinstance(roadnetwork,RoadNetwork):
+        if checks and not isinstance(roadnetwork,RoadNetwork):
             raise TypeError('roadnetwork input is not of type RoadNetwork')
-        if not isinstance(catalog,Catalog):
+        if checks and not isinstance(catalog,Catalog):
             raise TypeError('catalog input is not of type StorCatalogyBoard')
-        if not isinstance(parameters,ParameterDeclarations):
+        if checks and not isinstance(parameters,ParameterDeclarations):
             raise TypeError('parameters input is not of type ParameterDeclarations')
 
         self.entities = entities
@@ -86,23 +93,54 @@ class Scenario():
 
         return element
 
-    def write_xml(self,filename,prettyprint = True):
+    def write_xml(self,filename,prettyprint = True,canonical = False,archive = None,workers = None):
         """ writeXml writes the open scenario xml file
 
         Parameters
         ----------
-            filename (str): path and filename of the wanted xml file
+            filename (str): path and filename of the wanted xml file (the variant id if an archive is given)
 
             prettyprint (bool): pretty print or ugly print?
                 Default: True
 
+            canonical (bool): write a byte identical file for an unchanged scenario
+                (sorted attributes, fixed indentation, and a fixed header date unless header.date is set)
+                Default: False
+
+            archive (ScenarioArchive): add the scenario to the archive instead of writing a file (optional)
+                Default: None
+
+            workers (int): number of threads serializing the Stories, Entities and Init,
+                not used for the canonical output (see xml_string)
+                Default: None
+
         """
-        printToFile(self.get_element(),filename,prettyprint)
+        if not canonical:
+            if archive is not None:
+                with _span('serialize','generation',type='Scenario'):
+                    data = _encode(xml_string(self,prettyprint,workers),prettyprint)
+                with _span('write','archive',variant=filename,size=len(data)):
+                    archive.add(filename,data)
+                return
+            # written directly from the objects while the streaming is enabled, see serializers
+            write_object(self,filename,prettyprint,workers)
+            return
+        with _span('serialize','generation',type='Scenario'):
+            element = self.get_element()
+        if self.header.date is None:
+            element.find('FileHeader').set('date',CANONICAL_DATE)
+        if archive is not None:
+            data = canonical_xml(element,prettyprint)
+            with _span('write','archive',variant=filename,size=len(data)):
+                archive.add(filename,data)
+            return
+        with _span('write','io',filename=filename):
+            printToFile(element,filename,prettyprint,canonical)
         
 
 
 
-class RoadNetwork():
+class RoadNetwork(_BaseType):
     """ The RoadNetwork class creates the RoadNetwork of the openScenario
         
         Parameters
@@ -149,7 +187,8 @@ class RoadNetwork():
                 traffic_signal_controller (TrafficSignalController): the traffic signal controller to add
 
         """
-        if not isinstance(traffic_signal_controller,TrafficSignalController):
+        checks = _trust.off or _checks(self,'add_traffic_signal_controller',traffic_signal_controller)
+        if checks and not isinstance(traffic_signal_controller,TrafficSignalController):
             raise TypeError('traffic_signal_controller input is not of type TrafficSignalController')
         self.traffic_signals.append(traffic_signal_controller)
 
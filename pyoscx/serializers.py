@@ -0,0 +1,571 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from .helpers import _PRETTY, _UGLY, _PRETTY_DECLARATION, _write_element, _escape_attrib, _escape_cdata, _escape_minidom, _layout_stripped
+from .utils import _BaseType, _element_cache, _profile
+from .traces import _span
+
+
+class _StreamingState():
+    """ the state of the streaming serialization, changed with enable_streaming
+
+    """
+    def __init__(self):
+        self.enabled = False
+
+_streaming = _StreamingState()
+
+
+def enable_streaming():
+    """ enable_streaming makes xml_string, write_object and Scenario.write_xml write the objects
+        directly, without building their elements
+
+        The get_element method of each class is then translated once (on first use) to a function
+        that writes the text while it runs. Objects that keep their element (see enable_element_cache
+        and enable_interning), classes that can not be translated and all objects while the profiling
+        is enabled (see enable_profiling) are still written from their element.
+
+    """
+    _streaming.enabled = True
+
+
+def disable_streaming():
+    """ disable_streaming writes all objects from their element again (the default)
+
+    """
+    _streaming.enabled = False
+
+
+def xml_string(obj,prettyprint=True,workers=None):
+    """ xml_string returns the xml of an object, identical to printToFile(obj.get_element())
+
+        By default the text is written from the element of the object, with enable_streaming
+        it is written directly from the objects.
+
+        With workers (and the streaming enabled), the Stories and the Entities and Init sections
+        are serialized in a thread pool and their text is spliced into the document in order.
+        This only runs in parallel on a free-threaded Python build, with the GIL the threads take turns.
+
+        Parameters
+        ----------
+            obj (pyoscx object): object to serialize
+
+            prettyprint (bool): pretty or "ugly" print
+                Default: True
+
+            workers (int): number of threads serializing the Stories, Entities and Init
+                Default: None (serialized in the calling thread)
+
+        Returns
+        -------
+            str
+
+    """
+    output = _Output(_PRETTY if prettyprint else _UGLY)
+    if not _streaming.enabled:
+        _write_element(obj.get_element(),output.mode,0,output.parts)
+    elif workers is not None and workers > 1:
+        with ThreadPoolExecutor(max_workers=workers,thread_name_prefix='pyoscx_serializer') as executor:
+            output.executor = executor
+            _emit(output,obj,(),{})
+            for index, future in output.futures:
+                output.parts[index] = future.result()
+    else:
+        _emit(output,obj,(),{})
+    text = ''.join(output.parts)
+    if prettyprint:
+        return _PRETTY_DECLARATION + text
+    return text
+
+
+def write_object(obj,filename,prettyprint=True,workers=None):
+    """ write_object writes the xml of an object to a file, identical to printToFile(obj.get_element(),filename,prettyprint)
+
+        Parameters
+        ----------
+            obj (pyoscx object): object to write
+
+            filename (str): file to save to
+
+            prettyprint (bool): pretty or "ugly" print
+                Default: True
+
+            workers (int): number of threads serializing the Stories, Entities and Init (see xml_string)
+                Default: None
+
+    """
+    with _span('serialize','generation',type=type(obj).__name__):
+        text = xml_string(obj,prettyprint,workers)
+    with _span('write','io',filename=filename,characters=len(text)):
+        if prettyprint:
+            with open(filename, "w") as file_handle:
+                file_handle.write(text)
+        else:
+            with open(filename, "wb") as file_handle:
+                file_handle.write(_encode(text,prettyprint))
+
+
+def _encode(text,prettyprint):
+    """ returns the bytes of a file written by printToFile from the text of xml_string
+
+    """
+    if prettyprint:
+        return text.encode('utf-8')
+    return text.encode('ascii', 'xmlcharrefreplace')
+
+
+class _Fallback(Exception):
+    """ raised when the elements of an object are not built in document order,
+        the object is then written from its element
+
+    """
+    pass
+
+
+class _Output():
+    """ the state of a streaming serialization
+
+        Attributes
+        ----------
+            mode (str): _PRETTY or _UGLY
+
+            parts (list of str): the written text
+
+            stack (list): the open elements, each as [tag, index of the start tag in parts, depth, text]
+
+            root (int): depth of the root element of the object being written
+
+            executor (Executor): serializes the objects of _PARALLEL (None: written in order)
+
+            futures (list): the index in parts and the future of each object given to the executor
+
+    """
+    def __init__(self,mode,depth=0):
+        self.mode = mode
+        self.pretty = mode == _PRETTY
+        self.parts = []
+        # placeholders for the open elements of the document around a fragment
+        self.stack = [None]*depth
+        self.root = depth
+        self.executor = None
+        self.futures = []
+
+
+# the classes that are serialized in parallel by xml_string(obj,workers=...)
+_PARALLEL = ('Story','Entities','Init')
+
+
+def _fragment(obj,args,kwargs,mode,depth):
+    """ returns the text of an object written at depth, in a worker of xml_string
+
+    """
+    output = _Output(mode,depth)
+    _emit(output,obj,args,kwargs)
+    return ''.join(output.parts)
+
+
+class _Indents(dict):
+    """ the tabs of each depth
+
+    """
+    def __missing__(self,depth):
+        indent = self[depth] = '\t' * depth
+        return indent
+
+
+_indents = _Indents()
+
+
+def _emit(output,obj,args,kwargs):
+    """ writes an object with its translated get_element, or from its element
+
+    """
+    cls = type(obj)
+    parts = output.parts
+    stack = output.stack
+    if output.executor is not None and stack and cls.__name__ in _PARALLEL:
+        # written in a worker, the placeholder is replaced by its text at the end
+        output.futures.append((len(parts),output.executor.submit(_fragment,obj,args,kwargs,output.mode,len(stack))))
+        parts.append('')
+        return
+    emitter = _emitters[cls] if cls in _emitters else _emitter(cls)
+    if emitter is not None and not (_element_cache.enabled or _profile.profile is not None or '_xml_frozen' in obj.__dict__):
+        mark = len(parts)
+        level = len(stack)
+        root = output.root
+        output.root = level
+        try:
+            emitter(obj,output,*args,**kwargs)
+            while len(stack) > level:
+                _close(output)
+            return
+        except _Fallback:
+            del parts[mark:]
+            del stack[level:]
+            # the fragments of the removed text are written again with the element
+            output.futures = [(index, future) for index, future in output.futures if index < mark]
+            # the class builds its elements in another order, do not try again
+            _emitters[cls] = None
+        finally:
+            output.root = root
+    _write_element(obj.get_element(*args,**kwargs),output.mode,len(stack),parts)
+
+
+def _open(output,parent,tag,attrib):
+    """ ET.Element and ET.SubElement of the translated get_element, writes the start tag
+
+        The start tag is written as if the element gets children, _close changes it
+        if it does not get any.
+
+    """
+    stack = output.stack
+    if parent is None:
+        depth = output.root
+        if len(stack) != depth:
+            # a second element without parent
+            raise _Fallback()
+    else:
+        depth = parent[2] + 1
+        if len(stack) != depth or stack[-1] is not parent:
+            _close_after(output,parent)
+    if output.pretty:
+        text = _indents[depth] + '<' + tag
+        if attrib:
+            items = attrib.items()
+            for key in attrib:
+                if key.startswith('xmlns'):
+                    # minidom puts the namespace declarations first
+                    items = [i for i in items if i[0].startswith('xmlns')] + [i for i in items if not i[0].startswith('xmlns')]
+                    break
+            for key, value in items:
+                text += ' ' + key + '="' + _escape_minidom(value) + '"'
+        text += '>\n'
+    else:
+        text = '<' + tag
+        if attrib:
+            for key, value in attrib.items():
+                text += ' ' + key + '="' + _escape_attrib(value) + '"'
+        text += '>'
+    parts = output.parts
+    element = [tag,len(parts),depth,None]
+    parts.append(text)
+    stack.append(element)
+    return element
+
+
+def _child(output,parent,obj,*args,**kwargs):
+    """ parent.append(obj.get_element()) of the translated get_element, writes the object
+
+    """
+    stack = output.stack
+    if parent is None:
+        if len(stack) != output.root:
+            raise _Fallback()
+    elif len(stack) != parent[2] + 1 or stack[-1] is not parent:
+        _close_after(output,parent)
+    _emit(output,obj,args,kwargs)
+
+
+def _text(output,element,text):
+    """ element.text = text of the translated get_element
+
+    """
+    stack = output.stack
+    if stack[-1] is not element or element[1] != len(output.parts) - 1 or not isinstance(text,str):
+        # the text would come after the written children, or the element is closed
+        raise _Fallback()
+    if output.pretty:
+        element[3] = text
+    elif text:
+        output.parts.append(_escape_cdata(text))
+
+
+def _adopt(output,parent,element):
+    """ parent.append(element) of the translated get_element, the element is already written
+        (e.g. wrapped in a new root), so it can not be streamed
+
+    """
+    raise _Fallback()
+
+
+def _root(output,element):
+    """ return element of the translated get_element, only the root element can be returned
+
+    """
+    stack = output.stack
+    if element[2] != output.root or len(stack) <= element[2] or stack[element[2]] is not element:
+        raise _Fallback()
+
+
+def _close_after(output,parent):
+    """ closes the elements after parent, so the next child of parent can be written
+
+    """
+    stack = output.stack
+    depth = parent[2]
+    if depth < output.root or depth >= len(stack) or stack[depth] is not parent:
+        # parent is already closed
+        raise _Fallback()
+    while len(stack) > depth + 1:
+        _close(output)
+
+
+def _close(output):
+    """ writes the end of the last open element
+
+    """
+    tag, index, depth, text = output.stack.pop()
+    parts = output.parts
+    if output.pretty:
+        if text is not None:
+            text = _layout_stripped(text)
+        if index == len(parts) - 1:
+            if text:
+                parts[index] = parts[index][:-1] + _escape_minidom(text) + '</' + tag + '>\n'
+            else:
+                parts[index] = parts[index][:-2] + '/>\n'
+        elif text:
+            # minidom writes mixed content differently
+            raise _Fallback()
+        else:
+            parts.append(_indents[depth] + '</' + tag + '>\n')
+    elif index == len(parts) - 1:
+        parts[index] = parts[index][:-1] + ' />'
+    else:
+        parts.append('</' + tag + '>')
+
+
+# the translated get_element of each class, None if it can not be translated
+_emitters = {}
+
+
+def _emitter(cls):
+    """ returns the translated get_element of a class
+
+    """
+    function = cls.get_element
+    function = getattr(function,'_uncached',function)
+    function = getattr(function,'_unprofiled',function)
+    emitter = _emitters[cls] = _translate(function)
+    return emitter
+
+
+class _NotTranslatable(Exception):
+    """ raised for a get_element that does more than building its elements
+
+    """
+    pass
+
+
+def _translate(func):
+    """ translates a get_element method to a function writing its text, or returns None
+
+        ET.Element, ET.SubElement, element.append(obj.get_element()), element.append(element),
+        element.text and return element are replaced by calls of the streaming functions above, every other
+        use of an element makes the method untranslatable.
+
+    """
+    # imported here, as they are slow to import and only needed for the translation
+    import ast
+    import inspect
+    import textwrap
+    try:
+        source = textwrap.dedent(inspect.getsource(func))
+        filename = inspect.getsourcefile(func)
+    except (OSError,TypeError):
+        return None
+    if func.__code__.co_freevars:
+        return None
+    tree = ast.parse(source)
+    definition = tree.body[0]
+    if not isinstance(definition,ast.FunctionDef):
+        return None
+    try:
+        _Translator(definition).translate()
+    except _NotTranslatable:
+        return None
+    definition.decorator_list = []
+    definition.args.args.insert(1,ast.copy_location(ast.arg(arg='_output'),definition.args.args[0]))
+    definition.args.defaults = []
+    definition.args.kw_defaults = [None for _ in definition.args.kwonlyargs]
+    factory = ast.parse('def _factory(_open,_child,_text,_adopt,_root):\n    return ' + definition.name).body[0]
+    factory.body.insert(0,definition)
+    tree.body = [factory]
+    ast.fix_missing_locations(tree)
+    ast.increment_lineno(tree,func.__code__.co_firstlineno - 1)
+    namespace = {}
+    exec(compile(tree,filename,'exec'),func.__globals__,namespace)
+    emitter = namespace['_factory'](_open,_child,_text,_adopt,_root)
+    emitter.__defaults__ = func.__defaults__
+    emitter.__kwdefaults__ = func.__kwdefaults__
+    emitter.__qualname__ = func.__qualname__
+    return emitter
+
+
+class _Translator():
+    """ translates the statements of a get_element method
+
+    """
+    def __init__(self,definition):
+        import ast
+        self.ast = ast
+        self.definition = definition
+        # the variables holding elements
+        self.elements = set()
+        size = -1
+        while size != len(self.elements):
+            size = len(self.elements)
+            for node in ast.walk(definition):
+                if isinstance(node,ast.Assign) and (self._element_call(node.value) or self._element_name(node.value)):
+                    for target in node.targets:
+                        if isinstance(target,ast.Name):
+                            self.elements.add(target.id)
+
+    def translate(self):
+        self.definition.body = self._statements(self.definition.body)
+
+    def _element_call(self,node):
+        """ returns 'Element' or 'SubElement' for a call of ET.Element or ET.SubElement
+
+        """
+        ast = self.ast
+        if isinstance(node,ast.Call) and isinstance(node.func,ast.Attribute) and \
+                isinstance(node.func.value,ast.Name) and node.func.value.id == 'ET' and node.func.attr in ('Element','SubElement'):
+            return node.func.attr
+        return None
+
+    def _get_element_call(self,node):
+        """ true for a call of obj.get_element(...)
+
+        """
+        ast = self.ast
+        return isinstance(node,ast.Call) and isinstance(node.func,ast.Attribute) and node.func.attr == 'get_element'
+
+    def _element_name(self,node):
+        return isinstance(node,self.ast.Name) and node.id in self.elements
+
+    def _call(self,name,original,args,keywords=()):
+        """ returns a call of a streaming function, at the source location of the translated node
+
+        """
+        ast = self.ast
+        call = ast.Call(func=ast.Name(id=name,ctx=ast.Load()),args=[ast.Name(id='_output',ctx=ast.Load())] + list(args),keywords=list(keywords))
+        return self._locate(call,original)
+
+    def _locate(self,new,original):
+        """ gives the built nodes in new the source location of the original node, so tracebacks show the original line
+
+        """
+        ast = self.ast
+        for node in ast.walk(new):
+            if 'lineno' in node._attributes and not hasattr(node,'lineno'):
+                ast.copy_location(node,original)
+        return new
+
+    def _open(self,node):
+        """ translates an ET.Element or ET.SubElement call
+
+        """
+        ast = self.ast
+        kind = self._element_call(node)
+        args = list(node.args)
+        attrib = None
+        for keyword in node.keywords:
+            if keyword.arg != 'attrib':
+                raise _NotTranslatable()
+            attrib = keyword.value
+        if kind == 'SubElement':
+            if not args or not self._element_name(args[0]):
+                raise _NotTranslatable()
+            parent = args.pop(0)
+        else:
+            parent = ast.Constant(value=None)
+        if len(args) == 2 and attrib is None:
+            attrib = args.pop()
+        if len(args) != 1:
+            raise _NotTranslatable()
+        self._check(args[0])
+        if attrib is None:
+            attrib = ast.Constant(value=None)
+        else:
+            self._check(attrib)
+        return self._call('_open',node,[parent,args[0],attrib])
+
+    def _child(self,parent,node):
+        """ translates parent.append(obj.get_element(...))
+
+        """
+        for value in [node.func.value] + node.args + [k.value for k in node.keywords]:
+            self._check(value)
+        return self._call('_child',node,[parent,node.func.value] + node.args,node.keywords)
+
+    def _check(self,node):
+        """ raises _NotTranslatable if an expression uses an element or builds one
+
+        """
+        ast = self.ast
+        for child in ast.walk(node):
+            if isinstance(child,ast.Name) and (child.id in self.elements or child.id == 'ET'):
+                raise _NotTranslatable()
+            if self._get_element_call(child) or isinstance(child,(ast.Lambda,ast.FunctionDef,ast.ClassDef)):
+                raise _NotTranslatable()
+
+    def _statements(self,statements):
+        return [self._statement(statement) for statement in statements]
+
+    def _statement(self,node):
+        ast = self.ast
+        if isinstance(node,ast.Assign) and self._element_call(node.value):
+            if len(node.targets) != 1 or not isinstance(node.targets[0],ast.Name):
+                raise _NotTranslatable()
+            node.value = self._open(node.value)
+            return node
+        if isinstance(node,ast.Assign) and self._element_name(node.value):
+            # another name for the same element
+            if len(node.targets) != 1 or not isinstance(node.targets[0],ast.Name):
+                raise _NotTranslatable()
+            return node
+        if isinstance(node,ast.Assign) and len(node.targets) == 1 and isinstance(node.targets[0],ast.Attribute) and \
+                self._element_name(node.targets[0].value) and node.targets[0].attr == 'text':
+            self._check(node.value)
+            return self._locate(ast.Expr(value=self._call('_text',node,[node.targets[0].value,node.value])),node)
+        if isinstance(node,ast.Expr) and self._element_call(node.value) == 'SubElement':
+            node.value = self._open(node.value)
+            return node
+        if isinstance(node,ast.Expr) and isinstance(node.value,ast.Call) and isinstance(node.value.func,ast.Attribute) and \
+                node.value.func.attr == 'append' and self._element_name(node.value.func.value):
+            if len(node.value.args) != 1 or node.value.keywords:
+                raise _NotTranslatable()
+            if self._element_name(node.value.args[0]):
+                node.value = self._call('_adopt',node.value,[node.value.func.value,node.value.args[0]])
+            elif self._get_element_call(node.value.args[0]):
+                node.value = self._child(node.value.func.value,node.value.args[0])
+            else:
+                raise _NotTranslatable()
+            return node
+        if isinstance(node,ast.Return):
+            if self._element_name(node.value):
+                node.value = self._call('_root',node.value,[node.value])
+                return node
+            if self._get_element_call(node.value):
+                node.value = self._child(ast.Constant(value=None),node.value)
+                return node
+            if self._element_call(node.value):
+                node.value = self._open(node.value)
+                return node
+            raise _NotTranslatable()
+        if isinstance(node,ast.If):
+            self._check(node.test)
+            node.body = self._statements(node.body)
+            node.orelse = self._statements(node.orelse)
+            return node
+        if isinstance(node,ast.For):
+            self._check(node.target)
+            self._check(node.iter)
+            node.body = self._statements(node.body)
+            node.orelse = self._statements(node.orelse)
+            return node
+        if isinstance(node,(ast.FunctionDef,ast.AsyncFunctionDef,ast.ClassDef,ast.While,ast.With,ast.Try)):
+            raise _NotTranslatable()
+        # any other statement may not use the elements
+        self._check(node)
+        return node
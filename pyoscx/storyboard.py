@@ -4,12 +4,12 @@ from .actions import _Action, _ActionType, _PrivateActionType
 
 from .triggers import EmptyTrigger, ValueTrigger, SimulationTimeCondition
 from .utils import EntityRef, _TriggerType, _EntityTriggerType, _ValueTriggerType
-from .utils import ParameterDeclarations, CatalogFile, convert_bool
+from .utils import ParameterDeclarations, CatalogFile, convert_bool, _BaseType, _catalog_lock, _checks, _trust
 from .enumerations import Priority, Rule, ConditionEdge
 
 
 
-class Init():
+class Init(_BaseType):
     """ the Init class, creates the init part of the storyboard
         
         Attributes
@@ -49,7 +49,8 @@ class Init():
             action (*Action): Any private action to be added (like TeleportAction)
             
         """
-        if not isinstance(action,_PrivateActionType):
+        checks = _trust.off or _checks(self,'add_init_action',entityname,action)
+        if checks and not isinstance(action,_PrivateActionType):
             if isinstance(action,_ActionType):
                 raise TypeError('the action provided is a global action, please use add_global_action instead')
             raise TypeError('action input is not a valid action')
@@ -66,9 +67,10 @@ class Init():
             action (*Action): any global action to add to the init
 
         """
-        if isinstance(action,_PrivateActionType):
+        checks = _trust.off or _checks(self,'add_global_action',action)
+        if checks and isinstance(action,_PrivateActionType):
             raise TypeError('action input is a Private action, please use add_init_action instead')
-        if not isinstance(action,_ActionType):
+        if checks and not isinstance(action,_ActionType):
             raise TypeError('action input is not a valid action')
         self.global_actions.append(action)
     
@@ -106,7 +108,7 @@ class Init():
 
         return element
 
-class StoryBoard():
+class StoryBoard(_BaseType):
     """ The StoryBoard class creates the storyboard of OpenScenario
         
         Parameters
@@ -137,7 +139,7 @@ class StoryBoard():
 
 
     """
-    def __init__(self,init=Init(),stoptrigger=EmptyTrigger('stop')):
+    def __init__(self,init=None,stoptrigger=None):
         """ initalizes the storyboard
 
         Parameters
@@ -150,12 +152,17 @@ class StoryBoard():
                 Default: (EmptyTrigger) 
 
         """
-        if not isinstance(init,Init):
+        checks = _trust.off or _checks(self,'__init__',init,stoptrigger)
+        if init is None:
+            init = Init()
+        if stoptrigger is None:
+            stoptrigger = EmptyTrigger('stop')
+        if checks and not isinstance(init,Init):
             raise TypeError('init is not of type Init')
-        if not isinstance(stoptrigger,_TriggerType):
+        if checks and not isinstance(stoptrigger,_TriggerType):
             raise TypeError('stoptrigger is not a valid Trigger')
         # check that the stoptrigger has a triggeringpoint that is 'stop'
-        if stoptrigger._triggerpoint == 'StartTrigger':
+        if checks and stoptrigger._triggerpoint == 'StartTrigger':
             raise ValueError('the stoptrigger provided does not have stop as the triggeringpoint')
         self.init = init
         self.stoptrigger = stoptrigger
@@ -169,11 +176,12 @@ class StoryBoard():
             story (Story): the story to be added 
 
         """
-        if not isinstance(story,Story):
+        checks = _trust.off or _checks(self,'add_story',story)
+        if checks and not isinstance(story,Story):
             raise TypeError('story input is not of type Story')
         self.stories.append(story)
 
-    def add_act(self,act,parameters=ParameterDeclarations()):
+    def add_act(self,act,parameters=None):
         """ add_act is a quick way to add a single act to one story, for multi act type of scenarios, use Story instead.
     
             NOTE: if used multiple times multiple stories will be created
@@ -185,13 +193,16 @@ class StoryBoard():
                 parameters (ParameterDeclarations): the parameters of the story (optional)
                     Default: ParameterDeclarations()
         """
-        if not isinstance(act,Act):
+        checks = _trust.off or _checks(self,'add_act',act,parameters)
+        if checks and not isinstance(act,Act):
             raise TypeError('act input is not of type Act')
+        if parameters is None:
+            parameters = ParameterDeclarations()
         newstory = Story('story_' + act.name,parameters)
         newstory.add_act(act)
         self.stories.append(newstory)
 
-    def add_maneuver_group(self,maneuvergroup,starttrigger=None,stoptrigger=EmptyTrigger('stop'),parameters=ParameterDeclarations()):
+    def add_maneuver_group(self,maneuvergroup,starttrigger=None,stoptrigger=None,parameters=None):
         """ add_maneuver_group is a quick way to add a single maneuver_group to one story, for multi maneuver_group type of scenarios, use Act instead.
     
             NOTE: if used multiple times multiple stories will be created
@@ -210,21 +221,23 @@ class StoryBoard():
                     Default: ParameterDeclarations()
 
         """
-        if not isinstance(maneuvergroup,ManeuverGroup):
+        checks = _trust.off or _checks(self,'add_maneuver_group',maneuvergroup,starttrigger,stoptrigger,parameters)
+        if checks and not isinstance(maneuvergroup,ManeuverGroup):
             raise TypeError('maneuvergroup input is not of type ManeuverGroup')
         if starttrigger == None:
             starttrigger = ValueTrigger('act_start',0,ConditionEdge.rising,SimulationTimeCondition(0,Rule.greaterThan))
-        elif starttrigger._triggerpoint == 'StopTrigger':
+        elif checks and starttrigger._triggerpoint == 'StopTrigger':
             raise ValueError('the starttrigger provided does not have start as the triggeringpoint')
-
-        if stoptrigger._triggerpoint == 'StartTrigger':
+        if stoptrigger is None:
+            stoptrigger = EmptyTrigger('stop')
+        if checks and stoptrigger._triggerpoint == 'StartTrigger':
             raise ValueError('the stoptrigger provided is not of type StopTrigger')
         newact = Act('act_' + maneuvergroup.name,starttrigger,stoptrigger)
         newact.add_maneuver_group(maneuvergroup)
         self.add_act(newact,parameters)
 
 
-    def add_maneuver(self,maneuver,actors,starttrigger=None,stoptrigger=EmptyTrigger('stop'),parameters=ParameterDeclarations()):
+    def add_maneuver(self,maneuver,actors,starttrigger=None,stoptrigger=None,parameters=None):
         """ add_maneuver is a quick way to add a single maneuver to one story, for multi maneuver type of scenarios, use ManeuverGroup instead.
     
             NOTE: if used multiple times multiple stories will be created
@@ -245,7 +258,8 @@ class StoryBoard():
                     Default: ParameterDeclarations()
 
         """
-        if not isinstance(maneuver,Maneuver):
+        checks = _trust.off or _checks(self,'add_maneuver',maneuver,actors,starttrigger,stoptrigger,parameters)
+        if checks and not isinstance(maneuver,Maneuver):
             raise TypeError('maneuver input is not of type Maneuver')
         mangr = ManeuverGroup("maneuvuergroup_" + maneuver.name)
         if isinstance(actors,list):
@@ -265,9 +279,13 @@ class StoryBoard():
         # if not self.stories:
         #     raise ValueError('no stories available for storyboard')
         
-        if not self.stories:
-            self.add_maneuver_group(ManeuverGroup('empty'),EmptyTrigger())
-        for story in self.stories:
+        stories = self.stories
+        if not stories:
+            # written with an empty story, without changing the storyboard (which may be shared by threads)
+            empty = StoryBoard(self.init)
+            empty.add_maneuver_group(ManeuverGroup('empty'),EmptyTrigger())
+            stories = empty.stories
+        for story in stories:
             element.append(story.get_element())
                 
         element.append(self.stoptrigger.get_element())
@@ -275,7 +293,7 @@ class StoryBoard():
         return element
     
 
-class Story():
+class Story(_BaseType):
     """ The Story class creates a story of the OpenScenario
         
         Parameters
@@ -305,7 +323,7 @@ class Story():
                 Returns a dictionary of all attributes of the class
 
     """
-    def __init__(self, name, parameters=ParameterDeclarations()):
+    def __init__(self, name, parameters=None):
         """ initalizes the Story class
 
         Parameters
@@ -314,10 +332,13 @@ class Story():
 
             parameters (ParameterDeclarations): the parameters of the Story
         """
+        checks = _trust.off or _checks(self,'__init__',name,parameters)
         self.name = name
 
         self.acts = []
-        if not isinstance(parameters,ParameterDeclarations):
+        if parameters is None:
+            parameters = ParameterDeclarations()
+        if checks and not isinstance(parameters,ParameterDeclarations):
             raise TypeError('parameters input is not of type ParameterDeclarations')
 
         self.parameter = parameters
@@ -330,7 +351,8 @@ class Story():
             act (Act): act to add to the story
 
         """
-        if not isinstance(act,Act):
+        checks = _trust.off or _checks(self,'add_act',act)
+        if checks and not isinstance(act,Act):
             raise TypeError('act input is not of type Act')
         self.acts.append(act)
 
@@ -352,7 +374,7 @@ class Story():
             element.append(a.get_element())
         return element
 
-class Act():
+class Act(_BaseType):
     """ the Act class creates the Act of the OpenScenario
         
         Parameters
@@ -400,18 +422,19 @@ class Act():
                     Default: Emptytrigger
 
         """
+        checks = _trust.off or _checks(self,'__init__',name,starttrigger,stoptrigger)
 
         self.name = name
         if starttrigger == None:
             self.starttrigger = starttrigger = ValueTrigger('act_start',0,ConditionEdge.none,SimulationTimeCondition(0,Rule.greaterThan))
-        elif starttrigger._triggerpoint == 'StopTrigger':
+        elif checks and starttrigger._triggerpoint == 'StopTrigger':
             raise ValueError('the starttrigger provided does not have start as the triggeringpoint')
         else:
             self.starttrigger = starttrigger
 
         if stoptrigger == None:
             self.stoptrigger = EmptyTrigger('stop')
-        elif stoptrigger._triggerpoint == 'StartTrigger':
+        elif checks and stoptrigger._triggerpoint == 'StartTrigger':
             raise ValueError('the stoptrigger provided is not of type StopTrigger')
         else:
             self.stoptrigger = stoptrigger
@@ -426,7 +449,8 @@ class Act():
                 maneuvergroup (ManeuverGroup): the maneuvergroup to add
 
         """
-        if not isinstance(maneuvergroup,ManeuverGroup):
+        checks = _trust.off or _checks(self,'add_maneuver_group',maneuvergroup)
+        if checks and not isinstance(maneuvergroup,ManeuverGroup):
             raise TypeError('maneuvergroup is not of type ManeuverGroup')
         self.maneuvergroup.append(maneuvergroup)
 
@@ -450,7 +474,7 @@ class Act():
         element.append(self.stoptrigger.get_element())
         return element
 
-class ManeuverGroup():
+class ManeuverGroup(_BaseType):
     """ the ManeuverGroup creates the ManeuverGroup of the OpenScenario
         
         Parameters
@@ -513,7 +537,8 @@ class ManeuverGroup():
             maneuver (Maneuver, or CatalogReference): maneuver to add
 
         """
-        if not isinstance(maneuver,Maneuver):
+        checks = _trust.off or _checks(self,'add_maneuver',maneuver)
+        if checks and not isinstance(maneuver,Maneuver):
             raise TypeError('maneuver input is not of type Maneuver')
         self.maneuvers.append(maneuver)
 
@@ -545,7 +570,7 @@ class ManeuverGroup():
 
 
 
-class _Actors():
+class _Actors(_BaseType):
     """ _Actors is used to create the actors of a ManeuverGroup
         
         Parameters
@@ -616,7 +641,7 @@ class _Actors():
 
 
 
-class Maneuver():
+class Maneuver(_BaseType):
     """ The Maneuver class creates the Maneuver of OpenScenario
         
         Parameters
@@ -659,7 +684,8 @@ class Maneuver():
             name (str): name of the Maneuver
 
         """
-        if parameters is not None and not isinstance(parameters,ParameterDeclarations):
+        checks = _trust.off or _checks(self,'__init__',name,parameters)
+        if checks and parameters is not None and not isinstance(parameters,ParameterDeclarations):
             raise TypeError('parameters is not of type ParameterDeclarations')
         self.parameters = parameters
         self.name = name
@@ -679,10 +705,11 @@ class Maneuver():
                 author (str): author of the catalog
         
         """
-        cf = CatalogFile()
-        cf.create_catalog(filename,catalogtype,description,author)
-        cf.add_to_catalog(self)
-        cf.dump()
+        with _catalog_lock(filename):
+            cf = CatalogFile()
+            cf.create_catalog(filename,catalogtype,description,author)
+            cf.add_to_catalog(self)
+            cf.dump()
         
     def append_to_catalog(self,filename):
         """ adds the Controller to an existing catalog
@@ -692,10 +719,11 @@ class Maneuver():
                 filename (str): path to the catalog file
 
         """
-        cf = CatalogFile()
-        cf.open_catalog(filename)
-        cf.add_to_catalog(self)
-        cf.dump()
+        with _catalog_lock(filename):
+            cf = CatalogFile()
+            cf.open_catalog(filename)
+            cf.add_to_catalog(self)
+            cf.dump()
 
     def add_event(self,event):
         """ adds an event to the Maneuver
@@ -705,7 +733,8 @@ class Maneuver():
             name (Event): the event to add to the Maneuver
 
         """
-        if not isinstance(event,Event):
+        checks = _trust.off or _checks(self,'add_event',event)
+        if checks and not isinstance(event,Event):
             raise TypeError('event input is not of type Event')
         self.events.append(event)
 
@@ -730,7 +759,7 @@ class Maneuver():
 
         return element
 
-class Event():
+class Event(_BaseType):
     """ the Event class creates the event of OpenScenario
         
         Parameters
@@ -770,8 +799,9 @@ class Event():
 
     """
     def __init__(self,name,priority,maxexecution=1):
+        checks = _trust.off or _checks(self,'__init__',name,priority,maxexecution)
         self.name = name
-        if priority not in Priority:
+        if checks and priority not in Priority:
             ValueError('Not a valid priority')
         self.priority = priority
         self.action = []
@@ -786,7 +816,8 @@ class Event():
             trigger (*Trigger): Adds a trigger to start the event (not EmptyTrigger)
 
         """
-        if not isinstance(trigger,_TriggerType):
+        checks = _trust.off or _checks(self,'add_trigger',trigger)
+        if checks and not isinstance(trigger,_TriggerType):
             if isinstance(trigger,_ValueTriggerType):
                 raise TypeError('trigger input is a value trigger condition, please add to a ValueTrigger.')
             elif isinstance(_EntityTriggerType):
@@ -802,7 +833,8 @@ class Event():
                 action (*Action): any action to be added to the event
 
         """
-        if not isinstance(action,_ActionType):
+        checks = _trust.off or _checks(self,'add_action',actionname,action)
+        if checks and not isinstance(action,_ActionType):
             raise TypeError('action input is not a valid Action')
         self.action.append(_Action(actionname,action))
 
@@ -0,0 +1,298 @@
+import atexit
+import contextlib
+import json
+import os
+import sys
+import threading
+import time
+
+
+class Tracer():
+    """ the Tracer records spans (name, start, duration, process and thread) in the
+        Chrome trace event format, which can be opened in chrome://tracing or https://ui.perfetto.dev
+
+        While the tracing is enabled (see enable_tracing) pyoscx records the building of
+        the scenarios, the serialization, the writing, the cache lookups, the simulations
+        and the kpi evaluation of the runners and samplers. Own spans can be added with span().
+
+        Each process records its own events: a forked process starts with an empty Tracer
+        writing to its own file (the filename may contain {pid}), and merge_traces combines
+        the files of all processes. If the filename contains {pid}, the trace of a forked process
+        is written when it exits (also for the processes of multiprocessing), a process ended
+        with os._exit otherwise has to call write() or disable_tracing() itself.
+
+        Parameters
+        ----------
+            filename (str): file written by write() and disable_tracing(), {pid} is replaced by the process id (optional)
+                Default: None
+
+        Attributes
+        ----------
+            filename (str): file written by write() and disable_tracing()
+
+            pid (int): id of the process of the events
+
+            events (list of dict): the recorded trace events
+
+        Methods
+        -------
+            span(name,category,**args)
+                context manager recording a span
+
+            add_span(name,category,start,end,**args)
+                records a span of already measured times
+
+            instant(name,category,**args)
+                records an instant event
+
+            to_dict()
+                returns the trace as a dict
+
+            write(filename)
+                writes the trace as json
+
+    """
+    def __init__(self,filename=None):
+        """ initalize the Tracer
+
+        Parameters
+        ----------
+            filename (str): file written by write() and disable_tracing(), {pid} is replaced by the process id (optional)
+                Default: None
+
+        """
+        self.filename = filename
+        self.pid = os.getpid()
+        self.events = []
+        self._threads = {}
+
+    @contextlib.contextmanager
+    def span(self,name,category='pyoscx',**args):
+        """ span records the time of the with block as a span
+
+            Parameters
+            ----------
+                name (str): name of the span
+
+                category (str): category of the span
+                    Default: pyoscx
+
+                args: values shown with the span (json serializable)
+
+        """
+        start = time.perf_counter_ns()
+        try:
+            yield args
+        finally:
+            self.add_span(name,category,start,time.perf_counter_ns(),**args)
+
+    def add_span(self,name,category,start,end,**args):
+        """ add_span records a span of already measured times
+
+            Parameters
+            ----------
+                name (str): name of the span
+
+                category (str): category of the span
+
+                start (int): start time in ns (time.perf_counter_ns)
+
+                end (int): end time in ns (time.perf_counter_ns)
+
+                args: values shown with the span (json serializable)
+
+        """
+        event = {'name':name,'cat':category,'ph':'X','ts':start/1000,'dur':(end - start)/1000,'pid':self.pid,'tid':self._thread()}
+        if args:
+            event['args'] = args
+        self.events.append(event)
+
+    def instant(self,name,category='pyoscx',**args):
+        """ instant records an event without duration
+
+            Parameters
+            ----------
+                name (str): name of the event
+
+                category (str): category of the event
+                    Default: pyoscx
+
+                args: values shown with the event (json serializable)
+
+        """
+        event = {'name':name,'cat':category,'ph':'i','s':'t','ts':time.perf_counter_ns()/1000,'pid':self.pid,'tid':self._thread()}
+        if args:
+            event['args'] = args
+        self.events.append(event)
+
+    def _thread(self):
+        """ returns the id of the current thread, and remembers its name
+
+        """
+        tid = threading.get_ident()
+        if tid not in self._threads:
+            self._threads[tid] = threading.current_thread().name
+        return tid
+
+    def to_dict(self):
+        """ to_dict returns the trace, with the names of the process and the threads
+
+            Returns
+            -------
+                dict
+
+        """
+        metadata = [{'name':'process_name','ph':'M','pid':self.pid,'tid':0,'args':{'name':'pyoscx ' + str(self.pid)}}]
+        for tid, name in list(self._threads.items()):
+            metadata.append({'name':'thread_name','ph':'M','pid':self.pid,'tid':tid,'args':{'name':name}})
+        return {'traceEvents':metadata + list(self.events),'displayTimeUnit':'ms'}
+
+    def write(self,filename=None):
+        """ write writes the trace as json
+
+            Parameters
+            ----------
+                filename (str): the file, {pid} is replaced by the process id
+                    Default: None (filename of the Tracer)
+
+            Returns
+            -------
+                str, the written file
+
+        """
+        if filename is None:
+            filename = self.filename
+        if filename is None:
+            raise ValueError('no filename given for the trace')
+        filename = filename.replace('{pid}',str(self.pid))
+        with open(filename,'w') as f:
+            json.dump(self.to_dict(),f)
+        return filename
+
+
+def merge_traces(filenames,output):
+    """ merge_traces combines the traces of several processes to one file
+
+        Parameters
+        ----------
+            filenames (list of str): the trace files
+
+            output (str): the combined trace file
+
+    """
+    events = []
+    for filename in filenames:
+        with open(filename) as f:
+            events += json.load(f)['traceEvents']
+    with open(output,'w') as f:
+        json.dump({'traceEvents':events,'displayTimeUnit':'ms'},f)
+
+
+class _TraceState():
+    """ the state of the tracing
+
+    """
+    def __init__(self):
+        # the active Tracer, None while the tracing is disabled
+        self.tracer = None
+
+_tracing = _TraceState()
+
+
+def enable_tracing(filename=None):
+    """ enable_tracing starts recording spans (see Tracer)
+
+        Parameters
+        ----------
+            filename (str): file written when the tracing is disabled, {pid} is replaced by the process id (optional)
+                Default: None
+
+        Returns
+        -------
+            Tracer
+
+    """
+    _tracing.tracer = Tracer(filename)
+    return _tracing.tracer
+
+
+def disable_tracing():
+    """ disable_tracing stops recording and writes the trace if the Tracer has a filename
+
+        Returns
+        -------
+            Tracer, the recorded trace (None if the tracing was not enabled)
+
+    """
+    tracer = _tracing.tracer
+    _tracing.tracer = None
+    if tracer is not None and tracer.filename is not None:
+        tracer.write()
+    return tracer
+
+
+@contextlib.contextmanager
+def tracing(filename=None):
+    """ context manager for the tracing (see enable_tracing), yields the Tracer
+
+        Parameters
+        ----------
+            filename (str): file written at the end, {pid} is replaced by the process id (optional)
+                Default: None
+
+        Example
+        -------
+            with tracing('sweep-{pid}.json'):
+                runner.run_batch(scenarios)
+
+    """
+    previous = _tracing.tracer
+    tracer = enable_tracing(filename)
+    try:
+        yield tracer
+    finally:
+        disable_tracing()
+        _tracing.tracer = previous
+
+
+def _span(name,category,**args):
+    """ returns the span context manager of the active Tracer, or a context manager doing nothing
+
+    """
+    tracer = _tracing.tracer
+    if tracer is None:
+        # the arguments are a new dict for each call, the caller may add results to them
+        return contextlib.nullcontext(args)
+    return tracer.span(name,category,**args)
+
+
+def _after_fork():
+    """ a forked process records its own events
+
+    """
+    tracer = _tracing.tracer
+    if tracer is not None:
+        tracer = _tracing.tracer = Tracer(tracer.filename)
+        if tracer.filename is not None and '{pid}' in tracer.filename:
+            atexit.register(_write_at_exit,tracer)
+            util = sys.modules.get('multiprocessing.util')
+            if util is not None:
+                # multiprocessing ends its processes with os._exit, after running its finalizers,
+                # which are cleared in the new process before its after fork functions run
+                util.register_after_fork(tracer,_finalize_at_exit)
+
+def _finalize_at_exit(tracer):
+    """ writes the trace of a process of multiprocessing when it exits
+
+    """
+    sys.modules['multiprocessing.util'].Finalize(None,_write_at_exit,args=(tracer,),exitpriority=0)
+
+def _write_at_exit(tracer):
+    """ writes the trace of a forked process when it exits, unless the tracing was disabled (and written) before
+
+    """
+    if _tracing.tracer is tracer:
+        disable_tracing()
+
+if hasattr(os,'register_at_fork'):
+    os.register_at_fork(after_in_child=_after_fork)
@@ -1,6 +1,6 @@
 import xml.etree.ElementTree as ET
 
-from .utils import EntityRef, convert_bool, _PositionType, _ValueTriggerType, _EntityTriggerType, _TriggerType
+from .utils import EntityRef, convert_bool, convert_float, _PositionType, _ValueTriggerType, _EntityTriggerType, _TriggerType, _BaseType, _checks, _trust
 from .enumerations import Rule, ConditionEdge, TriggeringEntitiesRule, RelativeDistanceType, StoryboardElementType, StoryboardElementState
 
 
@@ -31,7 +31,8 @@ class EmptyTrigger(_TriggerType):
             triggeringpoint (str): start or stop 
 
         """
-        if triggeringpoint not in ['start','stop']:
+        checks = _trust.off or _checks(self,'__init__',triggeringpoint)
+        if checks and triggeringpoint not in ['start','stop']:
             raise ValueError('not a valid triggering point, valid start or stop')
         if triggeringpoint == 'start':
             self._triggerpoint = 'StartTrigger'
@@ -77,7 +78,8 @@ class Trigger(_TriggerType):
             triggeringpoint (str): start or stop
          
         """
-        if triggeringpoint not in ['start','stop']:
+        checks = _trust.off or _checks(self,'__init__',triggeringpoint)
+        if checks and triggeringpoint not in ['start','stop']:
             raise ValueError('not a valid triggering point, valid start or stop')
         if triggeringpoint == 'start':
             self._triggerpoint = 'StartTrigger'
@@ -93,7 +95,8 @@ class Trigger(_TriggerType):
             conditiongroup (ConditionGroup): a conditiongroup to add to the trigger
          
         """
-        if not isinstance(conditiongroup,ConditionGroup):
+        checks = _trust.off or _checks(self,'add_conditiongroup',conditiongroup)
+        if checks and not isinstance(conditiongroup,ConditionGroup):
             raise TypeError('conditiongroup input not of type ConditionGroup')   
         conditiongroup._set_used_by_parent()
         self.conditiongroups.append(conditiongroup)
@@ -140,7 +143,8 @@ class ConditionGroup(_TriggerType):
             triggeringpoint (str): start or stop
          
         """
-        if triggeringpoint not in ['start','stop']:
+        checks = _trust.off or _checks(self,'__init__',triggeringpoint)
+        if checks and triggeringpoint not in ['start','stop']:
             raise ValueError('not a valid triggering point, valid start or stop')
         if triggeringpoint == 'start':
             self._triggerpoint = 'StartTrigger'
@@ -156,7 +160,8 @@ class ConditionGroup(_TriggerType):
                 condition (EntityTrigger, or ValueTrigger): a condition to add to the ConditionGroup
          
         """
-        if not ( isinstance(condition,EntityTrigger) or isinstance(condition,ValueTrigger)):
+        checks = _trust.off or _checks(self,'add_condition',condition)
+        if checks and not ( isinstance(condition,EntityTrigger) or isinstance(condition,ValueTrigger)):
             raise TypeError('condition input not of type EntityTrigger or ValueTrigger')   
         condition._set_used_by_parent()
         self.conditions.append(condition)
@@ -174,18 +179,19 @@ class ConditionGroup(_TriggerType):
         """
         if not self.conditions:
             raise ValueError('No conditions were added to the ConditionGroup')
-        condgroup = ET.Element('ConditionGroup')
-
-        for c in self.conditions:
-            condgroup.append(c.get_element())
-
+        # the elements are created in document order, so they can be streamed (see serializers)
         if self._used_by_parent:
-            return condgroup
+            element = ET.Element('ConditionGroup')
+            condgroup = element
         else:
             # could create a new Trigger here, but went with this solution for now
             element = ET.Element(self._triggerpoint)
-            element.append(condgroup)
-            return element
+            condgroup = ET.SubElement(element,'ConditionGroup')
+
+        for c in self.conditions:
+            condgroup.append(c.get_element())
+
+        return element
 
 
 
@@ -251,8 +257,9 @@ class EntityTrigger(_TriggerType):
             triggeringpoint (str): start or stop 
     
         """
+        checks = _trust.off or _checks(self,'__init__',name,delay,conditionedge,entitycondition,triggerentity,triggeringrule,triggeringpoint)
         self.name = name
-        if triggeringpoint not in ['start','stop']:
+        if checks and triggeringpoint not in ['start','stop']:
             raise ValueError('not a valid triggering point, valid start or stop')
         if triggeringpoint == 'start':
             self._triggerpoint = 'StartTrigger'
@@ -260,10 +267,10 @@ class EntityTrigger(_TriggerType):
             self._triggerpoint = 'StopTrigger'
             
         self.delay = delay
-        if conditionedge not in ConditionEdge:
+        if checks and conditionedge not in ConditionEdge:
             raise ValueError('not a valid condition edge')
         self.conditionedge = conditionedge
-        if not isinstance(entitycondition,_EntityTriggerType):
+        if checks and not isinstance(entitycondition,_EntityTriggerType):
             raise TypeError('entitycondition is not a valid EntityCondition')
         self.entitycondition = entitycondition
         self.triggerentity = TriggeringEntities(triggeringrule)
@@ -289,26 +296,24 @@ class EntityTrigger(_TriggerType):
         """ returns the attributes of the LaneOffsetAction as a dict
 
         """
-        return {'name':self.name,'delay':str(self.delay),'conditionEdge':self.conditionedge.name}
+        return {'name':self.name,'delay':convert_float(self.delay,'time'),'conditionEdge':self.conditionedge.name}
 
     def get_element(self):
         """ returns the elementTree of the LaneOffsetAction
 
         """
-        condition = ET.Element('Condition',attrib=self.get_attributes())
-        byentity = ET.SubElement(condition,'ByEntityCondition')
-        byentity.append(self.triggerentity.get_element())
-        byentity.append(self.entitycondition.get_element())
-
-
         if self._used_by_parent:
-            return condition
+            element = ET.Element('Condition',attrib=self.get_attributes())
+            condition = element
         else:
             # could create a new Trigger ConditionGroup here, but went with this solution for now
             element = ET.Element(self._triggerpoint)
             condgroup = ET.SubElement(element,'ConditionGroup')
-            condgroup.append(condition)
-            return element
+            condition = ET.SubElement(condgroup,'Condition',attrib=self.get_attributes())
+        byentity = ET.SubElement(condition,'ByEntityCondition')
+        byentity.append(self.triggerentity.get_element())
+        byentity.append(self.entitycondition.get_element())
+        return element
 
 
 
@@ -375,8 +380,9 @@ class ValueTrigger(_TriggerType):
             triggeringpoint (str): start or stop 
 
         """
+        checks = _trust.off or _checks(self,'__init__',name,delay,conditionedge,valuecondition,triggeringpoint)
         self.name = name
-        if triggeringpoint not in ['start','stop']:
+        if checks and triggeringpoint not in ['start','stop']:
             raise ValueError('not a valid triggering point, valid start or stop')
         if triggeringpoint == 'start':
             self._triggerpoint = 'StartTrigger'
@@ -384,10 +390,10 @@ class ValueTrigger(_TriggerType):
             self._triggerpoint = 'StopTrigger'
             
         self.delay = delay
-        if conditionedge not in ConditionEdge:
+        if checks and conditionedge not in ConditionEdge:
             raise ValueError('not a valid condition edge')
         self.conditionedge = conditionedge
-        if not isinstance(valuecondition,_ValueTriggerType):
+        if checks and not isinstance(valuecondition,_ValueTriggerType):
             raise TypeError('entitycondition is not a valid EntityCondition')
         self.valuecondition = valuecondition
         self._used_by_parent = False
@@ -402,26 +408,26 @@ class ValueTrigger(_TriggerType):
         """ returns the attributes of the LaneOffsetAction as a dict
 
         """
-        return {'name':self.name,'delay':str(self.delay),'conditionEdge':self.conditionedge.name}
+        return {'name':self.name,'delay':convert_float(self.delay,'time'),'conditionEdge':self.conditionedge.name}
 
     def get_element(self):
         """ returns the elementTree of the LaneOffsetAction
 
         """
-        condition = ET.Element('Condition',attrib=self.get_attributes())
-        byvalue = ET.SubElement(condition,'ByValueCondition')
-        byvalue.append(self.valuecondition.get_element())
         if self._used_by_parent:
-            return condition
+            element = ET.Element('Condition',attrib=self.get_attributes())
+            condition = element
         else:
             # could create a new Trigger ConditionGroup here, but went with this solution for now
             element = ET.Element(self._triggerpoint)
             condgroup = ET.SubElement(element,'ConditionGroup')
-            condgroup.append(condition)
-            return element
+            condition = ET.SubElement(condgroup,'Condition',attrib=self.get_attributes())
+        byvalue = ET.SubElement(condition,'ByValueCondition')
+        byvalue.append(self.valuecondition.get_element())
+        return element
 
 
-class TriggeringEntities():
+class TriggeringEntities(_BaseType):
     """ the TriggeringEntities class is used by Value and Entity Triggers to defined the trigger entity
         
         Parameters
@@ -456,7 +462,8 @@ class TriggeringEntities():
             triggeringrule (str): all or any
 
         """
-        if triggeringrule not in TriggeringEntitiesRule:
+        checks = _trust.off or _checks(self,'__init__',triggeringrule)
+        if checks and triggeringrule not in TriggeringEntitiesRule:
             raise ValueError('not a vaild triggering rule')
         self.entity = [] 
         self.triggeringrule = triggeringrule
@@ -527,7 +534,7 @@ class EndOfRoadCondition(_EntityTriggerType):
         """ returns the attributes of the EndOfRoadCondition as a dict
 
         """
-        return {'duration':str(self.duration)}
+        return {'duration':convert_float(self.duration,'time')}
 
     def get_element(self):
         """ returns the elementTree of the EndOfRoadCondition
@@ -614,7 +621,7 @@ class OffroadCondition(_EntityTriggerType):
         """ returns the attributes of the OffroadCondition as a dict
 
         """
-        return {'duration':str(self.duration)}
+        return {'duration':convert_float(self.duration,'time')}
 
     def get_element(self):
         """ returns the elementTree of the OffroadCondition
@@ -680,15 +687,16 @@ class TimeHeadwayCondition(_EntityTriggerType):
                 Default: True
 
         """
+        checks = _trust.off or _checks(self,'__init__',entity,value,rule,alongroute,freespace)
         self.entity = entity
         self.value = value
-        if not isinstance(alongroute,bool):
+        if checks and not isinstance(alongroute,bool):
             raise TypeError('alongroute input not of type bool')
-        if not isinstance(freespace,bool):
+        if checks and not isinstance(freespace,bool):
             raise TypeError('freespace input not of type bool')
         self.alongroute = alongroute
         self.freespace = freespace
-        if rule not in Rule:
+        if checks and rule not in Rule:
             raise ValueError(rule + '; is not a valid rule.')
         self.rule = rule
 
@@ -698,7 +706,7 @@ class TimeHeadwayCondition(_EntityTriggerType):
         """
         basedict = {}
         basedict['entityRef'] = self.entity
-        basedict['value'] = str(self.value)
+        basedict['value'] = convert_float(self.value,'time')
         basedict['alongRoute'] = convert_bool(self.alongroute)
         basedict['freespace'] = convert_bool(self.freespace)
         basedict['rule'] = self.rule.name
@@ -781,24 +789,25 @@ class TimeToCollisionCondition(_EntityTriggerType):
                 position (*Position): a position for collision
         
         """
+        checks = _trust.off or _checks(self,'__init__',value,rule,alongroute,freespace,entity,position)
         self.value = value
-        if not isinstance(alongroute,bool):
+        if checks and not isinstance(alongroute,bool):
             raise TypeError('alongroute input not of type bool')
-        if not isinstance(freespace,bool):
+        if checks and not isinstance(freespace,bool):
             raise TypeError('freespace input not of type bool')
         self.freespace = freespace
         self.alongroute = alongroute
-        if rule not in Rule:
+        if checks and rule not in Rule:
             raise ValueError(rule + '; is not a valid rule.')
         self.rule = rule
         self.use_entity = None
-        if (entity !=None) and (position !=None):
+        if checks and (entity !=None) and (position !=None):
             raise ValueError('Can only have either entity of position, not both')
         if entity:
             self.entity = EntityRef(entity)
             self.use_entity = True
         if position:
-            if not isinstance(position,_PositionType):
+            if checks and not isinstance(position,_PositionType):
                 raise TypeError('input position is not a valid Position')
             self.position = position
             self.use_entity = False
@@ -808,7 +817,7 @@ class TimeToCollisionCondition(_EntityTriggerType):
 
         """
         basedict = {}
-        basedict['value'] = str(self.value)
+        basedict['value'] = convert_float(self.value,'time')
         basedict['alongRoute'] = convert_bool(self.alongroute)
         basedict['freespace'] = convert_bool(self.freespace)
         basedict['rule'] = self.rule.name
@@ -869,8 +878,9 @@ class AccelerationCondition(_EntityTriggerType):
 
             rule (Rule): condition rule of triggering 
         """
+        checks = _trust.off or _checks(self,'__init__',value,rule)
         self.value = value
-        if rule not in Rule:
+        if checks and rule not in Rule:
             raise ValueError(rule + '; is not a valid rule.')
         self.rule = rule
         
@@ -878,7 +888,7 @@ class AccelerationCondition(_EntityTriggerType):
         """ returns the attributes of the AccelerationCondition as a dict
 
         """
-        return {'value':str(self.value),'rule':self.rule.name}
+        return {'value':convert_float(self.value),'rule':self.rule.name}
 
     def get_element(self):
         """ returns the elementTree of the AccelerationCondition
@@ -921,7 +931,7 @@ class StandStillCondition(_EntityTriggerType):
         """ returns the attributes of the StandStillCondition as a dict
 
         """
-        return {'duration':str(self.duration)}
+        return {'duration':convert_float(self.duration,'time')}
 
     def get_element(self):
         """ returns the elementTree of the StandStillCondition
@@ -964,8 +974,9 @@ class SpeedCondition(_EntityTriggerType):
 
             rule (Rule): condition rule of triggering 
         """
+        checks = _trust.off or _checks(self,'__init__',value,rule)
         self.value = value
-        if rule not in Rule:
+        if checks and rule not in Rule:
             raise ValueError(rule + '; is not a valid rule.')
         self.rule = rule
         
@@ -974,10 +985,10 @@ class SpeedCondition(_EntityTriggerType):
 
         """
         basedict = {}
-        basedict['value'] = str(self.value)
+        basedict['value'] = convert_float(self.value,'speed')
         basedict['rule'] = self.rule.name
         return basedict
-        # return merge_dicts({'value':str(self.value)},self.rule.get_attributes())
+        # return merge_dicts({'value':convert_float(self.value)},self.rule.get_attributes())
 
     def get_element(self):
         """ returns the elementTree of the SpeedCondition
@@ -1027,8 +1038,9 @@ class RelativeSpeedCondition(_EntityTriggerType):
             entity (str): name of the entity to be relative to
             
         """
+        checks = _trust.off or _checks(self,'__init__',value,rule,entity)
         self.value = value
-        if rule not in Rule:
+        if checks and rule not in Rule:
             raise ValueError(rule + '; is not a valid rule.')
         self.rule = rule
         self.entity = entity
@@ -1038,11 +1050,11 @@ class RelativeSpeedCondition(_EntityTriggerType):
 
         """
         basedict = {}
-        basedict['value'] = str(self.value)
+        basedict['value'] = convert_float(self.value,'speed')
         basedict['rule'] = self.rule.name
         basedict['entityRef'] = self.entity
         return basedict
-        # return merge_dicts({'value':str(self.value),'entityRef':self.entity},self.rule.get_attributes())
+        # return merge_dicts({'value':convert_float(self.value),'entityRef':self.entity},self.rule.get_attributes())
 
     def get_element(self):
         """ returns the elementTree of the RelativeSpeedCondition
@@ -1086,7 +1098,7 @@ class TraveledDistanceCondition(_EntityTriggerType):
         """ returns the attributes of the TraveledDistanceCondition as a dict
 
         """
-        return {'value':str(self.value)}
+        return {'value':convert_float(self.value,'position')}
 
     def get_element(self):
         """ returns the elementTree of the TraveledDistanceCondition
@@ -1130,7 +1142,8 @@ class ReachPositionCondition(_EntityTriggerType):
             tolerance (float): tolerance of the position
 
         """
-        if not (isinstance(position,_PositionType)):
+        checks = _trust.off or _checks(self,'__init__',position,tolerance)
+        if checks and not (isinstance(position,_PositionType)):
             raise TypeError('position input is not a valid Position')
         self.position = position
         self.tolerance = tolerance
@@ -1139,7 +1152,7 @@ class ReachPositionCondition(_EntityTriggerType):
         """ returns the attributes of the ReachPositionCondition as a dict
 
         """
-        return {'tolerance':str(self.tolerance)}
+        return {'tolerance':convert_float(self.tolerance,'position')}
         
 
     def get_element(self):
@@ -1190,13 +1203,14 @@ class DistanceCondition(_EntityTriggerType):
 
     """
     def __init__(self,value,rule,position,alongroute=True,freespace=True):
+        checks = _trust.off or _checks(self,'__init__',value,rule,position,alongroute,freespace)
         self.value = value
         self.alongroute = alongroute
         self.freespace = freespace
-        if rule not in Rule:
+        if checks and rule not in Rule:
             raise ValueError(rule + '; is not a valid rule.')
         self.rule = rule
-        if not (isinstance(position,_PositionType)):
+        if checks and not (isinstance(position,_PositionType)):
             raise TypeError('position input is not a valid Position')
         self.position = position
 
@@ -1205,7 +1219,7 @@ class DistanceCondition(_EntityTriggerType):
 
         """
         basedict = {}
-        basedict['value'] = str(self.value)
+        basedict['value'] = convert_float(self.value,'position')
         basedict['alongRoute'] = convert_bool(self.alongroute)
         basedict['freespace'] = convert_bool(self.freespace)
         basedict['rule'] = self.rule.name
@@ -1274,15 +1288,16 @@ class RelativeDistanceCondition(_EntityTriggerType):
                 Default: True
 
         """
+        checks = _trust.off or _checks(self,'__init__',value,rule,dist_type,entity,alongroute,freespace)
         self.value = value
-        if not isinstance(freespace,bool):
+        if checks and not isinstance(freespace,bool):
             raise TypeError('freespace input not of type bool')
         self.alongroute = alongroute
         self.freespace = freespace
-        if dist_type not in RelativeDistanceType:
+        if checks and dist_type not in RelativeDistanceType:
             raise TypeError('dist_type is not of type RelativeDistanceType')
         self.dist_type = dist_type
-        if rule not in Rule:
+        if checks and rule not in Rule:
             raise ValueError(rule + '; is not a valid rule.')
         self.rule = rule
         self.entity = entity
@@ -1292,7 +1307,7 @@ class RelativeDistanceCondition(_EntityTriggerType):
 
         """
         basedict = {}
-        basedict['value'] = str(self.value)
+        basedict['value'] = convert_float(self.value,'position')
         basedict['freespace'] = convert_bool(self.freespace)
         basedict['entityRef'] = self.entity
         basedict['rule'] = self.rule.name
@@ -1354,9 +1369,10 @@ class ParameterCondition(_ValueTriggerType):
                 rule (Rule): condition rule of triggering 
 
         """
+        checks = _trust.off or _checks(self,'__init__',parameter,value,rule)
         self.parameter = parameter
         self.value = value
-        if rule not in Rule:
+        if checks and rule not in Rule:
             raise ValueError(rule + '; is not a valid rule.')
         self.rule = rule
         
@@ -1364,7 +1380,7 @@ class ParameterCondition(_ValueTriggerType):
         """ returns the attributes of the ParameterCondition as a dict
 
         """
-        basedict = {'parameterRef':self.parameter,'value':str(self.value)}
+        basedict = {'parameterRef':self.parameter,'value':convert_float(self.value)}
         basedict['rule'] = self.rule.name
         return basedict
 
@@ -1407,7 +1423,8 @@ class TimeOfDayCondition(_ValueTriggerType):
                 time of day (str): datetime ??? format unknown
             
         """
-        if rule not in Rule:
+        checks = _trust.off or _checks(self,'__init__',rule,datetime)
+        if checks and rule not in Rule:
             raise ValueError(rule + '; is not a valid rule.')
         self.rule = rule
         self.datetime = datetime
@@ -1461,8 +1478,9 @@ class SimulationTimeCondition(_ValueTriggerType):
 
                 rule (Rule): condition rule of triggering 
         """
+        checks = _trust.off or _checks(self,'__init__',value,rule)
         self.value = value
-        if rule not in Rule:
+        if checks and rule not in Rule:
             raise ValueError(rule + '; is not a valid rule.')
         self.rule = rule
     
@@ -1471,7 +1489,7 @@ class SimulationTimeCondition(_ValueTriggerType):
 
         """
         basedict = {}
-        basedict['value'] = str(self.value)
+        basedict['value'] = convert_float(self.value,'time')
         basedict['rule'] = self.rule.name
         return basedict
     def get_element(self):
@@ -1519,9 +1537,10 @@ class StoryboardElementStateCondition(_ValueTriggerType):
 
                 state (StoryboardElementType): state to trigger on
         """
-        if element not in StoryboardElementType:
+        checks = _trust.off or _checks(self,'__init__',element,reference,state)
+        if checks and element not in StoryboardElementType:
             raise TypeError('element input is not of type StoryBoardElementType')
-        if state not in StoryboardElementState:
+        if checks and state not in StoryboardElementState:
             raise TypeError('state input is not of type StoryBoardElementState')
         self.element = element
         self.reference = reference
@@ -1578,9 +1597,10 @@ class UserDefinedValueCondition(_ValueTriggerType):
 
                 rule (Rule): condition rule of triggering 
         """
+        checks = _trust.off or _checks(self,'__init__',name,value,rule)
         self.name = name
         self.value = value
-        if rule not in Rule:
+        if checks and rule not in Rule:
             raise ValueError(rule + '; is not a valid rule.')
         self.rule = rule
     
@@ -1588,7 +1608,7 @@ class UserDefinedValueCondition(_ValueTriggerType):
         """ returns the attributes of the UserDefinedValueCondition as a dict
 
         """
-        basedict = {'name':self.name,'value':str(self.value)}
+        basedict = {'name':self.name,'value':convert_float(self.value)}
         basedict['rule'] = self.rule.name
         return basedict
     def get_element(self):
@@ -1,31 +1,754 @@
 import os
+import contextlib
+import functools
+import hashlib
+import math
+import numbers
+import threading
+import weakref
 import xml.etree.ElementTree as ET
-from .helpers import printToFile
+from enum import Enum
+from .helpers import printToFile, CANONICAL_DATE, _register_fragment
 
 from .enumerations import ParameterType, Rule, ReferenceContext, DynamicsShapes, DynamicsDimension, RouteStrategy,XSI,XMLNS, VehicleCategory,PrecipitationType,CloudState
 import datetime as dt
 
-class _PositionType():
+class _BaseType():
+    """ base class of all pyoscx classes, adds a structural hash and structural comparison
+
+        The fingerprint is computed from the type and all attributes of the object,
+        where sub-objects contribute with their own fingerprints and lists keep their order.
+        The creation date of the FileHeader is not part of it, so two identically built
+        scenarios have the same fingerprint.
+
+        NOTE: the hash changes if the object changes, so do not change an object
+        while it is used as a key in a dict or a set.
+
+        When the element cache is enabled (see enable_element_cache) the element
+        and the fingerprint of each object are kept until the object, or any object
+        in it, is changed.
+
+        Methods
+        -------
+            clone()
+                Returns a copy on write copy of the object
+
+            validate()
+                Runs the checks skipped by the trusted construction on the object and everything in it
+
+            fingerprint()
+                Returns the structural hash of the object as a hex string
+
+            invalidate()
+                Drops the cached element of the object and of all objects containing it
+
+    """
+    # attributes that are not part of the structure (e.g. caches)
+    _FINGERPRINT_IGNORE = ()
+
+    # if the element of the class may be cached (not for elements with a creation time)
+    _CACHE_ELEMENT = True
+
+    def __init_subclass__(cls,**kwargs):
+        super().__init_subclass__(**kwargs)
+        if _element_cache.installed:
+            _install_cache(cls)
+        if _profile.profile is not None:
+            _profile.install(cls)
+
+    def __getstate__(self):
+        # caches, parent links and the interning are not copied or pickled
+        state = dict(_attributes(self))
+        for name in _CACHE_ATTRIBUTES:
+            state.pop(name,None)
+        return state
+
+    def __getattr__(self,name):
+        # only called for attributes missing in __dict__, i.e. the not yet copied attributes of a clone
+        shared = self.__dict__.get('_cow_shared')
+        if not shared or name not in shared:
+            raise AttributeError(type(self).__name__ + ' object has no attribute ' + repr(name))
+        if '_xml_frozen' in self.__dict__:
+            return shared[name]
+        with _cow_lock:
+            # another thread may have copied it in the meantime
+            if name in self.__dict__:
+                return self.__dict__[name]
+            value = _materialize(shared.pop(name))
+            if not shared:
+                del self.__dict__['_cow_shared']
+            self.__dict__[name] = value
+            _register_parent(self,value)
+        return value
+
+    def clone(self):
+        """ clone returns a copy of the object that shares all unchanged parts with it
+
+            The parts of the clone are copied (one level at a time) when they are reached
+            through the attributes of the clone, so changing the clone with attribute setters
+            or add_ methods only copies the path to the change. The original object (and
+            everything in it) becomes unchangeable, setting an attribute or calling an add_
+            method on it raises an AttributeError; clone it again to get another variant.
+            Lists and dicts of the original must not be changed directly.
+
+            Together with enable_element_cache, writing the clones reuses the elements of the shared parts.
+
+            Returns: same type as the object
+
+        """
+        _freeze(self)
+        return _lazy_copy(self)
+
+    def invalidate(self):
+        """ invalidate drops the cached element of the object and of all objects containing it,
+            only needed if a list of the object was changed directly (not with an add_ method)
+
+        """
+        stack = [self]
+        seen = set()
+        while stack:
+            obj = stack.pop()
+            if id(obj) in seen:
+                continue
+            seen.add(id(obj))
+            attributes = obj.__dict__
+            attributes.pop('_xml_cache',None)
+            parents = attributes.get('_xml_parents')
+            if parents:
+                for key, ref in list(parents.items()):
+                    parent = ref()
+                    if parent is None:
+                        del parents[key]
+                    else:
+                        stack.append(parent)
+
+    def validate(self):
+        """ validate runs the checks that were skipped by the trusted construction (see enable_trusted_construction)
+            for the object and all objects in it, by repeating their recorded constructor and add_ calls
+            on scratch objects
+
+            Raises the TypeError or ValueError of the first failing check.
+
+        """
+        objects = [obj for obj in _objects(self).values() if obj.__dict__.get('_trusted_calls')]
+        with _trust_mode(None):
+            for obj in objects:
+                calls = obj.__dict__['_trusted_calls']
+                scratch = object.__new__(type(obj))
+                if calls[0][0] != '__init__':
+                    # created with checks, the add_ calls are repeated on a copy of its lists
+                    scratch.__dict__.update(_copy_containers({k: v for k, v in obj.__dict__.items() if k not in _CACHE_ATTRIBUTES}))
+                for call in list(calls):
+                    method = getattr(type(obj),call[0])
+                    # without the invalidating wrapper of the element cache
+                    getattr(method,'_uncached',method)(scratch,*call[1:])
+        for obj in objects:
+            obj.__dict__.pop('_trusted_calls',None)
+
+    def fingerprint(self):
+        """ fingerprint returns a canonical, order aware, structural hash of the object
+
+            Returns: str
+
+        """
+        return self._digest({}).hex()
+
+    def _digest(self,memo):
+        """ _digest computes the hash of the object from the hashes of its children
+
+            Parameters
+            ----------
+                memo (dict): digests already computed in this call, by id
+
+        """
+        digest = memo.get(id(self))
+        if digest is None:
+            cache = None
+            if _element_cache.enabled or '_xml_frozen' in self.__dict__:
+                cache = _object_cache(self)
+                digest = cache.get('digest')
+                if digest is not None:
+                    memo[id(self)] = digest
+                    return digest
+            hasher = hashlib.blake2b(digest_size=16)
+            hasher.update(type(self).__qualname__.encode())
+            attributes = _attributes(self)
+            for name in sorted(attributes):
+                if name not in self._FINGERPRINT_IGNORE and name not in _CACHE_ATTRIBUTES:
+                    hasher.update(name.encode() + b'=')
+                    _update_hash(hasher,attributes[name],memo)
+            digest = memo[id(self)] = hasher.digest()
+            if cache is not None:
+                cache['digest'] = digest
+                _register_children(self)
+        return digest
+
+    def __eq__(self,other):
+        if not isinstance(other,_BaseType):
+            return NotImplemented
+        return type(self) is type(other) and self._digest({}) == other._digest({})
+
+    def __hash__(self):
+        return int.from_bytes(self._digest({})[:8],'little')
+
+def _update_hash(hasher,value,memo):
+    """ adds a value to a hash, all values are tagged with their type so the encoding is unambiguous
+
+    """
+    if value is None:
+        hasher.update(b'N')
+    elif isinstance(value,_BaseType):
+        hasher.update(b'o' + value._digest(memo))
+    elif isinstance(value,bool):
+        hasher.update(b'T' if value else b'F')
+    elif isinstance(value,int):
+        hasher.update(b'i' + str(value).encode() + b';')
+    elif isinstance(value,float):
+        hasher.update(b'f' + repr(value).encode() + b';')
+    elif isinstance(value,str):
+        encoded = value.encode()
+        hasher.update(b's' + str(len(encoded)).encode() + b':' + encoded)
+    elif isinstance(value,Enum):
+        hasher.update(b'e' + type(value).__qualname__.encode() + b'.' + value.name.encode() + b';')
+    elif isinstance(value,(list,tuple)):
+        hasher.update(b'l' + str(len(value)).encode() + b':')
+        for v in value:
+            _update_hash(hasher,v,memo)
+    elif isinstance(value,dict):
+        hasher.update(b'd' + str(len(value)).encode() + b':')
+        for k, v in value.items():
+            _update_hash(hasher,k,memo)
+            _update_hash(hasher,v,memo)
+    elif isinstance(value,ET.Element):
+        encoded = ET.tostring(value)
+        hasher.update(b'x' + str(len(encoded)).encode() + b':' + encoded)
+    else:
+        encoded = (type(value).__qualname__ + ':' + repr(value)).encode()
+        hasher.update(b'r' + str(len(encoded)).encode() + b':' + encoded)
+
+class _ElementCacheState():
+    """ the state of the element cache and of the interning, an epoch change invalidates all cached elements
+
+    """
+    def __init__(self):
+        self.enabled = False
+        self.interning = False
+        # weak references to the objects frozen by clone(), the hooks stay installed while any of them is alive
+        self.frozen = set()
+        self.installed = False
+        self.epoch = 0
+
+_element_cache = _ElementCacheState()
+
+# interned objects, by class and constructor arguments
+_interned = {}
+
+# serializes the installing and removing of the hooks, which may happen when a frozen object is collected
+_hooks_lock = threading.RLock()
+
+# serializes the copying of the attributes of clones, which may be read from several threads
+_cow_lock = threading.RLock()
+
+# a lock for each catalog file, for the read, add and write of dump_to_catalog and append_to_catalog
+_catalog_locks = {}
+_catalog_locks_lock = threading.Lock()
+
+def _catalog_lock(filename):
+    """ returns the lock of a catalog file
+
+    """
+    key = os.path.abspath(filename)
+    with _catalog_locks_lock:
+        lock = _catalog_locks.get(key)
+        if lock is None:
+            lock = _catalog_locks[key] = threading.Lock()
+    return lock
+
+# attributes used by the cache, the cloning and the trusted construction, not part of the structure
+_CACHE_ATTRIBUTES = ('_xml_cache','_xml_parents','_xml_frozen','_cow_shared','_trusted_calls')
+
+# values of _xml_frozen
+_INTERNED = 'interned'
+_SHARED = 'shared'
+
+def enable_element_cache():
+    """ enable_element_cache makes all objects keep their element (and fingerprint) until they change
+
+        An object is changed by setting an attribute or by calling one of its add_ methods,
+        this invalidates the object and every object containing it, so writing a scenario
+        again only rebuilds the changed parts. Lists changed directly need a call to invalidate().
+
+    """
+    if _element_cache.enabled:
+        return
+    _element_cache.enabled = True
+    _element_cache.epoch += 1
+    _update_hooks()
+
+def disable_element_cache():
+    """ disable_element_cache stops caching and tracking of changes
+
+    """
+    if not _element_cache.enabled:
+        return
+    _element_cache.enabled = False
+    _element_cache.epoch += 1
+    _update_hooks()
+
+def enable_interning():
+    """ enable_interning makes the value like classes (TransitionDynamics, DynamicsConstrains,
+        Orientation, EntityRef, BoundingBox, Center, Dimensions and the positions) return
+        one shared instance for equal constructor arguments
+
+        The shared instances can not be changed (setting an attribute raises an AttributeError,
+        a copy.deepcopy gives a changeable copy) and keep their element, so they are serialized once.
+
+    """
+    if _element_cache.interning:
+        return
+    _element_cache.interning = True
+    _update_hooks()
+
+def disable_interning():
+    """ disable_interning stops interning and forgets the shared instances,
+        objects that were created as shared instances stay unchangeable
+
+    """
+    if not _element_cache.interning:
+        return
+    _element_cache.interning = False
+    _interned.clear()
+    _update_hooks()
+
+def _update_hooks():
+    """ installs the caching wrappers and the tracking __setattr__ while caching or interning is enabled,
+        or objects frozen by clone() are alive
+
+    """
+    with _hooks_lock:
+        _set_hooks(_element_cache.enabled or _element_cache.interning or bool(_element_cache.frozen))
+
+def _set_hooks(active):
+    """ installs or removes the caching wrappers and the tracking __setattr__
+
+    """
+    if active and not _element_cache.installed:
+        _element_cache.installed = True
+        for cls in _subclasses(_BaseType):
+            _install_cache(cls)
+        _BaseType.__setattr__ = _tracking_setattr
+    elif not active and _element_cache.installed:
+        _element_cache.installed = False
+        del _BaseType.__setattr__
+        for cls in _subclasses(_BaseType):
+            for name, value in list(vars(cls).items()):
+                original = getattr(value,'_uncached',None)
+                if original is not None:
+                    setattr(cls,name,original)
+
+def _subclasses(cls):
+    """ returns all subclasses of a class
+
+    """
+    found = []
+    stack = [cls]
+    while stack:
+        for sub in stack.pop().__subclasses__():
+            if sub not in found:
+                found.append(sub)
+                stack.append(sub)
+    return found
+
+def _install_cache(cls):
+    """ wraps get_element (caching) and the add_ methods (invalidating) of a class
+
+    """
+    for name, value in list(vars(cls).items()):
+        if not callable(value) or hasattr(value,'_uncached'):
+            continue
+        if name == 'get_element':
+            setattr(cls,name,_cached_get_element(value))
+        elif name.startswith('add_'):
+            setattr(cls,name,_invalidating(value))
+
+def _object_cache(obj):
+    """ returns the cache of an object for the current epoch
+
+    """
+    cache = obj.__dict__.get('_xml_cache')
+    if cache is None or cache['epoch'] != _element_cache.epoch:
+        cache = obj.__dict__['_xml_cache'] = {'epoch':_element_cache.epoch}
+    return cache
+
+def _register_children(obj):
+    """ adds the object as parent to all objects in its attributes
+
+    """
+    _register_parent(obj,[v for k, v in _attributes(obj).items() if k not in _CACHE_ATTRIBUTES])
+
+def _register_parent(obj,value):
+    """ adds the object as parent to all objects in value
+
+    """
+    ref = weakref.ref(obj)
+    stack = [value]
+    while stack:
+        value = stack.pop()
+        if isinstance(value,_BaseType):
+            # frozen objects do not change, and are used by too many parents
+            if '_xml_frozen' not in value.__dict__:
+                value.__dict__.setdefault('_xml_parents',{})[id(obj)] = ref
+        elif isinstance(value,(list,tuple)):
+            stack.extend(value)
+        elif isinstance(value,dict):
+            stack.extend(value.values())
+
+def _cached_get_element(func):
+    """ wraps a get_element method to return the cached element
+
+    """
+    @functools.wraps(func)
+    def get_element(self,*args,**kwargs):
+        if not self._CACHE_ELEMENT or not (_element_cache.enabled or '_xml_frozen' in self.__dict__):
+            return func(self,*args,**kwargs)
+        cache = _object_cache(self)
+        key = (func,args,tuple(sorted(kwargs.items())))
+        element = cache.get(key)
+        if element is None:
+            element = func(self,*args,**kwargs)
+            cache[key] = element
+            _register_fragment(element)
+            _register_children(self)
+        return element
+    get_element._uncached = func
+    return get_element
+
+def _invalidating(func):
+    """ wraps an add_ method to invalidate the object after the change
+
+    """
+    @functools.wraps(func)
+    def method(self,*args,**kwargs):
+        if '_xml_frozen' in self.__dict__:
+            raise _frozen_error(self)
+        result = func(self,*args,**kwargs)
+        if _element_cache.enabled:
+            self.invalidate()
+        return result
+    method._uncached = func
+    return method
+
+def _frozen_error(obj):
+    """ returns the error for a change of an interned or cloned object
+
+    """
+    if obj.__dict__['_xml_frozen'] == _INTERNED:
+        return AttributeError('the interned ' + type(obj).__name__ + ' can not be changed, change a copy.deepcopy of it')
+    return AttributeError('the ' + type(obj).__name__ + ' is shared by clones and can not be changed, change a clone of it')
+
+def _tracking_setattr(self,name,value):
+    """ __setattr__ of all objects while the element cache, the interning or the cloning is used
+
+    """
+    if '_xml_frozen' in self.__dict__:
+        raise _frozen_error(self)
+    shared = self.__dict__.get('_cow_shared')
+    if shared:
+        shared.pop(name,None)
+    object.__setattr__(self,name,value)
+    if _element_cache.enabled and name not in _CACHE_ATTRIBUTES:
+        self.invalidate()
+
+def _attributes(obj):
+    """ returns the attributes of an object, including the not yet copied attributes of a clone
+
+    """
+    attributes = obj.__dict__
+    shared = attributes.get('_cow_shared')
+    if shared:
+        # an attribute set while the hooks were removed is in both, the one in __dict__ is newer
+        shared = dict(shared)
+        shared.update(attributes)
+        attributes = shared
+    return attributes
+
+def _freeze(root):
+    """ makes an object and everything in it unchangeable, so clones can share it
+
+    """
+    frozen = _element_cache.frozen
+    stack = [root]
+    while stack:
+        value = stack.pop()
+        if isinstance(value,_BaseType):
+            if '_xml_frozen' not in value.__dict__:
+                value.__dict__['_xml_frozen'] = _SHARED
+                frozen.add(weakref.ref(value,_unfrozen))
+                if not _element_cache.enabled:
+                    # changes were not tracked, the cache may be outdated
+                    value.__dict__.pop('_xml_cache',None)
+                stack.extend(v for k, v in _attributes(value).items() if k not in _CACHE_ATTRIBUTES)
+        elif isinstance(value,(list,tuple,set,frozenset)):
+            stack.extend(value)
+        elif isinstance(value,dict):
+            stack.extend(value.values())
+    _update_hooks()
+
+def _unfrozen(ref):
+    """ forgets a collected frozen object, and removes the hooks after the last one
+
+    """
+    frozen = _element_cache.frozen
+    frozen.discard(ref)
+    if not frozen and _element_cache.installed:
+        _update_hooks()
+
+def _lazy_copy(obj):
+    """ returns a copy of a frozen object, its changeable attributes are copied when they are first used
+
+    """
+    new = object.__new__(type(obj))
+    attributes = new.__dict__
+    shared = {}
+    for name, value in _attributes(obj).items():
+        if name in _CACHE_ATTRIBUTES:
+            continue
+        if isinstance(value,(list,tuple,dict,set)) or (isinstance(value,_BaseType) and value.__dict__.get('_xml_frozen') != _INTERNED):
+            shared[name] = value
+        else:
+            attributes[name] = value
+    if shared:
+        attributes['_cow_shared'] = shared
+    # the copy has the same content as long as it is not changed
+    if '_xml_cache' in obj.__dict__:
+        attributes['_xml_cache'] = obj.__dict__['_xml_cache']
+    # and the same checks to validate
+    if '_trusted_calls' in obj.__dict__:
+        attributes['_trusted_calls'] = list(obj.__dict__['_trusted_calls'])
+    return new
+
+def _materialize(value):
+    """ returns a changeable copy of a shared value, the objects in it are copied lazily
+
+    """
+    if isinstance(value,_BaseType):
+        if value.__dict__.get('_xml_frozen') == _INTERNED:
+            return value
+        return _lazy_copy(value)
+    if isinstance(value,(list,tuple,set)):
+        return type(value)(_materialize(v) for v in value)
+    if isinstance(value,dict):
+        return {k: _materialize(v) for k, v in value.items()}
+    return value
+
+def _objects(root):
+    """ returns all objects in the tree of root (once each)
+
+    """
+    objects = {}
+    stack = [root]
+    while stack:
+        value = stack.pop()
+        if isinstance(value,_BaseType):
+            if id(value) not in objects:
+                objects[id(value)] = value
+                stack.extend(v for k, v in _attributes(value).items() if k not in _CACHE_ATTRIBUTES)
+        elif isinstance(value,(list,tuple)):
+            stack.extend(value)
+        elif isinstance(value,dict):
+            stack.extend(value.values())
+    return objects
+
+class _TrustState():
+    """ the state of the trusted construction
+
+    """
+    def __init__(self):
+        # the process wide mode (see enable_trusted_construction): None for checked, else if the calls are recorded
+        self.record = None
+        # the mode of a thread in a trusted_construction context, overrides the process wide mode
+        self.local = threading.local()
+        # number of active trusted_construction contexts (of all threads)
+        self.contexts = 0
+        # True while no thread uses the trusted construction, read before calling _checks
+        self.off = True
+        self.lock = threading.Lock()
+
+_trust = _TrustState()
+
+class _ProfileState():
+    """ the state of the profiling (see instrumentation)
+
+    """
+    def __init__(self):
+        # the active Profile, None while the profiling is disabled
+        self.profile = None
+        # installs the instrumentation on a class, set by the instrumentation module
+        self.install = None
+
+_profile = _ProfileState()
+
+def enable_trusted_construction(record=True):
+    """ enable_trusted_construction skips the type and value checks of all constructors and add_ methods,
+        in all threads (see trusted_construction for one thread)
+
+        Only use it for input that is known to be valid (e.g. from a tested generator),
+        wrong input is not reported but gives a broken scenario. The calls can be recorded,
+        so the checks are run once at the end with validate() of the scenario.
+        The recorded calls are kept in the objects until they are validated.
+
+        Parameters
+        ----------
+            record (bool): record the calls for validate()
+                Default: True
+
+    """
+    with _trust.lock:
+        _trust.record = bool(record)
+        _trust.off = False
+
+def disable_trusted_construction():
+    """ disable_trusted_construction runs the checks again (except in the threads in a trusted_construction context)
+
+    """
+    with _trust.lock:
+        _trust.record = None
+        _trust.off = _trust.contexts == 0
+
+@contextlib.contextmanager
+def trusted_construction(record=True):
+    """ context manager for the trusted construction (see enable_trusted_construction),
+        only the calls of the current thread skip their checks
+
+        Parameters
+        ----------
+            record (bool): record the calls for validate()
+                Default: True
+
+        Example
+        -------
+            with trusted_construction():
+                scenario = build_scenario()
+            scenario.validate()
+
+    """
+    with _trust.lock:
+        _trust.contexts += 1
+        _trust.off = False
+    try:
+        with _trust_mode(bool(record)):
+            yield
+    finally:
+        with _trust.lock:
+            _trust.contexts -= 1
+            _trust.off = _trust.record is None and _trust.contexts == 0
+
+# marks a thread without a trusted_construction context
+_UNSET = object()
+
+@contextlib.contextmanager
+def _trust_mode(record):
+    """ sets the mode of the current thread (None for checked, else if the calls are recorded)
+
+    """
+    local = _trust.local
+    previous = getattr(local,'record',_UNSET)
+    local.record = record
+    try:
+        yield
+    finally:
+        if previous is _UNSET:
+            del local.record
+        else:
+            local.record = previous
+
+def _checks(obj,name,*args):
+    """ returns True if the checks of a constructor or add_ method are run,
+        called at the start of the method with its name and arguments (unless _trust.off)
+
+        In the trusted construction the checks are skipped, and in the recording mode the call
+        is added to the _trusted_calls of the object, so validate() can repeat it with checks.
+
+    """
+    record = getattr(_trust.local,'record',_trust.record)
+    if record is None:
+        return True
+    if record:
+        obj.__dict__.setdefault('_trusted_calls',[]).append((name,) + args)
+    return False
+
+def _copy_containers(value):
+    """ copies the lists and dicts in a value, but not the objects in them
+
+    """
+    if isinstance(value,list):
+        return [_copy_containers(v) for v in value]
+    if isinstance(value,dict):
+        return {k: _copy_containers(v) for k, v in value.items()}
+    return value
+
+class _InternType(type):
+    """ metaclass of the value like classes, returns the shared instance while interning is enabled
+
+    """
+    def __call__(cls,*args,**kwargs):
+        if not _element_cache.interning or not cls._INTERN:
+            return super().__call__(*args,**kwargs)
+        key = _intern_key(cls,args,kwargs)
+        if key is None:
+            return super().__call__(*args,**kwargs)
+        obj = _interned.get(key)
+        if obj is None:
+            obj = super().__call__(*args,**kwargs)
+            obj.__dict__['_xml_frozen'] = _INTERNED
+            obj = _interned.setdefault(key,obj)
+        return obj
+
+def _intern_key(cls,args,kwargs):
+    """ returns the interning key of a constructor call, or None if the arguments can not be interned
+
+    """
+    key = [cls]
+    for value in list(args) + [v for k in sorted(kwargs) for v in (k,kwargs[k])]:
+        if isinstance(value,_BaseType):
+            if '_xml_frozen' not in value.__dict__:
+                return None
+            key.append(id(value))
+        elif value is None or isinstance(value,(str,int,Enum)):
+            key.append((type(value),value))
+        elif isinstance(value,float) and value == value:
+            # -0.0 == 0.0, the sign is part of the key since it is written
+            key.append((float,value,math.copysign(1.0,value)))
+        else:
+            return None
+    return tuple(key)
+
+class _ValueType(_BaseType,metaclass=_InternType):
+    """ helper class for the value like classes that can be interned (see enable_interning)
+    """
+    _INTERN = True
+
+class _PositionType(_ValueType):
     """ helper class for typesetting
     """
     pass
 
-class _TriggerType():
+class _TriggerType(_BaseType):
     """ helper class for typesetting
     """
     pass
 
-class _ValueTriggerType():
+class _ValueTriggerType(_BaseType):
     """ helper class for typesetting
     """
     pass
 
-class _EntityTriggerType():
+class _EntityTriggerType(_BaseType):
     """ helper class for typesetting
     """
     pass
 
-class ParameterDeclarations():
+class ParameterDeclarations(_BaseType):
     """ The ParameterDeclarations class creates the ParameterDeclaration of OpenScenario
                     
         Attributes
@@ -56,7 +779,8 @@ class ParameterDeclarations():
 
 
         """
-        if not isinstance(parameter,Parameter):
+        checks = _trust.off or _checks(self,'add_parameter',parameter)
+        if checks and not isinstance(parameter,Parameter):
             raise TypeError('parameter input is not of type Parameter')
         self.parameters.append(parameter)
     
@@ -69,7 +793,7 @@ class ParameterDeclarations():
             element.append(p.get_element())
         return element
 
-class EntityRef():
+class EntityRef(_ValueType):
     """ EntityRef creates an EntityRef element of openscenario
         
         Parameters
@@ -111,7 +835,7 @@ class EntityRef():
         """
         return ET.Element('EntityRef',attrib=self.get_attributes())
 
-class Parameter():
+class Parameter(_BaseType):
     """ Parameter is a declaration of a ParameterDeclaration for declarations
         
         Parameters
@@ -154,8 +878,9 @@ class Parameter():
                 value (str): value of the parameter
 
         """
+        checks = _trust.off or _checks(self,'__init__',name,parameter_type,value)
         self.name = name
-        if parameter_type not in ParameterType:
+        if checks and parameter_type not in ParameterType:
             raise ValueError('parameter_type not a valid type.')
         self.parameter_type = parameter_type
         self.value = value
@@ -164,7 +889,7 @@ class Parameter():
         """ returns the attributes of the Parameter as a dict
 
         """
-        return {'name':self.name,'parameterType':self.parameter_type.name,'value':str(self.value)}
+        return {'name':self.name,'parameterType':self.parameter_type.name,'value':convert_float(self.value)}
 
     def get_element(self):
         """ returns the elementTree of the Parameter
@@ -173,7 +898,7 @@ class Parameter():
         element = ET.Element('ParameterDeclaration',attrib=self.get_attributes())
         return element
 
-class Orientation():
+class Orientation(_ValueType):
     """ Orientation describes the angular orientation of an entity
         
         Parameters
@@ -221,10 +946,11 @@ class Orientation():
 
                 reference (ReferenceContext): absolute or relative
         """
+        checks = _trust.off or _checks(self,'__init__',h,p,r,reference)
         self.h = h
         self.p = p
         self.r = r
-        if reference is not None and reference not in ReferenceContext:
+        if checks and reference is not None and reference not in ReferenceContext:
             raise TypeError('reference input is not of type ReferenceContext')
         self.ref = reference
 
@@ -245,13 +971,13 @@ class Orientation():
         """
         retdict = {}
         if self.h:
-            retdict['h'] = str(self.h)
+            retdict['h'] = convert_float(self.h,'angle')
 
         if self.p:
-            retdict['p'] = str(self.p)
+            retdict['p'] = convert_float(self.p,'angle')
 
         if self.r:
-            retdict['r'] = str(self.r)
+            retdict['r'] = convert_float(self.r,'angle')
 
         if self.ref:
             retdict['type'] = self.ref.name
@@ -264,7 +990,7 @@ class Orientation():
         """
         return ET.Element('Orientation',attrib=self.get_attributes())
 
-class TransitionDynamics():
+class TransitionDynamics(_ValueType):
     """ TransitionDynamics is used to define how the dynamics of a change
         
         Parameters
@@ -304,11 +1030,12 @@ class TransitionDynamics():
                 value (float): the value of the dynamics (time rate or distance)
 
         """
-        if shape not in DynamicsShapes:
+        checks = _trust.off or _checks(self,'__init__',shape,dimension,value)
+        if checks and shape not in DynamicsShapes:
             raise TypeError(shape + '; is not a valid shape.')
         
         self.shape = shape
-        if dimension not in DynamicsDimension:
+        if checks and dimension not in DynamicsDimension:
             raise ValueError(dimension + ' is not a valid dynamics dimension')
         self.dimension = dimension
         self.value = value
@@ -317,7 +1044,7 @@ class TransitionDynamics():
         """ returns the attributes of the DynamicsConstrains as a dict
 
         """
-        return {'dynamicsShape':self.shape.name,'value':str(self.value),'dynamicsDimension':self.dimension.name}
+        return {'dynamicsShape':self.shape.name,'value':convert_float(self.value,_DIMENSION_QUANTITY.get(self.dimension)),'dynamicsDimension':self.dimension.name}
 
     def get_element(self,name='TransitionDynamics'):
         """ returns the elementTree of the DynamicsConstrains
@@ -325,7 +1052,7 @@ class TransitionDynamics():
         """
         return ET.Element(name,self.get_attributes())
 
-class DynamicsConstrains():
+class DynamicsConstrains(_ValueType):
     """ DynamicsConstrains is used by triggers
         
         Parameters
@@ -384,11 +1111,11 @@ class DynamicsConstrains():
         """
         retdict = {}
         if self.max_speed:
-            retdict['maxSpeed'] = str(self.max_speed)
+            retdict['maxSpeed'] = convert_float(self.max_speed,'speed')
         if self.max_deceleration:
-            retdict['maxDeceleration'] = str(self.max_deceleration)
+            retdict['maxDeceleration'] = convert_float(self.max_deceleration)
         if self.max_acceleration:
-            retdict['maxAcceleration'] = str(self.max_acceleration)
+            retdict['maxAcceleration'] = convert_float(self.max_acceleration)
         return retdict
 
     def get_element(self,name = 'DynamicConstraints'):
@@ -398,7 +1125,7 @@ class DynamicsConstrains():
         return ET.Element(name,attrib=self.get_attributes())
 
 
-class Route():
+class Route(_BaseType):
     """ the Route class creates a route, needs atleast two waypoints to be valid
         
         Parameters
@@ -451,8 +1178,9 @@ class Route():
                     Default: False
 
         """
+        checks = _trust.off or _checks(self,'__init__',name,closed)
         self.name = name
-        if not isinstance(closed,bool):
+        if checks and not isinstance(closed,bool):
             raise TypeError('closed input is not of type bool')
         self.closed = closed
         self.waypoints = []
@@ -472,10 +1200,11 @@ class Route():
                 author (str): author of the catalog
         
         """
-        cf = CatalogFile()
-        cf.create_catalog(filename,catalogtype,description,author)
-        cf.add_to_catalog(self)
-        cf.dump()
+        with _catalog_lock(filename):
+            cf = CatalogFile()
+            cf.create_catalog(filename,catalogtype,description,author)
+            cf.add_to_catalog(self)
+            cf.dump()
         
     def append_to_catalog(self,filename):
         """ adds the Controller to an existing catalog
@@ -485,10 +1214,11 @@ class Route():
                 filename (str): path to the catalog file
 
         """
-        cf = CatalogFile()
-        cf.open_catalog(filename)
-        cf.add_to_catalog(self)
-        cf.dump()
+        with _catalog_lock(filename):
+            cf = CatalogFile()
+            cf.open_catalog(filename)
+            cf.add_to_catalog(self)
+            cf.dump()
 
     def add_parameter(self,parameter):
         """ adds a parameter to the Route
@@ -498,7 +1228,8 @@ class Route():
                 parameter (Parameter): the parameter to add
 
         """
-        if not isinstance(parameter,Parameter):
+        checks = _trust.off or _checks(self,'add_parameter',parameter)
+        if checks and not isinstance(parameter,Parameter):
             raise TypeError('parameter input is not of type Parameter')
         self.parameters.add_parameter(parameter)
 
@@ -536,7 +1267,7 @@ class Route():
             element.append(w.get_element())
         return element
 
-class Waypoint():
+class Waypoint(_BaseType):
     """ the Route class creates a route, needs atleast two waypoints to be valid
         
         Parameters
@@ -571,10 +1302,11 @@ class Waypoint():
                 routestrategy (RouteStrategy): routing strategy for this waypoint
 
         """
-        if not isinstance(position,_PositionType):
+        checks = _trust.off or _checks(self,'__init__',position,routestrategy)
+        if checks and not isinstance(position,_PositionType):
             raise TypeError('position input not a valid Position')
         self.position = position
-        if routestrategy not in RouteStrategy:
+        if checks and routestrategy not in RouteStrategy:
             ValueError('not a valid RouteStrategy')
         self.routestrategy = routestrategy
 
@@ -594,7 +1326,7 @@ class Waypoint():
         return element
 
 
-class Trajectory():
+class Trajectory(_BaseType):
     """ the Trajectory class creates a Trajectory, 
         
         Parameters
@@ -645,9 +1377,10 @@ class Trajectory():
             closed (boolean): if the trajectory is closed at the end
 
         """
+        checks = _trust.off or _checks(self,'__init__',name,closed)
 
         self.name = name
-        if not isinstance(closed,bool):
+        if checks and not isinstance(closed,bool):
             raise TypeError('closed input is not boolean')
         self.closed = closed
         self.parameters = ParameterDeclarations()
@@ -666,10 +1399,11 @@ class Trajectory():
                 author (str): author of the catalog
         
         """
-        cf = CatalogFile()
-        cf.create_catalog(filename,catalogtype,description,author)
-        cf.add_to_catalog(self)
-        cf.dump()
+        with _catalog_lock(filename):
+            cf = CatalogFile()
+            cf.create_catalog(filename,catalogtype,description,author)
+            cf.add_to_catalog(self)
+            cf.dump()
         
     def append_to_catalog(self,filename):
         """ adds the Controller to an existing catalog
@@ -679,10 +1413,11 @@ class Trajectory():
                 filename (str): path to the catalog file
 
         """
-        cf = CatalogFile()
-        cf.open_catalog(filename)
-        cf.add_to_catalog(self)
-        cf.dump()
+        with _catalog_lock(filename):
+            cf = CatalogFile()
+            cf.open_catalog(filename)
+            cf.add_to_catalog(self)
+            cf.dump()
 
     def add_shape(self,shape):
         """ adds a shape to the trajectory (only the same shape can be used)
@@ -692,7 +1427,8 @@ class Trajectory():
             shape (Polyline, Clothoid, or Nurbs): the shape to be added to the trajectory
 
         """
-        if not (isinstance(shape,Polyline) or isinstance(shape,Clothoid) or isinstance(shape,Nurbs)):
+        checks = _trust.off or _checks(self,'add_shape',shape)
+        if checks and not (isinstance(shape,Polyline) or isinstance(shape,Clothoid) or isinstance(shape,Nurbs)):
             raise TypeError('shape input neither of type Polyline, Clothoid, or Nurbs')
         self.shapes.append(shape)
 
@@ -704,7 +1440,8 @@ class Trajectory():
                 parameter (Parameter): the parameter to add
 
         """
-        if not isinstance(parameter,Parameter):
+        checks = _trust.off or _checks(self,'add_parameter',parameter)
+        if checks and not isinstance(parameter,Parameter):
             raise TypeError('input parameter is not of type Parameter')
         self.parameters.add_parameter(parameter)
 
@@ -729,7 +1466,7 @@ class Trajectory():
         return element
 
 
-class TimeReference():
+class TimeReference(_BaseType):
     """ the TimeReference class creates a TimeReference, 
         
         Parameters
@@ -771,15 +1508,16 @@ class TimeReference():
                 Default: None
 
         """
+        checks = _trust.off or _checks(self,'__init__',reference_domain,scale,offset)
         nones = [reference_domain == None, scale == None, offset == None]
         if sum(nones) == 3:
             self._only_nones = True
         elif sum(nones) == 0:
             self._only_nones = False
-        else:
+        elif checks:
             print('reference_domain={}, scale={}, offset={}'.format(reference_domain, scale, offset))
             raise ValueError('missing inputs for time reference')
-        if reference_domain is not None and reference_domain not in ReferenceContext:
+        if checks and reference_domain is not None and reference_domain not in ReferenceContext:
             raise TypeError('input reference_domain is not of type ReferenceContext')
         
         self.reference_domain = reference_domain
@@ -792,8 +1530,8 @@ class TimeReference():
         """
         retdict = {}
         retdict['domainAbsoluteRelative'] = self.reference_domain.name
-        retdict['scale'] = str(self.scale)
-        retdict['offset'] = str(self.offset)
+        retdict['scale'] = convert_float(self.scale)
+        retdict['offset'] = convert_float(self.offset,'time')
         return retdict
 
     def get_element(self):
@@ -809,7 +1547,7 @@ class TimeReference():
         
         return element
 
-class Polyline():
+class Polyline(_BaseType):
     """ the Polyline class creates a polyline of (minimum 2) positions
         
         Parameters
@@ -841,15 +1579,17 @@ class Polyline():
                 positions (list of positions): list of positions to create the polyline
 
         """
-        if len(time) < 2:
+        checks = _trust.off or _checks(self,'__init__',time,positions)
+        if checks and len(time) < 2:
             raise ValueError('not enough time inputs')
-        if len(positions)<2:
+        if checks and len(positions)<2:
             raise ValueError('not enough position inputs')
-        if len(time) != len(positions):
+        if checks and len(time) != len(positions):
             raise ValueError('time and positions are not the same lenght')
-        for p in positions:
-            if not isinstance(p,_PositionType):
-                raise TypeError('position input is not a valid position')
+        if checks:
+            for p in positions:
+                if not isinstance(p,_PositionType):
+                    raise TypeError('position input is not a valid position')
         self.positions = positions
         self.time = time
 
@@ -859,11 +1599,11 @@ class Polyline():
         """
         element = ET.Element('Polyline')
         for i in range(len(self.time)):
-            vert = ET.SubElement(element,'Vertex',attrib={'time':str(self.time[i])})
+            vert = ET.SubElement(element,'Vertex',attrib={'time':convert_float(self.time[i],'time')})
             vert.append(self.positions[i].get_element())
         return element
 
-class Clothoid():
+class Clothoid(_BaseType):
     """ the Clothoid class creates a Clothoid shape
         
         Parameters
@@ -922,18 +1662,19 @@ class Clothoid():
             stoptime (float): (optional) end time of the clothoid
 
         """
+        checks = _trust.off or _checks(self,'__init__',curvature,curvature_change,length,startposition,starttime,stoptime)
 
         
         self.curvature = curvature
         self.curvature_change = curvature_change
         self.length = length
-        if not isinstance(startposition,_PositionType):
+        if checks and not isinstance(startposition,_PositionType):
             raise TypeError('position input is not a valid position')
         self.startposition = startposition
         
         self.starttime = starttime
         self.stoptime = stoptime
-        if (self.starttime == None and self.stoptime != None) or (self.starttime != None and self.stoptime == None):
+        if checks and ((self.starttime == None and self.stoptime != None) or (self.starttime != None and self.stoptime == None)):
             raise ValueError('Both start and stoptime has to be set, or none of them')
     
     def get_attributes(self):
@@ -941,12 +1682,12 @@ class Clothoid():
 
         """
         retdict = {}
-        retdict['curvature'] = str(self.curvature)
-        retdict['curvatureDot'] = str(self.curvature_change)
-        retdict['length'] = str(self.length)
+        retdict['curvature'] = convert_float(self.curvature)
+        retdict['curvatureDot'] = convert_float(self.curvature_change)
+        retdict['length'] = convert_float(self.length,'position')
         if self.starttime != None:
-            retdict['startTime'] = str(self.starttime)
-            retdict['stopTime'] = str(self.stoptime)
+            retdict['startTime'] = convert_float(self.starttime,'time')
+            retdict['stopTime'] = convert_float(self.stoptime,'time')
         return retdict
 
     def get_element(self):
@@ -958,7 +1699,7 @@ class Clothoid():
 
         return element
 
-class ControlPoint():
+class ControlPoint(_BaseType):
     """ the ControlPoint class is used by Nurbs to define points 
         
         Parameters
@@ -1003,8 +1744,9 @@ class ControlPoint():
                 Default: None
 
         """
+        checks = _trust.off or _checks(self,'__init__',position,time,weight)
 
-        if not isinstance(position,_PositionType):
+        if checks and not isinstance(position,_PositionType):
             raise TypeError('position input is not a valid position')
         self.position = position
         self.time = time
@@ -1016,9 +1758,9 @@ class ControlPoint():
         """
         retdict = {}
         if self.time:
-            retdict['time'] = str(self.time)
+            retdict['time'] = convert_float(self.time,'time')
         if self.weight:
-            retdict['weight'] = str(self.weight)
+            retdict['weight'] = convert_float(self.weight)
         return retdict
 
     def get_element(self):
@@ -1029,7 +1771,7 @@ class ControlPoint():
         element.append(self.position.get_element())
         return element
 
-class Nurbs():
+class Nurbs(_BaseType):
     """ the Nurbs class creates a Nurbs shape
         
         Parameters
@@ -1089,7 +1831,8 @@ class Nurbs():
             ----------
                 controlpoint (ControlPoint): a contact point to add to the nurbs
         """
-        if not isinstance(controlpoint,ControlPoint):
+        checks = _trust.off or _checks(self,'add_control_point',controlpoint)
+        if checks and not isinstance(controlpoint,ControlPoint):
             raise TypeError('controlpoint input is not of type ControlPoint')
         self.controlpoints.append(controlpoint)
 
@@ -1111,7 +1854,7 @@ class Nurbs():
         for c in self.controlpoints:
             element.append(c.get_element())
         for k in self.knots:
-            ET.SubElement(element,'Knot',attrib={'value':str(k)})
+            ET.SubElement(element,'Knot',attrib={'value':convert_float(k)})
         
 
         return element
@@ -1119,7 +1862,7 @@ class Nurbs():
 
 
 
-class FileHeader():
+class FileHeader(_BaseType):
     """ FileHeader creates the header of the OpenScenario file
         
         Parameters
@@ -1128,12 +1871,17 @@ class FileHeader():
 
             author (str): the author of the scenario
 
+            date (str): fixed date of the header (isoformat)
+                Default: None (the time the element is created)
+
         Attributes
         ----------
             name (str): name of the scenario 
 
             author (str): the author of the scenario
 
+            date (str): fixed date of the header
+
         Methods
         -------
             get_element()
@@ -1143,16 +1891,24 @@ class FileHeader():
                 Returns a dictionary of all attributes of FileHeader
 
     """
-    def __init__(self,name,author):
+    _CACHE_ELEMENT = False
+    # the creation time is not part of the scenario
+    _FINGERPRINT_IGNORE = ('date',)
+
+    def __init__(self,name,author,date=None):
         self.name = name
         self.author = author
+        self.date = date
         
 
     def get_attributes(self):
         """ returns the attributes as a dict of the FileHeader
 
         """
-        return {'description':self.name,'author':self.author,'revMajor':'1','revMinor':'0','date':dt.datetime.now().isoformat()}
+        date = self.date
+        if date is None:
+            date = dt.datetime.now().isoformat()
+        return {'description':self.name,'author':self.author,'revMajor':'1','revMinor':'0','date':date}
 
     def get_element(self):
         """ returns the elementTree of the FileHeader
@@ -1164,7 +1920,7 @@ class FileHeader():
 
 
 
-class _TrafficSignalState():
+class _TrafficSignalState(_BaseType):
     """ crates a _TrafficSignalState used by Phase
         
         Parameters
@@ -1221,7 +1977,7 @@ class _TrafficSignalState():
         
 
     
-class Phase():
+class Phase(_BaseType):
     """ crates a Traffic light phase
         
         Parameters
@@ -1284,7 +2040,7 @@ class Phase():
         """
         retdict = {}
         retdict['name'] = self.name
-        retdict['duration'] = str(self.duration)
+        retdict['duration'] = convert_float(self.duration,'time')
         return retdict
 
     def get_element(self):
@@ -1297,7 +2053,7 @@ class Phase():
         return element
 
 
-class TrafficSignalController():
+class TrafficSignalController(_BaseType):
     """ the TrafficSignalController class creates a polyline of (minimum 2) positions
         
         Parameters
@@ -1360,7 +2116,8 @@ class TrafficSignalController():
                 phase (Phase): a phase of the trafficsignal
 
         """
-        if not isinstance(phase,Phase):
+        checks = _trust.off or _checks(self,'add_phase',phase)
+        if checks and not isinstance(phase,Phase):
             raise TypeError('phase input is not of type Phase')
         self.phases.append(phase)
 
@@ -1371,7 +2128,7 @@ class TrafficSignalController():
         retdict = {}
         retdict['name'] = self.name
         if self.delay:
-            retdict['delay'] = str(self.delay)
+            retdict['delay'] = convert_float(self.delay,'time')
         if self.reference:
             retdict['reference'] = self.reference
         return retdict
@@ -1387,7 +2144,7 @@ class TrafficSignalController():
 
 
 
-class TrafficDefinition():
+class TrafficDefinition(_BaseType):
     """ the TrafficDefinition class creates a TrafficDefinition used by the different TrafficActions
         
         Parameters
@@ -1452,7 +2209,8 @@ class TrafficDefinition():
                 weight (float): the corresponding weight for the distribution of the vehicle category
 
         """
-        if vehiclecategory not in VehicleCategory:
+        checks = _trust.off or _checks(self,'add_vehicle',vehiclecategory,weight)
+        if checks and vehiclecategory not in VehicleCategory:
             raise TypeError('vehcilecategory input is not of type VehcileCategory')
         self.vehiclecategories.append(vehiclecategory)
         self.vehicleweights.append(weight)
@@ -1467,7 +2225,8 @@ class TrafficDefinition():
                 weight (float): the corresponding weight for the controller
 
         """
-        if not ( isinstance(controller,Controller) or isinstance(controller,CatalogReference)):
+        checks = _trust.off or _checks(self,'add_controller',controller,weight)
+        if checks and not ( isinstance(controller,Controller) or isinstance(controller,CatalogReference)):
             raise TypeError('controller input not of type Controller or CatalogReference')
         self.controllers.append(controller)
         self.controllerweights.append(weight)
@@ -1493,11 +2252,11 @@ class TrafficDefinition():
         
         veh_element = ET.SubElement(element,'VehicleCategoryDistribution')
         for i in range(len(self.vehiclecategories)):
-            ET.SubElement(veh_element,'VehicleCategoryDistributionEntry',attrib={'category': self.vehiclecategories[i].name,'weight': str(self.vehicleweights[i])})
+            ET.SubElement(veh_element,'VehicleCategoryDistributionEntry',attrib={'category': self.vehiclecategories[i].name,'weight': convert_float(self.vehicleweights[i])})
 
         cnt_element = ET.SubElement(element,'ControllerDistribution')
         for i in range(len(self.controllers)):
-            tmp_controller = ET.SubElement(cnt_element,'ControllerDistributionEntry',attrib={'weight':str(self.controllerweights[i])})
+            tmp_controller = ET.SubElement(cnt_element,'ControllerDistributionEntry',attrib={'weight':convert_float(self.controllerweights[i])})
             tmp_controller.append(self.controllers[i].get_element())
 
         return element
@@ -1513,10 +2272,15 @@ class CatalogFile():
             prettyprint (boolean): if the final file should have prettyprint or not
                 Default: True
 
+            canonical (boolean): write byte identical files for identical content (see printToFile)
+                Default: False
+
         Attributes
         ----------
             prettyprint: if the final file should have prettyprint or not
 
+            canonical: if the final file is written in the canonical format
+
             catalog_element (Element): the element that is worked with
 
             filename (str): path to the file to be written to
@@ -1530,15 +2294,19 @@ class CatalogFile():
                 Adds a new catalog 
     """
 
-    def __init__(self,prettyprint = True):
+    def __init__(self,prettyprint = True,canonical = False):
         """ initalize the CatalogFile class
 
             Parameters
             ----------
                 prettyprint (boolean): if the final file should have prettyprint or not
                     Default: True
+
+                canonical (boolean): write byte identical files for identical content
+                    Default: False
         """
         self.prettyprint = prettyprint
+        self.canonical = canonical
         self.catalog_element = None
         self.filename = ''
 
@@ -1566,6 +2334,12 @@ class CatalogFile():
         self.filename = filename
         tree = ET.parse(self.filename)
         self.catalog_element = tree.getroot()
+        # the parser expands xsi:noNamespaceSchemaLocation to {XMLNS}noNamespaceSchemaLocation,
+        # written back as in create_catalog_element
+        for key in [k for k in self.catalog_element.attrib if k.startswith('{' + XMLNS + '}')]:
+            value = self.catalog_element.attrib.pop(key)
+            self.catalog_element.set('xmlns:xsi',XMLNS)
+            self.catalog_element.set('xsi:' + key.split('}',1)[1],value)
 
     def create_catalog(self,filename,catalogtype,description,author):
         """ create_catalog_element creates an empty catalog of a desiered type, 
@@ -1599,6 +2373,8 @@ class CatalogFile():
         """
         element = ET.Element('OpenSCENARIO',attrib={'xmlns:xsi':XMLNS,'xsi:noNamespaceSchemaLocation':'../../'+XSI})
         header = FileHeader(description,author)
+        if self.canonical:
+            header.date = CANONICAL_DATE
         element.append(header.get_element())
         ET.SubElement(element,'Catalog',attrib={'name':catalogtype})
 
@@ -1608,9 +2384,9 @@ class CatalogFile():
         """ writes the new/updated catalog file
 
         """
-        printToFile(self.catalog_element,self.filename,self.prettyprint)
+        printToFile(self.catalog_element,self.filename,self.prettyprint,self.canonical)
 
-class Catalog():
+class Catalog(_BaseType):
     """ The Catalog class creates the CatalogLocation of the OpenScenario input
         
         Parameters
@@ -1653,9 +2429,10 @@ class Catalog():
             path (str): path to the catalog
         
         """
+        checks = _trust.off or _checks(self,'add_catalog',catalogname,path)
 
 
-        if catalogname not in self._CATALOGS:
+        if checks and catalogname not in self._CATALOGS:
             raise ValueError('Not a correct catalog, approved catalogs are:' ''.join(self._CATALOGS))
         
         self.catalogs[catalogname] = path
@@ -1673,7 +2450,7 @@ class Catalog():
             ET.SubElement(tmpel,'Directory',{'path': self.catalogs[i]})
         return catloc
 
-class CatalogReference():
+class CatalogReference(_BaseType):
     """ CatalogReference creates an CatalogReference element of openscenario
         
         Parameters
@@ -1747,7 +2524,7 @@ class CatalogReference():
         
     
 
-class ParameterAssignment():
+class ParameterAssignment(_BaseType):
     """ ParameterAssignment creates an ParameterAssignment element of openscenario
         
         Parameters
@@ -1792,7 +2569,7 @@ class ParameterAssignment():
         """
         retdict = {}
         retdict['parameterRef'] = self.parameterref
-        retdict['value'] = str(self.value)
+        retdict['value'] = convert_float(self.value)
         return retdict
     
     def get_element(self):
@@ -1801,7 +2578,7 @@ class ParameterAssignment():
         """
         return ET.Element('ParameterAssignment',attrib=self.get_attributes())
 
-class TimeOfDay():
+class TimeOfDay(_BaseType):
     """ TimeOfDay creates an TimeOfDay element of openscenario
         
         Parameters
@@ -1889,7 +2666,7 @@ class TimeOfDay():
 
 
 
-class Weather():
+class Weather(_BaseType):
     """ Weather creates an Weather element of openscenario
         
         Parameters
@@ -1964,11 +2741,12 @@ class Weather():
                     Default: None  
                 
         """
-        if cloudstate not in CloudState:
+        checks = _trust.off or _checks(self,'__init__',cloudstate,sun_intensity,sun_azimuth,sun_elevation,precipitation,precipitation_intensity,visual_fog_range,fog_bounding_box)
+        if checks and cloudstate not in CloudState:
             raise TypeError('cloudstate input is not of type CloudState')
-        if precipitation not in PrecipitationType:
+        if checks and precipitation not in PrecipitationType:
             raise TypeError('precipitation input is not of type PrecipitationType')
-        if fog_bounding_box != None and not isinstance(fog_bounding_box, BoundingBox):
+        if checks and fog_bounding_box != None and not isinstance(fog_bounding_box, BoundingBox):
             raise TypeError('fog_bounding_box input is not of type BoundingBox')
         self.cloudstate = cloudstate 
         self.sun_intensity = sun_intensity
@@ -1990,15 +2768,15 @@ class Weather():
 
         """
         element = ET.Element('Weather',attrib=self.get_attributes())
-        ET.SubElement(element,'Sun',attrib={'intensity':str(self.sun_intensity),'azimuth':str(self.sun_azimuth),'elevation':str(self.sun_elevation)})
-        fog = ET.SubElement(element,'Fog',attrib={'visualRange':str(self.visual_fog_range)})
+        ET.SubElement(element,'Sun',attrib={'intensity':convert_float(self.sun_intensity),'azimuth':convert_float(self.sun_azimuth,'angle'),'elevation':convert_float(self.sun_elevation,'angle')})
+        fog = ET.SubElement(element,'Fog',attrib={'visualRange':convert_float(self.visual_fog_range,'position')})
         if self.fog_bounding_box:
             fog.append(self.fog_bounding_box.get_element())
-        ET.SubElement(element,'Precipitation',attrib={'precipitationType':self.precipitation.name,'intensity':str(self.precipitation_intensity)})
+        ET.SubElement(element,'Precipitation',attrib={'precipitationType':self.precipitation.name,'intensity':convert_float(self.precipitation_intensity)})
         return element
 
 
-class RoadCondition():
+class RoadCondition(_BaseType):
     """ Weather creates an Weather element of openscenario
         
         Parameters
@@ -2034,8 +2812,9 @@ class RoadCondition():
                     Default: None
                 
         """
+        checks = _trust.off or _checks(self,'__init__',friction_scale_factor,properties)
         self.friction_scale_factor = friction_scale_factor 
-        if properties is not None and not isinstance(properties,Properties):
+        if checks and properties is not None and not isinstance(properties,Properties):
             raise TypeError('properties input is not of type Properties')
         self.properties = properties
 
@@ -2043,7 +2822,7 @@ class RoadCondition():
         """ returns the attributes of the RoadCondition as a dict
 
         """
-        return {'frictionScaleFactor':str(self.friction_scale_factor)}
+        return {'frictionScaleFactor':convert_float(self.friction_scale_factor)}
 
     def get_element(self):
         """ returns the elementTree of the RoadCondition
@@ -2057,7 +2836,7 @@ class RoadCondition():
 
 
 
-class Environment():
+class Environment(_BaseType):
     """ The Environment class creates a environment used by Environment
         
         Parameters
@@ -2109,13 +2888,14 @@ class Environment():
                 parameters (ParameterDeclarations): the parameters to be used in the scenario
                     Default: None
         """
-        if not isinstance(timeofday,TimeOfDay):
+        checks = _trust.off or _checks(self,'__init__',timeofday,weather,roadcondition,parameters)
+        if checks and not isinstance(timeofday,TimeOfDay):
             raise TypeError('timeofday input is not of type TypeOfDay')
-        if not isinstance(weather,Weather):
+        if checks and not isinstance(weather,Weather):
             raise TypeError('weather input is not of type Weather')
-        if not isinstance(roadcondition,RoadCondition):
+        if checks and not isinstance(roadcondition,RoadCondition):
             raise TypeError('roadcondition input is not of type RoadCondition')
-        if parameters is not None and not isinstance(parameters,ParameterDeclarations):
+        if checks and parameters is not None and not isinstance(parameters,ParameterDeclarations):
             raise TypeError('parameters input is not of type ParameterDeclarations')    
         self.timeofday = timeofday
         self.weather = weather
@@ -2137,10 +2917,11 @@ class Environment():
                 author (str): author of the catalog
         
         """
-        cf = CatalogFile()
-        cf.create_catalog(filename,catalogtype,description,author)
-        cf.add_to_catalog(self)
-        cf.dump()
+        with _catalog_lock(filename):
+            cf = CatalogFile()
+            cf.create_catalog(filename,catalogtype,description,author)
+            cf.add_to_catalog(self)
+            cf.dump()
         
     def append_to_catalog(self,filename):
         """ adds the vehicle to an existing catalog
@@ -2150,10 +2931,11 @@ class Environment():
                 filename (str): path to the catalog file
 
         """
-        cf = CatalogFile()
-        cf.open_catalog(filename)
-        cf.add_to_catalog(self)
-        cf.dump()
+        with _catalog_lock(filename):
+            cf = CatalogFile()
+            cf.open_catalog(filename)
+            cf.add_to_catalog(self)
+            cf.dump()
     def get_element(self):
         """ returns the elementTree of the Environment
 
@@ -2168,7 +2950,7 @@ class Environment():
 
 
 
-class Controller():
+class Controller(_BaseType):
     """ the Controller class creates a controller of openScenario
 
         Parameters
@@ -2211,10 +2993,11 @@ class Controller():
             properties (Properties): properties of the Controller
         
         """
+        checks = _trust.off or _checks(self,'__init__',name,properties)
         self.name = name
         
         self.parameters = ParameterDeclarations()
-        if not isinstance(properties,Properties):
+        if checks and not isinstance(properties,Properties):
             raise TypeError('properties input is not of type Properties')
         self.properties = properties
 
@@ -2232,10 +3015,11 @@ class Controller():
                 author (str): author of the catalog
         
         """
-        cf = CatalogFile()
-        cf.create_catalog(filename,catalogtype,description,author)
-        cf.add_to_catalog(self)
-        cf.dump()
+        with _catalog_lock(filename):
+            cf = CatalogFile()
+            cf.create_catalog(filename,catalogtype,description,author)
+            cf.add_to_catalog(self)
+            cf.dump()
         
     def append_to_catalog(self,filename):
         """ adds the Controller to an existing catalog
@@ -2245,10 +3029,11 @@ class Controller():
                 filename (str): path to the catalog file
 
         """
-        cf = CatalogFile()
-        cf.open_catalog(filename)
-        cf.add_to_catalog(self)
-        cf.dump()
+        with _catalog_lock(filename):
+            cf = CatalogFile()
+            cf.open_catalog(filename)
+            cf.add_to_catalog(self)
+            cf.dump()
 
     def add_parameter(self,parameter):
         """ adds a parameter declaration to the Controller
@@ -2258,7 +3043,8 @@ class Controller():
                 parameter (Parameter): A new parameter declaration for the Controller
 
         """
-        if not isinstance(parameter,Parameter):
+        checks = _trust.off or _checks(self,'add_parameter',parameter)
+        if checks and not isinstance(parameter,Parameter):
             raise TypeError('parameter input is not of type Parameter')
         self.parameters.add_parameter(parameter)
 
@@ -2279,7 +3065,7 @@ class Controller():
         return element
 
 
-class BoundingBox():
+class BoundingBox(_ValueType):
     """ the Dimensions describes the size of an entity
 
         Parameters
@@ -2339,7 +3125,7 @@ class BoundingBox():
         element.append(self.boundingbox.get_element())
         return element
 
-class Center():
+class Center(_ValueType):
     """ the Center Class creates a centerpoint for a bounding box, reference point of a vehicle is the back axel
 
         Parameters
@@ -2387,7 +3173,7 @@ class Center():
         """ returns the attributes as a dict of the Center
 
         """
-        return {'x':str(self.x),'y':str(self.y),'z':str(self.z)}
+        return {'x':convert_float(self.x,'position'),'y':convert_float(self.y,'position'),'z':convert_float(self.z,'position')}
 
     def get_element(self):
         """ returns the elementTree of the Center
@@ -2396,7 +3182,7 @@ class Center():
         element = ET.Element('Center',attrib=self.get_attributes())
         return element
 
-class Dimensions():
+class Dimensions(_ValueType):
     """ the Dimensions describes the size of an entity
 
         Parameters
@@ -2444,7 +3230,7 @@ class Dimensions():
         """ returns the attributes as a dict of the Dimensions
 
         """
-        return {'width':str(self.width),'length':str(self.length),'height':str(self.height)}
+        return {'width':convert_float(self.width,'position'),'length':convert_float(self.length,'position'),'height':convert_float(self.height,'position')}
 
     def get_element(self):
         """ returns the elementTree of the Dimensions
@@ -2453,7 +3239,7 @@ class Dimensions():
         element = ET.Element('Dimensions',attrib=self.get_attributes())
         return element
 
-class Properties():
+class Properties(_BaseType):
     """ the Properties contains are for user defined properties of an object               
 
         Attributes
@@ -2535,3 +3321,107 @@ def convert_bool(value):
         return 'true'
     else:
         return 'false'
+
+class _NumericFormat():
+    """ the package wide settings of convert_float, changed with set_numeric_format
+
+    """
+    def __init__(self):
+        self.precision = {}
+        self.shorten_integers = False
+        self.omit_defaults = False
+
+_numeric_format = _NumericFormat()
+
+def set_numeric_format(position=None,time=None,angle=None,speed=None,other=None,shorten_integers=False,omit_defaults=False):
+    """ set_numeric_format sets how all classes write numeric attributes,
+        called without arguments it restores the default (full precision) format
+
+        Parameters
+        ----------
+            position (int): number of decimals of positions, distances and sizes (m)
+                Default: None (full precision)
+
+            time (int): number of decimals of times, durations and delays (s)
+                Default: None (full precision)
+
+            angle (int): number of decimals of angles (rad)
+                Default: None (full precision)
+
+            speed (int): number of decimals of speeds (m/s)
+                Default: None (full precision)
+
+            other (int): number of decimals of all other values
+                Default: None (full precision)
+
+            shorten_integers (bool): write whole numbers without decimals (1.0 as 1)
+                Default: False
+
+            omit_defaults (bool): leave out optional attributes that are equal to their default
+                (offset of the lane positions, dz of RelativeWorldPosition)
+                Default: False
+
+    """
+    precision = {'position':position,'time':time,'angle':angle,'speed':speed,None:other}
+    for decimals in precision.values():
+        if decimals is not None and (not isinstance(decimals,int) or decimals < 0):
+            raise ValueError('the number of decimals has to be a non negative int')
+    _numeric_format.precision = {k:v for k, v in precision.items() if v is not None}
+    _numeric_format.shorten_integers = shorten_integers
+    _numeric_format.omit_defaults = omit_defaults
+    # cached elements were written with the old format
+    _element_cache.epoch += 1
+
+def omit_default(value,default=0):
+    """ checks if an optional attribute should be left out (see set_numeric_format)
+
+        Parameters
+        ----------
+            value (float): the value of the attribute
+
+            default (float): the default of the attribute
+                Default: 0
+
+        Returns
+        -------
+            boolean
+
+    """
+    return _numeric_format.omit_defaults and not isinstance(value,str) and value == default
+
+def convert_float(value,quantity=None):
+    """ converts a numeric value to a string with a normalized format,
+        integers are kept as integers, floats (also numpy floats) get the shortest
+        representation that reads back to the same float.
+        The number of decimals of each quantity can be limited with set_numeric_format,
+        this compact format also writes -0.0 (e.g. a rounded -0.001) as 0.
+        Other values (e.g. parameter references as '$speed') are converted with str.
+
+        Parameters
+        ----------
+            value (float, int or str): the value to convert
+
+            quantity (str): what the value is, 'position', 'time', 'angle', 'speed' or None
+                Default: None
+
+        Returns
+        -------
+            str
+
+    """
+    if isinstance(value,bool) or not isinstance(value,(numbers.Real)):
+        return str(value)
+    if isinstance(value,numbers.Integral):
+        return str(int(value))
+    value = float(value)
+    decimals = _numeric_format.precision.get(quantity)
+    if decimals is not None and math.isfinite(value):
+        value = round(value,decimals)
+    if value == 0 and (decimals is not None or _numeric_format.shorten_integers):
+        # the sign of zero is only dropped in the compact format
+        return '0' if _numeric_format.shorten_integers else '0.0'
+    if _numeric_format.shorten_integers and value.is_integer():
+        return str(int(value))
+    return repr(value)
+
+_DIMENSION_QUANTITY = {DynamicsDimension.time:'time',DynamicsDimension.distance:'position'}
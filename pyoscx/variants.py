@@ -0,0 +1,200 @@
+import os
+import threading
+import xml.etree.ElementTree as ET
+
+from .enumerations import ParameterType, XMLNS, XSI
+from .helpers import printToFile, CANONICAL_DATE, _check_variant
+from .utils import FileHeader, Parameter, ParameterDeclarations, convert_float
+
+
+class ParameterVariants():
+    """ ParameterVariants writes the variants of a sweep as one base scenario and a small parameter file per variant
+
+        The base scenario uses parameter references ('$speed') for the values that change,
+        declared with default values in its ParameterDeclarations (see parameterized_scenario).
+        It is written once, and each variant only writes its parameter values: either as a
+        ParameterValueDistribution file (OpenSCENARIO 1.1) pointing at the base scenario, or as
+        command line arguments of the simulator (see EsminiRunner.run_variant). The written bytes
+        and the parse work of the simulator are then proportional to the number of parameters,
+        not to the size of the scenario.
+
+        Parameters
+        ----------
+            base (Scenario): the scenario with parameter references and declarations
+
+            directory (str): the directory of the base scenario and the parameter files
+
+            name (str): name of the base scenario file (without extension)
+                Default: base
+
+            date (str): date in the header of the parameter files, fixed so equal variants give equal files
+                Default: CANONICAL_DATE
+
+        Attributes
+        ----------
+            base (Scenario): the scenario with parameter references and declarations
+
+            directory (str): the directory of the base scenario and the parameter files
+
+            base_file (str): the file of the base scenario
+
+            date (str): date in the header of the parameter files
+
+            declared (dict of str: Parameter): the declared parameters of the base scenario
+
+        Methods
+        -------
+            write_base()
+                writes the base scenario (once)
+
+            write(variant,parameters)
+                writes the parameter file of a variant
+
+            command_line(parameters)
+                returns the parameter values as command line arguments of esmini
+
+    """
+    def __init__(self,base,directory,name='base',date=CANONICAL_DATE):
+        """ initalize the ParameterVariants
+
+        Parameters
+        ----------
+            base (Scenario): the scenario with parameter references and declarations
+
+            directory (str): the directory of the base scenario and the parameter files
+
+            name (str): name of the base scenario file (without extension)
+                Default: base
+
+            date (str): date in the header of the parameter files, fixed so equal variants give equal files
+                Default: CANONICAL_DATE
+
+        """
+        self.base = base
+        self.directory = directory
+        self.base_file = os.path.join(directory,_check_variant(name) + '.xosc')
+        self.date = date
+        self.declared = {parameter.name:parameter for parameter in base.parameters.parameters}
+        os.makedirs(directory,exist_ok=True)
+        self._lock = threading.Lock()
+        self._written = False
+
+    def write_base(self):
+        """ write_base writes the base scenario, only the first call writes the file
+
+            Returns
+            -------
+                str, the base scenario file
+
+        """
+        with self._lock:
+            if not self._written:
+                self.base.write_xml(self.base_file)
+                self._written = True
+        return self.base_file
+
+    def _values(self,parameters):
+        """ returns the parameter values as strings, checking that they are declared
+
+        """
+        values = []
+        for name, value in parameters.items():
+            if name not in self.declared:
+                raise ValueError('parameter ' + name + ' is not declared in the base scenario')
+            if isinstance(value,bool):
+                value = 'true' if value else 'false'
+            values.append((name,convert_float(value)))
+        return values
+
+    def write(self,variant,parameters):
+        """ write writes the parameter file of a variant (and the base scenario if it is not written yet)
+
+            The file is a ParameterValueDistribution (OpenSCENARIO 1.1) with one ParameterValueSet, referencing the base scenario.
+
+            Parameters
+            ----------
+                variant (str): the variant id, the file is <directory>/<variant>.xosc (no path separators or ..)
+
+                parameters (dict): values of the declared parameters that differ from the defaults
+
+            Returns
+            -------
+                str, the written file
+
+        """
+        _check_variant(variant)
+        values = self._values(parameters)
+        self.write_base()
+        element = ET.Element('OpenSCENARIO',attrib={'xmlns:xsi':XMLNS,'xsi:noNamespaceSchemaLocation':XSI})
+        header = FileHeader(variant,'pyoscx',self.date).get_element()
+        # the parameter distributions are part of OpenSCENARIO 1.1
+        header.set('revMinor','1')
+        element.append(header)
+        distribution = ET.SubElement(element,'ParameterValueDistribution')
+        ET.SubElement(distribution,'ScenarioFile',attrib={'filepath':os.path.basename(self.base_file)})
+        deterministic = ET.SubElement(distribution,'Deterministic')
+        multi = ET.SubElement(deterministic,'DeterministicMultiParameterDistribution')
+        valueset = ET.SubElement(ET.SubElement(multi,'ValueSetDistribution'),'ParameterValueSet')
+        for name, value in values:
+            ET.SubElement(valueset,'ParameterAssignment',attrib={'parameterRef':name,'value':value})
+        filename = os.path.join(self.directory,variant + '.xosc')
+        printToFile(element,filename,prettyprint=False)
+        return filename
+
+    def command_line(self,parameters):
+        """ command_line returns the parameter values as command line arguments of esmini (--param name=value)
+
+            Parameters
+            ----------
+                parameters (dict): values of the declared parameters that differ from the defaults
+
+            Returns
+            -------
+                list of str
+
+        """
+        args = []
+        for name, value in self._values(parameters):
+            args += ['--param',name + '=' + value]
+        return args
+
+
+# parameter types of the python values
+_PARAMETER_TYPES = ((bool,ParameterType.boolean),(int,ParameterType.integer),(float,ParameterType.double),(str,ParameterType.string))
+
+
+def parameterized_scenario(builder,defaults):
+    """ parameterized_scenario builds the base scenario of a sweep: the builder is called with
+        parameter references ('$name') instead of values, and the parameters are declared
+        with the default values
+
+        This only works for builders that pass the values on to the scenario unchanged
+        (no arithmetic or comparisons with the values).
+
+        Parameters
+        ----------
+            builder (callable): the scenario builder of the sweep, called as builder(**parameters)
+
+            defaults (dict): the default value of each parameter (bool, int, float or str)
+
+        Returns
+        -------
+            Scenario
+
+    """
+    declarations = ParameterDeclarations()
+    for name, value in defaults.items():
+        for python_type, parameter_type in _PARAMETER_TYPES:
+            if isinstance(value,python_type):
+                break
+        else:
+            raise TypeError('no parameter type for the value of ' + name + ': ' + str(type(value)))
+        if isinstance(value,bool):
+            value = 'true' if value else 'false'
+        declarations.add_parameter(Parameter(name,parameter_type,value))
+    scenario = builder(**{name:'$' + name for name in defaults})
+    for parameter in scenario.parameters.parameters:
+        if parameter.name not in defaults:
+            declarations.add_parameter(parameter)
+    scenario.parameters = declarations
+    return scenario
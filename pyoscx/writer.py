@@ -0,0 +1,291 @@
+import itertools
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from .serializers import xml_string, _encode
+from .traces import _span
+
+
+class AsyncWriter():
+    """ the AsyncWriter writes files from a thread pool, so the generation and serialization of
+        scenarios is not blocked by the disk
+
+        The producer serializes a scenario (write_scenario) or passes the bytes (submit), and
+        continues while a worker writes the file. At most max_inflight bytes are waiting to be
+        written, submit blocks when there are more. Each file is written to a temporary file
+        in the same directory and renamed, so a file is either missing or complete.
+
+        With fsync=True the written files are made durable in batches: after fsync_batch
+        files (or on flush) the temporary files are fsynced, renamed, and each of their directories
+        is fsynced once. The files then appear when their batch is committed, not one by one.
+
+        Files with the same name are written in the order they were submitted: a submit waits
+        until the previous file with the same name is renamed (or added to the batch), and a
+        later file replaces an earlier one in the same batch.
+
+        An error of a worker (e.g. a full disk) is raised in the producer, by the next
+        submit, flush or close.
+
+        Parameters
+        ----------
+            workers (int): number of writing threads
+                Default: 4
+
+            max_inflight (int): maximum number of bytes submitted but not yet written
+                Default: 64 MB
+
+            fsync (bool): make the files durable with batched fsyncs
+                Default: False
+
+            fsync_batch (int): number of files per fsync batch
+                Default: 64
+
+        Attributes
+        ----------
+            max_inflight (int): maximum number of bytes submitted but not yet written
+
+            fsync (bool): make the files durable with batched fsyncs
+
+            fsync_batch (int): number of files per fsync batch
+
+            written (int): number of written files (with fsync=True of committed files)
+
+            bytes_written (int): number of written bytes (with fsync=True of committed files)
+
+        Methods
+        -------
+            submit(filename,data)
+                writes bytes to a file in the background
+
+            write_scenario(filename,scenario,prettyprint)
+                serializes a scenario and writes it in the background
+
+            flush()
+                waits until all submitted files are written
+
+            close()
+                flushes and stops the threads
+
+    """
+    def __init__(self,workers=4,max_inflight=64*2**20,fsync=False,fsync_batch=64):
+        """ initalize the AsyncWriter
+
+        Parameters
+        ----------
+            workers (int): number of writing threads
+                Default: 4
+
+            max_inflight (int): maximum number of bytes submitted but not yet written
+                Default: 64 MB
+
+            fsync (bool): make the files durable with batched fsyncs
+                Default: False
+
+            fsync_batch (int): number of files per fsync batch
+                Default: 64
+
+        """
+        if workers < 1 or max_inflight < 1 or fsync_batch < 1:
+            raise ValueError('workers, max_inflight and fsync_batch should be at least 1')
+        self.max_inflight = max_inflight
+        self.fsync = fsync
+        self.fsync_batch = fsync_batch
+        self.written = 0
+        self.bytes_written = 0
+        self._executor = ThreadPoolExecutor(max_workers=workers,thread_name_prefix='pyoscx_writer')
+        self._condition = threading.Condition()
+        self._inflight = 0
+        self._pending = 0
+        # the files to commit, (tmpfile, filename, size, generation) by absolute filename
+        self._batch = {}
+        # the generation of the last renamed file of each absolute filename, and the lock of the renames
+        self._committed = {}
+        self._commit_lock = threading.Lock()
+        # the absolute filenames being written and not yet renamed or added to the batch
+        self._writing = set()
+        self._tmpfiles = itertools.count()
+        self._errors = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self,exc_type,exc_value,traceback):
+        if exc_type is None:
+            self.close()
+        else:
+            # the producer failed already, keep its exception and drop the files that are not committed
+            self._executor.shutdown(wait=True)
+            with self._condition:
+                batch, self._batch = self._batch, {}
+            for tmpfile, _, _, _ in batch.values():
+                _remove(tmpfile)
+
+    def submit(self,filename,data):
+        """ submit writes bytes to a file in the background, blocks while too many bytes are in flight
+
+            Parameters
+            ----------
+                filename (str): the file
+
+                data (bytes or str): the content, a str is written as utf-8
+
+        """
+        self._raise_error()
+        if isinstance(data,str):
+            data = data.encode('utf-8')
+        size = len(data)
+        key = os.path.abspath(filename)
+        with self._condition:
+            # a file larger than max_inflight is written alone
+            while key in self._writing or (self._inflight > 0 and self._inflight + size > self.max_inflight):
+                self._condition.wait()
+            self._inflight += size
+            self._pending += 1
+            self._writing.add(key)
+            # the number of the tmpfile orders the files submitted with the same name
+            generation = next(self._tmpfiles)
+            tmpfile = filename + '.tmp' + str(os.getpid()) + '_' + str(generation)
+        self._executor.submit(self._write,key,filename,tmpfile,data,generation)
+
+    def write_scenario(self,filename,scenario,prettyprint=True):
+        """ write_scenario serializes a scenario (in the calling thread) and writes it in the background,
+            the file is identical to scenario.write_xml(filename,prettyprint)
+
+            Parameters
+            ----------
+                filename (str): the file
+
+                scenario (Scenario): the scenario
+
+                prettyprint (bool): pretty or "ugly" print
+                    Default: True
+
+        """
+        with _span('serialize','generation',type=type(scenario).__name__):
+            data = _encode(xml_string(scenario,prettyprint),prettyprint)
+        self.submit(filename,data)
+
+    def _write(self,key,filename,tmpfile,data,generation):
+        """ writes one file, in a worker thread
+
+        """
+        batch = None
+        replaced = None
+        try:
+            try:
+                with _span('write','io',filename=filename,size=len(data)):
+                    with open(tmpfile,'wb') as file_handle:
+                        file_handle.write(data)
+                    if self.fsync:
+                        with self._condition:
+                            # a later file with the same name replaces the earlier one
+                            replaced = self._batch.pop(key,None)
+                            self._batch[key] = (tmpfile,filename,len(data),generation)
+                            if len(self._batch) >= self.fsync_batch:
+                                batch, self._batch = self._batch, {}
+                    else:
+                        os.replace(tmpfile,filename)
+                        with self._condition:
+                            self.written += 1
+                            self.bytes_written += len(data)
+            finally:
+                with self._condition:
+                    self._writing.discard(key)
+                    self._condition.notify_all()
+            if replaced:
+                _remove(replaced[0])
+            if batch:
+                self._commit(batch)
+        except Exception as e:
+            _remove(tmpfile)
+            with self._condition:
+                self._errors.append(e)
+        finally:
+            with self._condition:
+                self._inflight -= len(data)
+                self._pending -= 1
+                self._condition.notify_all()
+
+    def _commit(self,batch):
+        """ fsyncs and renames a batch of written files, then fsyncs their directories,
+            the files are counted when all of this succeeded
+
+            A file is not renamed over a later submitted file with the same name,
+            that was committed by another batch in the meantime.
+
+        """
+        renamed = []
+        with _span('fsync','io',files=len(batch)):
+            try:
+                for tmpfile, _, _, _ in batch.values():
+                    fd = os.open(tmpfile,os.O_RDONLY)
+                    try:
+                        os.fsync(fd)
+                    finally:
+                        os.close(fd)
+                with self._commit_lock:
+                    for key, (tmpfile, filename, size, generation) in batch.items():
+                        if generation < self._committed.get(key,-1):
+                            _remove(tmpfile)
+                            continue
+                        os.replace(tmpfile,filename)
+                        self._committed[key] = generation
+                        renamed.append(size)
+            except Exception:
+                for tmpfile, _, _, _ in batch.values():
+                    _remove(tmpfile)
+                raise
+            if hasattr(os,'O_DIRECTORY'):
+                for directory in set(os.path.dirname(key) for key in batch):
+                    fd = os.open(directory,os.O_RDONLY | os.O_DIRECTORY)
+                    try:
+                        os.fsync(fd)
+                    finally:
+                        os.close(fd)
+        with self._condition:
+            self.written += len(renamed)
+            self.bytes_written += sum(renamed)
+
+    def flush(self):
+        """ flush waits until all submitted files are written (and committed with fsync=True),
+            raises the first error of the workers
+
+        """
+        with self._condition:
+            while self._pending:
+                self._condition.wait()
+            batch, self._batch = self._batch, {}
+        if batch:
+            self._commit(batch)
+        self._raise_error()
+
+    def close(self):
+        """ close flushes and stops the worker threads
+
+        """
+        try:
+            self.flush()
+        finally:
+            self._executor.shutdown(wait=True)
+
+    def _raise_error(self):
+        """ raises (and forgets) the first error of the workers
+
+        """
+        with self._condition:
+            if not self._errors:
+                return
+            error = self._errors[0]
+            self._errors = []
+        raise error
+
+
+def _remove(filename):
+    """ removes a file if it exists
+
+    """
+    try:
+        os.remove(filename)
+    except OSError:
+        pass
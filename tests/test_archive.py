@@ -0,0 +1,113 @@
+import os
+import stat
+import zipfile
+
+import pytest
+
+import pyoscx as OSC
+
+
+def _scenario(speed):
+    init = OSC.Init()
+    td = OSC.TransitionDynamics(OSC.DynamicsShapes.step,OSC.DynamicsDimension.time,1)
+    init.add_init_action('Ego',OSC.AbsoluteSpeedAction(speed,td))
+    sb = OSC.StoryBoard(init)
+    entities = OSC.Entities()
+    sce = OSC.Scenario('archive','pyoscx',OSC.ParameterDeclarations(),entities,sb,OSC.RoadNetwork('road.xodr'),OSC.Catalog())
+    sce.header.date = '2020-06-01T12:00:00'
+    return sce
+
+
+@pytest.mark.parametrize('prettyprint,canonical',[(True,False),(False,False),(True,True)])
+def test_archive(tmp_path,prettyprint,canonical):
+    filename = str(tmp_path / 'corpus.zip')
+    with OSC.ScenarioArchive(filename,'w') as archive:
+        for i in range(5):
+            _scenario(10 + i).write_xml('variant_' + str(i),prettyprint,canonical,archive=archive)
+        with pytest.raises(ValueError):
+            archive.add('variant_0',b'')
+        for variant in ['../outside','sub/variant','..']:
+            with pytest.raises(ValueError):
+                archive.add(variant,b'')
+
+    _scenario(12).write_xml(str(tmp_path / 'expected.xosc'),prettyprint,canonical)
+    with OSC.ScenarioArchive(filename) as archive:
+        assert len(archive) == 5
+        assert archive.variants() == ['variant_' + str(i) for i in range(5)]
+        assert 'variant_2' in archive and 'variant_5' not in archive
+        assert archive.read('variant_2') == (tmp_path / 'expected.xosc').read_bytes()
+        with archive.open('variant_2') as file_handle:
+            assert file_handle.read() == (tmp_path / 'expected.xosc').read_bytes()
+        extracted = archive.extract('variant_2',str(tmp_path / 'out'))
+        assert extracted == str(tmp_path / 'out' / 'variant_2.xosc')
+        with pytest.raises(ValueError):
+            archive.read('variant_5')
+        with pytest.raises(ValueError):
+            archive.add('variant_5',b'')
+    assert zipfile.ZipFile(filename).getinfo('variant_2.xosc').compress_type == zipfile.ZIP_DEFLATED
+
+
+def test_archive_append(tmp_path):
+    filename = str(tmp_path / 'corpus.zip')
+    with OSC.ScenarioArchive(filename,'w') as archive:
+        archive.add('a','<a/>')
+    with OSC.ScenarioArchive(filename,'a') as archive:
+        archive.add('b',b'<b/>')
+    with OSC.ScenarioArchive(filename) as archive:
+        assert archive.variants() == ['a','b']
+        assert archive.read('a') == b'<a/>'
+    with pytest.raises(ValueError):
+        OSC.ScenarioArchive(filename,'x')
+
+
+@pytest.mark.skipif(os.name != 'posix',reason='uses a shell script as simulator')
+def test_run_archived(tmp_path):
+    bindir = tmp_path / 'esmini' / 'bin'
+    bindir.mkdir(parents=True)
+    exe = bindir / 'esmini'
+    exe.write_text('#!/bin/sh\necho "$@"\n')
+    exe.chmod(exe.stat().st_mode | stat.S_IEXEC)
+    filename = str(tmp_path / 'corpus.zip')
+    with OSC.ScenarioArchive(filename,'w') as archive:
+        _scenario(10).write_xml('variant_0',archive=archive)
+    runner = OSC.EsminiRunner(str(tmp_path / 'esmini'),outputdir=str(tmp_path / 'out'),record=False)
+    with OSC.ScenarioArchive(filename) as archive:
+        result = runner.run_archived(archive,'variant_0')
+    assert result.succeeded()
+    assert result.scenario_file == str(tmp_path / 'out' / 'variant_0.xosc')
+    assert '--osc ' + result.scenario_file in result.stdout
+
+
+def test_archive_unsafe_member(tmp_path):
+    # a member written by another tool is not extracted outside of the directory
+    filename = str(tmp_path / 'foreign.zip')
+    with zipfile.ZipFile(filename,'w') as foreign:
+        foreign.writestr('../outside.xosc',b'<a/>')
+    with OSC.ScenarioArchive(filename) as archive:
+        assert archive.variants() == ['../outside']
+        with pytest.raises(ValueError):
+            archive.extract('../outside',str(tmp_path / 'out'))
+    assert not (tmp_path / 'outside.xosc').exists()
+
+
+def test_archive_read_while_adding(tmp_path):
+    import threading
+    archive = OSC.ScenarioArchive(str(tmp_path / 'archive.zip'),'w')
+    archive.add('first','<OpenSCENARIO/>')
+    errors = []
+    def add():
+        try:
+            for i in range(200):
+                archive.add('variant_' + str(i),'<OpenSCENARIO>' + 'x'*200000 + '</OpenSCENARIO>')
+        except Exception as e:
+            errors.append(e)
+    thread = threading.Thread(target=add)
+    thread.start()
+    while thread.is_alive():
+        assert archive.read('first') == b'<OpenSCENARIO/>'
+        with archive.open('first') as file_handle:
+            assert file_handle.read() == b'<OpenSCENARIO/>'
+    thread.join()
+    archive.close()
+    assert errors == []
+    assert len(OSC.ScenarioArchive(str(tmp_path / 'archive.zip')).variants()) == 201
@@ -0,0 +1,121 @@
+import os
+import stat
+
+import pytest
+
+
+import pyoscx as OSC
+
+
+def _scenario(speed=10):
+    init = OSC.Init()
+    init.add_init_action('Ego',OSC.AbsoluteSpeedAction(speed,OSC.TransitionDynamics(OSC.DynamicsShapes.step,OSC.DynamicsDimension.time,1)))
+    sb = OSC.StoryBoard(init)
+    return OSC.Scenario('cache','Mandolin',OSC.ParameterDeclarations(),OSC.Entities(),sb,OSC.RoadNetwork('road.xodr'),OSC.Catalog())
+
+
+def _counting_esmini(tmp_path):
+    """ fake esmini that writes the recording and counts its calls
+    """
+    bindir = tmp_path / 'esmini' / 'bin'
+    bindir.mkdir(parents=True)
+    exe = bindir / 'esmini'
+    counter = tmp_path / 'calls'
+    exe.write_text('#!/bin/sh\n'
+                   'echo run >> ' + str(counter) + '\n'
+                   'while [ $# -gt 0 ]; do\n'
+                   '  if [ "$1" = "--record" ]; then echo recording > "$2"; fi\n'
+                   '  shift\n'
+                   'done\n')
+    exe.chmod(exe.stat().st_mode | stat.S_IEXEC)
+    return str(tmp_path / 'esmini'), counter
+
+
+def _calls(counter):
+    if not counter.exists():
+        return 0
+    return len(counter.read_text().splitlines())
+
+
+@pytest.mark.skipif(os.name != 'posix',reason='uses a shell script as simulator')
+def test_cache_hit_and_miss(tmp_path):
+    esmini, counter = _counting_esmini(tmp_path)
+    outdir = tmp_path / 'out'
+    outdir.mkdir()
+    (outdir / 'road.xodr').write_text('road version 1')
+    cache = OSC.ResultCache(str(tmp_path / 'cache'))
+    runner = OSC.EsminiRunner(esmini,outputdir=str(outdir),cache=cache)
+
+    first = runner.run(_scenario(),'first')
+    assert not first.cached
+    second = runner.run(_scenario(),'second')
+    assert second.cached
+    assert second.name == 'second'
+    assert second.returncode == first.returncode
+    assert open(second.record_file).read() == 'recording\n'
+    # the recording of a hit is in the outputdir, like the one of a simulated run
+    assert second.record_file == str(outdir / 'second.dat')
+    assert _calls(counter) == 1
+    assert not (outdir / 'second.xosc').exists()
+    assert (cache.hits, cache.misses) == (1, 1)
+
+    # a changed scenario, road file or simulator is a miss
+    assert not runner.run(_scenario(20),'third').cached
+    (outdir / 'road.xodr').write_text('road version 2')
+    assert not runner.run(_scenario(),'fourth').cached
+    assert _calls(counter) == 3
+
+
+def test_cache_eviction(tmp_path):
+    cache = OSC.ResultCache(str(tmp_path / 'cache'))
+    keys = ['%040x' % i for i in range(5)]
+    for i, key in enumerate(keys):
+        cache.put(key,OSC.RunResult('run',None,0,'x'*50,'',0.1))
+        if i == 0:
+            # room for three entries
+            cache.max_size = 3*cache.size()
+        if i == 2:
+            # keep the first entry recently used
+            assert cache.get(keys[0]) is not None
+    assert cache.size() <= cache.max_size
+    assert cache.get(keys[0]) is not None
+    assert cache.get(keys[1]) is None
+    assert cache.get(keys[2]) is None
+    assert cache.get(keys[4]) is not None
+
+
+def test_cache_skips_timeouts(tmp_path):
+    cache = OSC.ResultCache(str(tmp_path / 'cache'))
+    cache.put('ab' * 20,OSC.RunResult('run',None,None,'','',5,timed_out=True))
+    assert cache.get('ab' * 20) is None
+    assert cache.size() == 0
+
+
+def test_cache_corrupted_entry(tmp_path):
+    cache = OSC.ResultCache(str(tmp_path / 'cache'))
+    key = 'cd' * 20
+    cache.put(key,OSC.RunResult('run',None,0,'out','',0.1))
+    resultfile = os.path.join(cache._entry(key),'result.json')
+    with open(resultfile,'w') as file_handle:
+        file_handle.write('{"name": "ru')
+    assert cache.get(key) is None
+    # the corrupted entry is removed and stored again by the next put
+    cache.put(key,OSC.RunResult('run',None,0,'out','',0.1))
+    assert cache.get(key).stdout == 'out'
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_cache_evicted_record(tmp_path):
+    cache = OSC.ResultCache(str(tmp_path / 'cache'))
+    key = 'ef' * 20
+    (tmp_path / 'run.dat').write_text('recording')
+    cache.put(key,OSC.RunResult('run',None,0,'out','',0.1,str(tmp_path / 'run.dat')))
+    result = cache.get(key,'copy',str(tmp_path / 'copy.dat'))
+    assert result.record_file == str(tmp_path / 'copy.dat')
+    assert (tmp_path / 'copy.dat').read_text() == 'recording'
+    # removed by another process after the result was read, the lookup is a miss
+    os.remove(os.path.join(cache._entry(key),'record.dat'))
+    assert cache.get(key,'again',str(tmp_path / 'again.dat')) is None
+    assert (cache.hits, cache.misses) == (1, 1)
+    cache.put(key,OSC.RunResult('run',None,0,'out','',0.1,str(tmp_path / 'run.dat')))
+    assert cache.get(key,'again',str(tmp_path / 'again.dat')) is not None
@@ -22,4 +22,16 @@ def test_creating_new_catalog():
     white_veh.add_property('model_id','0')
     cf.add_to_catalog(white_veh)
     OSC.prettyprint(cf.catalog_element)
-    # cf.dump()
\ No newline at end of file
+    # cf.dump()
+
+def test_append_to_catalog_threads(tmp_path):
+    filename = str(tmp_path / 'vehicles.xosc')
+    bb = OSC.BoundingBox(2,5,1.8,2.0,0,0.9)
+    fa = OSC.Axle(0.523598775598,0.8,1.68,2.98,0.4)
+    ba = OSC.Axle(0.523598775598,0.8,1.68,0,0.4)
+    OSC.Vehicle('car_0',OSC.VehicleCategory.car,bb,fa,ba,69,10,10).dump_to_catalog(filename,'VehicleCatalog','vehicles','pyoscx')
+    vehicles = [OSC.Vehicle('car_' + str(i),OSC.VehicleCategory.car,bb,fa,ba,69,10,10) for i in range(1,21)]
+    OSC.run_parallel([(vehicle.append_to_catalog,(filename,)) for vehicle in vehicles],workers=8)
+    # no append is lost
+    names = sorted(e.get('name') for e in ET.parse(filename).getroot().iter('Vehicle'))
+    assert names == sorted('car_' + str(i) for i in range(21))
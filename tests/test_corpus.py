@@ -0,0 +1,76 @@
+import json
+import os
+import stat
+
+import pytest
+
+import pyoscx as OSC
+
+
+def _scenario(speed):
+    init = OSC.Init()
+    td = OSC.TransitionDynamics(OSC.DynamicsShapes.step,OSC.DynamicsDimension.time,1)
+    init.add_init_action('Ego',OSC.AbsoluteSpeedAction(speed,td))
+    sb = OSC.StoryBoard(init)
+    entities = OSC.Entities()
+    return OSC.Scenario('corpus','pyoscx',OSC.ParameterDeclarations(),entities,sb,OSC.RoadNetwork('road.xodr'),OSC.Catalog())
+
+
+def test_corpus(tmp_path):
+    corpus = OSC.ShardedCorpus(str(tmp_path / 'corpus'))
+    variants = [('variant_' + str(i),_scenario(i),{'speed':i}) for i in range(20)]
+    files = corpus.write_batch(variants,workers=4)
+    assert files == [corpus.path(v) for v, _, _ in variants]
+    assert all(os.path.isfile(f) for f in files)
+    # two levels of shards below the root
+    assert os.path.relpath(files[0],str(tmp_path / 'corpus')).count(os.sep) == 2
+
+    # a new reader only uses the manifest
+    reader = OSC.ShardedCorpus(str(tmp_path / 'corpus'))
+    assert sorted(reader.variants()) == sorted(v for v, _, _ in variants)
+    entry = reader.entry('variant_3')
+    assert entry['parameters'] == {'speed':3}
+    assert entry['fingerprint'] == variants[3][1].fingerprint()
+    assert entry['size'] == os.path.getsize(files[3])
+    assert os.path.join(str(tmp_path / 'corpus'),*entry['path'].split('/')) == files[3]
+    with pytest.raises(ValueError):
+        reader.entry('variant_20')
+
+    # written again, the last manifest line is used
+    reader.write('variant_3',_scenario(42),{'speed':42})
+    assert OSC.ShardedCorpus(str(tmp_path / 'corpus')).entry('variant_3')['parameters'] == {'speed':42}
+    with open(str(tmp_path / 'corpus' / 'manifest.jsonl')) as f:
+        lines = [json.loads(line) for line in f]
+    assert len(lines) == 21
+
+
+def test_corpus_layout(tmp_path):
+    corpus = OSC.ShardedCorpus(str(tmp_path),levels=1,width=3)
+    assert len(os.path.relpath(corpus.path('a'),str(tmp_path)).split(os.sep)[0]) == 3
+    assert OSC.ShardedCorpus(str(tmp_path),levels=0).path('a') == str(tmp_path / 'a.xosc')
+    with pytest.raises(ValueError):
+        OSC.ShardedCorpus(str(tmp_path),width=0)
+    for variant in ['../outside','sub/variant','..']:
+        with pytest.raises(ValueError):
+            corpus.path(variant)
+        with pytest.raises(ValueError):
+            corpus.write(variant,_scenario(1))
+
+
+@pytest.mark.skipif(os.name != 'posix',reason='uses a shell script as simulator')
+def test_run_corpus(tmp_path):
+    bindir = tmp_path / 'esmini' / 'bin'
+    bindir.mkdir(parents=True)
+    exe = bindir / 'esmini'
+    exe.write_text('#!/bin/sh\necho "$@"\n')
+    exe.chmod(exe.stat().st_mode | stat.S_IEXEC)
+    corpus = OSC.ShardedCorpus(str(tmp_path / 'corpus'))
+    corpus.write_batch([('variant_' + str(i),_scenario(i),None) for i in range(3)],workers=1)
+    runner = OSC.EsminiRunner(str(tmp_path / 'esmini'),outputdir=str(tmp_path / 'out'),record=False)
+    results = runner.run_corpus(corpus,['variant_2','variant_0'],workers=2)
+    assert [r.name for r in results] == ['variant_2','variant_0']
+    assert results[0].scenario_file == corpus.path('variant_2')
+    assert '--osc ' + corpus.path('variant_2') in results[0].stdout
+    assert len(runner.run_corpus(corpus)) == 3
+    # nothing was written to the outputdir
+    assert os.listdir(str(tmp_path / 'out')) == []
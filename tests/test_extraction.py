@@ -0,0 +1,63 @@
+import xml.etree.ElementTree as ET
+
+import pytest
+
+import pyoscx as OSC
+
+
+def _vehicle(name,max_speed=69):
+    bb = OSC.BoundingBox(2,5,1.8,2.0,0,0.9)
+    fa = OSC.Axle(0.5,0.8,1.68,2.98,0.4)
+    ba = OSC.Axle(0.5,0.8,1.68,0,0.4)
+    return OSC.Vehicle(name,OSC.VehicleCategory.car,bb,fa,ba,max_speed,10,10)
+
+
+def _scenario(target_speed):
+    entities = OSC.Entities()
+    entities.add_scenario_object('Ego',_vehicle('car_white'))
+    entities.add_scenario_object('Target',_vehicle('car_red',target_speed))
+    init = OSC.Init()
+    init.add_init_action('Ego',OSC.TeleportAction(OSC.WorldPosition()))
+    return OSC.Scenario('ccr','Mandolin',OSC.ParameterDeclarations(),entities,OSC.StoryBoard(init),OSC.RoadNetwork('road.xodr'),OSC.Catalog())
+
+
+def test_catalog_extraction(tmp_path):
+    scenarios = [_scenario(69),_scenario(69),_scenario(50)]
+    extractor = OSC.CatalogExtractor(str(tmp_path))
+    files = extractor.extract(scenarios)
+
+    assert list(files) == ['VehicleCatalog']
+    catalog = ET.parse(files['VehicleCatalog']).getroot().find('Catalog')
+    assert [v.attrib['name'] for v in catalog.findall('Vehicle')] == ['car_white','car_red']
+    assert extractor.references == 5
+
+    ego, target = scenarios[2].entities.scenario_objects
+    assert isinstance(ego.entityobject,OSC.CatalogReference)
+    assert ego.entityobject.entryname == 'car_white'
+    # used only once
+    assert isinstance(target.entityobject,OSC.Vehicle)
+    assert scenarios[0].catalog.catalogs == {'VehicleCatalog':str(tmp_path)}
+
+
+def test_catalog_extraction_name_clash(tmp_path):
+    scenarios = [_scenario(69),_scenario(50)]
+    for sce in scenarios:
+        sce.entities.scenario_objects[1].entityobject.name = 'car_white'
+    original = scenarios[1].entities.scenario_objects[1].entityobject
+    extractor = OSC.CatalogExtractor(str(tmp_path),min_count=1)
+    extractor.extract(scenarios)
+    names = [v.name for v in extractor.entries['VehicleCatalog']]
+    # the target of the first scenario is identical to the ego vehicle
+    assert names[0] == 'car_white'
+    assert len(names) == len(set(names)) == 2
+    assert scenarios[1].entities.scenario_objects[1].entityobject.entryname == names[1]
+    # the original definition is not renamed
+    assert original.name == 'car_white'
+
+
+def test_catalog_extraction_keeps_other_catalogs(tmp_path):
+    sce = _scenario(69)
+    sce.catalog.add_catalog('VehicleCatalog','../other')
+    extractor = OSC.CatalogExtractor(str(tmp_path),min_count=1)
+    assert extractor.extract([sce]) == {}
+    assert isinstance(sce.entities.scenario_objects[0].entityobject,OSC.Vehicle)
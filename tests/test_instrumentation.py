@@ -0,0 +1,88 @@
+import json
+import xml.etree.ElementTree as ET
+
+import pytest
+
+import pyoscx as OSC
+
+
+def _scenario():
+    td = OSC.TransitionDynamics(OSC.DynamicsShapes.step,OSC.DynamicsDimension.time,1)
+    init = OSC.Init()
+    init.add_init_action('Ego',OSC.AbsoluteSpeedAction(10,td))
+    man = OSC.Maneuver('man')
+    for i in range(3):
+        event = OSC.Event('event' + str(i),OSC.Priority.overwrite)
+        event.add_trigger(OSC.ValueTrigger('start',0,OSC.ConditionEdge.rising,OSC.SimulationTimeCondition(i,OSC.Rule.greaterThan)))
+        event.add_action('speed',OSC.AbsoluteSpeedAction(20 + i,td))
+        man.add_event(event)
+    sb = OSC.StoryBoard(init)
+    sb.add_maneuver(man,'Ego')
+    entities = OSC.Entities()
+    bb = OSC.BoundingBox(2,5,1.5,1.5,0,0.2)
+    entities.add_scenario_object('Ego',OSC.Vehicle('car',OSC.VehicleCategory.car,bb,OSC.Axle(2,2,2,1,1),OSC.Axle(1,1,2,1,1),150,10,10))
+    sce = OSC.Scenario('profile','pyoscx',OSC.ParameterDeclarations(),entities,sb,OSC.RoadNetwork('road.xodr'),OSC.Catalog())
+    sce.header.date = '2020-06-01T12:00:00'
+    return sce
+
+
+def _installed():
+    return any(hasattr(getattr(cls,name),'_unprofiled') for cls in (OSC.Event,OSC.Scenario,OSC.TransitionDynamics) for name in ('__init__','get_element'))
+
+
+def test_profiling(tmp_path):
+    expected = _scenario()
+    expected.write_xml(str(tmp_path / 'expected.xosc'))
+    with OSC.profiling() as profile:
+        sce = _scenario()
+        sce.write_xml(str(tmp_path / 'profiled.xosc'))
+    assert not _installed()
+    assert (tmp_path / 'profiled.xosc').read_bytes() == (tmp_path / 'expected.xosc').read_bytes()
+
+    assert profile.created['Event'] == 3
+    assert profile.created['AbsoluteSpeedAction'] == 4
+    assert profile.methods['Event.get_element']['calls'] == 3
+    assert profile.methods['Scenario.write_xml']['calls'] == 1
+    # each element is counted once, by the get_element that created it
+    elements = sum(stats['elements'] for stats in profile.methods.values())
+    assert elements == len(list(sce.get_element().iter()))
+    write = profile.methods['Scenario.write_xml']
+    assert write['self_time'] <= write['total_time']
+    assert profile.subtrees['Scenario.write_xml/Scenario/StoryBoard/Story/Act/ManeuverGroup/Maneuver/Event']['calls'] == 3
+
+    assert 'Event.get_element' in profile.report()
+    assert json.loads(profile.report('json'))['created']['Event'] == 3
+    with pytest.raises(ValueError):
+        profile.report('xml')
+
+
+def test_profiling_element_cache():
+    sce = _scenario()
+    try:
+        OSC.enable_element_cache()
+        profile = OSC.enable_profiling()
+        first = sce.storyboard.get_element()
+        assert sce.storyboard.get_element() is first
+        OSC.disable_element_cache()
+        sce.storyboard.get_element()
+    finally:
+        OSC.disable_profiling()
+        OSC.disable_element_cache()
+    # the second call was answered from the cache
+    assert profile.methods['StoryBoard.get_element']['calls'] == 2
+    assert not _installed()
+    assert not hasattr(OSC.Event.get_element,'_uncached')
+    assert ET.tostring(sce.storyboard.get_element()) == ET.tostring(first)
+    assert OSC.disable_profiling() is None
+
+
+def test_profiling_trusted_construction():
+    with OSC.trusted_construction(record=False):
+        with OSC.profiling() as profile:
+            _scenario()
+            # the profiled constructors skip their checks as well
+            OSC.AbsoluteSpeedAction(10,'not dynamics')
+    with pytest.raises(TypeError):
+        OSC.AbsoluteSpeedAction(10,'not dynamics')
+    assert not _installed()
+    assert profile.created['Event'] == 3
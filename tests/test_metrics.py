@@ -0,0 +1,81 @@
+import os
+import stat
+
+import pytest
+
+import pyoscx as OSC
+
+
+def _scenario():
+    init = OSC.Init()
+    init.add_init_action('Ego',OSC.TeleportAction(OSC.WorldPosition()))
+    sb = OSC.StoryBoard(init)
+    entities = OSC.Entities()
+    return OSC.Scenario('metrics','pyoscx',OSC.ParameterDeclarations(),entities,sb,OSC.RoadNetwork('road.xodr'),OSC.Catalog())
+
+
+def _fake_esmini(tmp_path,script):
+    bindir = tmp_path / 'esmini' / 'bin'
+    bindir.mkdir(parents=True)
+    exe = bindir / 'esmini'
+    exe.write_text('#!/bin/sh\n' + script + '\n')
+    exe.chmod(exe.stat().st_mode | stat.S_IEXEC)
+    return str(tmp_path / 'esmini')
+
+
+def _values(filename):
+    values = {}
+    with open(filename) as f:
+        for line in f:
+            if not line.startswith('#'):
+                name, value = line.rsplit(' ',1)
+                values[name] = float(value)
+    return values
+
+
+@pytest.mark.skipif(os.name != 'posix',reason='uses a shell script as simulator')
+def test_metrics_runner(tmp_path):
+    metrics = OSC.RunMetrics(str(tmp_path / 'pyoscx.prom'),interval=3600)
+    cache = OSC.ResultCache(str(tmp_path / 'cache'))
+    runner = OSC.EsminiRunner(_fake_esmini(tmp_path,'echo "$@"'),outputdir=str(tmp_path / 'out'),record=False,cache=cache,metrics=metrics)
+    sce = _scenario()
+    runner.run_batch([('run0',sce),('run1',_scenario())],workers=1)
+    values = _values(str(tmp_path / 'pyoscx.prom'))
+    assert values['pyoscx_runs_started_total'] == 2
+    assert values['pyoscx_runs_completed_total'] == 2
+    assert values['pyoscx_cache_hits_total'] == 1
+    assert values['pyoscx_queue_depth'] == 0
+    assert values['pyoscx_bytes_written_total'] == os.path.getsize(str(tmp_path / 'out' / 'run0.xosc'))
+    assert values['pyoscx_run_wall_seconds_count'] == 1
+    assert values['pyoscx_run_wall_seconds_bucket{le="+Inf"}'] == 1
+    assert values['pyoscx_run_cpu_seconds_count'] == (1 if hasattr(os,'waitid') else 0)
+    assert '# TYPE pyoscx_run_wall_seconds histogram' in metrics.to_text()
+    assert [p.name for p in tmp_path.iterdir() if p.name.startswith('pyoscx.prom')] == ['pyoscx.prom']
+
+
+@pytest.mark.skipif(os.name != 'posix',reason='uses a shell script as simulator')
+def test_metrics_timeout(tmp_path):
+    metrics = OSC.RunMetrics()
+    runner = OSC.EsminiRunner(_fake_esmini(tmp_path,'echo started\nexec sleep 10'),outputdir=str(tmp_path / 'out'),record=False,timeout=0.2,metrics=metrics)
+    result = runner.run(_scenario(),'slow')
+    assert result.timed_out
+    assert result.wall_time < 5
+    assert 'started' in result.stdout
+    assert metrics.timed_out == metrics.failed == metrics.started == 1
+    assert metrics.completed == 0
+
+
+def test_metrics_histogram():
+    metrics = OSC.RunMetrics(buckets=(1,10))
+    for wall_time in (0.5,1,5,50):
+        metrics.run_finished(OSC.RunResult('run',None,0,'','',wall_time,cpu_time=0.1))
+    text = metrics.to_text()
+    assert 'pyoscx_run_wall_seconds_bucket{le="1"} 2\n' in text
+    assert 'pyoscx_run_wall_seconds_bucket{le="10"} 3\n' in text
+    assert 'pyoscx_run_wall_seconds_bucket{le="+Inf"} 4\n' in text
+    assert 'pyoscx_run_wall_seconds_sum 56.5\n' in text
+    assert 'pyoscx_run_cpu_seconds_count 4\n' in text
+    with pytest.raises(ValueError):
+        metrics.write()
+    with pytest.raises(ValueError):
+        OSC.RunMetrics(interval=-1)
@@ -0,0 +1,66 @@
+import pytest
+
+
+import pyoscx as OSC
+
+
+def _scenario(n_entities=6,n_stories=3,n_events=4):
+    TD = OSC.TransitionDynamics(OSC.DynamicsShapes.step,OSC.DynamicsDimension.time,1)
+    entities = OSC.Entities()
+    init = OSC.Init()
+    bb = OSC.BoundingBox(2,5,1.5,1.5,0,0.2)
+    fa = OSC.Axle(2,2,2,1,1)
+    ba = OSC.Axle(1,1,2,1,1)
+    for i in range(n_entities):
+        entities.add_scenario_object('car' + str(i),OSC.Vehicle('car',OSC.VehicleCategory.car,bb,fa,ba,150,10,10))
+        init.add_init_action('car' + str(i),OSC.AbsoluteSpeedAction(10,TD))
+        init.add_init_action('car' + str(i),OSC.TeleportAction(OSC.WorldPosition(i,0)))
+    sb = OSC.StoryBoard(init)
+    for s in range(n_stories):
+        man = OSC.Maneuver('man' + str(s))
+        for e in range(n_events):
+            event = OSC.Event('event_' + str(s) + '_' + str(e),OSC.Priority.overwrite)
+            event.add_action('speed',OSC.AbsoluteSpeedAction(e,TD))
+            trigger = OSC.ConditionGroup()
+            trigger.add_condition(OSC.ValueTrigger('t1',0,OSC.ConditionEdge.rising,OSC.SimulationTimeCondition(e,OSC.Rule.greaterThan)))
+            trigger.add_condition(OSC.ValueTrigger('t2',0,OSC.ConditionEdge.rising,OSC.SimulationTimeCondition(e+1,OSC.Rule.greaterThan)))
+            event.add_trigger(trigger)
+            man.add_event(event)
+        sb.add_maneuver(man,'car' + str(s))
+    return OSC.Scenario('big','Mandolin',OSC.ParameterDeclarations(),entities,sb,OSC.RoadNetwork('road.xodr'),OSC.Catalog())
+
+
+def _fails(scenario):
+    """ 'failure' needs car4 and the event event_1_2 """
+    names = [so.name for so in scenario.entities.scenario_objects]
+    events = [e.name for story in scenario.storyboard.stories for act in story.acts for mg in act.maneuvergroup for m in mg.maneuvers for e in m.events]
+    # also make sure the candidate can still be serialized
+    scenario.get_element()
+    return 'car4' in names and 'event_1_2' in events
+
+
+def test_minimizer():
+    sce = _scenario()
+    minimizer = OSC.ScenarioMinimizer(_fails,workers=4)
+    small = minimizer.minimize(sce)
+
+    assert [so.name for so in small.entities.scenario_objects] == ['car4']
+    assert len(small.storyboard.stories) == 1
+    events = small.storyboard.stories[0].acts[0].maneuvergroup[0].maneuvers[0].events
+    assert [e.name for e in events] == ['event_1_2']
+    assert len(events[0].trigger.conditions) == 1
+    assert small.storyboard.init.initactions == {}
+    # the input is not changed
+    assert len(sce.entities.scenario_objects) == 6
+
+
+def test_minimizer_max_tests():
+    minimizer = OSC.ScenarioMinimizer(_fails,workers=1,max_tests=5)
+    minimizer.minimize(_scenario())
+    assert minimizer.tests <= 5
+
+
+def test_minimizer_not_failing():
+    minimizer = OSC.ScenarioMinimizer(lambda s: False)
+    with pytest.raises(ValueError):
+        minimizer.minimize(_scenario())
@@ -61,3 +61,8 @@ def test_route_position():
     OSC.prettyprint(routepos.get_element())
     routepos = OSC.RoutePositionInLaneCoordinates(route,1,'a',2)
     OSC.prettyprint(routepos.get_element())
+
+
+def test_no_shared_orientation():
+    assert OSC.LanePosition(0,0,1,1).orient is not OSC.LanePosition(0,0,1,1).orient
+    assert OSC.RelativeObjectPosition('Ego',1,1).orient is not OSC.RelativeObjectPosition('Ego',1,1).orient
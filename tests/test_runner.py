@@ -0,0 +1,98 @@
+import os
+import stat
+
+import pytest
+
+
+import pyoscx as OSC
+
+
+def _scenario():
+    init = OSC.Init()
+    init.add_init_action('Ego',OSC.TeleportAction(OSC.WorldPosition()))
+    sb = OSC.StoryBoard(init)
+    entities = OSC.Entities()
+    return OSC.Scenario('runner','Mandolin',OSC.ParameterDeclarations(),entities,sb,OSC.RoadNetwork('road.xodr'),OSC.Catalog())
+
+
+def _fake_esmini(tmp_path,returncode):
+    bindir = tmp_path / 'esmini' / 'bin'
+    bindir.mkdir(parents=True)
+    exe = bindir / 'esmini'
+    exe.write_text('#!/bin/sh\necho "$@"\nexit ' + str(returncode) + '\n')
+    exe.chmod(exe.stat().st_mode | stat.S_IEXEC)
+    return str(tmp_path / 'esmini')
+
+
+@pytest.mark.skipif(os.name != 'posix',reason='uses a shell script as simulator')
+def test_esmini_runner(tmp_path):
+    runner = OSC.EsminiRunner(_fake_esmini(tmp_path,0),outputdir=str(tmp_path / 'out'))
+    result = runner.run(_scenario(),'myrun')
+    assert result.succeeded()
+    assert os.path.isfile(result.scenario_file)
+    assert '--osc ' + result.scenario_file in result.stdout
+    assert '--record ' + result.record_file in result.stdout
+
+
+@pytest.mark.skipif(os.name != 'posix',reason='uses a shell script as simulator')
+def test_esmini_runner_batch(tmp_path):
+    runner = OSC.EsminiRunner(_fake_esmini(tmp_path,1),outputdir=str(tmp_path / 'out'),record=False)
+    results = runner.run_batch([('run' + str(i),_scenario()) for i in range(4)],workers=2)
+    assert [r.name for r in results] == ['run0','run1','run2','run3']
+    assert not any(r.succeeded() for r in results)
+
+
+@pytest.mark.skipif(os.name != 'posix',reason='uses a shell script as simulator')
+def test_esmini_runner_skip_duplicates(tmp_path):
+    runner = OSC.EsminiRunner(_fake_esmini(tmp_path,0),outputdir=str(tmp_path / 'out'),record=False)
+    results = runner.run_batch([('a',_scenario()),('b',_scenario()),('c',_scenario())],workers=2,skip_duplicates=True)
+    assert results[0] is results[1] is results[2]
+    assert sorted(p.name for p in (tmp_path / 'out').iterdir()) == ['a.xosc']
+
+
+@pytest.mark.skipif(os.name != 'posix',reason='uses a shell script as simulator')
+@pytest.mark.parametrize('staging',['memfd','tmpfs'])
+def test_esmini_runner_staging(tmp_path,staging):
+    if staging == 'memfd' and not hasattr(os,'memfd_create'):
+        pytest.skip('no memfd_create')
+    if staging == 'tmpfs' and not os.path.isdir('/dev/shm'):
+        pytest.skip('no /dev/shm')
+    bindir = tmp_path / 'esmini' / 'bin'
+    bindir.mkdir(parents=True)
+    exe = bindir / 'esmini'
+    # prints the scenario it was given
+    exe.write_text('#!/bin/sh\necho "$2"\ncat "$2"\n')
+    exe.chmod(exe.stat().st_mode | stat.S_IEXEC)
+    runner = OSC.EsminiRunner(str(tmp_path / 'esmini'),outputdir=str(tmp_path / 'out'),record=False,staging=staging)
+    sce = _scenario()
+    sce.header.date = '2020-06-01T12:00:00'
+    results = runner.run_batch([('run' + str(i),sce) for i in range(3)],workers=2)
+    sce.write_xml(str(tmp_path / 'expected.xosc'))
+    for result in results:
+        assert result.succeeded()
+        assert result.scenario_file is None
+        path, xml = result.stdout.split('\n',1)
+        assert xml == (tmp_path / 'expected.xosc').read_text()
+        assert path.startswith('/proc/self/fd/' if staging == 'memfd' else '/dev/shm/')
+        assert not os.path.exists(path) or staging == 'memfd'
+    assert os.listdir(str(tmp_path / 'out')) == []
+    with pytest.raises(ValueError):
+        OSC.EsminiRunner(str(tmp_path / 'esmini'),outputdir=str(tmp_path / 'out'),staging='ram')
+
+
+@pytest.mark.skipif(not hasattr(os,'wait4') or not hasattr(os,'waitid'),reason='no wait4/waitid')
+def test_wait4_run_interrupted(monkeypatch):
+    from pyoscx import runner
+    processes = []
+    popen = runner.subprocess.Popen
+    def record_popen(*args,**kwargs):
+        processes.append(popen(*args,**kwargs))
+        return processes[-1]
+    def interrupt(*args):
+        raise KeyboardInterrupt
+    monkeypatch.setattr(runner.subprocess,'Popen',record_popen)
+    monkeypatch.setattr(runner.os,'waitid',interrupt)
+    with pytest.raises(KeyboardInterrupt):
+        runner._wait4_run(['sleep','60'],None)
+    # the simulator is killed and reaped
+    assert processes[0].returncode is not None
@@ -0,0 +1,92 @@
+import pytest
+
+
+import pyoscx as OSC
+
+
+class _ThresholdRunner():
+    """ fake runner, passes if x + y is smaller than 1
+    """
+    def __init__(self):
+        self.runs = 0
+
+    def run(self,scenario,name):
+        self.runs += 1
+        return scenario['x'] + scenario['y'] < 1
+
+
+def _builder(x,y):
+    return {'x':x,'y':y}
+
+
+def test_adaptive_sampler_finds_boundary():
+    runner = _ThresholdRunner()
+    sampler = OSC.AdaptiveSampler(_builder,{'x':(0,1),'y':(0,1)},runner,classifier=lambda r: r,budget=400,batch_size=4,max_depth=4)
+    samples = sampler.run()
+    assert len(samples) == runner.runs
+    assert len(samples) <= 400
+    # a uniform grid with the same resolution would need 33*33 samples
+    assert len(samples) < 33*33/4
+
+    cells = sampler.boundary_cells()
+    assert cells
+    for low, high in cells:
+        assert low['x'] + low['y'] < 1
+        assert high['x'] + high['y'] >= 1
+        assert high['x'] - low['x'] == pytest.approx(1/32)
+
+
+def test_adaptive_sampler_budget():
+    runner = _ThresholdRunner()
+    sampler = OSC.AdaptiveSampler(_builder,{'x':(0,1),'y':(0,1)},runner,classifier=lambda r: r,budget=20,batch_size=4)
+    samples = sampler.run()
+    assert len(samples) <= 20
+    assert all(s.passed == (s.parameters['x'] + s.parameters['y'] < 1) for s in samples)
+
+
+def test_adaptive_sampler_initial_grid_too_large():
+    sampler = OSC.AdaptiveSampler(_builder,{'x':(0,1),'y':(0,1)},_ThresholdRunner(),budget=5)
+    with pytest.raises(ValueError):
+        sampler.run()
+
+
+class _DistanceRunner():
+    """ fake runner, returns the distance to (0.3, 0.7)
+    """
+    def run(self,scenario,name):
+        return ((scenario['x']-0.3)**2 + (scenario['y']-0.7)**2)**0.5
+
+
+class _WritableScenario(dict):
+    def write_xml(self,filename):
+        with open(filename,'w') as f:
+            f.write(str(self))
+
+
+def test_falsification_search():
+    search = OSC.FalsificationSearch(_builder,{'x':(0,1),'y':(0,1)},_DistanceRunner(),kpi=lambda r: r,population=20,generations=8,workers=4,seed=1)
+    worst = search.run(n_worst=3)
+    assert len(search.samples) == 160
+    assert len(worst) == 3
+    assert worst[0].kpi <= worst[1].kpi <= worst[2].kpi
+    assert worst[0].kpi < 0.05
+
+
+def test_falsification_search_checkpoint(tmp_path):
+    checkpoint = str(tmp_path / 'search.json')
+    search = OSC.FalsificationSearch(_builder,{'x':(0,1),'y':(0,1)},_DistanceRunner(),kpi=lambda r: r,population=10,generations=2,checkpoint=checkpoint,seed=2)
+    search.run()
+
+    resumed = OSC.FalsificationSearch(_builder,{'x':(0,1),'y':(0,1)},_DistanceRunner(),kpi=lambda r: r,population=10,generations=3,checkpoint=checkpoint)
+    assert resumed.generation == 2
+    assert len(resumed.samples) == 20
+    resumed.run()
+    assert resumed.generation == 3
+    assert len(resumed.samples) == 30
+
+
+def test_falsification_search_write_worst(tmp_path):
+    builder = lambda x,y: _WritableScenario(x=x,y=y)
+    search = OSC.FalsificationSearch(builder,{'x':(0,1),'y':(0,1)},_DistanceRunner(),kpi=lambda r: r,population=10,generations=2,seed=3)
+    search.run(n_worst=2,outputdir=str(tmp_path))
+    assert sorted(p.name for p in tmp_path.iterdir()) == ['worst_0.xosc','worst_1.xosc']
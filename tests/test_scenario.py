@@ -1,3 +1,5 @@
+import copy
+import xml.etree.ElementTree as ET
 
 import pytest
 
@@ -79,4 +81,157 @@ def test_scenario():
     sb.add_story(story)
 
     sce = OSC.Scenario('myscenario','Mandolin',OSC.ParameterDeclarations(),entities=entities,storyboard = sb,roadnetwork=road,catalog=catalog)
-    OSC.prettyprint(sce.get_element())
\ No newline at end of file
+    OSC.prettyprint(sce.get_element())
+
+def _ccr_scenario(speed=10,events=('first','second')):
+    init = OSC.Init()
+    TD = OSC.TransitionDynamics(OSC.DynamicsShapes.step,OSC.DynamicsDimension.time,1)
+    init.add_init_action('Ego',OSC.AbsoluteSpeedAction(speed,TD))
+    init.add_init_action('Ego',OSC.TeleportAction(OSC.LanePosition(25,0,-1,1)))
+    man = OSC.Maneuver('man')
+    for name in events:
+        event = OSC.Event(name,OSC.Priority.overwrite)
+        event.add_trigger(OSC.ValueTrigger('start',0,OSC.ConditionEdge.rising,OSC.SimulationTimeCondition(1,OSC.Rule.greaterThan)))
+        event.add_action('speed',OSC.AbsoluteSpeedAction(speed,TD))
+        man.add_event(event)
+    sb = OSC.StoryBoard(init)
+    sb.add_maneuver(man,'Ego')
+    entities = OSC.Entities()
+    bb = OSC.BoundingBox(2,5,1.5,1.5,0,0.2)
+    entities.add_scenario_object('Ego',OSC.Vehicle('car',OSC.VehicleCategory.car,bb,OSC.Axle(2,2,2,1,1),OSC.Axle(1,1,2,1,1),150,10,10))
+    return OSC.Scenario('fp','Mandolin',OSC.ParameterDeclarations(),entities,sb,OSC.RoadNetwork('road.xodr'),OSC.Catalog())
+
+
+def test_scenario_fingerprint():
+    sce1 = _ccr_scenario()
+    sce2 = _ccr_scenario()
+    assert sce1.fingerprint() == sce2.fingerprint()
+    assert sce1 == sce2
+    assert len({sce1,sce2}) == 1
+
+    assert _ccr_scenario(speed=11).fingerprint() != sce1.fingerprint()
+    # order of the events matters
+    assert _ccr_scenario(events=('second','first')).fingerprint() != sce1.fingerprint()
+
+
+def test_scenario_fingerprint_ignores_date():
+    sce1 = _ccr_scenario()
+    sce2 = _ccr_scenario()
+    sce1.header.date = '2020-06-01T12:00:00'
+    sce2.header.date = '2021-01-01T00:00:00'
+    assert sce1.fingerprint() == sce2.fingerprint()
+    assert sce1 == sce2
+
+
+def test_scenario_fingerprint_changes():
+    sce = _ccr_scenario()
+    before = sce.fingerprint()
+    sce.storyboard.init.add_init_action('Ego',OSC.AbsoluteSpeedAction(1,OSC.TransitionDynamics(OSC.DynamicsShapes.step,OSC.DynamicsDimension.time,1)))
+    assert sce.fingerprint() != before
+
+
+def test_canonical_write(tmp_path):
+    first = tmp_path / 'first.xosc'
+    second = tmp_path / 'second.xosc'
+    _ccr_scenario().write_xml(str(first),canonical=True)
+    _ccr_scenario().write_xml(str(second),canonical=True)
+    assert first.read_bytes() == second.read_bytes()
+    assert b'date="1970-01-01T00:00:00"' in first.read_bytes()
+
+    sce = _ccr_scenario()
+    sce.header.date = '2020-06-01T12:00:00'
+    sce.write_xml(str(second),prettyprint=False,canonical=True)
+    assert b'date="2020-06-01T12:00:00"' in second.read_bytes()
+    assert b'\n\t' not in second.read_bytes()
+
+
+def test_write_xml_matches_minidom(tmp_path):
+    import xml.dom.minidom as mini
+    sce = _ccr_scenario()
+    sce.header.date = '2020-06-01T12:00:00'
+    sce.write_xml(str(tmp_path / 'sce.xosc'))
+    rough = ET.tostring(sce.get_element(),'utf-8')
+    assert (tmp_path / 'sce.xosc').read_text() == mini.parseString(rough).toprettyxml(indent='\t')
+
+
+def test_element_cache(tmp_path):
+    try:
+        OSC.enable_element_cache()
+        sce = _ccr_scenario()
+        sce.write_xml(str(tmp_path / 'first.xosc'))
+        event = sce.storyboard.stories[0].acts[0].maneuvergroup[0].maneuvers[0].events[0]
+        story_element = sce.storyboard.stories[0].get_element()
+        entities_element = sce.entities.get_element()
+        assert sce.entities.get_element() is entities_element
+        fingerprint = sce.fingerprint()
+
+        # a changed attribute invalidates the object and its parents
+        event.action[0].action.speed = 42
+        assert sce.storyboard.stories[0].get_element() is not story_element
+        assert sce.entities.get_element() is entities_element
+        assert sce.fingerprint() != fingerprint
+        sce.write_xml(str(tmp_path / 'second.xosc'))
+        assert 'value="42"' in (tmp_path / 'second.xosc').read_text()
+
+        # so does an add_ method
+        story_element = sce.storyboard.stories[0].get_element()
+        event.add_action('extra',OSC.AbsoluteSpeedAction(43,OSC.TransitionDynamics(OSC.DynamicsShapes.step,OSC.DynamicsDimension.time,1)))
+        assert sce.storyboard.stories[0].get_element() is not story_element
+
+        # copies do not share the cache
+        copied = copy.deepcopy(sce)
+        copied.storyboard.stories[0].acts[0].maneuvergroup[0].maneuvers[0].events[0].action[0].action.speed = 44
+        assert sce.storyboard.stories[0].get_element() is sce.storyboard.stories[0].get_element()
+        # a shared object invalidates all objects containing it
+        init_element = sce.storyboard.init.get_element()
+        sce.storyboard.init.initactions['Ego'][0].transition_dynamics.value = 2
+        assert sce.storyboard.init.get_element() is not init_element
+        assert ET.tostring(copied.get_element()) != ET.tostring(sce.get_element())
+    finally:
+        OSC.disable_element_cache()
+    assert sce.entities.get_element() is not sce.entities.get_element()
+
+
+def test_clone():
+    base = _ccr_scenario()
+    base.header.date = '2020-06-01T12:00:00'
+    original = ET.tostring(base.get_element())
+    variant = base.clone()
+    assert variant == base
+    assert ET.tostring(variant.get_element()) == original
+
+    # changes of a clone copy the path to the change
+    event = variant.storyboard.stories[0].acts[0].maneuvergroup[0].maneuvers[0].events[0]
+    event.action[0].action.speed = 42
+    event.add_action('extra',OSC.AbsoluteSpeedAction(43,OSC.TransitionDynamics(OSC.DynamicsShapes.step,OSC.DynamicsDimension.time,1)))
+    assert ET.tostring(base.get_element()) == original
+    assert 'value="42"' in ET.tostring(variant.get_element()).decode()
+    assert variant != base
+    assert variant.entities.scenario_objects[0].entityobject is not base.entities.scenario_objects[0].entityobject
+
+    # the original is shared and can not be changed
+    with pytest.raises(AttributeError):
+        base.storyboard.stories[0].name = 'changed'
+    with pytest.raises(AttributeError):
+        base.entities.add_scenario_object('Target',base.entities.scenario_objects[0].entityobject)
+
+    # clones of clones, and copies of clones
+    second = variant.clone()
+    assert second == variant
+    copied = copy.deepcopy(variant)
+    assert copied == variant
+    copied.storyboard.stories[0].name = 'changed'
+    assert copied != variant
+
+
+def test_clone_hooks_removed():
+    import gc
+    from pyoscx.utils import _BaseType
+    base = _ccr_scenario()
+    variant = base.clone()
+    assert '__setattr__' in vars(_BaseType)
+    variant.header.description = 'variant'
+    # the tracking of changes is removed with the last frozen object
+    del base, variant
+    gc.collect()
+    assert '__setattr__' not in vars(_BaseType)
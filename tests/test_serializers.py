@@ -0,0 +1,188 @@
+import xml.etree.ElementTree as ET
+
+import pytest
+
+import pyoscx as OSC
+from pyoscx import serializers
+from pyoscx.utils import _BaseType
+
+
+@pytest.fixture(autouse=True)
+def streaming():
+    OSC.enable_streaming()
+    yield
+    OSC.disable_streaming()
+
+
+def _scenario():
+    bb = OSC.BoundingBox(2,5,1.8,2.0,0,0.9)
+    entities = OSC.Entities()
+    entities.add_scenario_object('Ego',OSC.Vehicle('car',OSC.VehicleCategory.car,bb,OSC.Axle(0.5,0.8,1.68,2.98,0.4),OSC.Axle(0.5,0.8,1.68,0,0.4),69,10,10))
+    init = OSC.Init()
+    td = OSC.TransitionDynamics(OSC.DynamicsShapes.step,OSC.DynamicsDimension.time,1)
+    init.add_init_action('Ego',OSC.AbsoluteSpeedAction(30,td))
+    init.add_init_action('Ego',OSC.TeleportAction(OSC.LanePosition(25,0,-1,1)))
+    group = OSC.ConditionGroup()
+    group.add_condition(OSC.EntityTrigger('close',0,OSC.ConditionEdge.rising,OSC.TimeHeadwayCondition('Ego',2,OSC.Rule.lessThan),'Ego'))
+    group.add_condition(OSC.ValueTrigger('time',0,OSC.ConditionEdge.none,OSC.SimulationTimeCondition(3,OSC.Rule.greaterThan)))
+    trigger = OSC.Trigger()
+    trigger.add_conditiongroup(group)
+    event = OSC.Event('event',OSC.Priority.overwrite)
+    event.add_trigger(trigger)
+    event.add_action('speed',OSC.AbsoluteSpeedAction(10,td))
+    event.add_action('param',OSC.ParameterSetAction('Speed','a "quoted" & <escaped> value'))
+    man = OSC.Maneuver('man')
+    man.add_event(event)
+    sb = OSC.StoryBoard(init,OSC.ValueTrigger('stop',0,OSC.ConditionEdge.rising,OSC.SimulationTimeCondition(10,OSC.Rule.greaterThan),'stop'))
+    sb.add_maneuver(man,'Ego')
+    sce = OSC.Scenario('serializers','pyoscx',OSC.ParameterDeclarations(),entities,sb,OSC.RoadNetwork('road.xodr'),OSC.Catalog())
+    sce.header.date = '2020-06-01T12:00:00'
+    return sce
+
+
+def _printed(obj,tmp_path,prettyprint):
+    OSC.printToFile(obj.get_element(),str(tmp_path / 'element.xosc'),prettyprint)
+    return (tmp_path / 'element.xosc').read_bytes()
+
+
+@pytest.mark.parametrize('prettyprint',[True,False])
+def test_write_object(tmp_path,prettyprint):
+    sce = _scenario()
+    serializers.write_object(sce,str(tmp_path / 'object.xosc'),prettyprint)
+    assert (tmp_path / 'object.xosc').read_bytes() == _printed(sce,tmp_path,prettyprint)
+
+    sce.write_xml(str(tmp_path / 'scenario.xosc'),prettyprint)
+    assert (tmp_path / 'scenario.xosc').read_bytes() == _printed(sce,tmp_path,prettyprint)
+
+
+@pytest.mark.parametrize('prettyprint',[True,False])
+def test_streaming_disabled(tmp_path,prettyprint):
+    OSC.disable_streaming()
+    sce = _scenario()
+    serializers._emitters.pop(OSC.Scenario,None)
+    sce.write_xml(str(tmp_path / 'scenario.xosc'),prettyprint)
+    assert (tmp_path / 'scenario.xosc').read_bytes() == _printed(sce,tmp_path,prettyprint)
+    # written from the element, nothing is translated
+    assert OSC.Scenario not in serializers._emitters
+
+
+@pytest.mark.parametrize('obj',[
+    OSC.AbsoluteSpeedAction(50,OSC.TransitionDynamics(OSC.DynamicsShapes.step,OSC.DynamicsDimension.rate,1)),
+    OSC.LateralDistanceAction('Ego',3,max_speed=50),
+    OSC.TeleportAction(OSC.WorldPosition()),
+    OSC.EntityTrigger('trigger',0.2,OSC.ConditionEdge.rising,OSC.TimeToCollisionCondition(10,OSC.Rule.equalTo,True,freespace=False,position=OSC.WorldPosition()),'Target'),
+    OSC.ValueTrigger('trigger',0,OSC.ConditionEdge.rising,OSC.ParameterCondition('something',2,OSC.Rule.equalTo)),
+    OSC.EmptyTrigger('stop'),
+    OSC.TriggeringEntities(OSC.TriggeringEntitiesRule.all)])
+def test_xml_string(obj):
+    assert serializers.xml_string(obj) == _pretty(obj.get_element())
+    assert serializers.xml_string(obj,False) == ET.tostring(obj.get_element(),'unicode')
+    assert serializers._emitters[type(obj)] is not None
+
+
+def _pretty(element):
+    import xml.dom.minidom as mini
+    return mini.parseString(ET.tostring(element,'utf-8')).toprettyxml(indent='\t')
+
+
+class _Wrapped(_BaseType):
+    """ builds its child before the root """
+    def __init__(self,text):
+        self.text = text
+
+    def get_element(self):
+        inner = ET.Element('Inner')
+        inner.text = self.text
+        element = ET.Element('Outer')
+        element.append(inner)
+        return element
+
+
+class _Container(_BaseType):
+    def __init__(self,*children):
+        self.children = children
+
+    def get_element(self):
+        element = ET.Element('Container',attrib={'xmlns:test':'test','name':'container'})
+        element.text = '\n'
+        for child in self.children:
+            element.append(child.get_element())
+        return element
+
+
+@pytest.mark.parametrize('prettyprint',[True,False])
+def test_fallback(tmp_path,prettyprint):
+    obj = _Container(_Wrapped('first'),_Wrapped('<second>'))
+    serializers.write_object(obj,str(tmp_path / 'object.xml'),prettyprint)
+    assert (tmp_path / 'object.xml').read_bytes() == _printed(obj,tmp_path,prettyprint)
+    # the wrapping class is written from its element
+    assert serializers._emitters[_Wrapped] is None
+    assert serializers._emitters[_Container] is not None
+
+
+def test_element_cache():
+    sce = _scenario()
+    expected = serializers.xml_string(sce)
+    try:
+        OSC.enable_element_cache()
+        assert serializers.xml_string(sce) == expected
+        sce.storyboard.init.initactions['Ego'][0].speed = 42
+        assert serializers.xml_string(sce) == expected.replace('value="30"','value="42"')
+    finally:
+        OSC.disable_element_cache()
+
+
+def _stories(n):
+    sce = _scenario()
+    for i in range(n):
+        event = OSC.Event('event' + str(i),OSC.Priority.overwrite)
+        event.add_trigger(OSC.ValueTrigger('start',0,OSC.ConditionEdge.rising,OSC.SimulationTimeCondition(i,OSC.Rule.greaterThan)))
+        event.add_action('speed',OSC.AbsoluteSpeedAction(i,OSC.TransitionDynamics(OSC.DynamicsShapes.step,OSC.DynamicsDimension.time,1)))
+        man = OSC.Maneuver('man' + str(i))
+        man.add_event(event)
+        sce.storyboard.add_maneuver(man,'Ego')
+    return sce
+
+
+@pytest.mark.parametrize('prettyprint',[True,False])
+def test_parallel(tmp_path,prettyprint):
+    sce = _stories(6)
+    assert len(sce.storyboard.stories) == 7
+    expected = serializers.xml_string(sce,prettyprint)
+    assert serializers.xml_string(sce,prettyprint,workers=3) == expected
+    sce.write_xml(str(tmp_path / 'parallel.xosc'),prettyprint,workers=3)
+    assert (tmp_path / 'parallel.xosc').read_bytes() == _printed(sce,tmp_path,prettyprint)
+
+
+class _TextAfterChild(_BaseType):
+    """ sets its text after the child is written """
+    def __init__(self,child):
+        self.child = child
+
+    def get_element(self):
+        element = ET.Element('Late')
+        element.append(self.child.get_element())
+        element.text = 'late'
+        return element
+
+
+def test_parallel_fallback():
+    # the fragment of a parent that falls back is written again with its element
+    obj = _Container(_TextAfterChild(_stories(2).storyboard.stories[1]))
+    assert serializers.xml_string(obj,workers=2) == serializers.xml_string(obj)
+    assert serializers._emitters[_TextAfterChild] is None
+
+
+def test_traceback_lines():
+    import inspect
+    import traceback
+    sce = _scenario()
+    sce.storyboard.stoptrigger = 'not a trigger'
+    with pytest.raises(AttributeError) as error:
+        serializers.xml_string(sce)
+    # the frames of the translated methods point at their append lines
+    lines = {frame.filename: frame.lineno for frame in traceback.extract_tb(error.value.__traceback__) if frame.name == 'get_element'}
+    source, first = inspect.getsourcelines(OSC.StoryBoard.get_element)
+    assert source[lines[inspect.getsourcefile(OSC.StoryBoard)] - first].strip() == 'element.append(self.stoptrigger.get_element())'
+    source, first = inspect.getsourcelines(OSC.Scenario.get_element)
+    assert source[lines[inspect.getsourcefile(OSC.Scenario)] - first].strip() == 'element.append(self.storyboard.get_element())'
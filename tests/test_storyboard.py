@@ -1,4 +1,5 @@
 import pytest
+import xml.etree.ElementTree as ET
 
 
 import pyoscx as OSC
@@ -280,4 +281,25 @@ def test_empty_storyboard():
    
 
 
-    OSC.prettyprint(sb.get_element())
\ No newline at end of file
+    OSC.prettyprint(sb.get_element())
+
+def test_no_shared_defaults():
+    first = OSC.StoryBoard()
+    second = OSC.StoryBoard()
+    assert first.init is not second.init
+    assert first.stoptrigger is not second.stoptrigger
+    first.init.add_init_action('Ego',OSC.TeleportAction(OSC.WorldPosition()))
+    assert second.init.initactions == {}
+    first.add_maneuver(OSC.Maneuver('man1'),'Ego')
+    first.add_maneuver(OSC.Maneuver('man2'),'Ego')
+    assert first.stories[0].parameter is not first.stories[1].parameter
+    assert OSC.Story('a').parameter is not OSC.Story('b').parameter
+
+
+def test_empty_storyboard_unchanged():
+    sb = OSC.StoryBoard()
+    element = sb.get_element()
+    # the empty story is written, but not added
+    assert sb.stories == []
+    assert element.find('Story').get('name') == 'story_act_empty'
+    assert ET.tostring(sb.get_element()) == ET.tostring(element)
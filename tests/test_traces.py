@@ -0,0 +1,111 @@
+import json
+import os
+import stat
+import threading
+
+import pytest
+
+import pyoscx as OSC
+
+
+def _scenario():
+    init = OSC.Init()
+    init.add_init_action('Ego',OSC.TeleportAction(OSC.WorldPosition()))
+    sb = OSC.StoryBoard(init)
+    entities = OSC.Entities()
+    return OSC.Scenario('traces','pyoscx',OSC.ParameterDeclarations(),entities,sb,OSC.RoadNetwork('road.xodr'),OSC.Catalog())
+
+
+def _fake_esmini(tmp_path):
+    bindir = tmp_path / 'esmini' / 'bin'
+    bindir.mkdir(parents=True)
+    exe = bindir / 'esmini'
+    exe.write_text('#!/bin/sh\nexit 0\n')
+    exe.chmod(exe.stat().st_mode | stat.S_IEXEC)
+    return str(tmp_path / 'esmini')
+
+
+def test_tracer(tmp_path):
+    tracer = OSC.Tracer(str(tmp_path / 'trace-{pid}.json'))
+    with tracer.span('outer','test',size=1) as args:
+        with tracer.span('inner','test'):
+            pass
+        args['done'] = True
+    tracer.instant('mark','test')
+    filename = tracer.write()
+    assert filename == str(tmp_path / ('trace-' + str(os.getpid()) + '.json'))
+    with open(filename) as f:
+        trace = json.load(f)
+    events = {e['name']:e for e in trace['traceEvents']}
+    assert events['outer']['ph'] == 'X' and events['outer']['args'] == {'size':1,'done':True}
+    assert events['outer']['ts'] <= events['inner']['ts']
+    assert events['inner']['dur'] <= events['outer']['dur']
+    assert events['mark']['ph'] == 'i'
+    assert events['thread_name']['args']['name'] == 'MainThread'
+    assert events['process_name']['pid'] == os.getpid()
+    with pytest.raises(ValueError):
+        OSC.Tracer().write()
+
+
+def test_no_tracing():
+    from pyoscx.traces import _span
+    # without a tracer each span still gets its own arguments
+    with _span('first','test') as first, _span('second','test',size=1) as second:
+        first['hit'] = True
+    assert first == {'hit':True} and second == {'size':1}
+
+
+@pytest.mark.skipif(os.name != 'posix',reason='uses a shell script as simulator')
+def test_tracing_runner(tmp_path):
+    runner = OSC.EsminiRunner(_fake_esmini(tmp_path),outputdir=str(tmp_path / 'out'),record=False)
+    with OSC.tracing(str(tmp_path / 'trace.json')) as tracer:
+        runner.run_batch([('run' + str(i),_scenario()) for i in range(4)],workers=2)
+    assert OSC.disable_tracing() is None
+    with open(str(tmp_path / 'trace.json')) as f:
+        events = json.load(f)['traceEvents']
+    spans = [e for e in events if e['ph'] == 'X']
+    assert set(e['name'] for e in spans) == {'run','serialize','write','simulate'}
+    simulations = [e for e in spans if e['name'] == 'simulate']
+    assert sorted(e['args']['run'] for e in simulations) == ['run0','run1','run2','run3']
+    assert all(e['args']['returncode'] == 0 for e in simulations)
+    # the runs are recorded in the worker threads
+    assert threading.get_ident() not in set(e['tid'] for e in simulations)
+    assert len(tracer.events) == len(spans)
+
+    # nothing is recorded while the tracing is disabled
+    runner.run(_scenario(),'untraced')
+    assert len(tracer.events) == len(spans)
+
+
+def test_merge_traces(tmp_path):
+    filenames = []
+    for i in range(2):
+        tracer = OSC.Tracer(str(tmp_path / ('trace' + str(i) + '.json')))
+        with tracer.span('span' + str(i),'test'):
+            pass
+        filenames.append(tracer.write())
+    OSC.merge_traces(filenames,str(tmp_path / 'merged.json'))
+    with open(str(tmp_path / 'merged.json')) as f:
+        events = json.load(f)['traceEvents']
+    assert [e['name'] for e in events if e['ph'] == 'X'] == ['span0','span1']
+
+
+def _traced_child():
+    from pyoscx.traces import _span
+    with _span('child_work','test'):
+        pass
+
+
+@pytest.mark.skipif(not hasattr(os,'register_at_fork'),reason='no fork')
+def test_forked_trace(tmp_path):
+    import multiprocessing
+    with OSC.tracing(str(tmp_path / 'trace-{pid}.json')) as tracer:
+        process = multiprocessing.get_context('fork').Process(target=_traced_child)
+        process.start()
+        process.join()
+    assert process.exitcode == 0
+    # the child wrote its own trace when it exited
+    with open(str(tmp_path / ('trace-' + str(process.pid) + '.json'))) as f:
+        child = json.load(f)
+    assert [e['name'] for e in child['traceEvents'] if e['ph'] == 'X'] == ['child_work']
+    assert os.path.isfile(str(tmp_path / ('trace-' + str(tracer.pid) + '.json')))
@@ -1,3 +1,5 @@
+import copy
+import xml.etree.ElementTree as ET
 import pytest
 
 
@@ -193,3 +195,176 @@ def test_nurbs():
     nurb.add_knots([5,4,3,2,1])
 
     OSC.prettyprint(nurb.get_element())
+
+def test_fingerprint_and_equality():
+    td1 = OSC.TransitionDynamics(OSC.DynamicsShapes.step,OSC.DynamicsDimension.time,1)
+    td2 = OSC.TransitionDynamics(OSC.DynamicsShapes.step,OSC.DynamicsDimension.time,1)
+    td3 = OSC.TransitionDynamics(OSC.DynamicsShapes.linear,OSC.DynamicsDimension.time,1)
+    assert td1 == td2
+    assert td1 != td3
+    assert td1 != None
+    assert td1.fingerprint() == td2.fingerprint()
+    assert len({td1,td2,td3}) == 2
+    assert OSC.Center(1,2,3) != OSC.Dimensions(1,2,3)
+
+def test_convert_float():
+    assert OSC.convert_float(1) == '1'
+    assert OSC.convert_float(1.0) == '1.0'
+    assert OSC.convert_float(-0.0) == '-0.0'
+    assert OSC.convert_float(0.0) == '0.0'
+    assert OSC.convert_float(0.1) == '0.1'
+    assert OSC.convert_float('$speed') == '$speed'
+
+def test_canonical_xml():
+    element = ET.Element('Root',attrib={'b':'1','a':'2'})
+    ET.SubElement(element,'Child',attrib={'y':'1','x':'2'})
+    assert OSC.canonical_xml(element) == b"<?xml version='1.0' encoding='utf-8'?>\n<Root a=\"2\" b=\"1\">\n\t<Child x=\"2\" y=\"1\" />\n</Root>\n"
+    assert OSC.canonical_xml(element,prettyprint=False) == b"<?xml version='1.0' encoding='utf-8'?>\n<Root a=\"2\" b=\"1\"><Child x=\"2\" y=\"1\" /></Root>\n"
+
+def test_numeric_format():
+    try:
+        OSC.set_numeric_format(position=2,angle=3,time=1,shorten_integers=True,omit_defaults=True)
+        pos = OSC.WorldPosition(1.23456,2.0,0,0.523598775598)
+        assert pos.get_attributes() == {'x':'1.23','y':'2','h':'0.524'}
+        assert OSC.LanePosition(10.0,0,-1,1).get_attributes() == {'roadId':'1','laneId':'-1','s':'10'}
+        assert OSC.convert_float(0.123456,'time') == '0.1'
+        assert OSC.convert_float(0.123456) == '0.123456'
+        assert OSC.convert_float(-0.001,'position') == '0'
+        assert OSC.convert_float(-0.0) == '0'
+        td = OSC.TransitionDynamics(OSC.DynamicsShapes.step,OSC.DynamicsDimension.distance,3.14159)
+        assert td.get_attributes()['value'] == '3.14'
+        with pytest.raises(ValueError):
+            OSC.set_numeric_format(position=-1)
+    finally:
+        OSC.set_numeric_format()
+    assert OSC.LanePosition(10.0,0,-1,1).get_attributes()['offset'] == '0'
+    assert OSC.convert_float(0.123456,'time') == '0.123456'
+
+def test_interning():
+    changeable_orientation = OSC.Orientation(h=1)
+    try:
+        OSC.enable_interning()
+        td1 = OSC.TransitionDynamics(OSC.DynamicsShapes.step,OSC.DynamicsDimension.time,1)
+        td2 = OSC.TransitionDynamics(OSC.DynamicsShapes.step,OSC.DynamicsDimension.time,1)
+        assert td1 is td2
+        assert OSC.TransitionDynamics(OSC.DynamicsShapes.step,OSC.DynamicsDimension.time,1.0) is not td1
+        assert OSC.WorldPosition(1,2,h=0.5) is OSC.WorldPosition(1,2,h=0.5)
+        assert OSC.WorldPosition(-0.0,2).get_attributes()['x'] == '-0.0'
+        assert OSC.WorldPosition(0.0,2).get_attributes()['x'] == '0.0'
+        assert OSC.LanePosition(10,0,-1,1,OSC.Orientation(h=1)) is OSC.LanePosition(10,0,-1,1,OSC.Orientation(h=1))
+        # the shared element is built once
+        assert td1.get_element() is td2.get_element()
+        with pytest.raises(AttributeError):
+            td1.value = 2
+        changeable = copy.deepcopy(td1)
+        changeable.value = 2
+        assert changeable.get_attributes()['value'] == '2'
+        # objects holding a changeable object are not interned
+        assert OSC.LanePosition(10,0,-1,1,changeable_orientation) is not OSC.LanePosition(10,0,-1,1,changeable_orientation)
+    finally:
+        OSC.disable_interning()
+    assert OSC.Orientation(h=1) is not OSC.Orientation(h=1)
+    td = OSC.TransitionDynamics(OSC.DynamicsShapes.step,OSC.DynamicsDimension.time,1)
+    td.value = 3
+
+
+def test_trusted_construction():
+    def build(action):
+        event = OSC.Event('event',OSC.Priority.overwrite)
+        event.add_trigger(OSC.ValueTrigger('start',0,OSC.ConditionEdge.rising,OSC.SimulationTimeCondition(1,OSC.Rule.greaterThan)))
+        event.add_action('action',action)
+        man = OSC.Maneuver('man')
+        man.add_event(event)
+        return man
+
+    td = OSC.TransitionDynamics(OSC.DynamicsShapes.step,OSC.DynamicsDimension.time,1)
+    checked = build(OSC.AbsoluteSpeedAction(10,td))
+    with OSC.trusted_construction():
+        trusted = build(OSC.AbsoluteSpeedAction(10,td))
+        # the checks are skipped
+        broken = build(OSC.AbsoluteSpeedAction(10,'not dynamics'))
+        broken.add_event('not an event')
+    assert trusted == checked
+    assert ET.tostring(trusted.get_element()) == ET.tostring(checked.get_element())
+    trusted.validate()
+    with pytest.raises(TypeError):
+        broken.validate()
+
+    # the checks are back after the context
+    with pytest.raises(TypeError):
+        OSC.AbsoluteSpeedAction(10,'not dynamics')
+
+    # add_ calls on objects created with checks are validated as well
+    with OSC.trusted_construction():
+        checked.add_event('not an event')
+    with pytest.raises(TypeError):
+        checked.validate()
+
+    # without recording there is nothing to validate
+    with OSC.trusted_construction(record=False):
+        unrecorded = OSC.AbsoluteSpeedAction(10,'not dynamics')
+    unrecorded.validate()
+
+
+def test_trusted_construction_per_object_and_thread():
+    import gc
+    import threading
+    import weakref
+    td = OSC.TransitionDynamics(OSC.DynamicsShapes.step,OSC.DynamicsDimension.time,1)
+    # objects that are never validated do not stay alive
+    with OSC.trusted_construction():
+        ref = weakref.ref(OSC.AbsoluteSpeedAction(10,td))
+        action = OSC.AbsoluteSpeedAction(10,td)
+    gc.collect()
+    assert ref() is None
+    action.validate()
+    assert '_trusted_calls' not in action.__dict__
+
+    # the context only skips the checks of its own thread
+    errors = []
+    inside = threading.Event()
+    done = threading.Event()
+    def other():
+        inside.wait()
+        try:
+            OSC.AbsoluteSpeedAction(10,'not dynamics')
+        except TypeError as e:
+            errors.append(e)
+        done.set()
+    thread = threading.Thread(target=other)
+    thread.start()
+    with OSC.trusted_construction():
+        inside.set()
+        done.wait()
+        OSC.AbsoluteSpeedAction(10,'not dynamics')
+    thread.join()
+    assert len(errors) == 1
+
+
+def test_lazy_names():
+    import importlib
+    # every class and function of a submodule is in the table of its submodule
+    for module, names in OSC._SUBMODULES.items():
+        submodule = importlib.import_module('pyoscx.' + module)
+        defined = [name for name, value in vars(submodule).items() if not name.startswith('_') and getattr(value,'__module__',None) == submodule.__name__]
+        assert set(defined) <= set(names)
+    for name in OSC.__all__:
+        assert getattr(OSC,name) is getattr(importlib.import_module('pyoscx.' + OSC._NAMES[name]),name)
+    # names imported by the submodules still work
+    assert OSC.ET is ET
+    with pytest.raises(AttributeError):
+        OSC.does_not_exist
+
+
+def test_clone_read_by_threads():
+    init = OSC.Init()
+    td = OSC.TransitionDynamics(OSC.DynamicsShapes.step,OSC.DynamicsDimension.time,1)
+    for i in range(20):
+        init.add_init_action('car' + str(i),OSC.AbsoluteSpeedAction(i,td))
+    expected = ET.tostring(init.get_element())
+    for _ in range(10):
+        clone = init.clone()
+        # the attributes of the clone are copied by the first thread reaching them
+        elements = OSC.run_parallel([(clone.get_element,()) for _ in range(8)],workers=8)
+        assert all(ET.tostring(element) == expected for element in elements)
+        assert '_cow_shared' not in clone.__dict__
@@ -0,0 +1,74 @@
+import os
+import stat
+import xml.etree.ElementTree as ET
+
+import pytest
+
+import pyoscx as OSC
+
+
+def _builder(speed,distance,lane=-1,name='Ego'):
+    init = OSC.Init()
+    td = OSC.TransitionDynamics(OSC.DynamicsShapes.step,OSC.DynamicsDimension.time,1)
+    init.add_init_action(name,OSC.AbsoluteSpeedAction(speed,td))
+    init.add_init_action(name,OSC.TeleportAction(OSC.LanePosition(distance,0,lane,1)))
+    sb = OSC.StoryBoard(init)
+    parameters = OSC.ParameterDeclarations()
+    parameters.add_parameter(OSC.Parameter('fixed',OSC.ParameterType.integer,1))
+    return OSC.Scenario('variants','pyoscx',parameters,OSC.Entities(),sb,OSC.RoadNetwork('road.xodr'),OSC.Catalog())
+
+
+def test_parameterized_scenario():
+    sce = OSC.parameterized_scenario(_builder,{'speed':10.5,'distance':20,'lane':-1,'name':'Ego'})
+    element = sce.get_element()
+    declarations = {e.get('name'):e.attrib for e in element.iter('ParameterDeclaration')}
+    assert declarations['speed'] == {'name':'speed','parameterType':'double','value':'10.5'}
+    assert declarations['distance']['parameterType'] == 'integer'
+    assert declarations['name']['parameterType'] == 'string'
+    assert 'fixed' in declarations
+    assert element.find('.//AbsoluteTargetSpeed').get('value') == '$speed'
+    assert element.find('.//LanePosition').get('s') == '$distance'
+    with pytest.raises(TypeError):
+        OSC.parameterized_scenario(_builder,{'speed':None,'distance':1})
+
+
+def test_parameter_variants(tmp_path):
+    variants = OSC.ParameterVariants(OSC.parameterized_scenario(_builder,{'speed':10.0,'distance':20}),str(tmp_path))
+    files = [variants.write('variant_' + str(i),{'speed':10.0 + i}) for i in range(3)]
+    assert sorted(os.listdir(str(tmp_path))) == ['base.xosc','variant_0.xosc','variant_1.xosc','variant_2.xosc']
+    assert os.path.getsize(files[0]) < os.path.getsize(variants.base_file)
+    distribution = ET.parse(files[2]).getroot().find('ParameterValueDistribution')
+    assert distribution.find('ScenarioFile').get('filepath') == 'base.xosc'
+    assert [e.attrib for e in distribution.iter('ParameterAssignment')] == [{'parameterRef':'speed','value':'12.0'}]
+    assert variants.command_line({'speed':12,'distance':5}) == ['--param','speed=12','--param','distance=5']
+    with pytest.raises(ValueError):
+        variants.write('bad',{'unknown':1})
+
+    header = ET.parse(files[0]).getroot().find('FileHeader')
+    assert header.get('revMajor') == '1' and header.get('revMinor') == '1' and header.get('date') == OSC.CANONICAL_DATE
+    # the same variant gives the same bytes
+    with open(files[0],'rb') as f:
+        first = f.read()
+    variants.write('variant_0',{'speed':10.0})
+    with open(files[0],'rb') as f:
+        assert f.read() == first
+    for variant in ['../outside','sub/variant','..','']:
+        with pytest.raises(ValueError):
+            variants.write(variant,{'speed':1.0})
+
+
+@pytest.mark.skipif(os.name != 'posix',reason='uses a shell script as simulator')
+def test_run_variant(tmp_path):
+    bindir = tmp_path / 'esmini' / 'bin'
+    bindir.mkdir(parents=True)
+    exe = bindir / 'esmini'
+    exe.write_text('#!/bin/sh\necho "$@"\n')
+    exe.chmod(exe.stat().st_mode | stat.S_IEXEC)
+    variants = OSC.ParameterVariants(OSC.parameterized_scenario(_builder,{'speed':10.0,'distance':20}),str(tmp_path / 'variants'))
+    runner = OSC.EsminiRunner(str(tmp_path / 'esmini'),outputdir=str(tmp_path / 'out'),record=False)
+    result = runner.run_variant(variants,{'speed':15},'fast')
+    assert result.succeeded()
+    assert result.scenario_file == variants.base_file
+    assert '--osc ' + variants.base_file in result.stdout
+    assert '--param speed=15' in result.stdout
+    assert os.listdir(str(tmp_path / 'variants')) == ['base.xosc']
@@ -0,0 +1,132 @@
+import os
+import threading
+import time
+
+import pytest
+
+import pyoscx as OSC
+
+
+def _scenario(speed):
+    init = OSC.Init()
+    td = OSC.TransitionDynamics(OSC.DynamicsShapes.step,OSC.DynamicsDimension.time,1)
+    init.add_init_action('Ego',OSC.AbsoluteSpeedAction(speed,td))
+    sb = OSC.StoryBoard(init)
+    sce = OSC.Scenario('writer','pyoscx',OSC.ParameterDeclarations(),OSC.Entities(),sb,OSC.RoadNetwork('road.xodr'),OSC.Catalog())
+    sce.header.date = '2020-06-01T12:00:00'
+    return sce
+
+
+@pytest.mark.parametrize('fsync',[False,True])
+def test_async_writer(tmp_path,fsync):
+    with OSC.AsyncWriter(workers=3,fsync=fsync,fsync_batch=4) as writer:
+        for i in range(10):
+            writer.write_scenario(str(tmp_path / ('s' + str(i) + '.xosc')),_scenario(i),prettyprint=bool(i % 2))
+        writer.submit(str(tmp_path / 'text.txt'),'text')
+    assert writer.written == 11
+    assert sorted(os.listdir(str(tmp_path))) == sorted(['s' + str(i) + '.xosc' for i in range(10)] + ['text.txt'])
+    for i in range(10):
+        _scenario(i).write_xml(str(tmp_path / 'expected.xosc'),prettyprint=bool(i % 2))
+        assert (tmp_path / ('s' + str(i) + '.xosc')).read_bytes() == (tmp_path / 'expected.xosc').read_bytes()
+        os.remove(str(tmp_path / 'expected.xosc'))
+
+
+def test_async_writer_error(tmp_path):
+    writer = OSC.AsyncWriter(workers=2)
+    writer.submit(str(tmp_path / 'file.xosc'),b'data')
+    writer.submit(str(tmp_path / 'missing' / 'file.xosc'),b'data')
+    with pytest.raises(FileNotFoundError):
+        writer.flush()
+    # the error is reported once
+    writer.close()
+    assert writer.written == 1
+    assert os.listdir(str(tmp_path)) == ['file.xosc']
+
+
+def test_async_writer_inflight(tmp_path,monkeypatch):
+    writer = OSC.AsyncWriter(workers=4,max_inflight=100)
+    release = threading.Event()
+    inflight = []
+    original = writer._write
+
+    def slow_write(*args):
+        inflight.append(writer._inflight)
+        release.wait(5)
+        original(*args)
+    monkeypatch.setattr(writer,'_write',slow_write)
+    writer.submit(str(tmp_path / 'a'),b'x'*60)
+    producer = threading.Thread(target=writer.submit,args=(str(tmp_path / 'b'),b'x'*60))
+    producer.start()
+    time.sleep(0.1)
+    # the second submit waits for the first file
+    assert producer.is_alive()
+    release.set()
+    producer.join(5)
+    writer.close()
+    assert max(inflight) <= 100
+    assert writer.bytes_written == 120
+    with pytest.raises(ValueError):
+        OSC.AsyncWriter(workers=0)
+
+
+@pytest.mark.parametrize('fsync',[False,True])
+def test_async_writer_same_file(tmp_path,fsync):
+    filename = str(tmp_path / 'same.txt')
+    with OSC.AsyncWriter(workers=4,fsync=fsync,fsync_batch=8) as writer:
+        for i in range(50):
+            writer.submit(filename,str(i))
+    # the last submitted content wins, replaced files of a batch are not counted
+    assert os.listdir(str(tmp_path)) == ['same.txt']
+    assert (tmp_path / 'same.txt').read_text() == '49'
+    assert writer.written <= 50
+
+
+def test_async_writer_failed_commit(tmp_path,monkeypatch):
+    def failing_fsync(fd):
+        raise OSError('fsync failed')
+    writer = OSC.AsyncWriter(workers=2,fsync=True,fsync_batch=2)
+    monkeypatch.setattr(os,'fsync',failing_fsync)
+    writer.submit(str(tmp_path / 'a'),b'a')
+    writer.submit(str(tmp_path / 'b'),b'b')
+    with pytest.raises(OSError):
+        writer.close()
+    # nothing is counted that was not committed
+    assert writer.written == 0 and writer.bytes_written == 0
+    assert os.listdir(str(tmp_path)) == []
+
+
+def test_async_writer_producer_error(tmp_path):
+    with pytest.raises(RuntimeError):
+        with OSC.AsyncWriter(fsync=True) as writer:
+            writer.submit(str(tmp_path / 'a'),b'a')
+            raise RuntimeError('producer failed')
+    # the files of the pending batch are removed
+    assert os.listdir(str(tmp_path)) == []
+
+
+def test_async_writer_stale_batch(tmp_path,monkeypatch):
+    # the first batch is committed after the second one, which has a newer version of the same file
+    fsync = os.fsync
+    calls = []
+    lock = threading.Lock()
+    def slow_first_fsync(fd):
+        with lock:
+            calls.append(fd)
+            first = len(calls) == 1
+        if first:
+            time.sleep(0.3)
+        fsync(fd)
+    monkeypatch.setattr(os,'fsync',slow_first_fsync)
+    filename = str(tmp_path / 'same.txt')
+    with OSC.AsyncWriter(workers=4,fsync=True,fsync_batch=2) as writer:
+        writer.submit(filename,'old')
+        writer.submit(str(tmp_path / 'a.txt'),'a')
+        while not calls:
+            time.sleep(0.01)
+        writer.submit(filename,'new')
+        writer.submit(str(tmp_path / 'b.txt'),'b')
+        for i in range(20):
+            writer.submit(filename,str(i))
+            writer.submit(str(tmp_path / ('c' + str(i) + '.txt')),'c')
+    assert (tmp_path / 'same.txt').read_text() == '19'
+    assert not [name for name in os.listdir(str(tmp_path)) if '.tmp' in name]